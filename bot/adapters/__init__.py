@@ -1,22 +1,32 @@
 """
 Adapter package (P3).
 
-Provides explicit registries for :class:`~bot.providers.Transcriber` and
-:class:`~bot.providers.TextProcessor` adapters, replacing ``if/elif``
+Provides explicit registries for :class:`~bot.providers.Transcriber`,
+:class:`~bot.providers.TextProcessor` and
+:class:`~bot.providers.SinglePassProcessor` adapters, replacing ``if/elif``
 factory chains.
 
 On import, this package registers the built-in adapter factories
-(``openai-native``, ``gemini-native``, ``openai-compat``) with the global
+(``openai-native``, ``gemini-native``, ``openai-compat``,
+``local-whisper``, ``mock``) with the global
 registries so they can be created by adapter type name.
 """
 
 from __future__ import annotations
 
 from bot.adapters.defaults import register_defaults
-from bot.adapters.openai_compat import OpenAICompatTextProcessor, OpenAICompatTranscriber
+from bot.adapters.local_whisper import LocalWhisperTranscriber, probe_local_whisper
+from bot.adapters.mock import MockBehaviour, MockTextProcessor, MockTranscriber
+from bot.adapters.openai_compat import (
+    OpenAICompatSinglePassProcessor,
+    OpenAICompatTextProcessor,
+    OpenAICompatTranscriber,
+)
 from bot.adapters.registry import (
+    SinglePassRegistry,
     TextProcessorRegistry,
     TranscriberRegistry,
+    single_pass_registry,
     text_processor_registry,
     transcriber_registry,
 )
@@ -25,10 +35,18 @@ from bot.adapters.registry import (
 register_defaults()
 
 __all__ = [
+    "LocalWhisperTranscriber",
+    "MockBehaviour",
+    "MockTextProcessor",
+    "MockTranscriber",
+    "OpenAICompatSinglePassProcessor",
     "OpenAICompatTextProcessor",
     "OpenAICompatTranscriber",
+    "SinglePassRegistry",
     "TextProcessorRegistry",
     "TranscriberRegistry",
+    "probe_local_whisper",
+    "single_pass_registry",
     "text_processor_registry",
     "transcriber_registry",
 ]
@@ -1,8 +1,9 @@
 """
 Default adapter registrations (P3).
 
-Registers the built-in transcriber and text-processor factories so they
-can be created by adapter type name through the global registries.
+Registers the built-in transcriber, text-processor and single-pass
+factories so they can be created by adapter type name through the global
+registries.
 
 Adapter types registered
 ------------------------
@@ -14,7 +15,14 @@ Key             Transcriber               Text processor
 ``gemini``      ``GeminiTranscriber``         alias for ``gemini-native``
 ``gemini-native``  same                      same
 ``openai-compat``  ``OpenAICompatTranscriber``  ``OpenAICompatTextProcessor``
+``local-whisper``  ``LocalWhisperTranscriber``  —
+``mock``        ``MockTranscriber``           ``MockTextProcessor``
 =============== ========================= ===============================
+
+Every adapter type above except ``local-whisper`` (transcription only)
+and ``mock`` (load tests) also registers a single-pass processor:
+``OpenAISinglePassProcessor`` (audio-input chat models),
+``GeminiSinglePassProcessor`` and ``OpenAICompatSinglePassProcessor``.
 """
 
 from __future__ import annotations
@@ -22,14 +30,23 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+from bot.adapters.local_whisper import LocalWhisperTranscriber
+from bot.adapters.mock import MockTextProcessor, MockTranscriber
 from bot.adapters.openai_compat import (
+    OpenAICompatSinglePassProcessor,
     OpenAICompatTextProcessor,
     OpenAICompatTranscriber,
 )
-from bot.adapters.registry import text_processor_registry, transcriber_registry
+from bot.adapters.registry import (
+    single_pass_registry,
+    text_processor_registry,
+    transcriber_registry,
+)
 from bot.providers import (
+    GeminiSinglePassProcessor,
     GeminiTextProcessor,
     GeminiTranscriber,
+    OpenAISinglePassProcessor,
     OpenAITextProcessor,
     OpenAIWhisperTranscriber,
 )
@@ -86,9 +103,16 @@ def _gemini_native_processor(
 def _openai_compat_transcriber(
     api_key: str,
     endpoint: str = "",
+    model_name: str = "whisper-1",
+    streaming_transcription: bool = False,
     **kwargs,  # noqa: ARG001
 ) -> OpenAICompatTranscriber:
-    return OpenAICompatTranscriber(api_key=api_key, endpoint=endpoint)
+    return OpenAICompatTranscriber(
+        api_key=api_key,
+        endpoint=endpoint,
+        model_name=model_name,
+        streaming=streaming_transcription,
+    )
 
 
 def _openai_compat_processor(
@@ -106,6 +130,74 @@ def _openai_compat_processor(
     )
 
 
+def _local_whisper_transcriber(
+    api_key: str = "",
+    endpoint: str = "",
+    model_name: str = "",
+    **kwargs,  # noqa: ARG001
+) -> LocalWhisperTranscriber:
+    return LocalWhisperTranscriber(
+        endpoint=endpoint,
+        api_key=api_key,
+        model_name=model_name,
+    )
+
+
+def _mock_transcriber(
+    endpoint: str = "",
+    **kwargs,  # noqa: ARG001
+) -> MockTranscriber:
+    return MockTranscriber(endpoint=endpoint)
+
+
+def _mock_processor(
+    endpoint: str = "",
+    **kwargs,  # noqa: ARG001
+) -> MockTextProcessor:
+    return MockTextProcessor(endpoint=endpoint)
+
+
+def _openai_native_single_pass(
+    api_key: str,
+    model_name: str = "gpt-4o-audio-preview",
+    prompts: Optional[dict] = None,
+    **kwargs,  # noqa: ARG001
+) -> OpenAISinglePassProcessor:
+    return OpenAISinglePassProcessor(
+        api_key=api_key,
+        model_name=model_name,
+        prompts=prompts,
+    )
+
+
+def _gemini_native_single_pass(
+    api_key: str,
+    model_name: str = "gemini-2.0-flash",
+    prompts: Optional[dict] = None,
+    **kwargs,  # noqa: ARG001
+) -> GeminiSinglePassProcessor:
+    return GeminiSinglePassProcessor(
+        api_key=api_key,
+        model_name=model_name,
+        prompts=prompts,
+    )
+
+
+def _openai_compat_single_pass(
+    api_key: str,
+    model_name: str = "gpt-4o-audio-preview",
+    endpoint: str = "",
+    prompts: Optional[dict] = None,
+    **kwargs,  # noqa: ARG001
+) -> OpenAICompatSinglePassProcessor:
+    return OpenAICompatSinglePassProcessor(
+        api_key=api_key,
+        model_name=model_name,
+        endpoint=endpoint,
+        prompts=prompts,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Registration
 # ---------------------------------------------------------------------------
@@ -120,11 +212,13 @@ def register_defaults() -> None:
     if not transcriber_registry.has_type("openai-native"):
         transcriber_registry.register("openai-native", _openai_native_transcriber)
         text_processor_registry.register("openai-native", _openai_native_processor)
+        single_pass_registry.register("openai-native", _openai_native_single_pass)
 
         # Short alias for backward compatibility with the legacy Config class
         # whose ``provider_name`` is ``"openai"`` (not ``"openai-native"``).
         transcriber_registry.register("openai", _openai_native_transcriber)
         text_processor_registry.register("openai", _openai_native_processor)
+        single_pass_registry.register("openai", _openai_native_single_pass)
 
         logger.debug("Registered OpenAI native adapters")
 
@@ -132,10 +226,12 @@ def register_defaults() -> None:
     if not transcriber_registry.has_type("gemini-native"):
         transcriber_registry.register("gemini-native", _gemini_native_transcriber)
         text_processor_registry.register("gemini-native", _gemini_native_processor)
+        single_pass_registry.register("gemini-native", _gemini_native_single_pass)
 
         # Short alias for backward compatibility.
         transcriber_registry.register("gemini", _gemini_native_transcriber)
         text_processor_registry.register("gemini", _gemini_native_processor)
+        single_pass_registry.register("gemini", _gemini_native_single_pass)
 
         logger.debug("Registered Gemini native adapters")
 
@@ -143,5 +239,19 @@ def register_defaults() -> None:
     if not transcriber_registry.has_type("openai-compat"):
         transcriber_registry.register("openai-compat", _openai_compat_transcriber)
         text_processor_registry.register("openai-compat", _openai_compat_processor)
+        single_pass_registry.register("openai-compat", _openai_compat_single_pass)
 
         logger.debug("Registered OpenAI-compatible adapters")
+
+    # --- Local Whisper servers (transcription only) ---
+    if not transcriber_registry.has_type("local-whisper"):
+        transcriber_registry.register("local-whisper", _local_whisper_transcriber)
+
+        logger.debug("Registered local Whisper adapter")
+
+    # --- Mock provider (load tests and chaos experiments) ---
+    if not transcriber_registry.has_type("mock"):
+        transcriber_registry.register("mock", _mock_transcriber)
+        text_processor_registry.register("mock", _mock_processor)
+
+        logger.debug("Registered mock adapters")
@@ -0,0 +1,278 @@
+"""
+Local HTTP transcription adapter for self-hosted Whisper servers.
+
+Works with servers that accept a multipart upload of the audio file:
+
+- faster-whisper-server / speaches, LocalAI and other OpenAI-compatible
+  servers (``/v1/audio/transcriptions``)
+- whisper.cpp ``server`` (``/inference``)
+
+No API key is required; when one is configured it is sent as a bearer
+token.  The connection is configured through the provider endpoint:
+
+``http://localhost:8000/v1``
+    The adapter posts to ``/v1/audio/transcriptions``.
+``http://localhost:8080/inference``
+    An endpoint whose path already ends with ``/inference`` or
+    ``/transcriptions`` is used as-is.
+``?response_format=verbose_json&language=it``
+    Optional query parameters: the response format (``json``,
+    ``verbose_json`` or ``text``) and a language hint.  They are sent as
+    form fields, not in the URL.
+
+The per-request adapters share one keep-alive ``httpx.AsyncClient`` per
+server (and event loop), so consecutive voice messages reuse the same
+connection instead of paying a new TCP handshake each time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mimetypes
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+import httpx
+
+from bot import constants as c
+from bot.capabilities import CapabilityModel
+from bot.exceptions import TranscribeError, TranscribeTimeout
+from bot.providers import (
+    Transcriber,
+    TranscriptionResult,
+    _log_provider_failure,
+    _log_text_preview,
+)
+
+logger = logging.getLogger(__name__)
+
+_DIRECT_PATHS = ("/inference", "/transcriptions")
+
+
+# ---------------------------------------------------------------------------
+# Endpoint parsing
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class LocalWhisperEndpoint:
+    """A parsed local Whisper endpoint.
+
+    *url* is the transcription URL, *base_url* the API root used for
+    model discovery (``.../v1``) and *origin* the ``scheme://host:port``
+    part the keep-alive client is keyed on.
+    """
+
+    url: str
+    base_url: str
+    origin: str
+    response_format: str = "json"
+    language: Optional[str] = None
+
+
+def parse_endpoint(endpoint: str) -> LocalWhisperEndpoint:
+    """Parse a provider *endpoint* into a :class:`LocalWhisperEndpoint`.
+
+    Raises :class:`ValueError` for an unsupported ``response_format``.
+    """
+    parts = urlsplit((endpoint or c.LOCAL_WHISPER_DEFAULT_ENDPOINT).strip())
+    query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    response_format = (query.get("response_format") or "json").lower()
+    if response_format not in c.LOCAL_WHISPER_RESPONSE_FORMATS:
+        raise ValueError(f"Unsupported response_format: {response_format}")
+    language = (query.get("language") or "").strip() or None
+
+    origin = urlunsplit((parts.scheme, parts.netloc, "", "", ""))
+    path = parts.path.rstrip("/")
+    if path.endswith(_DIRECT_PATHS):
+        url = origin + path
+        base_path = path.rsplit("/audio/", 1)[0] if "/audio/" in path else ""
+    else:
+        base_path = path if path.endswith("/v1") else f"{path}/v1"
+        url = f"{origin}{base_path}/audio/transcriptions"
+    return LocalWhisperEndpoint(
+        url=url,
+        base_url=origin + base_path,
+        origin=origin,
+        response_format=response_format,
+        language=language,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Keep-alive clients
+# ---------------------------------------------------------------------------
+
+# httpx clients are bound to the event loop that opened their connections:
+# one pool per loop, so worker processes and benchmarks never share them.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _shared_client(origin: str) -> httpx.AsyncClient:
+    pool = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = pool.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                c.PROGRESS_TIMEOUTS.get("transcribe", 120),
+                connect=c.LOCAL_WHISPER_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_keepalive_connections=c.LOCAL_WHISPER_MAX_KEEPALIVE,
+                keepalive_expiry=c.LOCAL_WHISPER_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        pool[origin] = client
+    return client
+
+
+async def close_local_whisper_clients() -> None:
+    """Close the keep-alive clients of the running loop (used on shutdown)."""
+    pool = _clients.pop(asyncio.get_running_loop(), {})
+    for client in pool.values():
+        await client.aclose()
+
+
+def _auth_headers(api_key: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+
+# ---------------------------------------------------------------------------
+# Transcriber
+# ---------------------------------------------------------------------------
+
+
+def _parse_transcription(response: httpx.Response, response_format: str) -> TranscriptionResult:
+    if response_format == "text" or "json" not in response.headers.get("content-type", ""):
+        return TranscriptionResult(text=response.text.strip())
+    data = response.json()
+    segments = data.get("segments")
+    duration = data.get("duration")
+    return TranscriptionResult(
+        text=(data.get("text") or "").strip(),
+        language=data.get("language") or None,
+        duration_seconds=float(duration) if duration is not None else None,
+        segments=[
+            {"start": s.get("start"), "end": s.get("end"), "text": s.get("text", "")}
+            for s in segments
+            if isinstance(s, dict)
+        ] if isinstance(segments, list) else None,
+    )
+
+
+class LocalWhisperTranscriber(Transcriber):
+    """Transcription through a self-hosted Whisper HTTP server.
+
+    *model_name* is sent as the ``model`` form field (whisper.cpp ignores
+    it); *endpoint* also carries the response format and language hint,
+    see the module docstring.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "",
+        api_key: str = "",
+        model_name: str = "",
+    ) -> None:
+        self.endpoint = parse_endpoint(endpoint)
+        self.api_key = api_key
+        self.model_name = model_name or c.LOCAL_WHISPER_DEFAULT_MODEL
+
+    def get_capabilities(self) -> CapabilityModel:
+        return CapabilityModel(transcription=True)
+
+    def _form_fields(self) -> Dict[str, str]:
+        fields = {
+            "model": self.model_name,
+            "response_format": self.endpoint.response_format,
+            "temperature": "0",
+        }
+        if self.endpoint.language:
+            fields["language"] = self.endpoint.language
+        return fields
+
+    async def transcribe(self, file_path: str) -> TranscriptionResult:
+        logger.info("Transcribe %s with local Whisper server", file_path)
+        mime_type = mimetypes.guess_type(file_path)[0] or "audio/mpeg"
+        try:
+            with open(file_path, "rb") as audio:
+                response = await _shared_client(self.endpoint.origin).post(
+                    self.endpoint.url,
+                    data=self._form_fields(),
+                    files={"file": (os.path.basename(file_path), audio, mime_type)},
+                    headers=_auth_headers(self.api_key),
+                )
+            response.raise_for_status()
+            result = _parse_transcription(response, self.endpoint.response_format)
+        except httpx.TimeoutException as e:
+            _log_provider_failure("local-whisper", "transcribe", e)
+            raise TranscribeTimeout("Timeout in transcribe", c.MSG_TIMEOUT_TRANSCRIBE) from e
+        except Exception as e:
+            _log_provider_failure("local-whisper", "transcribe", e)
+            raise TranscribeError(
+                f"Local Whisper transcription failed: {e}",
+                c.MSG_ERROR_TRANSCRIBE,
+            ) from e
+
+        _log_text_preview("Raw text", result.text)
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Health and capability detection
+# ---------------------------------------------------------------------------
+
+
+async def probe_local_whisper(
+    endpoint: str,
+    api_key: str = "",
+    session: httpx.AsyncClient | None = None,
+) -> Dict[str, Any]:
+    """Check that a local Whisper server answers and list its models.
+
+    Tries ``GET {base_url}/models`` (OpenAI-compatible servers), then
+    ``GET {origin}/health`` and finally the server root, so whisper.cpp
+    — which has no model list — is still detected as reachable.
+
+    Returns ``reachable``, ``status_code``, ``models``, ``latency_ms``
+    and the parsed ``response_format`` / ``language``.  Connection
+    errors propagate as ``httpx`` exceptions.
+    """
+    parsed = parse_endpoint(endpoint)
+    result: Dict[str, Any] = {
+        "reachable": False,
+        "status_code": None,
+        "models": [],
+        "latency_ms": None,
+        "response_format": parsed.response_format,
+        "language": parsed.language,
+    }
+    client = session or httpx.AsyncClient(timeout=c.LOCAL_WHISPER_HEALTH_TIMEOUT_SECONDS)
+    try:
+        started = time.perf_counter()
+        for url in (f"{parsed.base_url}/models", f"{parsed.origin}/health", f"{parsed.origin}/"):
+            resp = await client.get(url, headers=_auth_headers(api_key))
+            result["status_code"] = resp.status_code
+            if resp.status_code in (401, 403):
+                break
+            if resp.status_code >= 400:
+                continue
+            result["reachable"] = True
+            if url.endswith("/models") and "json" in resp.headers.get("content-type", ""):
+                data = resp.json().get("data", [])
+                result["models"] = [
+                    m["id"] for m in data if isinstance(m, dict) and m.get("id")
+                ]
+            break
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    finally:
+        if session is None:
+            await client.aclose()
+    return result
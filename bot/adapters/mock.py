@@ -0,0 +1,276 @@
+"""
+Mock transcription and text-processing adapters for load tests.
+
+The ``mock`` adapter type never leaves the process: it sleeps for a
+sampled latency and returns synthetic text, so the whole
+``handle_audio`` → resolver → adapter path (bulkheads, rate budgets,
+retries, circuit breaker, adaptive limiter) can be exercised without
+spending API credit.
+
+Behaviour is configured through the provider endpoint stored in the
+database, as query parameters of a ``mock://`` URL, e.g.::
+
+    mock://?latency=lognormal&latency_ms=800&jitter_ms=300&error_rate=0.05&throttle_rate=0.02
+
+=================== ========= ============================================
+Parameter           Default   Meaning
+=================== ========= ============================================
+``latency``         lognormal ``fixed``, ``uniform``, ``normal`` or
+                              ``lognormal`` distribution
+``latency_ms``      800       median (lognormal) or mean of the latency
+``jitter_ms``       200       spread: half-width (uniform), standard
+                              deviation (normal) or ``latency_ms *
+                              (e^sigma - 1)`` (lognormal)
+``transcribe_latency_ms``     per-operation override of ``latency_ms``
+``refine_latency_ms``         same, for refinement
+``chunk_ms``        50        pause between streamed chunks
+``chunk_chars``     24        characters per streamed chunk
+``error_rate``      0         share of calls failing with HTTP 500
+``timeout_rate``    0         share of calls hanging until ``timeout_ms``
+``timeout_ms``      stage     how long a timed-out call hangs (defaults to
+                    timeout   the stage timeout)
+``throttle_rate``   0         share of calls rejected with HTTP 429
+``retry_after_ms``  1000      ``retry-after-ms`` sent with a 429 (0: none)
+``words``           60        length of the synthetic transcript
+``seed``            0         seed of the random sequence
+=================== ========= ============================================
+
+Draws come from one seeded ``random.Random`` per endpoint, shared by the
+per-request adapters, so a run with the same seed and call order injects
+the same latencies and failures.  Injected failures look like real ones:
+HTTP errors are ``httpx.HTTPStatusError`` causes (classified by the retry
+policy, 429s counted as throttling) and timeouts raise the usual
+``TranscribeTimeout`` / ``RefineTimeout``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+from dataclasses import dataclass, fields
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from bot import constants as c
+from bot.capabilities import CapabilityModel
+from bot.exceptions import RefineError, RefineTimeout, TranscribeError, TranscribeTimeout
+from bot.providers import (
+    RefineStreamEvent,
+    TextProcessor,
+    Transcriber,
+    TranscriptionResult,
+    _log_provider_failure,
+    record_token_usage,
+)
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+_WORDS = (
+    "allora ti volevo dire che domani mattina passo in ufficio verso le nove "
+    "e porto anche i documenti per la riunione così ne parliamo con calma"
+).split()
+
+
+@dataclass(frozen=True)
+class MockBehaviour:
+    """Latency and failure settings of a ``mock`` provider."""
+
+    latency: str = "lognormal"
+    latency_ms: float = 800.0
+    jitter_ms: float = 200.0
+    transcribe_latency_ms: Optional[float] = None
+    refine_latency_ms: Optional[float] = None
+    chunk_ms: float = 50.0
+    chunk_chars: int = 24
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_ms: Optional[float] = None
+    throttle_rate: float = 0.0
+    retry_after_ms: float = 1000.0
+    words: int = 60
+    seed: int = 0
+
+    @classmethod
+    def from_endpoint(cls, endpoint: str) -> "MockBehaviour":
+        """Parse the query parameters of *endpoint*.
+
+        Raises :class:`ValueError` for unknown parameters, malformed
+        numbers, an unknown distribution or failure rates summing past 1.
+        """
+        query = {key: values[-1] for key, values in parse_qs(urlsplit(endpoint or "").query).items()}
+        types = {f.name: f for f in fields(cls)}
+        unknown = set(query) - set(types)
+        if unknown:
+            raise ValueError(f"Unknown mock parameters: {', '.join(sorted(unknown))}")
+        values = {}
+        for name, raw in query.items():
+            if name == "latency":
+                values[name] = raw.lower()
+            elif name in ("chunk_chars", "words", "seed"):
+                values[name] = int(raw)
+            else:
+                values[name] = float(raw)
+        behaviour = cls(**values)
+        if behaviour.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {behaviour.latency}")
+        rates = (behaviour.error_rate, behaviour.timeout_rate, behaviour.throttle_rate)
+        if any(rate < 0 for rate in rates) or sum(rates) > 1:
+            raise ValueError("Failure rates must be >= 0 and sum to at most 1")
+        return behaviour
+
+    def sample_latency(self, rng: random.Random, operation: str) -> float:
+        """Return one latency draw for *operation*, in seconds."""
+        override = getattr(self, f"{operation}_latency_ms", None)
+        center = self.latency_ms if override is None else override
+        if self.latency == "fixed" or center <= 0:
+            value = center
+        elif self.latency == "uniform":
+            value = rng.uniform(center - self.jitter_ms, center + self.jitter_ms)
+        elif self.latency == "normal":
+            value = rng.gauss(center, self.jitter_ms)
+        else:
+            value = rng.lognormvariate(math.log(center), math.log1p(self.jitter_ms / center))
+        return max(0.0, value) / 1000
+
+
+# One random sequence per endpoint, shared by the per-request adapters.
+_rngs: Dict[str, random.Random] = {}
+
+
+def _rng_for(endpoint: str, seed: int) -> random.Random:
+    rng = _rngs.get(endpoint)
+    if rng is None:
+        rng = _rngs[endpoint] = random.Random(seed)
+    return rng
+
+
+def reset_mock_state() -> None:
+    """Forget the random sequences so the next calls restart from the seed."""
+    _rngs.clear()
+
+
+def _http_error(operation: str, status: int, retry_after_ms: float = 0) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", f"mock://{operation}")
+    headers = {"retry-after-ms": str(int(retry_after_ms))} if retry_after_ms else {}
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"Mock HTTP {status}", request=request, response=response)
+
+
+class _MockCalls:
+    """Shared latency sampling, failure injection and chunking."""
+
+    def __init__(self, endpoint: str = "") -> None:
+        self.behaviour = MockBehaviour.from_endpoint(endpoint)
+        self._rng = _rng_for(endpoint or "mock://", self.behaviour.seed)
+
+    async def _call(self, operation: str) -> None:
+        """Wait like a provider call and raise the injected failure, if any.
+
+        Raises ``httpx.HTTPStatusError`` or ``httpx.ReadTimeout``; the
+        adapters wrap both into pipeline errors.
+        """
+        b = self.behaviour
+        draw = self._rng.random()
+        latency = b.sample_latency(self._rng, operation)
+        if draw < b.throttle_rate:
+            raise _http_error(operation, 429, b.retry_after_ms)
+        draw -= b.throttle_rate
+        if draw < b.timeout_rate:
+            timeout_ms = b.timeout_ms
+            if timeout_ms is None:
+                timeout_ms = c.PROGRESS_TIMEOUTS.get(operation, 60) * 1000
+            await asyncio.sleep(timeout_ms / 1000)
+            raise httpx.ReadTimeout("Mock timeout")
+        await asyncio.sleep(latency)
+        if draw - b.timeout_rate < b.error_rate:
+            raise _http_error(operation, 500)
+
+    async def _chunks(self, text: str) -> AsyncIterator[str]:
+        size = max(1, self.behaviour.chunk_chars)
+        for start in range(0, len(text), size):
+            if start:
+                await asyncio.sleep(self.behaviour.chunk_ms / 1000)
+            yield text[start:start + size]
+
+    def _transcript(self) -> str:
+        words = [_WORDS[i % len(_WORDS)] for i in range(max(1, self.behaviour.words))]
+        return " ".join(words)
+
+
+def _record_usage(*texts: str) -> int:
+    """Report synthetic token usage to the rate budget and return it."""
+    chars = sum(len(text) for text in texts)
+    total = math.ceil(chars * c.PROVIDER_TOKENS_PER_CHAR)
+    record_token_usage(SimpleNamespace(total_tokens=total))
+    return total
+
+
+class MockTranscriber(_MockCalls, Transcriber):
+    """Synthetic transcriber; see the module docstring for the settings."""
+
+    supports_transcribe_streaming = True
+
+    def get_capabilities(self) -> CapabilityModel:
+        return CapabilityModel(transcription=True, streaming_transcription=True)
+
+    async def transcribe(self, file_path: str) -> TranscriptionResult:
+        logger.info("Transcribe %s with mock provider", file_path)
+        try:
+            await self._call("transcribe")
+        except httpx.TimeoutException as e:
+            _log_provider_failure("mock", "transcribe", e)
+            raise TranscribeTimeout("Timeout in transcribe", c.MSG_TIMEOUT_TRANSCRIBE) from e
+        except httpx.HTTPStatusError as e:
+            _log_provider_failure("mock", "transcribe", e)
+            raise TranscribeError(f"Mock transcription failed: {e}", c.MSG_ERROR_TRANSCRIBE) from e
+        text = self._transcript()
+        _record_usage(text)
+        return TranscriptionResult(text=text, language="it")
+
+    async def stream_transcribe(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        result = await self.transcribe(file_path)
+        async for chunk in self._chunks(result.text):
+            yield RefineStreamEvent(type="delta", text=chunk)
+        yield RefineStreamEvent(
+            type="done", text=result.text, total_tokens=math.ceil(len(result.text) * c.PROVIDER_TOKENS_PER_CHAR)
+        )
+
+
+class MockTextProcessor(_MockCalls, TextProcessor):
+    """Synthetic text processor: returns the transcript as the refined text."""
+
+    supports_refine_streaming = True
+
+    def get_capabilities(self) -> CapabilityModel:
+        return CapabilityModel(text_generation=True, refinement=True, streaming_refinement=True)
+
+    async def _refine(self, raw_text: str) -> tuple[str, int]:
+        try:
+            await self._call("refine")
+        except httpx.TimeoutException as e:
+            _log_provider_failure("mock", "refine", e)
+            raise RefineTimeout("Timeout in refine", c.MSG_TIMEOUT_REFINE) from e
+        except httpx.HTTPStatusError as e:
+            _log_provider_failure("mock", "refine", e)
+            raise RefineError(f"Mock refine failed: {e}", c.MSG_ERROR_REFINE) from e
+        text = raw_text.strip()
+        return text, _record_usage(raw_text, text)
+
+    async def process(self, raw_text: str) -> str:
+        logger.info("Refine text with mock provider")
+        text, _ = await self._refine(raw_text)
+        return text
+
+    async def stream_process(self, raw_text: str) -> AsyncIterator[RefineStreamEvent]:
+        logger.info("Stream refine text with mock provider")
+        text, total_tokens = await self._refine(raw_text)
+        async for chunk in self._chunks(text):
+            yield RefineStreamEvent(type="delta", text=chunk)
+        yield RefineStreamEvent(type="done", text=text, total_tokens=total_tokens)
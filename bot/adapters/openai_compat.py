@@ -1,5 +1,5 @@
 """
-OpenAI-compatible transcription and text-processing adapters (P3).
+OpenAI-compatible transcription, text-processing and single-pass adapters (P3).
 
 Works with any OpenAI-compatible API endpoint, including:
 
@@ -25,12 +25,15 @@ from bot import constants as c
 from bot.capabilities import CapabilityModel
 from bot.exceptions import RefineError, RefineTimeout, TranscribeError, TranscribeTimeout
 from bot.providers import (
+    OpenAISinglePassProcessor,
     RefineStreamEvent,
     TextProcessor,
     Transcriber,
     TranscriptionResult,
     _log_provider_failure,
     _log_text_preview,
+    record_token_usage,
+    usage_total_tokens,
 )
 
 logger = logging.getLogger(__name__)
@@ -56,21 +59,47 @@ def _normalise_endpoint(endpoint: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+def _transcription_model(model_name: str) -> str:
+    """Return *model_name* when it names a speech-to-text model.
+
+    In single-provider pipelines the provider's chat model is passed to
+    every factory, so anything that is not a Whisper or ``*-transcribe``
+    model falls back to ``whisper-1``.
+    """
+    mid = (model_name or "").lower()
+    if "whisper" in mid or "transcribe" in mid:
+        return model_name
+    return "whisper-1"
+
+
 class OpenAICompatTranscriber(Transcriber):
     """OpenAI-compatible transcription adapter.
 
     Uses the ``/v1/audio/transcriptions`` endpoint of any OpenAI-compatible
     API.  The caller supplies the *endpoint* URL (e.g.
     ``https://openrouter.ai/api/v1``); the adapter appends ``/v1`` if
-    needed.
+    needed.  With *streaming* set, :meth:`stream_transcribe` requests
+    ``stream=True`` and yields the partial transcript as it is decoded.
     """
 
-    def __init__(self, api_key: str, endpoint: str = "") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        endpoint: str = "",
+        model_name: str = "whisper-1",
+        streaming: bool = False,
+    ) -> None:
         base_url = _normalise_endpoint(endpoint)
         self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.model_name = _transcription_model(model_name)
+        self.supports_transcribe_streaming = streaming
 
     def get_capabilities(self) -> CapabilityModel:
-        return CapabilityModel(transcription=True)
+        return CapabilityModel(
+            transcription=True,
+            streaming_transcription=self.supports_transcribe_streaming,
+        )
 
     async def transcribe(self, file_path: str) -> TranscriptionResult:
         logger.info("Transcribe %s with OpenAI-compatible endpoint", file_path)
@@ -81,7 +110,7 @@ class OpenAICompatTranscriber(Transcriber):
                 max_retries=0,
             )
             return client.audio.transcriptions.create(
-                model="whisper-1",
+                model=self.model_name,
                 file=open(file_path, "rb"),
                 temperature=0,
             )
@@ -98,10 +127,58 @@ class OpenAICompatTranscriber(Transcriber):
                 c.MSG_ERROR_TRANSCRIBE,
             ) from e
 
+        record_token_usage(getattr(result, "usage", None))
         text = result.text
         _log_text_preview("Raw text", text)
         return TranscriptionResult(text=text)
 
+    async def stream_transcribe(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        if not self.supports_transcribe_streaming:
+            async for event in super().stream_transcribe(file_path):
+                yield event
+            return
+
+        logger.info("Stream transcribe %s with OpenAI-compatible endpoint", file_path)
+        accumulated: list[str] = []
+        final_text = None
+        usage = None
+        try:
+            client = self.async_client.with_options(
+                timeout=c.PROGRESS_TIMEOUTS.get("transcribe", 120),
+                max_retries=0,
+            )
+            with open(file_path, "rb") as audio:
+                stream = await client.audio.transcriptions.create(
+                    model=self.model_name,
+                    file=audio,
+                    temperature=0,
+                    stream=True,
+                )
+                async for event in stream:
+                    event_type = getattr(event, "type", "")
+                    if event_type == "transcript.text.delta":
+                        delta = getattr(event, "delta", "") or ""
+                        if delta:
+                            accumulated.append(delta)
+                            yield RefineStreamEvent(type="delta", text=delta)
+                    elif event_type == "transcript.text.done":
+                        final_text = getattr(event, "text", None)
+                        usage = getattr(event, "usage", None)
+        except openai.APITimeoutError as e:
+            _log_provider_failure("openai-compat", "stream_transcribe", e)
+            raise TranscribeTimeout("Timeout in transcribe", c.MSG_TIMEOUT_TRANSCRIBE) from e
+        except Exception as e:
+            _log_provider_failure("openai-compat", "stream_transcribe", e)
+            raise TranscribeError(
+                f"OpenAI-compatible streaming transcription failed: {e}",
+                c.MSG_ERROR_TRANSCRIBE,
+            ) from e
+
+        record_token_usage(usage)
+        text = final_text if final_text is not None else "".join(accumulated)
+        _log_text_preview("Raw text", text)
+        yield RefineStreamEvent(type="done", text=text, total_tokens=usage_total_tokens(usage))
+
 
 # ---------------------------------------------------------------------------
 # Text processor
@@ -187,6 +264,7 @@ class OpenAICompatTextProcessor(TextProcessor):
                 c.MSG_ERROR_REFINE,
             ) from e
 
+        record_token_usage(getattr(resp, "usage", None))
         content = resp.choices[0].message.content
         out = content.strip() if content else ""
         _log_text_preview("Refined text", out)
@@ -226,7 +304,13 @@ class OpenAICompatTextProcessor(TextProcessor):
                         accumulated
                     )
                     _log_text_preview("Refined text", completed)
-                    yield RefineStreamEvent(type="done", text=completed)
+                    yield RefineStreamEvent(
+                        type="done",
+                        text=completed,
+                        total_tokens=usage_total_tokens(
+                            getattr(getattr(event, "response", None), "usage", None)
+                        ),
+                    )
                     return
         except openai.APITimeoutError as e:
             _log_provider_failure("openai-compat", "stream_refine", e)
@@ -239,3 +323,33 @@ class OpenAICompatTextProcessor(TextProcessor):
                 f"OpenAI-compatible streaming refinement failed: {e}",
                 c.MSG_ERROR_REFINE,
             ) from e
+
+
+# ---------------------------------------------------------------------------
+# Single-pass processor
+# ---------------------------------------------------------------------------
+
+
+class OpenAICompatSinglePassProcessor(OpenAISinglePassProcessor):
+    """OpenAI-compatible single-pass adapter.
+
+    Sends audio plus refinement prompt to an audio-capable chat model
+    (e.g. an OpenRouter model with audio input) at any OpenAI-compatible
+    endpoint.
+    """
+
+    provider_label = "openai-compat"
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gpt-4o-audio-preview",
+        endpoint: str = "",
+        prompts: Optional[dict] = None,
+    ) -> None:
+        super().__init__(
+            api_key=api_key,
+            model_name=model_name,
+            prompts=prompts,
+            base_url=_normalise_endpoint(endpoint),
+        )
@@ -2,8 +2,8 @@
 Adapter registries (P3).
 
 Replaces ``if/elif`` factory chains with explicit registries for
-:class:`~bot.providers.Transcriber` and :class:`~bot.providers.TextProcessor`
-adapters.  New adapter types register themselves and can then be created
+:class:`~bot.providers.Transcriber`, :class:`~bot.providers.TextProcessor`
+and :class:`~bot.providers.SinglePassProcessor` adapters.  New adapter types register themselves and can then be created
 by name through the registry.
 
 Usage
@@ -31,7 +31,7 @@ from __future__ import annotations
 
 from typing import Any, Callable, Dict, Optional
 
-from bot.providers import TextProcessor, Transcriber
+from bot.providers import SinglePassProcessor, TextProcessor, Transcriber
 
 # Type aliases for the factory callables.
 # Each factory receives keyword arguments extracted from configuration
@@ -39,6 +39,7 @@ from bot.providers import TextProcessor, Transcriber
 # return an instance of the requested adapter type.
 TranscriberFactory = Callable[..., Transcriber]
 TextProcessorFactory = Callable[..., TextProcessor]
+SinglePassFactory = Callable[..., SinglePassProcessor]
 
 
 # ---------------------------------------------------------------------------
@@ -157,6 +158,60 @@ class TextProcessorRegistry:
         return adapter_type in self._registry
 
 
+# ---------------------------------------------------------------------------
+# Single-pass registry
+# ---------------------------------------------------------------------------
+
+
+class SinglePassRegistry:
+    """Registry of single-pass (audio → refined text) adapter factories.
+
+    Only adapter types that can send audio and the refinement prompt in
+    one request are registered.
+    """
+
+    def __init__(self) -> None:
+        self._registry: Dict[str, SinglePassFactory] = {}
+
+    def register(
+        self,
+        adapter_type: str,
+        factory: Optional[SinglePassFactory] = None,
+    ) -> SinglePassFactory:
+        if factory is not None:
+            self._registry[adapter_type] = factory
+            return factory
+
+        def decorator(fn: SinglePassFactory) -> SinglePassFactory:
+            self._registry[adapter_type] = fn
+            return fn
+
+        return decorator
+
+    def create(self, adapter_type: str, **kwargs: Any) -> SinglePassProcessor:
+        """Create a :class:`~bot.providers.SinglePassProcessor` for *adapter_type*.
+
+        Raises
+        ------
+        ValueError:
+            If *adapter_type* is not registered.
+        """
+        factory = self._registry.get(adapter_type)
+        if factory is None:
+            registered = ", ".join(sorted(self._registry))
+            raise ValueError(
+                f"Unknown single-pass adapter type: '{adapter_type}'. "
+                f"Registered types: {registered}"
+            )
+        return factory(**kwargs)
+
+    def known_types(self) -> set[str]:
+        return set(self._registry)
+
+    def has_type(self, adapter_type: str) -> bool:
+        return adapter_type in self._registry
+
+
 # ---------------------------------------------------------------------------
 # Singleton instances
 # ---------------------------------------------------------------------------
@@ -166,3 +221,6 @@ transcriber_registry = TranscriberRegistry()
 
 text_processor_registry = TextProcessorRegistry()
 """Global singleton text-processor registry."""
+
+single_pass_registry = SinglePassRegistry()
+"""Global singleton single-pass registry."""
@@ -0,0 +1,200 @@
+"""
+Pre-admission checks on the metadata Telegram sends with an audio message.
+
+The update already carries the duration of voice notes and audio files, the
+MIME type and the file name.  :class:`MetadataAdmission` checks them in the
+``rate_limited`` decorator, before the rate limiter hands out a slot and
+before ``get_file()`` downloads anything.  A recording that is too long, or
+in a format the pipeline does not accept, is then refused at once instead
+of after download, conversion and a provider error.
+
+The maximum duration is ``admission_max_duration_seconds`` (``0`` = no
+limit), overridden by ``admission_duration_tiers``, a JSON object whose
+keys are, from the most to the least specific:
+
+``user:<id>`` / ``chat:<id>``
+    one Telegram user, or one chat (group);
+``admin`` / ``groups`` / ``users``
+    the ``authorized.json`` roles: admins, messages in a group chat, and
+    everyone else.
+
+The values are seconds; ``0`` lifts the limit for that tier.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from bot import constants as c
+
+logger = logging.getLogger(__name__)
+
+TIER_ROLES = ("admin", "groups", "users")
+TIER_PREFIXES = ("user:", "chat:")
+DEFAULT_ALLOWED_EXTENSIONS = (
+    "aac", "aiff", "amr", "flac", "m4a", "mp3", "mp4",
+    "oga", "ogg", "opus", "wav", "webm", "wma",
+)
+
+
+def parse_duration_tiers(value: str | Mapping[str, Any] | None) -> Dict[str, int]:
+    """Parse and validate ``admission_duration_tiers`` (``{tier: seconds}``)."""
+    if not value:
+        return {}
+    data = json.loads(value) if isinstance(value, str) else value
+    if not isinstance(data, Mapping):
+        raise ValueError("deve essere un oggetto JSON {livello: secondi}")
+    tiers: Dict[str, int] = {}
+    for key, seconds in data.items():
+        key = str(key).strip()
+        if key not in TIER_ROLES and not (
+            key.startswith(TIER_PREFIXES) and key.split(":", 1)[1].lstrip("-").isdigit()
+        ):
+            raise ValueError(
+                f"livello '{key}' sconosciuto (usa admin, groups, users, user:<id> o chat:<id>)"
+            )
+        if isinstance(seconds, bool) or not isinstance(seconds, int) or seconds < 0:
+            raise ValueError(f"la durata di '{key}' deve essere un intero di secondi >= 0")
+        tiers[key] = seconds
+    return tiers
+
+
+def parse_extensions(value: str | Iterable[str] | None) -> tuple[str, ...]:
+    """Normalise a comma-separated extension list (``""`` = any extension)."""
+    items = value.split(",") if isinstance(value, str) else (value or ())
+    return tuple(sorted({item.strip().lower().lstrip(".") for item in items if item.strip()}))
+
+
+def format_duration(seconds: int) -> str:
+    """``754`` -> ``"12:34"``, ``3723`` -> ``"1:02:03"``."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+@dataclass(frozen=True)
+class AdmissionRejection:
+    """Why a message was refused and the reply for the user."""
+
+    reason: str  # "duration" | "mime" | "extension"
+    message: str
+
+
+class MetadataAdmission:
+    """Duration, MIME and extension rules evaluated without downloading.
+
+    Parameters
+    ----------
+    max_duration_seconds:
+        Default maximum duration; ``0`` means no limit.
+    duration_tiers:
+        Per-user, per-chat and per-role overrides (see the module docstring).
+    allowed_extensions:
+        File-name extensions accepted for audio files and documents; empty
+        accepts any.  Voice notes are always Ogg/Opus.
+    """
+
+    def __init__(
+        self,
+        max_duration_seconds: int = 0,
+        duration_tiers: Optional[Mapping[str, int]] = None,
+        allowed_extensions: Iterable[str] = DEFAULT_ALLOWED_EXTENSIONS,
+    ):
+        self.max_duration_seconds = max(0, int(max_duration_seconds))
+        self.duration_tiers = dict(duration_tiers or {})
+        self.allowed_extensions = parse_extensions(allowed_extensions)
+        self.checked = 0
+        self.rejected = {"duration": 0, "mime": 0, "extension": 0}
+
+    @classmethod
+    def from_config(cls, admission_config: Mapping[str, Any]) -> "MetadataAdmission":
+        return cls(
+            max_duration_seconds=admission_config.get("max_duration_seconds", 0),
+            duration_tiers=admission_config.get("duration_tiers"),
+            allowed_extensions=admission_config.get("allowed_extensions", DEFAULT_ALLOWED_EXTENSIONS),
+        )
+
+    def max_duration_for(self, user_id: int, chat_id: int, is_group: bool, is_admin: bool) -> int:
+        """Maximum duration in seconds for this sender (``0`` = no limit)."""
+        candidates = [f"user:{user_id}", f"chat:{chat_id}"]
+        if is_admin:
+            candidates.append("admin")
+        candidates.append("groups" if is_group else "users")
+        for key in candidates:
+            if key in self.duration_tiers:
+                return self.duration_tiers[key]
+        return self.max_duration_seconds
+
+    def check(self, message, is_admin: bool = False) -> Optional[AdmissionRejection]:
+        """Return the rejection for *message*, or ``None`` to admit it."""
+        self.checked += 1
+        attachment = message.voice or message.audio or message.document
+        if attachment is None:
+            return None
+
+        mime_type = getattr(attachment, "mime_type", None)
+        if mime_type and not mime_type.lower().startswith("audio/"):
+            return self._reject(message, "mime", c.MSG_UNSUPPORTED_TYPE, mime_type=mime_type)
+
+        file_name = getattr(attachment, "file_name", None) if message.voice is None else None
+        ext = os.path.splitext(file_name or "")[1].lstrip(".").lower()
+        if ext and self.allowed_extensions and ext not in self.allowed_extensions:
+            return self._reject(
+                message,
+                "extension",
+                c.MSG_UNSUPPORTED_FORMAT.format(
+                    extension=ext, allowed=", ".join(self.allowed_extensions)
+                ),
+                extension=ext,
+            )
+
+        duration = getattr(attachment, "duration", None)
+        if isinstance(duration, timedelta):
+            duration = duration.total_seconds()
+        if duration:
+            duration = int(duration)
+            chat = message.chat
+            limit = self.max_duration_for(
+                message.from_user.id if message.from_user else 0,
+                chat.id,
+                getattr(chat, "type", "private") != "private",
+                is_admin,
+            )
+            if limit and duration > limit:
+                return self._reject(
+                    message,
+                    "duration",
+                    c.MSG_AUDIO_TOO_LONG.format(
+                        duration=format_duration(duration), max_duration=format_duration(limit)
+                    ),
+                    duration_s=duration,
+                    limit_s=limit,
+                )
+        return None
+
+    def _reject(self, message, reason: str, text: str, **detail: Any) -> AdmissionRejection:
+        self.rejected[reason] += 1
+        logger.info(
+            "Audio rejected before download | reason=%s user_id=%s chat_id=%s %s",
+            reason,
+            message.from_user.id if message.from_user else None,
+            message.chat.id,
+            " ".join(f"{key}={value}" for key, value in detail.items()),
+        )
+        return AdmissionRejection(reason, text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_duration_seconds": self.max_duration_seconds,
+            "tiers": len(self.duration_tiers),
+            "allowed_extensions": list(self.allowed_extensions),
+            "checked": self.checked,
+            "rejected": dict(self.rejected),
+        }
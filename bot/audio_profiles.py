@@ -0,0 +1,269 @@
+"""
+FFmpeg encoding profiles for the conversion stage.
+
+A profile fixes the codec, sample rate, channel count, bitrate and FFmpeg
+thread count of the file sent to the transcriber.  The bot uses
+:data:`DEFAULT_AUDIO_PROFILE` (MP3, 44.1 kHz stereo, 192 kbps) unless the
+``audio_conversion_profiles`` setting maps the transcriber's adapter type
+to another profile, stored as JSON::
+
+    {"openai": {"codec": "opus", "sample_rate": 16000, "channels": 1,
+                "bitrate": "32k", "threads": 1}}
+
+``python -m bot.bench.ffmpeg_profiles`` measures a matrix of profiles and
+writes the fastest one per transcriber to that setting.
+
+:class:`AudioPreprocessing` adds optional FFmpeg filters to the same
+conversion: trimming long pauses (``silenceremove``) and speeding the audio
+up (``atempo``).  Providers bill and process by audio duration, so the
+removed seconds come off transcription time and cost.  It is configured per
+pipeline profile (``pipeline_profiles.audio_preprocessing``) and is off by
+default.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# codec -> (FFmpeg encoder, file extension)
+CODECS: Dict[str, Tuple[str, str]] = {
+    "mp3": ("libmp3lame", "mp3"),
+    "opus": ("libopus", "ogg"),
+    "aac": ("aac", "m4a"),
+    "flac": ("flac", "flac"),
+    "wav": ("pcm_s16le", "wav"),
+}
+LOSSLESS_CODECS = ("flac", "wav")
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# Short adapter names registered for backward compatibility.
+ADAPTER_ALIASES = {"openai": "openai-native", "gemini": "gemini-native"}
+
+# Upload formats each transcriber adapter accepts; unknown adapters get MP3.
+# OpenAI single-pass sends the file as ``input_audio``, which takes only
+# WAV and MP3.
+_ALL_CODECS = tuple(CODECS)
+TRANSCRIBER_CODECS: Dict[str, Tuple[str, ...]] = {
+    "openai-native": ("mp3", "wav"),
+    "openai-compat": ("mp3", "flac", "wav"),
+    "gemini-native": _ALL_CODECS,
+    "local-whisper": _ALL_CODECS,
+    "mock": _ALL_CODECS,
+}
+
+_BITRATE_RE = re.compile(r"^\d{1,4}k$")
+
+
+@dataclass(frozen=True)
+class AudioProfile:
+    """Output settings of one FFmpeg conversion.
+
+    *bitrate* is ignored by lossless codecs; *threads* ``0`` leaves the
+    choice to FFmpeg.
+    """
+
+    codec: str = "mp3"
+    sample_rate: int = 44100
+    channels: int = 2
+    bitrate: Optional[str] = "192k"
+    threads: int = 0
+
+    def __post_init__(self) -> None:
+        if self.codec not in CODECS:
+            raise ValueError(f"codec {self.codec!r} sconosciuto")
+        if not 8000 <= self.sample_rate <= 48000:
+            raise ValueError(f"sample_rate {self.sample_rate} fuori dall'intervallo 8000-48000")
+        if self.codec == "opus" and self.sample_rate not in OPUS_SAMPLE_RATES:
+            raise ValueError(f"opus non supporta sample_rate {self.sample_rate}")
+        if self.channels not in (1, 2):
+            raise ValueError("channels deve essere 1 o 2")
+        if self.bitrate is not None and not _BITRATE_RE.match(self.bitrate):
+            raise ValueError(f"bitrate {self.bitrate!r} deve avere la forma '64k'")
+        if not 0 <= self.threads <= 64:
+            raise ValueError("threads deve essere tra 0 e 64")
+
+    @property
+    def extension(self) -> str:
+        return CODECS[self.codec][1]
+
+    @property
+    def label(self) -> str:
+        channels = "mono" if self.channels == 1 else "stereo"
+        parts = [self.codec, f"{self.sample_rate / 1000:g}kHz", channels]
+        if self.bitrate and self.codec not in LOSSLESS_CODECS:
+            parts.append(self.bitrate)
+        parts.append(f"threads={self.threads or 'auto'}")
+        return " ".join(parts)
+
+    def output_args(self) -> List[str]:
+        """FFmpeg output options (placed between the input and the output path)."""
+        args = ["-vn", "-c:a", CODECS[self.codec][0], "-ar", str(self.sample_rate), "-ac", str(self.channels)]
+        if self.bitrate and self.codec not in LOSSLESS_CODECS:
+            args += ["-b:a", self.bitrate]
+        if self.threads:
+            args += ["-threads", str(self.threads)]
+        return args
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AudioProfile":
+        """Build a profile from its JSON form; raises :class:`ValueError`."""
+        if not isinstance(data, Mapping):
+            raise ValueError("il profilo deve essere un oggetto JSON")
+        unknown = set(data) - {"codec", "sample_rate", "channels", "bitrate", "threads"}
+        if unknown:
+            raise ValueError(f"campi sconosciuti: {', '.join(sorted(unknown))}")
+        try:
+            return cls(
+                codec=str(data.get("codec", "mp3")),
+                sample_rate=int(data.get("sample_rate", 44100)),
+                channels=int(data.get("channels", 2)),
+                bitrate=str(data["bitrate"]) if data.get("bitrate") else None,
+                threads=int(data.get("threads", 0)),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(str(e)) from e
+
+
+DEFAULT_AUDIO_PROFILE = AudioProfile()
+
+
+# silenceremove keeps this much of every trimmed pause so words stay apart.
+KEEP_SILENCE_MS = 300
+MAX_TEMPO = 2.0
+
+
+@dataclass(frozen=True)
+class AudioPreprocessing:
+    """Optional filters applied while converting.
+
+    *trim_silence* shortens every pause quieter than *silence_threshold_db*
+    and longer than *min_silence_ms* to :data:`KEEP_SILENCE_MS`, and drops
+    leading silence.  *tempo* > 1 speeds the audio up without changing the
+    pitch.  The defaults change nothing.
+    """
+
+    trim_silence: bool = False
+    silence_threshold_db: int = -50
+    min_silence_ms: int = 700
+    tempo: float = 1.0
+
+    def __post_init__(self) -> None:
+        if not -80 <= self.silence_threshold_db <= -20:
+            raise ValueError("silence_threshold_db deve essere tra -80 e -20")
+        if not 200 <= self.min_silence_ms <= 10000:
+            raise ValueError("min_silence_ms deve essere tra 200 e 10000")
+        if not 1.0 <= self.tempo <= MAX_TEMPO:
+            raise ValueError(f"tempo deve essere tra 1.0 e {MAX_TEMPO:g}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.trim_silence or self.tempo != 1.0
+
+    @property
+    def label(self) -> str:
+        parts = []
+        if self.trim_silence:
+            parts.append(f"silence<{self.silence_threshold_db}dB>{self.min_silence_ms}ms")
+        if self.tempo != 1.0:
+            parts.append(f"tempo={self.tempo:g}")
+        return " ".join(parts) or "none"
+
+    def filter_chain(self) -> str:
+        """The ``-af`` filter graph ("" when nothing is enabled)."""
+        filters = []
+        if self.trim_silence:
+            threshold = f"{self.silence_threshold_db}dB"
+            filters.append(
+                "silenceremove="
+                f"start_periods=1:start_threshold={threshold}:"
+                f"stop_periods=-1:stop_duration={self.min_silence_ms / 1000:g}:"
+                f"stop_threshold={threshold}:stop_silence={KEEP_SILENCE_MS / 1000:g}"
+            )
+        if self.tempo != 1.0:
+            filters.append(f"atempo={self.tempo:g}")
+        return ",".join(filters)
+
+    def output_args(self) -> List[str]:
+        chain = self.filter_chain()
+        return ["-af", chain] if chain else []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AudioPreprocessing":
+        """Build the settings from their JSON form; raises :class:`ValueError`."""
+        if not isinstance(data, Mapping):
+            raise ValueError("la pre-elaborazione deve essere un oggetto JSON")
+        unknown = set(data) - {"trim_silence", "silence_threshold_db", "min_silence_ms", "tempo"}
+        if unknown:
+            raise ValueError(f"campi sconosciuti: {', '.join(sorted(unknown))}")
+        try:
+            return cls(
+                trim_silence=bool(data.get("trim_silence", False)),
+                silence_threshold_db=int(data.get("silence_threshold_db", -50)),
+                min_silence_ms=int(data.get("min_silence_ms", 700)),
+                tempo=float(data.get("tempo", 1.0)),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(str(e)) from e
+
+
+NO_PREPROCESSING = AudioPreprocessing()
+
+
+def canonical_adapter_type(adapter_type: Optional[str]) -> str:
+    """``"openai"`` -> ``"openai-native"``; other names are returned as-is."""
+    return ADAPTER_ALIASES.get(adapter_type or "", adapter_type or "")
+
+
+def accepted_codecs(adapter_type: Optional[str]) -> Tuple[str, ...]:
+    """Codecs the transcriber of *adapter_type* accepts as upload."""
+    return TRANSCRIBER_CODECS.get(canonical_adapter_type(adapter_type), ("mp3",))
+
+
+def parse_profile_map(raw: Optional[str]) -> Dict[str, AudioProfile]:
+    """Parse the ``audio_conversion_profiles`` setting.
+
+    An empty value means no overrides.  Keys are stored under the
+    canonical adapter type (``openai`` becomes ``openai-native``).  Raises
+    :class:`ValueError` for malformed JSON, invalid profiles, or a codec
+    the adapter does not accept.
+    """
+    if not raw or not raw.strip():
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON non valido: {e.msg}") from e
+    if not isinstance(data, dict):
+        raise ValueError("serve un oggetto JSON {adapter: profilo}")
+    profiles = {}
+    for adapter_type, entry in data.items():
+        try:
+            profile = AudioProfile.from_dict(entry)
+        except ValueError as e:
+            raise ValueError(f"{adapter_type}: {e}") from e
+        adapter_type = canonical_adapter_type(adapter_type)
+        if adapter_type in TRANSCRIBER_CODECS and profile.codec not in accepted_codecs(adapter_type):
+            raise ValueError(f"{adapter_type}: codec {profile.codec} non supportato")
+        profiles[adapter_type] = profile
+    return profiles
+
+
+def dump_profile_map(profiles: Mapping[str, AudioProfile]) -> str:
+    """Serialise *profiles* for the ``audio_conversion_profiles`` setting."""
+    return json.dumps({key: profile.to_dict() for key, profile in sorted(profiles.items())})
+
+
+def profile_for(
+    adapter_type: Optional[str], profiles: Optional[Mapping[str, AudioProfile]]
+) -> AudioProfile:
+    """Return the profile configured for *adapter_type*, or the default."""
+    return (profiles or {}).get(canonical_adapter_type(adapter_type), DEFAULT_AUDIO_PROFILE)
@@ -0,0 +1,6 @@
+"""
+Benchmarks for the audio pipeline.
+
+Each module is runnable with ``python -m bot.bench.<name>`` and prints a
+JSON report to stdout.
+"""
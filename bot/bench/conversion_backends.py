@@ -0,0 +1,184 @@
+"""
+Conversion backend benchmark: FFmpeg subprocess vs in-process PyAV.
+
+Cuts ``test_audio.mp3`` into Opus voice notes of ``--durations`` seconds
+(as Telegram sends them) and converts each one ``--repeat`` times through a
+:class:`~bot.conversion.ConversionPool` per backend, with the default
+profile or ``--profile``.  For every duration the report holds the median
+and p95 conversion time of each backend and the time the in-process
+backend saves; ``spawn_ms`` is the median cost of starting
+``ffmpeg -version``, the floor the subprocess backend pays per file.
+``--concurrency`` > 1 also times a burst of that many simultaneous
+conversions of each note.
+
+The ``pyav`` backend needs PyAV (``pip install av``); without it only the
+subprocess backend is measured.
+
+Usage::
+
+    python -m bot.bench.conversion_backends --durations 3,10,60 --repeat 20
+    python -m bot.bench.conversion_backends --concurrency 8 --output backends.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from bot import conversion
+from bot.audio_profiles import DEFAULT_AUDIO_PROFILE, AudioProfile
+from bot.bench.e2e import DEFAULT_AUDIO, prepare_audio_variants
+from bot.conversion import ConversionPool
+
+
+def _p95(samples: Sequence[float]) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1)
+
+
+def available_backends() -> List[str]:
+    """Backends that can run here (``pyav`` only with PyAV installed)."""
+    return [b for b in conversion.CONVERSION_BACKENDS if b != "pyav" or conversion.av is not None]
+
+
+async def measure_spawn(repeat: int) -> float:
+    """Median wall time of starting and reaping ``ffmpeg -version``, in ms."""
+    samples = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-version",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await process.wait()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 1)
+
+
+async def measure_backend(
+    backend: str,
+    source: str,
+    work_dir: str,
+    profile: AudioProfile,
+    repeat: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Convert *source* with *backend* and return its timings.
+
+    Conversions that the ``pyav`` backend hands to FFmpeg are counted in
+    ``fallbacks``; their timings are not comparable.
+    """
+    pool = ConversionPool(processes=max(1, concurrency), backend=backend)
+    target = os.path.join(work_dir, f"{backend}.{profile.extension}")
+    try:
+        await pool.convert(source, target, profile)  # warm-up: thread pool, codecs
+        samples = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            await pool.convert(source, target, profile)
+            samples.append((time.perf_counter() - started) * 1000)
+        result: Dict[str, Any] = {
+            "median_ms": round(statistics.median(samples), 1),
+            "p95_ms": _p95(samples),
+            "output_bytes": os.path.getsize(target),
+        }
+        if concurrency > 1:
+            targets = [
+                os.path.join(work_dir, f"{backend}-{index}.{profile.extension}")
+                for index in range(concurrency)
+            ]
+            started = time.perf_counter()
+            await asyncio.gather(*(pool.convert(source, path, profile) for path in targets))
+            result["burst_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            for path in targets:
+                os.remove(path)
+        result["fallbacks"] = pool.fallbacks
+        return result
+    finally:
+        pool.close()
+        if os.path.exists(target):
+            os.remove(target)
+
+
+async def run_benchmark(
+    variants: Dict[int, str],
+    backends: Sequence[str],
+    profile: AudioProfile = DEFAULT_AUDIO_PROFILE,
+    repeat: int = 10,
+    concurrency: int = 1,
+    measure_spawn_cost: bool = True,
+) -> Dict[str, Any]:
+    """Compare *backends* on the voice notes in *variants* (``{seconds: path}``)."""
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for duration, source in sorted(variants.items()):
+            row = {
+                backend: await measure_backend(backend, source, work_dir, profile, repeat, concurrency)
+                for backend in backends
+            }
+            if "ffmpeg" in row and "pyav" in row:
+                row["pyav_saved_ms"] = round(row["ffmpeg"]["median_ms"] - row["pyav"]["median_ms"], 1)
+            results[f"{duration}s"] = row
+    return {
+        "benchmark": "conversion_backends",
+        "profile": profile.label,
+        "repeat": repeat,
+        "concurrency": concurrency,
+        "backends": list(backends),
+        "spawn_ms": await measure_spawn(repeat) if measure_spawn_cost else None,
+        "results": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.bench.conversion_backends",
+        description="Compare the FFmpeg subprocess and in-process PyAV conversion backends.",
+    )
+    parser.add_argument("--audio", default=DEFAULT_AUDIO)
+    parser.add_argument("--durations", default="3,10,30",
+                        help="Voice-note lengths in seconds, comma separated")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Also time a burst of this many simultaneous conversions")
+    parser.add_argument("--profile", help="Conversion profile as JSON (default: MP3 44.1 kHz)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if shutil.which("ffmpeg") is None:
+        parser.error("ffmpeg not found in PATH")
+    if not os.path.isfile(args.audio):
+        parser.error(f"audio file not found: {args.audio}")
+    try:
+        durations = [int(item) for item in args.durations.split(",") if item.strip()]
+        profile = AudioProfile.from_dict(json.loads(args.profile)) if args.profile else DEFAULT_AUDIO_PROFILE
+    except ValueError as exc:
+        parser.error(str(exc))
+    backends = available_backends()
+    if "pyav" not in backends:
+        print("PyAV not installed: measuring the ffmpeg backend only", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        variants = prepare_audio_variants(args.audio, durations, work_dir)
+        report = asyncio.run(run_benchmark(
+            variants, backends, profile, repeat=args.repeat, concurrency=args.concurrency,
+        ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+"""
+End-to-end load test of the Telegram audio pipeline.
+
+Builds the real application with :func:`~bot.core.app.create_application`
+(rate limiter, stage engine, pipeline resolver, delivery adapter, decorated
+``handle_audio``) on a throwaway database whose only provider is the
+``mock`` adapter.  Bot API calls are answered in-process by
+:class:`FakeBotRequest`, which also counts them and serves the voice files;
+the voice files are cut from ``test_audio.mp3`` with the real FFmpeg, one
+per ``--durations`` entry, and converted by the pipeline like any upload.
+
+``--users`` simulated users each send ``--requests`` voice messages one
+after the other (closed loop, optional ``--think-ms``).  The report holds
+throughput, end-to-end latency percentiles, per-stage latency percentiles
+(from the handler's stage logs), queue wait (end-to-end minus pipeline
+time: admission queue plus resolution), stage-engine stats and Bot API
+call counts.
+
+``--output`` writes the JSON report; ``--baseline`` compares it with a
+stored one and exits with status 1 when throughput dropped or a p95 grew
+by more than ``--tolerance``.
+
+Usage::
+
+    python -m bot.bench.e2e --users 20 --requests 5 --output e2e.json
+    python -m bot.bench.e2e --users 20 --requests 5 --baseline e2e.json \\
+        --mock-endpoint "mock://?latency_ms=400&error_rate=0.05&seed=2" \\
+        --setting rate_limit_max_concurrent_global=10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from telegram import Update
+from telegram.request import BaseRequest, RequestData
+
+from bot.adapters.mock import reset_mock_state
+from bot.config_service import ConfigService
+from bot.core.app import create_application
+from bot.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIO = "test_audio.mp3"
+DEFAULT_MOCK_ENDPOINT = "mock://?latency=lognormal&latency_ms=800&jitter_ms=200&seed=1"
+_BENCH_TOKEN = "123456:BENCH"
+_FIRST_USER_ID = 10_000
+# Settings applied before --setting overrides: no per-user cooldown, so a
+# closed-loop user can send its next message right away.
+_DEFAULT_SETTINGS = {"rate_limit_cooldown": "0"}
+
+
+# ---------------------------------------------------------------------------
+# Bot API stand-in
+# ---------------------------------------------------------------------------
+
+
+class FakeBotRequest(BaseRequest):
+    """Answers Bot API calls in-process and counts them by method.
+
+    *files* maps the ``file_id`` of each voice variant to its bytes;
+    ``getFile`` and the file download serve them.  *rtt_ms* delays every
+    call to stand in for the Bot API round trip.
+    """
+
+    def __init__(self, files: Mapping[str, bytes], rtt_ms: float = 0.0):
+        self._files = dict(files)
+        self._rtt = rtt_ms / 1000
+        self._message_id = 0
+        self.calls: Dict[str, int] = {}
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def _message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._message_id += 1
+        chat_id = params.get("chat_id", 0)
+        return {
+            "message_id": params.get("message_id", self._message_id),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "text": params.get("text", ""),
+        }
+
+    def _result(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        if method in ("sendMessage", "editMessageText"):
+            return self._message(params)
+        if method == "getFile":
+            file_id = params["file_id"]
+            return {
+                "file_id": file_id,
+                "file_unique_id": file_id,
+                "file_size": len(self._files.get(file_id, b"")),
+                "file_path": f"voice/{file_id}.ogg",
+            }
+        return True
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout=None,
+        write_timeout=None,
+        connect_timeout=None,
+        pool_timeout=None,
+    ) -> tuple[int, bytes]:
+        if self._rtt:
+            await asyncio.sleep(self._rtt)
+        if "/file/bot" in url:
+            self.calls["downloadFile"] = self.calls.get("downloadFile", 0) + 1
+            file_id = url.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            return 200, self._files.get(file_id, b"")
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] = self.calls.get(api_method, 0) + 1
+        params = request_data.parameters if request_data is not None else {}
+        body = {"ok": True, "result": self._result(api_method, params)}
+        return 200, json.dumps(body).encode()
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def prepare_audio_variants(source: str, durations: Sequence[int], work_dir: str) -> Dict[int, str]:
+    """Cut *source* into one Opus voice file per duration with FFmpeg.
+
+    Shorter sources are looped.  Returns ``{duration: path}``.
+    """
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg not found in PATH")
+    variants = {}
+    for duration in durations:
+        path = os.path.join(work_dir, f"voice-{duration}s.ogg")
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error", "-stream_loop", "-1", "-i", source,
+                "-t", str(duration), "-ac", "1", "-c:a", "libopus", "-b:a", "32k", path,
+            ],
+            check=True,
+        )
+        variants[duration] = path
+    return variants
+
+
+def _voice_update(update_id: int, user_id: int, duration: int, file_size: int) -> Dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Bench"},
+            "voice": {
+                "file_id": f"voice-{duration}s",
+                "file_unique_id": f"bench-{update_id}",
+                "duration": duration,
+                "mime_type": "audio/ogg",
+                "file_size": file_size,
+            },
+        },
+    }
+
+
+class _StageLogCollector(logging.Handler):
+    """Collects stage and pipeline durations from the audio handler's logs.
+
+    Users send one message at a time, so the pipeline summary of a user
+    belongs to that user's in-flight request.
+    """
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.stages: Dict[str, List[float]] = {}
+        self.pipeline: Dict[int, Dict[str, Any]] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not isinstance(record.msg, str) or not record.args:
+            return
+        if record.msg.startswith("Audio stage completed"):
+            _, stage, duration_ms = record.args
+            self.stages.setdefault(stage, []).append(float(duration_ms))
+        elif record.msg.startswith("Audio pipeline finished"):
+            user_id, _, status, duration_ms = record.args
+            self.pipeline[user_id] = {"status": status, "duration_ms": float(duration_ms)}
+
+
+def _percentiles(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "mean_ms": round(statistics.fmean(ordered), 1),
+        "max_ms": round(ordered[-1], 1),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Load test
+# ---------------------------------------------------------------------------
+
+
+async def run_load_test(
+    audio_variants: Mapping[int, str],
+    users: int,
+    requests_per_user: int,
+    work_dir: str,
+    mock_endpoint: str = DEFAULT_MOCK_ENDPOINT,
+    settings: Optional[Mapping[str, str]] = None,
+    think_ms: float = 0.0,
+    telegram_rtt_ms: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Drive *users* closed-loop users through the real application.
+
+    *audio_variants* maps a voice duration in seconds to an audio file;
+    *settings* are ConfigService settings applied before the application
+    is built.
+    """
+    reset_mock_state()
+    db = DatabaseManager(os.path.join(work_dir, "bench.sqlite3"))
+    db.initialize()
+    config_service = ConfigService(db)
+    for key, value in {**_DEFAULT_SETTINGS, **(settings or {})}.items():
+        errors = config_service.update_setting(key, value)
+        if errors:
+            raise ValueError(f"{key}: {'; '.join(errors)}")
+    user_ids = [_FIRST_USER_ID + index for index in range(users)]
+    db.replace_authorized_data({"admin": [], "users": user_ids, "groups": []})
+    db.add_provider(name="Mock", adapter_type="mock", endpoint=mock_endpoint)
+
+    files = {}
+    for duration, path in audio_variants.items():
+        with open(path, "rb") as audio:
+            files[f"voice-{duration}s"] = audio.read()
+    request = FakeBotRequest(files, rtt_ms=telegram_rtt_ms)
+    application = create_application(
+        _BENCH_TOKEN, None, database_manager=db, config_service=config_service, bot_request=request,
+    )
+    # With no legacy Config the handler only needs the audio directory.
+    application.bot_data["config"] = SimpleNamespace(audio_dir=work_dir)
+
+    audio_logger = logging.getLogger("bot.handlers.audio")
+    collector = _StageLogCollector()
+    saved = (audio_logger.level, audio_logger.propagate)
+    audio_logger.addHandler(collector)
+    audio_logger.setLevel(logging.INFO)
+    audio_logger.propagate = False
+
+    rng = random.Random(seed)
+    durations = sorted(audio_variants)
+    samples: List[Dict[str, Any]] = []
+    next_update_id = iter(range(1, users * requests_per_user + 1))
+
+    async def user_loop(user_id: int) -> None:
+        for _ in range(requests_per_user):
+            duration = rng.choice(durations)
+            update_id = next(next_update_id)
+            payload = _voice_update(update_id, user_id, duration, len(files[f"voice-{duration}s"]))
+            update = Update.de_json(payload, application.bot)
+            collector.pipeline.pop(user_id, None)
+            started = time.perf_counter()
+            await application.process_update(update)
+            e2e_ms = (time.perf_counter() - started) * 1000
+            pipeline = collector.pipeline.pop(user_id, None)
+            samples.append({
+                "duration_s": duration,
+                "e2e_ms": e2e_ms,
+                "status": pipeline["status"] if pipeline else "rejected",
+                "queue_wait_ms": max(0.0, e2e_ms - pipeline["duration_ms"]) if pipeline else None,
+            })
+            if think_ms:
+                await asyncio.sleep(think_ms / 1000)
+
+    try:
+        await application.initialize()
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(user_loop(user_id) for user_id in user_ids))
+        wall_s = time.perf_counter() - wall_start
+        stage_stats = application.bot_data["stage_engine"].get_stats()
+        await application.shutdown()
+    finally:
+        audio_logger.removeHandler(collector)
+        audio_logger.setLevel(saved[0])
+        audio_logger.propagate = saved[1]
+        db.close()
+
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[sample["status"]] = statuses.get(sample["status"], 0) + 1
+    completed = [s for s in samples if s["status"] != "rejected"]
+    return {
+        "benchmark": "e2e",
+        "users": users,
+        "requests_per_user": requests_per_user,
+        "mock_endpoint": mock_endpoint,
+        "durations_s": durations,
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(statuses.get("success", 0) / wall_s, 3) if wall_s else None,
+        "statuses": statuses,
+        "e2e": _percentiles([s["e2e_ms"] for s in completed]),
+        "e2e_by_duration": {
+            str(duration): _percentiles([s["e2e_ms"] for s in completed if s["duration_s"] == duration])
+            for duration in durations
+        },
+        "queue_wait": _percentiles([s["queue_wait_ms"] for s in completed]),
+        "stages": {stage: _percentiles(values) for stage, values in collector.stages.items()},
+        "stage_engine": stage_stats,
+        "telegram_api_calls": dict(sorted(request.calls.items())),
+    }
+
+
+def compare_with_baseline(
+    report: Mapping[str, Any], baseline: Mapping[str, Any], tolerance: float
+) -> List[str]:
+    """Return a description of every metric that regressed past *tolerance*.
+
+    Checked: throughput (lower is worse) and the end-to-end, queue-wait and
+    per-stage p95 (higher is worse).
+    """
+    regressions = []
+    old_rps, new_rps = baseline.get("throughput_rps"), report.get("throughput_rps")
+    if old_rps and new_rps is not None and new_rps < old_rps * (1 - tolerance):
+        regressions.append(f"throughput_rps {old_rps} -> {new_rps}")
+
+    def p95(section: Mapping[str, Any] | None) -> Optional[float]:
+        return section.get("p95_ms") if section else None
+
+    pairs = [("e2e", p95(baseline.get("e2e")), p95(report.get("e2e"))),
+             ("queue_wait", p95(baseline.get("queue_wait")), p95(report.get("queue_wait")))]
+    for stage, stats in (baseline.get("stages") or {}).items():
+        pairs.append((f"stages.{stage}", p95(stats), p95((report.get("stages") or {}).get(stage))))
+    for name, old, new in pairs:
+        # Sub-millisecond baselines are noise, not a reference.
+        if old and old >= 1 and new is not None and new > old * (1 + tolerance):
+            regressions.append(f"{name}.p95_ms {old} -> {new}")
+    return regressions
+
+
+def _parse_settings(values: Sequence[str]) -> Dict[str, str]:
+    settings = {}
+    for item in values:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--setting expects key=value, got {item!r}")
+        settings[key.strip()] = value.strip()
+    return settings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.bench.e2e",
+        description="Load-test the Telegram audio pipeline with mock providers.",
+    )
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=5, help="Voice messages per user")
+    parser.add_argument("--durations", default="5,15,30,60", help="Voice durations in seconds")
+    parser.add_argument("--audio", default=DEFAULT_AUDIO, help="Source audio for the voice files")
+    parser.add_argument("--mock-endpoint", default=DEFAULT_MOCK_ENDPOINT)
+    parser.add_argument("--setting", action="append", default=[], metavar="KEY=VALUE",
+                        help="ConfigService setting, e.g. rate_limit_max_concurrent_global=10")
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    parser.add_argument("--telegram-rtt-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare with a stored report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    try:
+        settings = _parse_settings(args.setting)
+        durations = [int(value) for value in args.durations.split(",") if value.strip()]
+    except (argparse.ArgumentTypeError, ValueError) as exc:
+        parser.error(str(exc))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        try:
+            variants = prepare_audio_variants(args.audio, durations, work_dir)
+        except (RuntimeError, subprocess.CalledProcessError) as exc:
+            parser.error(f"cannot prepare voice files: {exc}")
+        report = asyncio.run(run_load_test(
+            variants,
+            max(1, args.users),
+            max(1, args.requests),
+            work_dir,
+            mock_endpoint=args.mock_endpoint,
+            settings=settings,
+            think_ms=args.think_ms,
+            telegram_rtt_ms=args.telegram_rtt_ms,
+            seed=args.seed,
+        ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare_with_baseline(report, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
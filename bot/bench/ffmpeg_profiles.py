@@ -0,0 +1,281 @@
+"""
+FFmpeg encoding-profile benchmark and auto-tuner.
+
+Converts every file of a corpus (``test_audio.mp3`` by default) with
+:func:`bot.utils.convert_to_mp3` through a matrix of codecs, sample rates,
+bitrates and ``-threads`` values (mono output), plus the current default
+profile for reference.  For each profile it records:
+
+- conversion wall time (median of ``--repeat`` runs, summed over the corpus)
+- FFmpeg CPU time (user + system of the child process)
+- output size
+- estimated upload time at ``--bandwidth-mbps``
+
+Conversion plus upload is the latency a profile adds before the provider
+starts working.  For each ``--transcribers`` adapter type the profile with
+the lowest total among the codecs that adapter accepts (and at least
+``--min-sample-rate``) is recommended; ``--save`` merges the
+recommendations into the ``audio_conversion_profiles`` setting of the
+application database.
+
+Usage::
+
+    python -m bot.bench.ffmpeg_profiles --bandwidth-mbps 5
+    python -m bot.bench.ffmpeg_profiles --corpus a.ogg b.m4a --codecs mp3,opus \\
+        --transcribers openai-native,local-whisper --save
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Mapping, Sequence
+
+from bot import utils
+from bot.audio_profiles import (
+    DEFAULT_AUDIO_PROFILE,
+    LOSSLESS_CODECS,
+    AudioProfile,
+    accepted_codecs,
+    canonical_adapter_type,
+    dump_profile_map,
+    parse_profile_map,
+)
+
+DEFAULT_CORPUS = ("test_audio.mp3",)
+DEFAULT_TRANSCRIBERS = ("openai-native", "gemini-native", "openai-compat", "local-whisper")
+# Whisper resamples to 16 kHz: lower rates cost accuracy for little size.
+DEFAULT_MIN_SAMPLE_RATE = 16000
+
+
+def build_matrix(
+    codecs: Sequence[str],
+    sample_rates: Sequence[int],
+    bitrates: Sequence[str],
+    threads: Sequence[int],
+) -> List[AudioProfile]:
+    """Return every valid mono profile of the matrix.
+
+    Lossless codecs ignore the bitrate axis; combinations a codec does not
+    support (e.g. Opus at 44.1 kHz) are skipped.
+    """
+    profiles: List[AudioProfile] = []
+    for codec in codecs:
+        for rate in sample_rates:
+            for bitrate in ([None] if codec in LOSSLESS_CODECS else bitrates):
+                for thread_count in threads:
+                    try:
+                        profile = AudioProfile(codec, rate, 1, bitrate, thread_count)
+                    except ValueError:
+                        continue
+                    if profile not in profiles:
+                        profiles.append(profile)
+    return profiles
+
+
+def _children_cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def measure_profile(
+    profile: AudioProfile,
+    corpus: Sequence[str],
+    work_dir: str,
+    repeat: int,
+    bandwidth_mbps: float,
+) -> Dict[str, Any]:
+    """Convert *corpus* with *profile* and return its costs.
+
+    Conversions run one at a time so the CPU time of finished children
+    is attributable to this profile.
+    """
+    convert_ms = 0.0
+    cpu_ms = 0.0
+    output_bytes = 0
+    for index, source in enumerate(corpus):
+        target = os.path.join(work_dir, f"tune-{index}.{profile.extension}")
+        walls, cpus = [], []
+        for _ in range(max(1, repeat)):
+            cpu_before = _children_cpu_seconds()
+            started = time.perf_counter()
+            await utils.convert_to_mp3(source, target, profile)
+            walls.append((time.perf_counter() - started) * 1000)
+            cpus.append((_children_cpu_seconds() - cpu_before) * 1000)
+        convert_ms += statistics.median(walls)
+        cpu_ms += statistics.median(cpus)
+        output_bytes += os.path.getsize(target)
+        os.remove(target)
+    upload_ms = output_bytes * 8 / (bandwidth_mbps * 1_000_000) * 1000
+    return {
+        "profile": profile.to_dict(),
+        "label": profile.label,
+        "convert_ms": round(convert_ms, 1),
+        "cpu_ms": round(cpu_ms, 1),
+        "output_bytes": output_bytes,
+        "upload_ms": round(upload_ms, 1),
+        "total_ms": round(convert_ms + upload_ms, 1),
+    }
+
+
+def recommend(
+    results: Sequence[Mapping[str, Any]],
+    transcribers: Sequence[str],
+    min_sample_rate: int = DEFAULT_MIN_SAMPLE_RATE,
+) -> Dict[str, AudioProfile]:
+    """Pick the lowest-latency eligible profile for each transcriber.
+
+    Ties on total time go to the smaller output.  Transcribers without an
+    eligible measured profile are left out; picks are keyed by the
+    canonical adapter type, as providers store it.
+    """
+    picks: Dict[str, AudioProfile] = {}
+    for adapter_type in map(canonical_adapter_type, transcribers):
+        codecs = accepted_codecs(adapter_type)
+        eligible = [
+            r for r in results
+            if r["profile"]["codec"] in codecs and r["profile"]["sample_rate"] >= min_sample_rate
+        ]
+        if eligible:
+            best = min(eligible, key=lambda r: (r["total_ms"], r["output_bytes"]))
+            picks[adapter_type] = AudioProfile.from_dict(best["profile"])
+    return picks
+
+
+async def run_tuner(
+    corpus: Sequence[str],
+    profiles: Sequence[AudioProfile],
+    transcribers: Sequence[str],
+    bandwidth_mbps: float,
+    repeat: int = 3,
+    min_sample_rate: int = DEFAULT_MIN_SAMPLE_RATE,
+) -> Dict[str, Any]:
+    """Measure *profiles* (and the default) on *corpus* and recommend one per transcriber."""
+    candidates = [DEFAULT_AUDIO_PROFILE] + [p for p in profiles if p != DEFAULT_AUDIO_PROFILE]
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = [
+            await measure_profile(profile, corpus, work_dir, repeat, bandwidth_mbps)
+            for profile in candidates
+        ]
+    default = results[0]
+    picks = recommend(results, transcribers, min_sample_rate)
+    recommendations = {}
+    for adapter_type, profile in picks.items():
+        row = next(r for r in results if r["profile"] == profile.to_dict())
+        recommendations[adapter_type] = {
+            **row,
+            "saved_ms_vs_default": round(default["total_ms"] - row["total_ms"], 1),
+        }
+    return {
+        "benchmark": "ffmpeg_profiles",
+        "corpus": list(corpus),
+        "bandwidth_mbps": bandwidth_mbps,
+        "repeat": repeat,
+        "default": default,
+        "results": sorted(results, key=lambda r: r["total_ms"]),
+        "recommendations": recommendations,
+    }
+
+
+def save_recommendations(db_path: str, picks: Mapping[str, AudioProfile]) -> List[str]:
+    """Merge *picks* into ``audio_conversion_profiles`` through ConfigService.
+
+    Returns the validation errors (empty on success).
+    """
+    from bot.config_service import ConfigService
+    from bot.database import DatabaseManager
+
+    db = DatabaseManager(db_path)
+    db.initialize()
+    try:
+        try:
+            current = parse_profile_map(db.get_setting("audio_conversion_profiles"))
+        except ValueError:
+            current = {}
+        current.update(picks)
+        return ConfigService(db).update_setting("audio_conversion_profiles", dump_profile_map(current))
+    finally:
+        db.close()
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.bench.ffmpeg_profiles",
+        description="Measure FFmpeg conversion profiles and recommend one per transcriber.",
+    )
+    parser.add_argument("--corpus", nargs="+", default=list(DEFAULT_CORPUS))
+    parser.add_argument("--codecs", default="mp3,opus,aac,flac")
+    parser.add_argument("--sample-rates", default="16000,24000,48000")
+    parser.add_argument("--bitrates", default="32k,64k,128k")
+    parser.add_argument("--threads", default="1,2,0", help="FFmpeg -threads values (0 = auto)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--bandwidth-mbps", type=float, default=10.0,
+                        help="Upload bandwidth towards the providers")
+    parser.add_argument("--transcribers", default=",".join(DEFAULT_TRANSCRIBERS))
+    parser.add_argument("--min-sample-rate", type=int, default=DEFAULT_MIN_SAMPLE_RATE)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--save", action="store_true",
+                        help="Store the recommendations in the application settings")
+    parser.add_argument("--db", default=os.getenv(
+        "APPLICATION_DB", os.path.join(os.getenv("AUDIO_DIR", "audio_files"), "app.sqlite3")
+    ))
+    args = parser.parse_args(argv)
+
+    if shutil.which("ffmpeg") is None:
+        parser.error("ffmpeg not found in PATH")
+    missing = [path for path in args.corpus if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"corpus file not found: {', '.join(missing)}")
+    if args.bandwidth_mbps <= 0:
+        parser.error("--bandwidth-mbps must be positive")
+    try:
+        profiles = build_matrix(
+            _csv(args.codecs),
+            [int(rate) for rate in _csv(args.sample_rates)],
+            _csv(args.bitrates),
+            [int(count) for count in _csv(args.threads)],
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    report = asyncio.run(run_tuner(
+        args.corpus,
+        profiles,
+        _csv(args.transcribers),
+        args.bandwidth_mbps,
+        repeat=args.repeat,
+        min_sample_rate=args.min_sample_rate,
+    ))
+
+    if args.save:
+        picks = {
+            adapter_type: AudioProfile.from_dict(row["profile"])
+            for adapter_type, row in report["recommendations"].items()
+        }
+        errors = save_recommendations(args.db, picks)
+        if errors:
+            print("; ".join(errors), file=sys.stderr)
+            sys.exit(1)
+        report["saved_to"] = args.db
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
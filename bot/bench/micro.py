@@ -0,0 +1,294 @@
+"""
+Microbenchmarks for the pure-Python hot paths run on every request.
+
+=============================  ==============================================
+Benchmark                      Operation timed
+=============================  ==============================================
+``rate_limiter_contention``    one ``request_admission`` + ``release_async``
+                               pair, 400 requests from 100 users contending
+                               for 8 global slots (queue enabled)
+``split_text_chunks``          splitting a 1 MB transcript into messages
+``progressive_draft_updates``  building the draft updates of a 50 kB text
+``pipeline_resolver_resolve``  ``PipelineResolver.resolve`` with 40 providers
+                               (encrypted credentials) and 400 provider
+                               models
+``restricted_lookup``          one ``restricted`` handler call by the last
+                               user of a 10 000-entry whitelist
+``secret_store_decrypt``       ``SecretStore.decrypt`` of an API key
+=============================  ==============================================
+
+Fixtures are fixed-size and seeded, so numbers only move when the code
+does.  Each benchmark runs ``--repeat`` rounds and reports the best and
+median time per operation; the best round is compared with the
+benchmark's budget and, with ``--baseline``, with a stored report.  The
+command exits with status 1 when a hot path got slower than either.
+
+Usage::
+
+    python -m bot.bench.micro --output micro.json
+    python -m bot.bench.micro --baseline micro.json --tolerance 0.25
+    python -m bot.bench.micro --only rate_limiter_contention --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from bot.database import DatabaseManager
+from bot.database.secret_store import SecretStore
+from bot.decorators.auth import restricted
+from bot.pipeline_resolver import PipelineResolver
+from bot.rate_limiter import RateLimiter
+from bot.ui.streaming import build_progressive_draft_updates, split_text_chunks
+
+_SEED = 42
+_RESOLVER_ADAPTERS = ("openai", "gemini", "openai-compat", "mock", "local-whisper")
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A timed operation.
+
+    *setup* receives a scratch directory and the suite's event loop and
+    returns the function timed in each round; one call performs *ops* operations.  *budget_us* is the
+    slowest acceptable best-round time per operation, set well above
+    typical hardware so that only real regressions trip it.
+    """
+
+    name: str
+    setup: Callable[[str, asyncio.AbstractEventLoop], Callable[[], Any]]
+    ops: int
+    budget_us: float
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def _text(size: int) -> str:
+    rng = random.Random(_SEED)
+    alphabet = string.ascii_lowercase + "àèéìòù"
+    words = ("".join(rng.choices(alphabet, k=rng.randint(2, 10))) for _ in iter(int, 1))
+    parts: List[str] = []
+    length = 0
+    for word in words:
+        if length >= size:
+            break
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:size]
+
+
+def _setup_rate_limiter(_work_dir: str, loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    users, per_user = 100, 4
+    limiter = RateLimiter(
+        max_per_user=per_user,
+        cooldown=0,
+        max_global=8,
+        queue_enabled=True,
+        max_queue_size=users * per_user,
+        max_queued_per_user=per_user,
+    )
+
+    async def request(user_id: int) -> None:
+        admission = await limiter.request_admission(user_id, 1.0)
+        if not admission.allowed:
+            return
+        if admission.queued:
+            await limiter.wait_for_queue_turn(admission.queue_entry)
+        await asyncio.sleep(0)
+        await limiter.release_async(user_id)
+
+    async def contention_round() -> None:
+        await asyncio.gather(*(request(user) for user in range(users) for _ in range(per_user)))
+
+    return lambda: loop.run_until_complete(contention_round())
+
+
+def _setup_split(_work_dir: str, _loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    text = _text(1_000_000)
+    return lambda: split_text_chunks(text)
+
+
+def _setup_drafts(_work_dir: str, _loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    text = _text(50_000)
+    return lambda: build_progressive_draft_updates(text)
+
+
+def _setup_resolver(work_dir: str, _loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    store = SecretStore(os.path.join(work_dir, "resolver.key"))
+    store.initialize()
+    db = DatabaseManager(os.path.join(work_dir, "resolver.sqlite3"), secret_store=store)
+    db.initialize()
+    for index in range(40):
+        adapter = _RESOLVER_ADAPTERS[index % len(_RESOLVER_ADAPTERS)]
+        endpoint = "mock://?latency=fixed&latency_ms=0" if adapter == "mock" else None
+        provider_id = db.add_provider(
+            name=f"Provider {index:02d}",
+            adapter_type=adapter,
+            endpoint=endpoint,
+            credentials=f"sk-bench-{index:02d}-" + "x" * 40,
+        )
+        for model in range(10):
+            db.add_provider_model(provider_id, f"model-{index:02d}-{model}")
+    resolver = PipelineResolver(db)
+    return resolver.resolve
+
+
+def _setup_restricted(_work_dir: str, loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    users = list(range(1_000_000, 1_010_000))
+    authorized = {"admin": [1], "users": users, "groups": list(range(-1000, 0))}
+    user_id = users[-1]
+
+    @restricted
+    async def handler(update, context):
+        return True
+
+    update = SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id),
+        effective_chat=SimpleNamespace(id=user_id),
+    )
+    context = SimpleNamespace(bot_data={
+        "config": SimpleNamespace(authorized_data=authorized),
+        "whitelist_manager": SimpleNamespace(authorized_data=authorized),
+    })
+
+    async def calls() -> None:
+        for _ in range(100):
+            await handler(update, context)
+
+    return lambda: loop.run_until_complete(calls())
+
+
+def _setup_decrypt(work_dir: str, _loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    store = SecretStore(os.path.join(work_dir, "decrypt.key"))
+    store.initialize()
+    token = store.encrypt("sk-bench-" + "x" * 48)
+    return lambda: store.decrypt(token)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    bench.name: bench
+    for bench in (
+        Benchmark("rate_limiter_contention", _setup_rate_limiter, ops=400, budget_us=250),
+        Benchmark("split_text_chunks", _setup_split, ops=1, budget_us=5_000),
+        Benchmark("progressive_draft_updates", _setup_drafts, ops=1, budget_us=20_000),
+        Benchmark("pipeline_resolver_resolve", _setup_resolver, ops=1, budget_us=500_000),
+        Benchmark("restricted_lookup", _setup_restricted, ops=100, budget_us=1_000),
+        Benchmark("secret_store_decrypt", _setup_decrypt, ops=1, budget_us=1_000),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def run_benchmark(
+    bench: Benchmark, work_dir: str, loop: asyncio.AbstractEventLoop, repeat: int
+) -> Dict[str, Any]:
+    """Time *repeat* rounds of *bench* (after one warm-up round)."""
+    operation = bench.setup(work_dir, loop)
+    operation()
+    rounds = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        operation()
+        rounds.append((time.perf_counter() - started) * 1_000_000 / bench.ops)
+    best = min(rounds)
+    return {
+        "ops_per_round": bench.ops,
+        "rounds": len(rounds),
+        "best_us": round(best, 2),
+        "median_us": round(statistics.median(rounds), 2),
+        "budget_us": bench.budget_us,
+        "within_budget": best <= bench.budget_us,
+    }
+
+
+def run_suite(names: Sequence[str] | None = None, repeat: int = 7) -> Dict[str, Any]:
+    """Run the selected benchmarks (all by default) and return the report."""
+    selected = [BENCHMARKS[name] for name in (names or BENCHMARKS)]
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for bench in selected:
+                results[bench.name] = run_benchmark(bench, work_dir, loop, repeat)
+    finally:
+        loop.close()
+    return {"benchmark": "micro", "python": sys.version.split()[0], "results": results}
+
+
+def find_regressions(
+    report: Mapping[str, Any],
+    baseline: Optional[Mapping[str, Any]] = None,
+    tolerance: float = 0.25,
+) -> List[str]:
+    """Return every benchmark over budget or slower than *baseline*.
+
+    A benchmark regresses against the baseline when its best round is
+    more than *tolerance* slower than the stored best round.
+    """
+    regressions = []
+    stored = (baseline or {}).get("results", {})
+    for name, result in report["results"].items():
+        if not result["within_budget"]:
+            regressions.append(f"{name} {result['best_us']}us over budget {result['budget_us']}us")
+        old = stored.get(name, {}).get("best_us")
+        if old and result["best_us"] > old * (1 + tolerance):
+            regressions.append(f"{name} {old}us -> {result['best_us']}us")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.bench.micro",
+        description="Time the in-process hot paths and fail on regressions.",
+    )
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS),
+                        help="Run only this benchmark (repeatable)")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed rounds per benchmark")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare with a stored report")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    # The resolver logs every resolution; keep the report readable.
+    logging.basicConfig(level=logging.ERROR)
+    report = run_suite(args.only, args.repeat)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+    regressions = find_regressions(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Latency benchmark: single-pass versus two-stage execution.
+
+Two-stage runs ``Transcriber.transcribe`` then ``TextProcessor.process``
+(two round trips, the raw transcript travels through the bot); single-pass
+runs ``SinglePassProcessor.process_audio`` (one round trip).  Both go
+through the resilient wrappers used in production.  For the streaming
+variants the time to the first delta is reported as well.
+
+By default the providers are synthetic: each call waits ``--rtt-ms`` plus
+its own service time, which isolates the cost of the extra round trip.
+With ``--audio`` the real adapters registered for ``--adapter`` are
+called, with the API key read from ``BENCH_API_KEY``.
+
+Usage::
+
+    python -m bot.bench.single_pass --runs 20 --rtt-ms 300
+    BENCH_API_KEY=... python -m bot.bench.single_pass --audio sample.mp3 \\
+        --adapter gemini-native --model gemini-2.0-flash --runs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+from bot.providers import (
+    RefineStreamEvent,
+    ResilientSinglePassProcessor,
+    ResilientTextProcessor,
+    ResilientTranscriber,
+    SinglePassProcessor,
+    TextProcessor,
+    Transcriber,
+    TranscriptionResult,
+)
+
+_SYNTHETIC_TEXT = "testo di prova " * 40
+
+
+class _SyntheticCall:
+    def __init__(self, rtt_ms: float, service_ms: float):
+        self._delay = (rtt_ms + service_ms) / 1000
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self._delay)
+
+
+class SyntheticTranscriber(_SyntheticCall, Transcriber):
+    async def transcribe(self, file_path: str) -> TranscriptionResult:
+        await self.wait()
+        return TranscriptionResult(text=_SYNTHETIC_TEXT)
+
+
+class SyntheticTextProcessor(_SyntheticCall, TextProcessor):
+    supports_refine_streaming = True
+
+    async def process(self, raw_text: str) -> str:
+        await self.wait()
+        return raw_text
+
+    async def stream_process(self, raw_text: str) -> AsyncIterator[RefineStreamEvent]:
+        await self.wait()
+        yield RefineStreamEvent(type="delta", text=raw_text)
+        yield RefineStreamEvent(type="done", text=raw_text)
+
+
+class SyntheticSinglePass(_SyntheticCall, SinglePassProcessor):
+    supports_refine_streaming = True
+
+    async def process_audio(self, file_path: str) -> str:
+        await self.wait()
+        return _SYNTHETIC_TEXT
+
+    async def stream_process_audio(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        await self.wait()
+        yield RefineStreamEvent(type="delta", text=_SYNTHETIC_TEXT)
+        yield RefineStreamEvent(type="done", text=_SYNTHETIC_TEXT)
+
+
+def synthetic_components(
+    rtt_ms: float, transcribe_ms: float, refine_ms: float, single_pass_ms: float
+) -> tuple[Transcriber, TextProcessor, SinglePassProcessor]:
+    return (
+        ResilientTranscriber(SyntheticTranscriber(rtt_ms, transcribe_ms)),
+        ResilientTextProcessor(SyntheticTextProcessor(rtt_ms, refine_ms)),
+        ResilientSinglePassProcessor(SyntheticSinglePass(rtt_ms, single_pass_ms)),
+    )
+
+
+def live_components(
+    adapter: str, model: str, endpoint: str, api_key: str
+) -> tuple[Transcriber, TextProcessor, SinglePassProcessor]:
+    from bot.adapters import single_pass_registry, text_processor_registry, transcriber_registry
+
+    kwargs = {"api_key": api_key, "endpoint": endpoint, "model_name": model}
+    return (
+        ResilientTranscriber(transcriber_registry.create(adapter, **kwargs)),
+        ResilientTextProcessor(text_processor_registry.create(adapter, **kwargs)),
+        ResilientSinglePassProcessor(single_pass_registry.create(adapter, **kwargs)),
+    )
+
+
+async def _first_delta(stream: AsyncIterator[RefineStreamEvent], start: float) -> float | None:
+    first = None
+    async for event in stream:
+        if event.type == "delta" and first is None:
+            first = time.perf_counter() - start
+    return first
+
+
+async def _time(call: Callable[[], Awaitable[Any]]) -> float:
+    start = time.perf_counter()
+    await call()
+    return time.perf_counter() - start
+
+
+async def measure(
+    transcriber: Transcriber,
+    processor: TextProcessor,
+    single_pass: SinglePassProcessor,
+    audio_path: str,
+    runs: int,
+) -> Dict[str, Dict[str, List[float]]]:
+    """Return per-mode lists of ``total`` and (streaming) ``first_delta`` seconds."""
+    samples: Dict[str, Dict[str, List[float]]] = {
+        mode: {"total": [], "first_delta": []}
+        for mode in ("two_stage", "single_pass", "two_stage_stream", "single_pass_stream")
+    }
+
+    async def two_stage():
+        result = await transcriber.transcribe(audio_path)
+        return await processor.process(result.text)
+
+    for _ in range(runs):
+        samples["two_stage"]["total"].append(await _time(two_stage))
+        samples["single_pass"]["total"].append(
+            await _time(lambda: single_pass.process_audio(audio_path))
+        )
+
+        start = time.perf_counter()
+        result = await transcriber.transcribe(audio_path)
+        first = await _first_delta(processor.stream_process(result.text), start)
+        samples["two_stage_stream"]["total"].append(time.perf_counter() - start)
+        samples["two_stage_stream"]["first_delta"].append(first)
+
+        start = time.perf_counter()
+        first = await _first_delta(single_pass.stream_process_audio(audio_path), start)
+        samples["single_pass_stream"]["total"].append(time.perf_counter() - start)
+        samples["single_pass_stream"]["first_delta"].append(first)
+    return samples
+
+
+def _summary(values: List[float]) -> Dict[str, float] | None:
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {
+        "p50_ms": round(statistics.median(values) * 1000, 1),
+        "mean_ms": round(statistics.fmean(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+def run_benchmark(
+    components: tuple[Transcriber, TextProcessor, SinglePassProcessor],
+    audio_path: str,
+    runs: int,
+) -> Dict[str, Any]:
+    samples = asyncio.run(measure(*components, audio_path, runs))
+    results = {
+        mode: {"total": _summary(data["total"]), "first_delta": _summary(data["first_delta"])}
+        for mode, data in samples.items()
+    }
+    two_stage = results["two_stage"]["total"]["p50_ms"]
+    single = results["single_pass"]["total"]["p50_ms"]
+    return {
+        "benchmark": "single_pass",
+        "runs": runs,
+        "results": results,
+        "single_pass_saving_ms": round(two_stage - single, 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.bench.single_pass",
+        description="Compare single-pass and two-stage provider latency.",
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=300.0)
+    parser.add_argument("--transcribe-ms", type=float, default=1500.0)
+    parser.add_argument("--refine-ms", type=float, default=1200.0)
+    parser.add_argument("--single-pass-ms", type=float, default=2200.0)
+    parser.add_argument("--audio", help="Audio file: call real providers instead of synthetic ones")
+    parser.add_argument("--adapter", default="gemini-native")
+    parser.add_argument("--model", default="gemini-2.0-flash")
+    parser.add_argument("--endpoint", default="")
+    args = parser.parse_args(argv)
+
+    if args.audio:
+        api_key = os.environ.get("BENCH_API_KEY", "")
+        if not api_key:
+            parser.error("BENCH_API_KEY must be set when --audio is given")
+        components = live_components(args.adapter, args.model, args.endpoint, api_key)
+        audio_path = args.audio
+    else:
+        components = synthetic_components(
+            args.rtt_ms, args.transcribe_ms, args.refine_ms, args.single_pass_ms
+        )
+        audio_path = "synthetic.mp3"
+
+    report = run_benchmark(components, audio_path, max(1, args.runs))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Throughput benchmark for the dispatcher / worker-process split.
+
+Each synthetic job burns ``--cpu-ms`` of CPU (standing in for conversion
+and response handling) and then waits ``--io-ms`` (standing in for the
+download and provider calls).  The baseline runs ``--jobs`` jobs in-process,
+``--concurrency`` at a time on one event loop, the way the bot does without
+dispatch mode.  The same jobs are then queued in a throwaway SQLite database
+and drained by 1..``--max-processes`` :class:`~bot.workers.PipelineWorker`
+processes, each running ``--concurrency`` jobs at once, exercising the real
+claim/finish path through SQLite.  Speedups are relative to the in-process
+run.
+
+Usage::
+
+    python -m bot.bench.workers --jobs 48 --max-processes 4 --cpu-ms 50 --io-ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from bot import constants as c
+from bot.database import DatabaseManager
+from bot.workers import PipelineWorker, StageReporter
+
+
+def _burn_cpu(duration_ms: float) -> None:
+    deadline = time.perf_counter() + duration_ms / 1000
+    digest = b"bench"
+    while time.perf_counter() < deadline:
+        digest = hashlib.sha256(digest).digest()
+
+
+class SyntheticJobHandler:
+    """Stand-in for :class:`~bot.workers.AudioJobHandler` with fixed costs."""
+
+    def __init__(self, cpu_ms: float, io_ms: float):
+        self._cpu_ms = cpu_ms
+        self._io_ms = io_ms
+
+    async def __call__(self, job: Dict[str, Any], set_stage: StageReporter) -> str:
+        await set_stage("convert")
+        _burn_cpu(self._cpu_ms)
+        await set_stage("transcribe")
+        await asyncio.sleep(self._io_ms / 1000)
+        return f"job {job['id']}"
+
+
+async def _drain_queue(
+    db: DatabaseManager, worker_id: str, cpu_ms: float, io_ms: float, concurrency: int
+) -> None:
+    worker = PipelineWorker(
+        db,
+        SyntheticJobHandler(cpu_ms, io_ms),
+        worker_id=worker_id,
+        poll_interval=0.01,
+        concurrency=concurrency,
+    )
+    await worker.run(until_idle=True)
+
+
+def _bench_worker(
+    db_path: str,
+    worker_id: str,
+    cpu_ms: float,
+    io_ms: float,
+    concurrency: int,
+    barrier,
+    finished,
+) -> None:
+    db = DatabaseManager(db_path)
+    db.initialize()
+    try:
+        # Start draining together so interpreter start-up is not timed, and
+        # report when draining ends so shutdown is not timed either.
+        barrier.wait()
+        asyncio.run(_drain_queue(db, worker_id, cpu_ms, io_ms, concurrency))
+        finished.put(time.time())
+    finally:
+        db.close()
+
+
+def _enqueue_jobs(db: DatabaseManager, jobs: int) -> None:
+    for index in range(jobs):
+        db.enqueue_pipeline_job(
+            chat_id=1,
+            user_id=1,
+            message_id=index,
+            ack_message_id=index,
+            file_id=f"bench-{index}",
+            file_unique_id=f"bench-{index}",
+            file_ext="ogg",
+        )
+
+
+async def _run_in_process(jobs: int, cpu_ms: float, io_ms: float, concurrency: int) -> int:
+    handler = SyntheticJobHandler(cpu_ms, io_ms)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def set_stage(stage: str) -> None:
+        pass
+
+    async def run_one(index: int) -> str:
+        async with slots:
+            return await handler({"id": index}, set_stage)
+
+    results = await asyncio.gather(*(run_one(index) for index in range(jobs)))
+    return len(results)
+
+
+def measure_in_process(
+    jobs: int, cpu_ms: float, io_ms: float, concurrency: int = c.PIPELINE_WORKER_CONCURRENCY
+) -> Dict[str, Any]:
+    """Run *jobs* synthetic jobs on one event loop, *concurrency* at a time."""
+    start_time = time.perf_counter()
+    completed = asyncio.run(_run_in_process(jobs, cpu_ms, io_ms, max(1, concurrency)))
+    elapsed = time.perf_counter() - start_time
+    return {
+        "mode": "in_process",
+        "processes": 0,
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "completed": completed,
+        "elapsed_s": round(elapsed, 3),
+        "jobs_per_s": round(jobs / elapsed, 2) if elapsed else None,
+    }
+
+
+def measure(
+    processes: int,
+    jobs: int,
+    cpu_ms: float,
+    io_ms: float,
+    concurrency: int = c.PIPELINE_WORKER_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Drain *jobs* synthetic jobs with *processes* workers and time it."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.sqlite3")
+        db = DatabaseManager(db_path)
+        db.initialize()
+        _enqueue_jobs(db, jobs)
+
+        ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Barrier(processes + 1)
+        finished = ctx.Queue()
+        workers = [
+            ctx.Process(
+                target=_bench_worker,
+                args=(
+                    db_path,
+                    f"bench-{index}",
+                    cpu_ms,
+                    io_ms,
+                    max(1, concurrency),
+                    barrier,
+                    finished,
+                ),
+            )
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start_time = time.time()
+        for worker in workers:
+            worker.join()
+        joined_at = time.time()
+        reported = []
+        while not finished.empty():
+            reported.append(finished.get())
+        # A worker that crashed reports nothing; then time until it exited.
+        elapsed = (max(reported) if len(reported) == len(workers) else joined_at) - start_time
+
+        counts = db.count_pipeline_jobs()
+        db.close()
+
+    return {
+        "mode": "workers",
+        "processes": processes,
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "completed": counts.get("done", 0),
+        "elapsed_s": round(elapsed, 3),
+        "jobs_per_s": round(jobs / elapsed, 2) if elapsed else None,
+    }
+
+
+def run_benchmark(
+    jobs: int,
+    max_processes: int,
+    cpu_ms: float,
+    io_ms: float,
+    concurrency: int = c.PIPELINE_WORKER_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Measure in-process throughput, then 1..*max_processes* workers."""
+    results: List[Dict[str, Any]] = [measure_in_process(jobs, cpu_ms, io_ms, concurrency)]
+    results.extend(
+        measure(processes, jobs, cpu_ms, io_ms, concurrency)
+        for processes in range(1, max_processes + 1)
+    )
+    baseline = results[0]["jobs_per_s"] or 0
+    for result in results:
+        result["speedup"] = (
+            round(result["jobs_per_s"] / baseline, 2) if baseline and result["jobs_per_s"] else None
+        )
+    return {
+        "benchmark": "workers",
+        "cpu_ms": cpu_ms,
+        "io_ms": io_ms,
+        "concurrency": concurrency,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.bench.workers",
+        description="Compare in-process throughput with 1..N pipeline-worker processes.",
+    )
+    parser.add_argument("--jobs", type=int, default=48)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cpu-ms", type=float, default=50.0)
+    # Provider calls dominate a real job; keep the wait well above the CPU cost.
+    parser.add_argument("--io-ms", type=float, default=500.0)
+    parser.add_argument("--concurrency", type=int, default=c.PIPELINE_WORKER_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.jobs,
+        max(1, args.max_processes),
+        args.cpu_ms,
+        args.io_ms,
+        max(1, args.concurrency),
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -63,6 +63,10 @@ class CapabilityModel:
     refines in one request.
     """
 
+    streaming_transcription: bool = False
+    """Can stream partial transcript text while transcribing
+    (``stream=True`` on ``/v1/audio/transcriptions``)."""
+
     def to_dict(self) -> dict[str, bool]:
         """Return a JSON-safe dict (``True``/``False`` only)."""
         return {
@@ -71,6 +75,7 @@ class CapabilityModel:
             "refinement": self.refinement,
             "streaming_refinement": self.streaming_refinement,
             "single_pass_audio_to_text": self.single_pass_audio_to_text,
+            "streaming_transcription": self.streaming_transcription,
         }
 
     @classmethod
@@ -87,6 +92,7 @@ class CapabilityModel:
             refinement=bool(data.get("refinement", False)),
             streaming_refinement=bool(data.get("streaming_refinement", False)),
             single_pass_audio_to_text=bool(data.get("single_pass_audio_to_text", False)),
+            streaming_transcription=bool(data.get("streaming_transcription", False)),
         )
 
 
@@ -131,6 +137,16 @@ _ADAPTER_DEFAULTS: dict[str, CapabilityModel] = {
         streaming_refinement=True,
         single_pass_audio_to_text=False,
     ),
+    # Self-hosted Whisper servers only transcribe.
+    "local-whisper": CapabilityModel(transcription=True),
+    # Synthetic provider for load tests (bot.adapters.mock).
+    "mock": CapabilityModel(
+        transcription=True,
+        text_generation=True,
+        refinement=True,
+        streaming_refinement=True,
+        streaming_transcription=True,
+    ),
 }
 
 # Models whose *only* capability is text generation (no audio).
@@ -176,7 +192,7 @@ def detect_capabilities(
         return base
 
     mid = model_name.lower()
-    has_audio_keywords = any(kw in mid for kw in ("whisper", "audio"))
+    has_audio_keywords = any(kw in mid for kw in ("whisper", "audio", "transcribe"))
     is_known_transcription = mid in {m.lower() for m in _TRANSCRIPTION_MODELS}
 
     # Transcription capability per adapter type.
@@ -214,6 +230,7 @@ def detect_capabilities(
         refinement=base.refinement,
         streaming_refinement=_detect_streaming(model_name) if base.streaming_refinement else False,
         single_pass_audio_to_text=single_pass,
+        streaming_transcription=transcription and _detect_transcribe_streaming(adapter_type, model_name),
     )
 
 
@@ -228,6 +245,19 @@ def _detect_streaming(model_name: str) -> bool:
     return mid not in non_streaming
 
 
+def _detect_transcribe_streaming(adapter_type: str, model_name: str) -> bool:
+    """Return ``True`` when partial transcripts can be streamed.
+
+    The OpenAI-compatible adapter streams for OpenAI's ``*-transcribe``
+    models, not ``whisper-1``; self-hosted servers that stream Whisper
+    output can be enabled with a capability override.  The ``mock``
+    adapter always streams.
+    """
+    if adapter_type == "mock":
+        return True
+    return adapter_type == "openai-compat" and "transcribe" in model_name.lower()
+
+
 def merge_capabilities(
     detected: CapabilityModel,
     overrides: Optional[dict[str, bool]],
@@ -247,6 +277,7 @@ def merge_capabilities(
         refinement=overrides.get("refinement", detected.refinement),
         streaming_refinement=overrides.get("streaming_refinement", detected.streaming_refinement),
         single_pass_audio_to_text=overrides.get("single_pass_audio_to_text", detected.single_pass_audio_to_text),
+        streaming_transcription=overrides.get("streaming_transcription", detected.streaming_transcription),
     )
 
 
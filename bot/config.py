@@ -55,6 +55,8 @@ class Config:
         self.rate_limit_config = self._load_rate_limit_config()
         self.provider_resilience_config = self._load_provider_resilience_config()
         self.telegram_progressive_output_config = self._load_telegram_progressive_output_config()
+        self.telegram_bot_api_config = self._load_telegram_bot_api_config()
+        self.pipeline_dispatch_enabled = self._get_bool("PIPELINE_DISPATCH", False)
         self.prompts = self._load_prompts()
         self.authorized_data = self._load_authorized_data()
         self._validate_ffmpeg()
@@ -205,6 +207,30 @@ class Config:
                 defaults["max_queued_per_user"],
                 minimum=1,
             ),
+            "adaptive_enabled": self._get_bool(
+                "RATE_LIMIT_ADAPTIVE",
+                bool(c.ADAPTIVE_CONCURRENCY_DEFAULTS["adaptive_enabled"]),
+            ),
+            "adaptive_min": self._get_int(
+                "RATE_LIMIT_ADAPTIVE_MIN",
+                c.ADAPTIVE_CONCURRENCY_DEFAULTS["adaptive_min"],
+                minimum=1,
+            ),
+            "adaptive_max": self._get_int(
+                "RATE_LIMIT_ADAPTIVE_MAX",
+                c.ADAPTIVE_CONCURRENCY_DEFAULTS["adaptive_max"],
+                minimum=1,
+            ),
+            "prepare_max_jobs": self._get_int(
+                "RATE_LIMIT_PREPARE_JOBS",
+                c.PREPARATION_DEFAULTS["prepare_max_jobs"],
+                minimum=0,
+            ),
+            "prepare_max_mb": self._get_int(
+                "RATE_LIMIT_PREPARE_MB",
+                c.PREPARATION_DEFAULTS["prepare_max_mb"],
+                minimum=1,
+            ),
         }
 
     def _load_provider_resilience_config(self) -> Dict[str, int | bool]:
@@ -226,6 +252,34 @@ class Config:
                 defaults["cooldown_seconds"],
                 minimum=0,
             ),
+            "retry_enabled": self._get_bool(
+                "PROVIDER_RETRY_ENABLED",
+                bool(c.PROVIDER_RETRY_DEFAULTS["retry_enabled"]),
+            ),
+            "retry_max_attempts": self._get_int(
+                "PROVIDER_RETRY_MAX_ATTEMPTS",
+                c.PROVIDER_RETRY_DEFAULTS["retry_max_attempts"],
+                minimum=1,
+            ),
+            "retry_budget_percent": self._get_int(
+                "PROVIDER_RETRY_BUDGET_PERCENT",
+                c.PROVIDER_RETRY_DEFAULTS["retry_budget_percent"],
+                minimum=0,
+            ),
+            "hedging_enabled": self._get_bool(
+                "PROVIDER_HEDGING_ENABLED",
+                bool(c.PROVIDER_HEDGING_DEFAULTS["hedging_enabled"]),
+            ),
+            "hedging_percentile": self._get_int(
+                "PROVIDER_HEDGING_PERCENTILE",
+                c.PROVIDER_HEDGING_DEFAULTS["hedging_percentile"],
+                minimum=50,
+            ),
+            "hedging_budget_percent": self._get_int(
+                "PROVIDER_HEDGING_BUDGET_PERCENT",
+                c.PROVIDER_HEDGING_DEFAULTS["hedging_budget_percent"],
+                minimum=0,
+            ),
         }
 
     def _load_telegram_progressive_output_config(self) -> Dict[str, bool]:
@@ -237,6 +291,26 @@ class Config:
             "enabled": self._get_bool(
                 "TELEGRAM_DRAFT_STREAMING", bool(defaults["enabled"])
             ),
+            "raw_first": self._get_bool(
+                "TELEGRAM_RAW_FIRST", bool(defaults["raw_first"])
+            ),
+        }
+
+    def _load_telegram_bot_api_config(self) -> Dict[str, Any]:
+        """Load the optional self-hosted Bot API server settings."""
+        from bot import constants as c
+        defaults = c.TELEGRAM_BOT_API_DEFAULTS
+
+        return {
+            "base_url": os.getenv(
+                "TELEGRAM_BOT_API_URL", defaults["base_url"]
+            ).strip().rstrip("/"),
+            "local_mode": self._get_bool(
+                "TELEGRAM_BOT_API_LOCAL", bool(defaults["local_mode"])
+            ),
+            "files_dir": os.getenv(
+                "TELEGRAM_BOT_API_DIR", defaults["files_dir"]
+            ).strip(),
         }
 
     @staticmethod
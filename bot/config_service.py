@@ -36,6 +36,8 @@ Usage::
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from bot.admission import DEFAULT_ALLOWED_EXTENSIONS, parse_duration_tiers
+from bot.audio_profiles import parse_profile_map
 from bot.database import DatabaseManager, SecretStore, SecretStoreError
 
 # ---------------------------------------------------------------------------
@@ -91,6 +93,76 @@ SETTINGS_REGISTRY: List[SettingDef] = [
         required=True,
         placeholder="Inserisci il token del bot…",
     ),
+    SettingDef(
+        key="telegram_bot_api_url",
+        label="Server Bot API locale",
+        description=(
+            "URL di un server telegram-bot-api self-hosted (es. "
+            "http://telegram-bot-api:8081). Lasciare vuoto per usare "
+            "l'API cloud di Telegram."
+        ),
+        type="string",
+        default=None,
+        group="telegram",
+        requires_reload=True,
+        placeholder="http://localhost:8081",
+    ),
+    SettingDef(
+        key="telegram_bot_api_local_mode",
+        label="Modalità locale Bot API",
+        description=(
+            "Il server è avviato con --local: i file vengono letti "
+            "direttamente dal suo filesystem (volume condiviso) e il limite "
+            "di dimensione sale a 2000 MB."
+        ),
+        type="boolean",
+        default=False,
+        group="telegram",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="telegram_bot_api_files_dir",
+        label="Cartella file Bot API",
+        description=(
+            "Cartella di lavoro del server Bot API in modalità locale, "
+            "montata allo stesso percorso nel container del bot. Solo i "
+            "file al suo interno vengono letti direttamente; vuoto = "
+            "scarica sempre via HTTP."
+        ),
+        type="string",
+        default=None,
+        group="telegram",
+        requires_reload=True,
+        placeholder="/var/lib/telegram-bot-api",
+    ),
+    SettingDef(
+        key="telegram_update_mode",
+        label="Ricezione aggiornamenti",
+        description=(
+            "polling: il bot interroga Telegram (long polling). webhook: "
+            "Telegram invia gli aggiornamenti al server web, riducendo la "
+            "latenza. Il webhook richiede un URL pubblico HTTPS."
+        ),
+        type="enum",
+        default="polling",
+        enum_values=["polling", "webhook"],
+        group="telegram",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="telegram_webhook_url",
+        label="URL pubblico webhook",
+        description=(
+            "Indirizzo HTTPS pubblico di questo server web (senza percorso). "
+            "Il bot registra il webhook su un percorso segreto generato "
+            "a ogni avvio."
+        ),
+        type="string",
+        default=None,
+        group="telegram",
+        requires_reload=True,
+        placeholder="https://bot.example.com",
+    ),
     # ------ Provider ------
     SettingDef(
         key="llm_provider",
@@ -180,11 +252,56 @@ SETTINGS_REGISTRY: List[SettingDef] = [
     SettingDef(
         key="rate_limit_max_file_size_mb",
         label="Max dimensione file (MB)",
-        description="Dimensione massima consentita per i file audio in megabyte.",
+        description=(
+            "Dimensione massima consentita per i file audio in megabyte. "
+            "Oltre 20 MB serve un server Bot API locale in modalità --local."
+        ),
         type="integer",
         default=20,
         min_value=1,
+        max_value=2000,
+        group="rate_limits",
+    ),
+    SettingDef(
+        key="admission_max_duration_seconds",
+        label="Durata massima audio (secondi)",
+        description=(
+            "Rifiuta subito, senza scaricarli, vocali e file audio più lunghi "
+            "di questa durata secondo i metadati di Telegram. 0 = nessun limite."
+        ),
+        type="integer",
+        default=0,
+        min_value=0,
+        max_value=86400,
+        group="rate_limits",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="admission_duration_tiers",
+        label="Durata massima per livello",
+        description=(
+            "Eccezioni alla durata massima, in JSON {livello: secondi}. "
+            "Livelli, dal più specifico: user:<id>, chat:<id>, admin, groups "
+            "(messaggi nei gruppi), users. 0 = nessun limite per quel livello."
+        ),
+        type="text",
+        default="",
         group="rate_limits",
+        requires_reload=True,
+        placeholder='{"admin": 0, "groups": 300, "user:123456789": 3600}',
+    ),
+    SettingDef(
+        key="admission_allowed_extensions",
+        label="Estensioni audio accettate",
+        description=(
+            "Estensioni dei file audio e dei documenti accettate, separate da "
+            "virgola; gli altri file sono rifiutati prima del download. "
+            "Vuoto = qualsiasi estensione."
+        ),
+        type="text",
+        default=",".join(DEFAULT_ALLOWED_EXTENSIONS),
+        group="rate_limits",
+        requires_reload=True,
     ),
     SettingDef(
         key="rate_limit_queue_enabled",
@@ -215,6 +332,59 @@ SETTINGS_REGISTRY: List[SettingDef] = [
         min_value=1,
         group="rate_limits",
     ),
+    SettingDef(
+        key="rate_limit_adaptive_enabled",
+        label="Limite globale adattivo",
+        description=(
+            "Regola automaticamente il limite di richieste globali in base "
+            "a latenza, timeout e risposte 429 dei provider (AIMD), entro "
+            "i limiti minimo e massimo qui sotto."
+        ),
+        type="boolean",
+        default=False,
+        group="rate_limits",
+    ),
+    SettingDef(
+        key="rate_limit_adaptive_min",
+        label="Limite adattivo minimo",
+        description="Valore minimo del limite globale adattivo.",
+        type="integer",
+        default=1,
+        min_value=1,
+        group="rate_limits",
+    ),
+    SettingDef(
+        key="rate_limit_adaptive_max",
+        label="Limite adattivo massimo",
+        description="Valore massimo del limite globale adattivo.",
+        type="integer",
+        default=20,
+        min_value=1,
+        group="rate_limits",
+    ),
+    SettingDef(
+        key="rate_limit_prepare_max_jobs",
+        label="Preparazioni in anticipo",
+        description=(
+            "Richieste che scaricano e convertono l'audio prima di occupare "
+            "un posto globale (anche mentre sono in coda), così la "
+            "trascrizione parte appena tocca a loro. 0 = occupano il posto o "
+            "attendono il turno prima del download."
+        ),
+        type="integer",
+        default=4,
+        min_value=0,
+        group="rate_limits",
+    ),
+    SettingDef(
+        key="rate_limit_prepare_max_mb",
+        label="Spazio preparazioni (MB)",
+        description="Spazio su disco massimo dei file preparati in anticipo.",
+        type="integer",
+        default=200,
+        min_value=1,
+        group="rate_limits",
+    ),
     # ------ Provider resilience ------
     SettingDef(
         key="provider_resilience_enabled",
@@ -252,6 +422,87 @@ SETTINGS_REGISTRY: List[SettingDef] = [
         min_value=0,
         group="resilience",
     ),
+    SettingDef(
+        key="provider_retry_enabled",
+        label="Retry provider",
+        description=(
+            "Ripete le chiamate ai provider fallite per errori temporanei "
+            "(429, 5xx, rete) con attese casuali crescenti, rispettando "
+            "Retry-After e il timeout della fase."
+        ),
+        type="boolean",
+        default=True,
+        group="resilience",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="provider_retry_max_attempts",
+        label="Tentativi massimi",
+        description=(
+            "Numero massimo di tentativi per chiamata, compreso il primo."
+        ),
+        type="integer",
+        default=3,
+        min_value=1,
+        max_value=10,
+        group="resilience",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="provider_retry_budget_percent",
+        label="Budget retry (%)",
+        description=(
+            "Percentuale massima di chiamate che possono essere ripetute, "
+            "per non sovraccaricare un provider già in difficoltà."
+        ),
+        type="integer",
+        default=20,
+        min_value=0,
+        max_value=100,
+        group="resilience",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="provider_hedging_enabled",
+        label="Richieste hedged",
+        description=(
+            "Se il modello principale non risponde entro la sua latenza "
+            "abituale (percentile), invia la stessa richiesta al primo "
+            "modello di fallback e usa la prima risposta valida."
+        ),
+        type="boolean",
+        default=False,
+        group="resilience",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="provider_hedging_percentile",
+        label="Percentile hedging",
+        description=(
+            "Percentile della latenza del modello principale oltre il "
+            "quale parte la richiesta al fallback (es. 90 o 95)."
+        ),
+        type="integer",
+        default=95,
+        min_value=50,
+        max_value=99,
+        group="resilience",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="provider_hedging_budget_percent",
+        label="Budget hedging (%)",
+        description=(
+            "Percentuale massima di richieste che possono generare una "
+            "richiesta hedged, per contenere i costi."
+        ),
+        type="integer",
+        default=10,
+        min_value=0,
+        max_value=100,
+        group="resilience",
+        requires_reload=True,
+    ),
     # ------ Output ------
     SettingDef(
         key="telegram_draft_streaming",
@@ -265,6 +516,134 @@ SETTINGS_REGISTRY: List[SettingDef] = [
         default=False,
         group="output",
     ),
+    SettingDef(
+        key="telegram_raw_first_delivery",
+        label="Trascrizione grezza immediata",
+        description=(
+            "Mostra subito la trascrizione grezza nel messaggio di "
+            "avanzamento e la sostituisce con il testo rielaborato al "
+            "termine del refinement. Se il refinement fallisce, il testo "
+            "grezzo resta visibile con un'etichetta."
+        ),
+        type="boolean",
+        default=False,
+        group="output",
+    ),
+    # ------ Pipeline stages ------
+    SettingDef(
+        key="pipeline_stage_download_concurrency",
+        label="Concorrenza download",
+        description="Download audio da Telegram simultanei.",
+        type="integer",
+        default=6,
+        min_value=1,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="pipeline_stage_convert_concurrency",
+        label="Concorrenza conversione",
+        description=(
+            "Conversioni FFmpeg simultanee (fase CPU-bound). 0 = una per core; "
+            "valori oltre il numero di core vengono limitati. I core sono "
+            "divisi tra le conversioni con -threads."
+        ),
+        type="integer",
+        default=0,
+        min_value=0,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="conversion_backend",
+        label="Motore di conversione",
+        description=(
+            "ffmpeg: un processo FFmpeg per file. pyav: decodifica e "
+            "ricodifica nel processo del bot tramite PyAV (pacchetto 'av'), "
+            "evitando l'avvio di FFmpeg per le note brevi; se PyAV manca o "
+            "fallisce si usa FFmpeg."
+        ),
+        type="enum",
+        default="ffmpeg",
+        enum_values=["ffmpeg", "pyav"],
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="conversion_nice",
+        label="Priorità conversione (nice)",
+        description=(
+            "Abbassa la priorità dei processi FFmpeg (0 = invariata, 19 = "
+            "minima) per mantenere reattivi Telegram e l'interfaccia web "
+            "quando le conversioni saturano la CPU."
+        ),
+        type="integer",
+        default=0,
+        min_value=0,
+        max_value=19,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="pipeline_stage_transcribe_concurrency",
+        label="Concorrenza trascrizione",
+        description="Chiamate di trascrizione simultanee verso il provider.",
+        type="integer",
+        default=6,
+        min_value=1,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="pipeline_stage_refine_concurrency",
+        label="Concorrenza rielaborazione",
+        description="Chiamate di rielaborazione simultanee verso il provider.",
+        type="integer",
+        default=6,
+        min_value=1,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="pipeline_stage_deliver_concurrency",
+        label="Concorrenza invio",
+        description="Invii della risposta a Telegram simultanei.",
+        type="integer",
+        default=6,
+        min_value=1,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="pipeline_stage_queue_size",
+        label="Coda di ingresso",
+        description=(
+            "Richieste che possono attendere il download quando è saturo; "
+            "oltre questo limite la richiesta viene rifiutata. Le fasi "
+            "successive fanno attendere le richieste senza rifiutarle."
+        ),
+        type="integer",
+        default=20,
+        min_value=0,
+        group="pipeline_stages",
+        requires_reload=True,
+    ),
+    SettingDef(
+        key="audio_conversion_profiles",
+        label="Profili di conversione audio",
+        description=(
+            "Parametri FFmpeg per tipo di adapter di trascrizione, in JSON "
+            "(codec, sample_rate, channels, bitrate, threads). Gli adapter "
+            "non elencati usano MP3 44,1 kHz stereo a 192 kbps. Il comando "
+            "'python -m bot.bench.ffmpeg_profiles --save' li misura e li "
+            "salva qui."
+        ),
+        type="text",
+        default="",
+        group="pipeline_stages",
+        requires_reload=True,
+        placeholder='{"gemini-native": {"codec": "opus", "sample_rate": 16000, "channels": 1, "bitrate": "32k"}}',
+    ),
     # ------ Infrastructure ------
     SettingDef(
         key="audio_cleanup_on_startup",
@@ -275,6 +654,19 @@ SETTINGS_REGISTRY: List[SettingDef] = [
         scope="infrastructure",
         group="infrastructure",
     ),
+    SettingDef(
+        key="pipeline_dispatch_enabled",
+        label="Elaborazione su processi worker",
+        description=(
+            "Il bot accoda gli audio nel database e li lascia elaborare ai "
+            "processi avviati con 'python -m bot.workers'."
+        ),
+        type="boolean",
+        default=False,
+        scope="infrastructure",
+        group="infrastructure",
+        requires_reload=True,
+    ),
 ]
 
 
@@ -390,6 +782,16 @@ def _validate(sd: SettingDef, value: str) -> List[str]:
             errors.append(
                 f"{sd.label} deve contenere il placeholder {{{{raw_text}}}}."
             )
+        elif sd.key == "audio_conversion_profiles":
+            try:
+                parse_profile_map(value)
+            except ValueError as e:
+                errors.append(f"{sd.label} non valido: {e}.")
+        elif sd.key == "admission_duration_tiers":
+            try:
+                parse_duration_tiers(value)
+            except ValueError as e:
+                errors.append(f"{sd.label} non valido: {e}.")
 
     return errors
 
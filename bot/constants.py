@@ -36,8 +36,10 @@ MSG_ERROR_INTERNAL = "❌ Errore interno durante l'elaborazione."
 # Progress messages
 MSG_PROGRESS_DOWNLOAD = "⬇️ Download audio"
 MSG_PROGRESS_CONVERT = "🔄 Conversione MP3"
+MSG_PROGRESS_WAITING_TURN = "⏳ Audio pronto, in attesa del turno"
 MSG_PROGRESS_TRANSCRIBE = "🎧 Trascrizione audio"
 MSG_PROGRESS_REFINE = "✍️ Rielaborazione testo"
+MSG_PROGRESS_SINGLE_PASS = "🎧 Trascrizione e rielaborazione audio"
 MSG_PROGRESS_FINALIZING = "🎯 Finalizzazione"
 
 # Timeout messages
@@ -45,12 +47,16 @@ MSG_TIMEOUT_DOWNLOAD = "⏰ Download troppo lento, riprova con file più piccoli
 MSG_TIMEOUT_CONVERT = "⏰ Conversione audio bloccata, contatta l'admin"
 MSG_TIMEOUT_TRANSCRIBE = "⏰ Server LLM occupato, riprova tra pochi secondi"
 MSG_TIMEOUT_REFINE = "⏰ Rielaborazione lenta, riprova più tardi"
+MSG_TIMEOUT_SINGLE_PASS = "⏰ Elaborazione audio lenta, riprova più tardi"
 
 # Error messages per fase
 MSG_ERROR_DOWNLOAD = "❌ Errore nel download audio"
 MSG_ERROR_CONVERT = "❌ Errore conversione MP3"
 MSG_ERROR_TRANSCRIBE = "❌ Errore trascrizione audio"
 MSG_ERROR_REFINE = "❌ Errore rielaborazione testo"
+MSG_ERROR_SINGLE_PASS = "❌ Errore elaborazione audio"
+MSG_PROVIDER_BUSY = "⏳ Il provider AI ha troppe richieste in corso. Riprova tra poco."
+MSG_PROVIDER_RATE_LIMITED = "⏳ Il provider AI ha raggiunto il limite di richieste al minuto. Riprova tra poco."
 MSG_PROVIDER_TEMPORARILY_UNAVAILABLE = "⏳ Il provider AI è temporaneamente non disponibile. Riprova tra poco."
 
 # Progress configuration
@@ -68,7 +74,50 @@ PROGRESS_TIMEOUTS = {
     "refine": 90         # 90 secondi max
 }
 
+# Single-pass plans (audio → refined text in one provider call) get the
+# transcribe and refine budgets combined.  Not part of PROGRESS_TIMEOUTS so
+# the stale-job threshold below keeps counting each stage once.
+SINGLE_PASS_TIMEOUT_SECONDS = PROGRESS_TIMEOUTS["transcribe"] + PROGRESS_TIMEOUTS["refine"]
+
+# Gemini audio input.  Files up to this size go inline in generate_content
+# (the request limit is 20 MB and inline data is base64-encoded); larger
+# ones go through the Files API, polled with backoff while PROCESSING.
+GEMINI_INLINE_AUDIO_MAX_BYTES = 14 * 1024 * 1024
+GEMINI_FILE_POLL_INITIAL_SECONDS = 0.25
+GEMINI_FILE_POLL_MAX_SECONDS = 2.0
+GEMINI_FILE_DELETE_TIMEOUT_SECONDS = 10
+
+# Local Whisper servers (bot.adapters.local_whisper).  One keep-alive HTTP
+# client per server is shared by the per-request adapters; idle sockets
+# are closed after LOCAL_WHISPER_KEEPALIVE_EXPIRY_SECONDS.
+LOCAL_WHISPER_DEFAULT_ENDPOINT = "http://localhost:8000/v1"
+LOCAL_WHISPER_DEFAULT_MODEL = "whisper-1"
+LOCAL_WHISPER_RESPONSE_FORMATS = ("json", "verbose_json", "text")
+LOCAL_WHISPER_MAX_KEEPALIVE = 4
+LOCAL_WHISPER_KEEPALIVE_EXPIRY_SECONDS = 60
+LOCAL_WHISPER_CONNECT_TIMEOUT_SECONDS = 5
+LOCAL_WHISPER_HEALTH_TIMEOUT_SECONDS = 5
+
+# Worker-process dispatch (bot.workers)
+MSG_PIPELINE_JOB_QUEUED = "⏳ Audio ricevuto, in attesa di un worker…"
+PIPELINE_WORKER_POLL_SECONDS = 0.5
+PIPELINE_DISPATCH_POLL_SECONDS = 1.0
+# Workers refresh the claim of each running job this often; a job whose
+# claim was not refreshed for five intervals lost its worker.
+PIPELINE_JOB_HEARTBEAT_SECONDS = 30
+PIPELINE_JOB_STALE_SECONDS = 5 * PIPELINE_JOB_HEARTBEAT_SECONDS
+PIPELINE_JOB_MAX_ATTEMPTS = 2
+# Jobs claimed and run at once by one worker process.
+PIPELINE_WORKER_CONCURRENCY = 4
+# Delivered job rows are deleted after a day, checked hourly.
+PIPELINE_JOB_RETENTION_SECONDS = 24 * 3600
+PIPELINE_JOB_PRUNE_INTERVAL_SECONDS = 3600
+
 MSG_COMPLETION_HEADER = "📝 Trascrizione Completata\n🤖 Modello: {model_name}"
+MSG_RAW_TRANSCRIPT_HEADER = "🎧 Trascrizione grezza\n✍️ Rielaborazione in corso…"
+MSG_RAW_TRANSCRIPT_UNREFINED_HEADER = (
+    "🎧 Trascrizione grezza\n⚠️ Rielaborazione non riuscita, testo non rielaborato."
+)
 
 # Success Messages
 def msg_user_added(uid): return f"✅ Utente {uid} aggiunto."
@@ -92,6 +141,14 @@ DEFAULT_PROMPT_REFINE_TEMPLATE = (
     "Testo originale:\n{raw_text}\n\nTesto rielaborato:\n"
 )
 
+DEFAULT_PROMPT_SINGLE_PASS = (
+    "Trascrivi questo audio e rielabora il testo: correggi gli errori, aggiungi la "
+    "punteggiatura, rendi adatte a un testo scritto eventuali esitazioni e ripetizioni, "
+    "ma rimani il più aderente possibile a quanto detto.\n"
+    "IMPORTANTE: Restituisci SOLO il testo rielaborato. NON aggiungere commenti introduttivi, "
+    "premesse o saluti."
+)
+
 # Rate limiting messages
 MSG_CONCURRENT_LIMIT = "⏳ Troppe richieste simultanee. Max {max_concurrent} audio alla volta."
 MSG_COOLDOWN = "⏳ Attendi ancora {seconds}s prima di inviare un altro audio."
@@ -100,6 +157,8 @@ MSG_QUEUE_ACCEPTED = "⏳ Il bot è occupato. Richiesta accodata (posizione {pos
 MSG_QUEUE_FULL = "⏳ Coda piena. Riprova tra poco."
 MSG_ALREADY_QUEUED = "⏳ Hai già una richiesta in coda. Attendi il tuo turno."
 MSG_FILE_TOO_LARGE = "❌ File troppo grande. Max {max_size}MB."
+MSG_AUDIO_TOO_LONG = "❌ Audio troppo lungo ({duration}). Durata massima: {max_duration}."
+MSG_UNSUPPORTED_FORMAT = "❌ Formato .{extension} non supportato. Formati accettati: {allowed}."
 
 # Rate limit defaults
 RATE_LIMIT_DEFAULTS = {
@@ -112,15 +171,94 @@ RATE_LIMIT_DEFAULTS = {
     "max_queued_per_user": 1,
 }
 
+# Adaptive (AIMD) global concurrency limit — see rate_limiter.AdaptiveConcurrencyLimit
+ADAPTIVE_CONCURRENCY_DEFAULTS = {
+    "adaptive_enabled": 0,
+    "adaptive_min": 1,
+    "adaptive_max": 20,
+}
+ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE = 2.0  # smoothed / baseline latency ratio
+ADAPTIVE_CONCURRENCY_BACKOFF_RATIO = 0.75
+ADAPTIVE_CONCURRENCY_DECREASE_COOLDOWN_SECONDS = 10
+
+# Download/convert ahead of the queue turn — see rate_limiter.PreparationBudget
+PREPARATION_DEFAULTS = {
+    "prepare_max_jobs": 4,
+    "prepare_max_mb": 200,
+}
+
 PROVIDER_RESILIENCE_DEFAULTS = {
     "enabled": 1,
     "failure_threshold": 3,
     "cooldown_seconds": 60,
 }
 
+# Provider call retries — see bot.retry.RetryPolicy
+PROVIDER_RETRY_DEFAULTS = {
+    "retry_enabled": 1,
+    "retry_max_attempts": 3,
+    "retry_budget_percent": 20,
+}
+PROVIDER_RETRY_BASE_DELAY_SECONDS = 0.2
+# Longest pause between attempts; a longer Retry-After hands the request to
+# the fallback model / circuit breaker instead of waiting.
+PROVIDER_RETRY_MAX_DELAY_SECONDS = 5.0
+# Retries that may be spent at once before the budget has to refill.
+PROVIDER_RETRY_BUDGET_BURST = 10
+
+# Client-side RPM/TPM budgets per provider connection — see providers.ProviderRateBudget
+# Longest wait for budget before the call fails over to a fallback model.
+PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS = 10.0
+# Refine pre-charge: ~4 characters per token, the answer about as long as the
+# transcript, plus the fixed system/instruction prompt.
+PROVIDER_TOKENS_PER_CHAR = 0.25
+PROVIDER_REFINE_PROMPT_TOKENS = 200
+
+# Hedged requests across fallback models — see bot.hedging.HedgingPolicy
+PROVIDER_HEDGING_DEFAULTS = {
+    "hedging_enabled": 0,
+    "hedging_percentile": 95,
+    "hedging_budget_percent": 10,
+}
+PROVIDER_HEDGING_MIN_SAMPLES = 20
+# Latency/health-aware provider ranking — see providers.EndpointHealth
+PROVIDER_HEALTH_EWMA_ALPHA = 0.2
+PROVIDER_HEALTH_ERROR_HALF_LIFE_SECONDS = 300
+# Candidates whose expected completion time is within this factor of the
+# fastest are considered tied and ordered by admin priority.
+PROVIDER_RANKING_TIE_RATIO = 1.2
+PROVIDER_HEDGING_WINDOW = 200
+
 TELEGRAM_PROGRESSIVE_OUTPUT_DEFAULTS = {
     "enabled": 0,
+    "raw_first": 0,
 }
 
+# Staged pipeline engine: per-stage concurrency and shared waiting-queue bound.
+# Conversion is CPU-bound (FFmpeg; 0 = one process per core, see
+# bot.conversion), the other stages wait on the network.
+PIPELINE_STAGE_DEFAULTS = {
+    "download": 6,
+    "convert": 0,
+    "transcribe": 6,
+    "refine": 6,
+    "deliver": 6,
+    "queue_size": 20,
+}
+# Requests kept per stage for the p95 wait/service times in the health report.
+PIPELINE_STAGE_STATS_WINDOW = 200
+
+TELEGRAM_BOT_API_DEFAULTS = {
+    "base_url": "",
+    "local_mode": 0,
+    # Working directory of the ``--local`` server as mounted in this process.
+    "files_dir": "",
+}
+
+# getFile limits: the cloud Bot API serves files up to 20 MB, a local
+# ``telegram-bot-api`` server started with ``--local`` up to 2000 MB.
+TELEGRAM_CLOUD_MAX_FILE_SIZE_MB = 20
+TELEGRAM_LOCAL_MAX_FILE_SIZE_MB = 2000
+
 # Configuration
 MAX_MESSAGE_LENGTH = 4000
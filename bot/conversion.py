@@ -0,0 +1,271 @@
+"""
+Machine-sized pool for the CPU-bound FFmpeg conversions.
+
+FFmpeg competes for CPU: more concurrent encoders than cores, each free to
+start one thread per core, only makes every conversion slower.  The
+:class:`ConversionPool` fixes how many conversions the ``convert`` stage of
+the staged pipeline engine runs at once (at most the core count, and the
+core count when ``pipeline_stage_convert_concurrency`` is ``0``) and gives
+each FFmpeg process an explicit ``-threads`` share of the cores.  With
+``conversion_nice`` > 0 FFmpeg runs at a lower scheduling priority, so the
+event loop serving Telegram and the web UI keeps its CPU time while
+conversions saturate the machine.
+
+The ``conversion_backend`` setting selects how a file is converted:
+
+``ffmpeg``
+    one ``ffmpeg`` subprocess per file (:func:`bot.utils.convert_to_mp3`).
+``pyav``
+    decode, resample and re-encode in-process through the libav bindings of
+    PyAV (``pip install av``), on a thread pool of the pool's size.  This
+    skips process startup, codec probing and pipe setup, which dominate
+    the conversion of short voice notes.  When PyAV is missing or fails on
+    a file, the subprocess path is used instead.  Conversions with
+    :class:`~bot.audio_profiles.AudioPreprocessing` filters always use
+    the subprocess.
+
+The pool is application-scoped (``Application.bot_data['conversion_pool']``);
+queue and run time of the conversions are reported by the ``convert``
+stage in ``RuntimeManager.get_health()``.  ``bot.workers`` builds one pool
+per worker process, splitting the cores between the processes.
+``python -m bot.bench.conversion_backends`` compares the two backends on
+short notes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, Optional
+
+from bot import utils
+from bot.audio_profiles import (
+    CODECS,
+    DEFAULT_AUDIO_PROFILE,
+    LOSSLESS_CODECS,
+    AudioPreprocessing,
+    AudioProfile,
+)
+from bot.utils import ConversionResult
+
+try:
+    import av
+except ImportError:  # pragma: no cover - optional dependency
+    av = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+MAX_NICE = 19
+CONVERSION_BACKENDS = ("ffmpeg", "pyav")
+
+
+class ConversionCancelled(Exception):
+    """Raised inside an in-process conversion whose caller went away."""
+
+
+def available_cpus() -> int:
+    """Cores this process may run on (CPU affinity aware)."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def transcode_in_process(
+    src_path: str,
+    dst_path: str,
+    profile: AudioProfile,
+    cancelled: threading.Event | None = None,
+) -> ConversionResult:
+    """Convert *src_path* to *dst_path* with PyAV, in the calling thread.
+
+    Produces the same stream as the FFmpeg subprocess for *profile* (first
+    audio stream, resampled to the profile's rate and channel layout) and
+    returns the decoded and encoded durations.  Setting *cancelled* stops
+    the conversion at the next frame and removes the partial output.
+    """
+    if av is None:
+        raise RuntimeError("PyAV is not installed")
+    layout = "mono" if profile.channels == 1 else "stereo"
+    input_seconds = 0.0
+    output_samples = 0
+    try:
+        with av.open(src_path) as source, av.open(dst_path, "w") as target:
+            in_stream = source.streams.audio[0]
+            out_stream = target.add_stream(CODECS[profile.codec][0], rate=profile.sample_rate)
+            out_stream.codec_context.layout = layout
+            if profile.bitrate and profile.codec not in LOSSLESS_CODECS:
+                out_stream.codec_context.bit_rate = int(profile.bitrate[:-1]) * 1000
+            if profile.threads:
+                out_stream.codec_context.thread_count = profile.threads
+            resampler = av.AudioResampler(
+                format=out_stream.codec_context.format.name,
+                layout=layout,
+                rate=profile.sample_rate,
+            )
+            for frame in source.decode(in_stream):
+                if cancelled is not None and cancelled.is_set():
+                    raise ConversionCancelled(dst_path)
+                input_seconds += frame.samples / frame.sample_rate
+                for resampled in resampler.resample(frame):
+                    output_samples += resampled.samples
+                    target.mux(out_stream.encode(resampled))
+            for resampled in resampler.resample(None):
+                output_samples += resampled.samples
+                target.mux(out_stream.encode(resampled))
+            target.mux(out_stream.encode(None))
+    except BaseException:
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        raise
+    return ConversionResult(
+        input_seconds=round(input_seconds, 2),
+        output_seconds=round(output_samples / profile.sample_rate, 2),
+    )
+
+
+def _lower_thread_priority(nice: int) -> None:
+    """Executor initializer: renice the conversion thread itself (Linux)."""
+    if nice:
+        utils._lower_priority(threading.get_native_id(), nice)
+
+
+class ConversionPool:
+    """Process cap, thread split and priority of the FFmpeg conversions.
+
+    Parameters
+    ----------
+    processes:
+        Concurrent conversions; ``0`` means one per core.  Values above
+        the core count are capped.
+    nice:
+        ``nice`` increment applied to every FFmpeg process (0-19).
+    threads:
+        ``-threads`` per conversion; ``0`` splits the cores evenly across
+        *processes*.
+    cpu_count:
+        Cores to size for (default: :func:`available_cpus`).
+    backend:
+        One of :data:`CONVERSION_BACKENDS`; ``pyav`` falls back to
+        ``ffmpeg`` when PyAV is not installed.
+    """
+
+    def __init__(
+        self,
+        processes: int = 0,
+        nice: int = 0,
+        threads: int = 0,
+        cpu_count: Optional[int] = None,
+        backend: str = "ffmpeg",
+    ):
+        self.cpu_count = max(1, int(cpu_count or available_cpus()))
+        requested = int(processes) or self.cpu_count
+        self.processes = max(1, min(requested, self.cpu_count))
+        self.threads = int(threads) or max(1, self.cpu_count // self.processes)
+        self.nice = max(0, min(int(nice), MAX_NICE))
+        if requested > self.processes:
+            logger.warning(
+                "Conversion concurrency capped at core count | requested=%s cores=%s",
+                requested,
+                self.cpu_count,
+            )
+        if backend not in CONVERSION_BACKENDS:
+            raise ValueError(f"Unknown conversion backend: {backend}")
+        if backend == "pyav" and av is None:
+            logger.warning("PyAV not installed, converting with the FFmpeg subprocess")
+            backend = "ffmpeg"
+        self.backend = backend
+        self.in_process = 0
+        self.fallbacks = 0
+        self.audio_seconds_in = 0.0
+        self.audio_seconds_out = 0.0
+        self._executor: ThreadPoolExecutor | None = None
+
+    def tune(self, profile: AudioProfile | None) -> AudioProfile:
+        """Return *profile* with the pool's thread share unless it sets its own."""
+        profile = profile or DEFAULT_AUDIO_PROFILE
+        if profile.threads:
+            return profile
+        return replace(profile, threads=min(self.threads, 64))
+
+    async def convert(
+        self,
+        src_path: str,
+        dst_path: str,
+        profile: AudioProfile | None = None,
+        preprocessing: AudioPreprocessing | None = None,
+    ) -> ConversionResult:
+        """Convert with the pool's backend, threads and priority.
+
+        An in-process conversion that fails is retried once through the
+        FFmpeg subprocess, which raises :class:`~bot.exceptions.ConvertError`.
+        Returns the audio duration before and after the conversion.
+        """
+        tuned = self.tune(profile)
+        if self.backend == "pyav" and not (preprocessing and preprocessing.enabled):
+            try:
+                result = await self._convert_in_process(src_path, dst_path, tuned)
+                self.in_process += 1
+                return self._record(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.fallbacks += 1
+                logger.warning(
+                    "In-process conversion failed, using FFmpeg | src=%s error=%s", src_path, e
+                )
+        result = await utils.convert_to_mp3(
+            src_path, dst_path, tuned, nice=self.nice, preprocessing=preprocessing
+        )
+        return self._record(result)
+
+    def _record(self, result: ConversionResult | None) -> ConversionResult | None:
+        if result is not None and result.removed_seconds is not None:
+            self.audio_seconds_in += result.input_seconds
+            self.audio_seconds_out += result.output_seconds
+        return result
+
+    async def _convert_in_process(
+        self, src_path: str, dst_path: str, profile: AudioProfile
+    ) -> ConversionResult:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.processes,
+                thread_name_prefix="conversion",
+                initializer=_lower_thread_priority,
+                initargs=(self.nice,),
+            )
+        cancelled = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, transcode_in_process, src_path, dst_path, profile, cancelled
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted: ask it to stop at the next
+            # frame so it does not write the file after cleanup.
+            cancelled.set()
+            raise
+
+    def close(self) -> None:
+        """Release the in-process conversion threads (idle ones exit at once)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "cpu_count": self.cpu_count,
+            "processes": self.processes,
+            "threads_per_process": self.threads,
+            "nice": self.nice,
+            "in_process": self.in_process,
+            "fallbacks": self.fallbacks,
+            "audio_seconds_in": round(self.audio_seconds_in, 1),
+            "audio_seconds_out": round(self.audio_seconds_out, 1),
+        }
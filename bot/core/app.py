@@ -8,8 +8,11 @@ import logging
 from typing import List
 
 from telegram import BotCommand
+from telegram.request import BaseRequest
 from telegram.ext import Application, ApplicationBuilder, CommandHandler, MessageHandler, filters, ContextTypes
 
+from bot import constants as c
+from bot.admission import MetadataAdmission
 from bot.config_service import ConfigService
 from bot.database import DatabaseManager
 from bot.database.secret_store import SecretStore
@@ -18,10 +21,15 @@ from bot.runtime import RuntimeSnapshot
 from bot.state import StateChecker
 from bot.handlers.admin import WhitelistManager, adduser, removeuser, addgroup, removegroup
 from bot.handlers.audio import AudioProcessor, handle_audio
+from bot.hedging import HedgingPolicy
+from bot.retry import RetryPolicy
 from bot.pipeline_resolver import PipelineResolver
-from bot.utils import ProviderComponents, create_provider_components
-from bot.rate_limiter import RateLimiter
+from bot.conversion import ConversionPool
+from bot.pipeline_stages import StagedPipelineEngine
+from bot.utils import ProviderComponents, create_provider_components, local_bot_api_files_dir
+from bot.rate_limiter import AdaptiveConcurrencyLimit, PreparationBudget, RateLimiter
 from bot.ui.streaming import TelegramDeliveryAdapter
+from bot.workers import JobDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +46,55 @@ async def cleanup_rate_limiter_job(context: ContextTypes.DEFAULT_TYPE) -> None:
         logger.error(f"Error in rate limiter cleanup job: {e}")
 
 
+def configure_bot_api_server(builder: ApplicationBuilder, bot_api_config: dict) -> ApplicationBuilder:
+    """Point *builder* at a self-hosted Bot API server when one is configured."""
+    base_url = (bot_api_config.get("base_url") or "").rstrip("/")
+    if not base_url:
+        return builder
+
+    local_mode = bool(bot_api_config.get("local_mode"))
+    logger.info("Using local Bot API server | base_url=%s local_mode=%s", base_url, local_mode)
+    return (
+        builder
+        .base_url(f"{base_url}/bot")
+        .base_file_url(f"{base_url}/file/bot")
+        .local_mode(local_mode)
+    )
+
+
+def effective_max_file_size_mb(configured_mb: int, bot_api_config: dict) -> int:
+    """Clamp the configured file-size limit to what ``getFile`` can serve."""
+    ceiling = (
+        c.TELEGRAM_LOCAL_MAX_FILE_SIZE_MB
+        if bot_api_config.get("base_url") and bot_api_config.get("local_mode")
+        else c.TELEGRAM_CLOUD_MAX_FILE_SIZE_MB
+    )
+    if configured_mb > ceiling:
+        logger.warning(
+            "max_file_size_mb=%s exceeds the Bot API limit; clamping to %s",
+            configured_mb,
+            ceiling,
+        )
+        return ceiling
+    return configured_mb
+
+
+def _build_adaptive_limit(rate_limit_config: dict) -> AdaptiveConcurrencyLimit | None:
+    """Return the AIMD controller when the adaptive global limit is enabled.
+
+    ``max_concurrent_global`` becomes the starting point, clamped to the
+    configured bounds.
+    """
+    if not rate_limit_config.get("adaptive_enabled"):
+        return None
+    defaults = c.ADAPTIVE_CONCURRENCY_DEFAULTS
+    return AdaptiveConcurrencyLimit(
+        initial=rate_limit_config["max_concurrent_global"],
+        min_limit=rate_limit_config.get("adaptive_min", defaults["adaptive_min"]),
+        max_limit=rate_limit_config.get("adaptive_max", defaults["adaptive_max"]),
+    )
+
+
 def create_application(
     token: str,
     config,
@@ -45,6 +102,7 @@ def create_application(
     secret_store: SecretStore | None = None,
     config_service: ConfigService | None = None,
     state_checker: StateChecker | None = None,
+    bot_request: BaseRequest | None = None,
 ) -> Application:
     """
     Create and configure the Telegram application.
@@ -54,6 +112,8 @@ def create_application(
         config: Bot configuration object (may be ``None`` after A7).
         database_manager: Optional unified database manager (A1).
         secret_store: Optional secret store for at-rest encryption (A2).
+        bot_request: Optional transport for Bot API calls (used by the
+            load-test harness to answer them without a network).
 
     Returns:
         Configured Application instance
@@ -76,16 +136,6 @@ def create_application(
         except Exception as e:
             logger.error(f"Failed to setup bot commands: {e}")
 
-    # Build application
-    # Enable concurrent updates to allow parallel processing of messages
-    app = (
-        ApplicationBuilder()
-        .token(token)
-        .concurrent_updates(True)
-        .post_init(_post_init)
-        .build()
-    )
-    
     # Build the runtime configuration snapshot (A4.1).
     # When ConfigService is available, use it to resolve settings (with
     # fallback to the legacy Config for values not yet migrated).
@@ -95,13 +145,30 @@ def create_application(
             snapshot = RuntimeSnapshot.from_config_service(config_service, config)
         else:
             snapshot = RuntimeSnapshot.from_legacy_config(config)
-        app.bot_data['runtime_snapshot'] = snapshot
     except Exception:
         logger.warning("Could not build RuntimeSnapshot; falling back to Config")
         snapshot = config  # type: ignore[assignment]
 
+    bot_api_config = getattr(snapshot, "telegram_bot_api_config", None) or {}
+
+    # Build application
+    # Enable concurrent updates to allow parallel processing of messages
+    builder = (
+        ApplicationBuilder()
+        .token(token)
+        .concurrent_updates(True)
+        .post_init(_post_init)
+    )
+    builder = configure_bot_api_server(builder, bot_api_config)
+    if bot_request is not None:
+        builder = builder.request(bot_request)
+    app = builder.build()
+    if isinstance(snapshot, RuntimeSnapshot):
+        app.bot_data['runtime_snapshot'] = snapshot
+
     # Store config in bot_data for global access (singleton pattern)
     app.bot_data['config'] = config
+    app.bot_data['local_bot_api_files_dir'] = local_bot_api_files_dir(bot_api_config)
     if database_manager is not None:
         app.bot_data['database_manager'] = database_manager
     if secret_store is not None:
@@ -113,7 +180,11 @@ def create_application(
 
     # P4 — Automatic pipeline resolver.
     if database_manager is not None:
-        resolver = PipelineResolver(database_manager)
+        resolver = PipelineResolver(
+            database_manager,
+            hedging=HedgingPolicy.from_config(snapshot.provider_resilience_config),
+            retry=RetryPolicy.from_config(snapshot.provider_resilience_config),
+        )
         app.bot_data['pipeline_resolver'] = resolver
 
     # WhitelistManager: use the unified database when available (A4.1).
@@ -122,6 +193,14 @@ def create_application(
     )
 
     # Runtime objects built from the snapshot (A4.1).
+    stage_config = dict(getattr(snapshot, "pipeline_stage_config", None) or {})
+    conversion_pool = ConversionPool(
+        processes=stage_config.get("convert", c.PIPELINE_STAGE_DEFAULTS["convert"]),
+        nice=getattr(snapshot, "conversion_nice", 0),
+        backend=getattr(snapshot, "conversion_backend", "ffmpeg"),
+    )
+    app.bot_data['conversion_pool'] = conversion_pool
+
     # P1 — prefer separate Transcriber + TextProcessor components
     # when available (all current providers support both).
     if config is not None:
@@ -133,34 +212,66 @@ def create_application(
                 text_processor=components.text_processor,
                 provider_name=components.provider_name,
                 model_name=components.model_name,
+                conversion_pool=conversion_pool,
             )
         except Exception:
             logger.warning("Falling back to legacy AudioProcessor")
-            app.bot_data['audio_processor'] = AudioProcessor(config)
+            app.bot_data['audio_processor'] = AudioProcessor(
+                config, conversion_pool=conversion_pool
+            )
     else:
         # No Config available — create a minimal AudioProcessor; actual
         # providers will be resolved per-request by the PipelineResolver.
-        app.bot_data['audio_processor'] = AudioProcessor.__new__(AudioProcessor)
-        app.bot_data['audio_processor'].config = snapshot
-        app.bot_data['audio_processor']._transcriber = None
-        app.bot_data['audio_processor']._text_processor = None
-        app.bot_data['audio_processor']._model_name_override = None
-        app.bot_data['audio_processor'].provider = object()
-        app.bot_data['audio_processor']._provider_name = snapshot.provider_name or "unknown"
+        app.bot_data['audio_processor'] = AudioProcessor.unresolved(
+            snapshot,
+            provider_name=snapshot.provider_name,
+            conversion_pool=conversion_pool,
+        )
 
     app.bot_data['delivery_adapter'] = TelegramDeliveryAdapter(
         progressive_enabled=snapshot.telegram_progressive_output_config["enabled"],
+        raw_first_enabled=snapshot.telegram_progressive_output_config.get("raw_first", False),
+    )
+    app.bot_data['audio_profiles'] = dict(getattr(snapshot, "audio_profiles", None) or {})
+    app.bot_data['stage_engine'] = StagedPipelineEngine(
+        {**stage_config, "convert": conversion_pool.processes}
+    )
+    app.bot_data['metadata_admission'] = MetadataAdmission.from_config(
+        getattr(snapshot, "admission_config", None) or {}
     )
     app.bot_data['rate_limiter'] = RateLimiter(
         max_per_user=snapshot.rate_limit_config["max_per_user"],
         cooldown=snapshot.rate_limit_config["cooldown_seconds"],
         max_global=snapshot.rate_limit_config["max_concurrent_global"],
-        max_file_size_mb=snapshot.rate_limit_config["max_file_size_mb"],
+        max_file_size_mb=effective_max_file_size_mb(
+            snapshot.rate_limit_config["max_file_size_mb"], bot_api_config,
+        ),
         queue_enabled=snapshot.rate_limit_config["queue_enabled"],
         max_queue_size=snapshot.rate_limit_config["max_queue_size"],
         max_queued_per_user=snapshot.rate_limit_config["max_queued_per_user"],
+        adaptive=_build_adaptive_limit(snapshot.rate_limit_config),
+    )
+    preparation_defaults = c.PREPARATION_DEFAULTS
+    app.bot_data['preparation_budget'] = PreparationBudget(
+        max_jobs=snapshot.rate_limit_config.get(
+            "prepare_max_jobs", preparation_defaults["prepare_max_jobs"]
+        ),
+        max_mb=snapshot.rate_limit_config.get(
+            "prepare_max_mb", preparation_defaults["prepare_max_mb"]
+        ),
     )
     
+    # Worker-process mode: the bot only queues jobs for `python -m bot.workers`.
+    dispatcher = None
+    if getattr(snapshot, "pipeline_dispatch_enabled", False):
+        if database_manager is not None:
+            dispatcher = JobDispatcher.from_rate_limits(
+                database_manager, snapshot.rate_limit_config
+            )
+            app.bot_data['job_dispatcher'] = dispatcher
+        else:
+            logger.warning("Pipeline dispatch requires the application database; running in-process")
+
     # Register handlers
     register_handlers(app)
     
@@ -169,6 +280,14 @@ def create_application(
         # Run cleanup every hour (3600s), starting after 1 minute (60s)
         app.job_queue.run_repeating(cleanup_rate_limiter_job, interval=3600, first=60)
         logger.info("Rate limiter cleanup job scheduled")
+        if dispatcher is not None:
+            app.job_queue.run_repeating(
+                dispatcher.poll, interval=c.PIPELINE_DISPATCH_POLL_SECONDS, first=1,
+            )
+            app.job_queue.run_repeating(
+                dispatcher.prune, interval=c.PIPELINE_JOB_PRUNE_INTERVAL_SECONDS, first=60,
+            )
+            logger.info("Pipeline job dispatcher scheduled")
     
     return app
 
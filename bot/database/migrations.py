@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from typing import Callable, List
 
 from bot.database.schema import (
+    PIPELINE_JOBS,
+    PIPELINE_JOBS_STATUS_INDEX,
     PIPELINE_STAGE_FALLBACKS,
     PIPELINE_STAGES,
     PROVIDER_MODELS,
@@ -106,6 +108,49 @@ def _migration_002_provider_models_and_pipeline_stages(conn: sqlite3.Connection)
     logger.info("Applied migration 002: provider_models + pipeline stages")
 
 
+def _migration_003_pipeline_jobs(conn: sqlite3.Connection) -> None:
+    """Add the pipeline_jobs table used to hand audio jobs to worker processes."""
+    conn.execute(PIPELINE_JOBS)
+    conn.execute(PIPELINE_JOBS_STATUS_INDEX)
+    logger.info("Applied migration 003: pipeline_jobs")
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column_ddl: str) -> None:
+    try:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column_ddl}")
+    except sqlite3.OperationalError as e:
+        # Column may already exist if schema was created with it.
+        if "duplicate column" not in str(e).lower():
+            raise
+
+
+def _migration_004_provider_bulkheads(conn: sqlite3.Connection) -> None:
+    """Add per-provider and per-model concurrency limits (0 = unlimited)."""
+    _add_column(conn, "provider_connections", "max_concurrent INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, "provider_connections", "max_queued INTEGER NOT NULL DEFAULT 20")
+    _add_column(conn, "provider_models", "max_concurrent INTEGER NOT NULL DEFAULT 0")
+    logger.info("Applied migration 004: provider bulkhead limits")
+
+
+def _migration_005_provider_priority(conn: sqlite3.Connection) -> None:
+    """Add the admin-pinned provider priority used to break ranking ties."""
+    _add_column(conn, "provider_connections", "priority INTEGER NOT NULL DEFAULT 0")
+    logger.info("Applied migration 005: provider priority")
+
+
+def _migration_006_provider_rate_limits(conn: sqlite3.Connection) -> None:
+    """Add per-provider requests/tokens-per-minute budgets (0 = unlimited)."""
+    _add_column(conn, "provider_connections", "rpm_limit INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, "provider_connections", "tpm_limit INTEGER NOT NULL DEFAULT 0")
+    logger.info("Applied migration 006: provider rate limits")
+
+
+def _migration_007_profile_audio_preprocessing(conn: sqlite3.Connection) -> None:
+    """Add per-profile audio preprocessing (silence trimming, tempo) as JSON."""
+    _add_column(conn, "pipeline_profiles", "audio_preprocessing TEXT")
+    logger.info("Applied migration 007: pipeline profile audio preprocessing")
+
+
 # ---------------------------------------------------------------------------
 # Migration registry
 #
@@ -124,6 +169,31 @@ MIGRATIONS: List[Migration] = [
         description="Provider models, pipeline stages, fallback chains, and pipeline mode",
         migrate=_migration_002_provider_models_and_pipeline_stages,
     ),
+    Migration(
+        version=3,
+        description="Pipeline job queue for dispatcher/worker processes",
+        migrate=_migration_003_pipeline_jobs,
+    ),
+    Migration(
+        version=4,
+        description="Per-provider and per-model concurrency limits",
+        migrate=_migration_004_provider_bulkheads,
+    ),
+    Migration(
+        version=5,
+        description="Admin-pinned provider priority for health-aware selection",
+        migrate=_migration_005_provider_priority,
+    ),
+    Migration(
+        version=6,
+        description="Per-provider RPM/TPM client-side rate limits",
+        migrate=_migration_006_provider_rate_limits,
+    ),
+    Migration(
+        version=7,
+        description="Per-profile audio preprocessing (silence trimming, tempo)",
+        migrate=_migration_007_profile_audio_preprocessing,
+    ),
 ]
 
 
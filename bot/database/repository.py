@@ -277,6 +277,11 @@ class DatabaseManager:
         encrypted_credentials: Optional[str] = None,
         capabilities: Optional[Dict[str, Any]] = None,
         enabled: Optional[bool] = None,
+        max_concurrent: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        priority: Optional[int] = None,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None,
     ) -> bool:
         """Update fields on a provider connection.
 
@@ -310,6 +315,21 @@ class DatabaseManager:
         if enabled is not None:
             fields.append("enabled = ?")
             params.append(1 if enabled else 0)
+        if max_concurrent is not None:
+            fields.append("max_concurrent = ?")
+            params.append(max(0, int(max_concurrent)))
+        if max_queued is not None:
+            fields.append("max_queued = ?")
+            params.append(max(0, int(max_queued)))
+        if priority is not None:
+            fields.append("priority = ?")
+            params.append(int(priority))
+        if rpm_limit is not None:
+            fields.append("rpm_limit = ?")
+            params.append(max(0, int(rpm_limit)))
+        if tpm_limit is not None:
+            fields.append("tpm_limit = ?")
+            params.append(max(0, int(tpm_limit)))
 
         if not fields:
             return False
@@ -324,7 +344,7 @@ class DatabaseManager:
         self.connection.commit()
         return cur.rowcount > 0
 
-    def _get_active_pipeline_profile_id(self) -> Optional[int]:
+    def get_active_pipeline_profile_id(self) -> Optional[int]:
         """Return the active pipeline profile ID from settings, or ``None``."""
         val = self.get_setup_state("active_pipeline_profile")
         return int(val) if val else None
@@ -332,7 +352,7 @@ class DatabaseManager:
     def _check_provider_not_in_use(self, provider_id: int) -> None:
         """Raise :class:`ResourceInUseError` if *provider_id* is referenced
         by the active pipeline profile."""
-        active_id = self._get_active_pipeline_profile_id()
+        active_id = self.get_active_pipeline_profile_id()
         if active_id is None:
             return
         profile = self.get_pipeline_profile(active_id)
@@ -376,7 +396,7 @@ class DatabaseManager:
     def _check_model_not_in_use(self, model_entry_id: int) -> None:
         """Raise :class:`ResourceInUseError` if *model_entry_id* is
         referenced by the active pipeline profile."""
-        active_id = self._get_active_pipeline_profile_id()
+        active_id = self.get_active_pipeline_profile_id()
         if active_id is None:
             return
         stages = self.list_pipeline_stages(active_id)
@@ -484,6 +504,7 @@ class DatabaseManager:
         detected: Optional[bool] = None,
         manually_overridden: Optional[bool] = None,
         enabled: Optional[bool] = None,
+        max_concurrent: Optional[int] = None,
     ) -> bool:
         """Update fields on a provider model entry.
 
@@ -516,6 +537,9 @@ class DatabaseManager:
         if enabled is not None:
             fields.append("enabled = ?")
             params.append(1 if enabled else 0)
+        if max_concurrent is not None:
+            fields.append("max_concurrent = ?")
+            params.append(max(0, int(max_concurrent)))
 
         if not fields:
             return False
@@ -743,6 +767,30 @@ class DatabaseManager:
         self.connection.commit()
         return cur.rowcount > 0
 
+    def get_pipeline_profile_preprocessing(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        """Return the audio preprocessing settings of a profile, or ``None``."""
+        row = self.connection.execute(
+            "SELECT audio_preprocessing FROM pipeline_profiles WHERE id = ?", (profile_id,)
+        ).fetchone()
+        if row is None or not row["audio_preprocessing"]:
+            return None
+        return json.loads(row["audio_preprocessing"])
+
+    def set_pipeline_profile_preprocessing(
+        self, profile_id: int, preprocessing: Optional[Dict[str, Any]]
+    ) -> bool:
+        """Store (or clear, with ``None``) a profile's audio preprocessing.
+
+        Returns ``True`` if the row existed.
+        """
+        cur = self.connection.execute(
+            "UPDATE pipeline_profiles SET audio_preprocessing = ?, "
+            "updated_at = datetime('now') WHERE id = ?",
+            (json.dumps(preprocessing) if preprocessing else None, profile_id),
+        )
+        self.connection.commit()
+        return cur.rowcount > 0
+
     # ------------------------------------------------------------------
     # Internal helpers — model capabilities parsing
     # ------------------------------------------------------------------
@@ -842,6 +890,8 @@ class DatabaseManager:
         result = self._row_as_dict(row)
         if result.get("fallback_policy"):
             result["fallback_policy"] = json.loads(result["fallback_policy"])
+        if result.get("audio_preprocessing"):
+            result["audio_preprocessing"] = json.loads(result["audio_preprocessing"])
         # Attach stages for profiles without explicit stages (backward compat)
         result["stages"] = self.list_pipeline_stages(profile_id)
         return result
@@ -856,6 +906,8 @@ class DatabaseManager:
             result = self._row_as_dict(row)
             if result.get("fallback_policy"):
                 result["fallback_policy"] = json.loads(result["fallback_policy"])
+            if result.get("audio_preprocessing"):
+                result["audio_preprocessing"] = json.loads(result["audio_preprocessing"])
             result["stages"] = self.list_pipeline_stages(row["id"])
             results.append(result)
         return results
@@ -969,6 +1021,205 @@ class DatabaseManager:
             results.append(result)
         return results
 
+    # ------------------------------------------------------------------
+    # Pipeline jobs (dispatcher / worker processes)
+    # ------------------------------------------------------------------
+
+    def enqueue_pipeline_job(
+        self,
+        *,
+        chat_id: int,
+        user_id: int,
+        message_id: int,
+        ack_message_id: int,
+        file_id: str,
+        file_unique_id: str,
+        file_ext: str,
+        max_per_user: int = 0,
+        max_pending: int = 0,
+    ) -> Optional[int]:
+        """Queue an audio job for a worker process and return its ID.
+
+        Returns ``None`` instead when *user_id* already has *max_per_user*
+        jobs queued or running, or everyone together *max_pending*
+        (``0`` = no cap).  The check and the insert are one statement, so
+        concurrent submissions cannot exceed the caps.
+        """
+        cur = self.connection.execute(
+            "INSERT INTO pipeline_jobs "
+            "(chat_id, user_id, message_id, ack_message_id, file_id, file_unique_id, file_ext) "
+            "SELECT ?, ?, ?, ?, ?, ?, ? WHERE "
+            "(? = 0 OR (SELECT COUNT(*) FROM pipeline_jobs "
+            "WHERE status IN ('queued', 'running') AND user_id = ?) < ?) "
+            "AND (? = 0 OR (SELECT COUNT(*) FROM pipeline_jobs "
+            "WHERE status IN ('queued', 'running')) < ?)",
+            (
+                chat_id, user_id, message_id, ack_message_id, file_id, file_unique_id, file_ext,
+                max_per_user, user_id, max_per_user, max_pending, max_pending,
+            ),
+        )
+        self.connection.commit()
+        return cur.lastrowid if cur.rowcount else None
+
+    def count_pending_pipeline_jobs(self, user_id: Optional[int] = None) -> int:
+        """Return how many jobs are queued or running, for *user_id* or everyone."""
+        query = "SELECT COUNT(*) FROM pipeline_jobs WHERE status IN ('queued', 'running')"
+        params: tuple = ()
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params = (user_id,)
+        return self.connection.execute(query, params).fetchone()[0]
+
+    def claim_pipeline_job(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest queued job, or return ``None``.
+
+        ``BEGIN IMMEDIATE`` takes the database write lock before reading, so
+        two worker processes can never claim the same row.
+        """
+        conn = self.connection
+        conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM pipeline_jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.commit()
+                return None
+            conn.execute(
+                "UPDATE pipeline_jobs SET status = 'running', worker_id = ?, "
+                "attempts = attempts + 1, claimed_at = datetime('now') WHERE id = ?",
+                (worker_id, row["id"]),
+            )
+            job = conn.execute(
+                "SELECT * FROM pipeline_jobs WHERE id = ?", (row["id"],)
+            ).fetchone()
+            conn.commit()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self._row_as_dict(job)
+
+    def set_pipeline_job_stage(self, job_id: int, stage: str) -> None:
+        """Record the stage a running job has reached (for progress display)."""
+        self.connection.execute(
+            "UPDATE pipeline_jobs SET stage = ? WHERE id = ?", (stage, job_id)
+        )
+        self.connection.commit()
+
+    def heartbeat_pipeline_job(self, job_id: int, worker_id: str) -> bool:
+        """Refresh ``claimed_at`` of a job still running on *worker_id*.
+
+        Workers call this while a job runs, so
+        :meth:`requeue_stale_pipeline_jobs` only recovers jobs whose worker
+        stopped.  Returns ``False`` once the job was taken away.
+        """
+        cur = self.connection.execute(
+            "UPDATE pipeline_jobs SET claimed_at = datetime('now') "
+            "WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (job_id, worker_id),
+        )
+        self.connection.commit()
+        return cur.rowcount > 0
+
+    def finish_pipeline_job(
+        self,
+        job_id: int,
+        *,
+        worker_id: str,
+        result_text: Optional[str] = None,
+        user_message: Optional[str] = None,
+    ) -> bool:
+        """Mark a job ``done`` (with *result_text*) or ``failed`` (with *user_message*).
+
+        Only applies while the job is still running on *worker_id*; a
+        worker whose job was requeued meanwhile gets ``False`` and its
+        result is dropped.
+        """
+        status = "done" if user_message is None else "failed"
+        cur = self.connection.execute(
+            "UPDATE pipeline_jobs SET status = ?, result_text = ?, user_message = ?, "
+            "finished_at = datetime('now') "
+            "WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (status, result_text, user_message, job_id, worker_id),
+        )
+        self.connection.commit()
+        return cur.rowcount > 0
+
+    def list_pipeline_jobs(
+        self, statuses: List[str], *, undelivered_only: bool = False, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Return jobs with one of *statuses*, oldest first."""
+        placeholders = ", ".join("?" for _ in statuses)
+        query = f"SELECT * FROM pipeline_jobs WHERE status IN ({placeholders})"
+        if undelivered_only:
+            query += " AND delivered_at IS NULL"
+        query += " ORDER BY id LIMIT ?"
+        rows = self.connection.execute(query, (*statuses, limit)).fetchall()
+        return [self._row_as_dict(row) for row in rows]
+
+    def mark_pipeline_job_delivered(self, job_id: int) -> None:
+        """Mark a job delivered and drop its transcript from the database."""
+        self.connection.execute(
+            "UPDATE pipeline_jobs SET delivered_at = datetime('now'), result_text = NULL "
+            "WHERE id = ?",
+            (job_id,),
+        )
+        self.connection.commit()
+
+    def requeue_stale_pipeline_jobs(
+        self,
+        older_than_seconds: int,
+        *,
+        max_attempts: int = 3,
+        failure_message: str = "",
+    ) -> int:
+        """Return ``running`` jobs whose claim was not refreshed for
+        *older_than_seconds* to the queue.
+
+        Recovers jobs whose worker process died mid-pipeline; live workers
+        keep their claims fresh with :meth:`heartbeat_pipeline_job`.  Jobs that
+        already used *max_attempts* are marked ``failed`` with
+        *failure_message* instead, so a job that crashes its worker cannot
+        loop forever.  Returns the number of requeued jobs.
+        """
+        cutoff = (f"-{int(older_than_seconds)} seconds",)
+        self.connection.execute(
+            "UPDATE pipeline_jobs SET status = 'failed', user_message = ?, "
+            "finished_at = datetime('now') "
+            "WHERE status = 'running' AND claimed_at <= datetime('now', ?) "
+            "AND attempts >= ?",
+            (failure_message, *cutoff, max_attempts),
+        )
+        cur = self.connection.execute(
+            "UPDATE pipeline_jobs SET status = 'queued', worker_id = NULL, stage = NULL "
+            "WHERE status = 'running' AND claimed_at <= datetime('now', ?)",
+            cutoff,
+        )
+        self.connection.commit()
+        return cur.rowcount
+
+    def prune_pipeline_jobs(self, older_than_seconds: int) -> int:
+        """Delete jobs delivered more than *older_than_seconds* ago.
+
+        Returns the number of deleted rows.
+        """
+        cur = self.connection.execute(
+            "DELETE FROM pipeline_jobs WHERE delivered_at IS NOT NULL "
+            "AND delivered_at <= datetime('now', ?)",
+            (f"-{int(older_than_seconds)} seconds",),
+        )
+        self.connection.commit()
+        return cur.rowcount
+
+    def count_pipeline_jobs(self) -> Dict[str, int]:
+        """Return ``{status: count}`` for undelivered jobs."""
+        rows = self.connection.execute(
+            "SELECT status, COUNT(*) AS n FROM pipeline_jobs "
+            "WHERE delivered_at IS NULL GROUP BY status"
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
     # ------------------------------------------------------------------
     # Legacy import helpers
     # ------------------------------------------------------------------
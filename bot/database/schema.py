@@ -77,6 +77,7 @@ CREATE TABLE IF NOT EXISTS provider_models (
     detected              INTEGER NOT NULL DEFAULT 1,
     manually_overridden   INTEGER NOT NULL DEFAULT 0,
     enabled               INTEGER NOT NULL DEFAULT 1,
+    max_concurrent        INTEGER NOT NULL DEFAULT 0,
     created_at            TEXT NOT NULL DEFAULT (datetime('now')),
     updated_at            TEXT NOT NULL DEFAULT (datetime('now')),
     UNIQUE(provider_id, model_id)
@@ -122,6 +123,11 @@ CREATE TABLE IF NOT EXISTS provider_connections (
     encrypted_credentials TEXT,
     capabilities          TEXT,
     enabled               INTEGER NOT NULL DEFAULT 1,
+    max_concurrent        INTEGER NOT NULL DEFAULT 0,
+    max_queued            INTEGER NOT NULL DEFAULT 20,
+    priority              INTEGER NOT NULL DEFAULT 0,
+    rpm_limit             INTEGER NOT NULL DEFAULT 0,
+    tpm_limit             INTEGER NOT NULL DEFAULT 0,
     created_at            TEXT NOT NULL DEFAULT (datetime('now')),
     updated_at            TEXT NOT NULL DEFAULT (datetime('now'))
 );
@@ -142,6 +148,7 @@ CREATE TABLE IF NOT EXISTS pipeline_profiles (
     fallback_policy            TEXT,
     mode                       TEXT NOT NULL DEFAULT 'two_stage'
                                 CHECK(mode IN ('two_stage', 'single_pass')),
+    audio_preprocessing        TEXT,
     created_at                 TEXT NOT NULL DEFAULT (datetime('now')),
     updated_at                 TEXT NOT NULL DEFAULT (datetime('now'))
 );
@@ -185,6 +192,38 @@ CREATE TABLE IF NOT EXISTS audit_events (
 );
 """
 
+# ---------------------------------------------------------------------------
+# Pipeline jobs (dispatcher / worker-process coordination)
+# ---------------------------------------------------------------------------
+
+PIPELINE_JOBS = """
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id         INTEGER NOT NULL,
+    user_id         INTEGER NOT NULL,
+    message_id      INTEGER NOT NULL,
+    ack_message_id  INTEGER NOT NULL,
+    file_id         TEXT NOT NULL,
+    file_unique_id  TEXT NOT NULL,
+    file_ext        TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'queued'
+                    CHECK(status IN ('queued', 'running', 'done', 'failed')),
+    stage           TEXT,
+    worker_id       TEXT,
+    result_text     TEXT,
+    user_message    TEXT,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    created_at      TEXT NOT NULL DEFAULT (datetime('now')),
+    claimed_at      TEXT,
+    finished_at     TEXT,
+    delivered_at    TEXT
+);
+"""
+
+PIPELINE_JOBS_STATUS_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_status ON pipeline_jobs (status, id);
+"""
+
 # ---------------------------------------------------------------------------
 # Aggregate lists used by the migration runner
 # ---------------------------------------------------------------------------
@@ -1,11 +1,120 @@
+from contextvars import ContextVar
 from functools import wraps
+from typing import Optional
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from bot.rate_limiter import PreparationBudget, PreparationTicket, QueueEntry, RateLimiter
+
+
+class _RateSlot:
+    """The global rate-limit slot of one request, released at most once."""
+
+    def __init__(self, limiter: RateLimiter, user_id: int, held: bool):
+        self.limiter = limiter
+        self.user_id = user_id
+        self.held = held
+
+    async def release(self) -> None:
+        if self.held:
+            self.held = False
+            await self.limiter.release_async(self.user_id)
+
+
+class _ProviderTurn:
+    """A request that prepares its audio before waiting for its slot."""
+
+    def __init__(self, limiter: RateLimiter, entry: QueueEntry, slot: _RateSlot,
+                 budget: PreparationBudget, ticket: PreparationTicket, queued: bool):
+        self.limiter = limiter
+        self.entry = entry
+        self.slot = slot
+        self.budget = budget
+        self.ticket = ticket
+        self.queued = queued
+        self.settled = False
+
+    async def wait(self, artifact_paths) -> None:
+        if self.settled:
+            return
+        self.budget.track(self.ticket, *artifact_paths)
+        try:
+            await self.limiter.mark_ready(self.entry)
+            await self.limiter.wait_for_queue_turn(self.entry)
+            self.slot.held = True
+        finally:
+            self.settled = True
+            self.budget.release(self.ticket)
+
+    async def abandon(self) -> None:
+        self.budget.release(self.ticket)
+        if not self.settled:
+            self.settled = True
+            await self.limiter.cancel_queue_entry(self.entry)
+
+
+_provider_turn: ContextVar[Optional[_ProviderTurn]] = ContextVar("provider_turn", default=None)
+_rate_slot: ContextVar[Optional[_RateSlot]] = ContextVar("rate_slot", default=None)
+
+
+def provider_turn_pending() -> bool:
+    """``True`` when the current request was queued and has no slot yet."""
+    turn = _provider_turn.get()
+    return turn is not None and turn.queued and not turn.settled
+
+
+async def wait_for_provider_turn(*artifact_paths: str) -> None:
+    """Wait for the rate-limit slot of a request prepared ahead of it.
+
+    The audio handler calls this once the audio is downloaded and
+    converted, passing the prepared files so they count against the
+    preparation budget.  Returns at once for requests that took their
+    slot on admission.
+    """
+    turn = _provider_turn.get()
+    if turn is not None:
+        await turn.wait(artifact_paths)
+
+
+async def release_rate_limit_slot() -> None:
+    """Give the current request's global slot back before it finishes.
+
+    The audio handler calls this once a request enters the stages after
+    transcription, so a slow refine or delivery waits on its own stage
+    limit instead of holding a slot another request could transcribe with.
+    Later calls, and the decorator's own release, are no-ops.
+    """
+    slot = _rate_slot.get()
+    if slot is not None:
+        await slot.release()
+
+
+def _is_admin(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> bool:
+    whitelist_manager = context.bot_data.get('whitelist_manager')
+    if whitelist_manager is not None:
+        authorized_data = whitelist_manager.authorized_data
+    else:
+        config = context.bot_data.get('config')
+        authorized_data = getattr(config, 'authorized_data', None) or {}
+    return user_id in authorized_data.get('admin', [])
+
+
 def rate_limited(func):
     """
     Decorator to enforce rate limits on audio processing.
-    
+
+    Before any slot is taken, the message metadata (duration, MIME type,
+    extension) is checked by ``bot_data['metadata_admission']`` when set,
+    so doomed requests are refused without downloading the file.
+
+    A request with room in ``bot_data['preparation_budget']``, queued or
+    not, runs the handler without a global slot: it downloads and converts
+    first and waits for its slot in :func:`wait_for_provider_turn`.  The
+    handler gives the slot back with :func:`release_rate_limit_slot` once
+    transcription is done, so slots are only held by the provider stages up
+    to transcription.  Slots go to waiting requests in arrival order.
+
     Limits per user:
     - Max concurrent requests: 2
     - Global limit: 6
@@ -16,22 +125,31 @@ def rate_limited(func):
         limiter = context.bot_data.get('rate_limiter')
         if limiter is None:
             raise RuntimeError("RateLimiter not initialized")
-        
+
         # Get user info
         user_id = update.effective_user.id if update.effective_user else 0
-        
+
         # Get file size estimate
         message = update.message
         file_size_mb = 0
         if message:
+            metadata_admission = context.bot_data.get('metadata_admission')
+            if metadata_admission is not None:
+                rejection = metadata_admission.check(message, is_admin=_is_admin(context, user_id))
+                if rejection is not None:
+                    await message.reply_text(rejection.message)
+                    return
+
             if message.voice:
                 file_size_mb = (message.voice.file_size or 0) / (1024 * 1024)
             elif message.audio:
                 file_size_mb = (message.audio.file_size or 0) / (1024 * 1024)
             elif message.document:
                 file_size_mb = (message.document.file_size or 0) / (1024 * 1024)
-        
-        admission = await limiter.request_admission(user_id, file_size_mb)
+
+        budget = context.bot_data.get('preparation_budget')
+        prepare = budget is not None and budget.max_jobs > 0
+        admission = await limiter.request_admission(user_id, file_size_mb, prepare=prepare)
 
         if not admission.allowed:
             await message.reply_text(admission.message)
@@ -39,13 +157,34 @@ def rate_limited(func):
 
         if admission.queued:
             await message.reply_text(admission.message)
-            await limiter.wait_for_queue_turn(admission.queue_entry)
-        
+
+        slot = _RateSlot(limiter, user_id, held=True)
+        turn = token = None
+        if admission.queue_entry is not None:
+            ticket = budget.reserve(int(file_size_mb * 1024 * 1024)) if prepare else None
+            if ticket is not None:
+                # Download and convert now; the handler waits for the slot
+                # right before the provider stages.
+                slot.held = False
+                turn = _ProviderTurn(
+                    limiter, admission.queue_entry, slot, budget, ticket, admission.queued
+                )
+                token = _provider_turn.set(turn)
+            else:
+                if prepare:
+                    await limiter.mark_ready(admission.queue_entry)
+                await limiter.wait_for_queue_turn(admission.queue_entry)
+
+        slot_token = _rate_slot.set(slot)
         try:
             # Execute the function
             return await func(update, context, *args, **kwargs)
         finally:
-            # Always release the slot
-            await limiter.release_async(user_id)
-    
+            _rate_slot.reset(slot_token)
+            if turn is not None:
+                _provider_turn.reset(token)
+                await turn.abandon()
+            # Always release the slot, unless the handler already did
+            await slot.release()
+
     return wrapped
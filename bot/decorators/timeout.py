@@ -4,6 +4,8 @@ Timeout handling decorators for async operations.
 
 import asyncio
 import logging
+import time
+from contextvars import ContextVar
 from functools import wraps
 from typing import Callable, Any, TypeVar, Awaitable
 
@@ -19,13 +21,28 @@ TIMEOUT_EXCEPTIONS = {
     "convert": ConvertTimeout,
     "transcribe": TranscribeTimeout,
     "refine": RefineTimeout,
+    "single_pass": TranscribeTimeout,
 }
 
 
+# Monotonic deadline of the stage currently running under a timeout, so
+# provider retries (bot.retry) never sleep past it.
+_stage_deadline: ContextVar[float | None] = ContextVar("stage_deadline", default=None)
+
+
 def _get_timeout_exception(stage_name: str):
     return TIMEOUT_EXCEPTIONS.get(stage_name, RefineTimeout)
 
 
+def remaining_stage_time() -> float | None:
+    """Seconds left before the current stage times out, or ``None`` when
+    not running under :func:`execute_with_timeout` / :func:`timeout_handler`."""
+    deadline = _stage_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
 def execute_with_timeout(stage_name: str, awaitable: Awaitable[T], default_timeout: int = 60) -> Awaitable[T]:
     """
     Execute an awaitable with stage-specific timeout.
@@ -45,6 +62,7 @@ def execute_with_timeout(stage_name: str, awaitable: Awaitable[T], default_timeo
     timeout_seconds = c.PROGRESS_TIMEOUTS.get(stage_name, default_timeout)
     
     async def _runner():
+        token = _stage_deadline.set(time.monotonic() + timeout_seconds)
         try:
             logger.debug(f"Starting {stage_name} with timeout: {timeout_seconds}s")
             return await asyncio.wait_for(awaitable, timeout=timeout_seconds)
@@ -54,6 +72,8 @@ def execute_with_timeout(stage_name: str, awaitable: Awaitable[T], default_timeo
                 f"Timeout in {stage_name}",
                 getattr(c, f"MSG_TIMEOUT_{stage_name.upper()}", c.MSG_ERROR_INTERNAL),
             )
+        finally:
+            _stage_deadline.reset(token)
             
     return _runner()
 
@@ -73,6 +93,7 @@ def timeout_handler(stage_name: str, default_timeout: int = 60) -> Callable:
         async def wrapper(*args, **kwargs) -> T:
             # Get timeout for this stage
             timeout_seconds = c.PROGRESS_TIMEOUTS.get(stage_name, default_timeout)
+            token = _stage_deadline.set(time.monotonic() + timeout_seconds)
             
             try:
                 logger.debug(f"Starting {stage_name} with timeout: {timeout_seconds}s")
@@ -83,6 +104,8 @@ def timeout_handler(stage_name: str, default_timeout: int = 60) -> Callable:
                     f"Timeout in {stage_name}",
                     getattr(c, f"MSG_TIMEOUT_{stage_name.upper()}", c.MSG_ERROR_INTERNAL),
                 )
+            finally:
+                _stage_deadline.reset(token)
         
         return wrapper
     return decorator
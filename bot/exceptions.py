@@ -83,6 +83,18 @@ class ProviderCircuitOpen(AudioPipelineStageError):
     """Raised when the provider circuit breaker is open."""
 
 
+class ProviderBulkheadFull(AudioPipelineStageError):
+    """Raised when a provider's concurrency limit and waiting queue are full."""
+
+
+class ProviderRateLimited(AudioPipelineStageError):
+    """Raised when a provider's RPM/TPM budget does not refill in time."""
+
+
+class StageQueueFull(AudioPipelineStageError):
+    """Raised when a pipeline stage's waiting queue is full."""
+
+
 class PipelineResolutionError(AudioPipelineError):
     """Raised when the pipeline resolver cannot produce a valid execution plan.
 
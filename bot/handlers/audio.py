@@ -6,26 +6,54 @@ import os
 import sys
 import logging
 import asyncio
+import inspect
 import time
 from typing import Optional
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from bot.audio_profiles import (
+    DEFAULT_AUDIO_PROFILE,
+    NO_PREPROCESSING,
+    AudioPreprocessing,
+    AudioProfile,
+    profile_for,
+)
+from bot.conversion import ConversionPool
 from bot.capabilities import CapabilityModel
 from bot.decorators.auth import restricted
 from bot.decorators.timeout import execute_with_timeout
-from bot.decorators.rate_limit import rate_limited
+from bot.decorators.rate_limit import (
+    provider_turn_pending,
+    rate_limited,
+    release_rate_limit_slot,
+    wait_for_provider_turn,
+)
 from bot.exceptions import (
-    AudioPipelineError,
     AudioPipelineStageError,
     AudioPipelineTimeout,
     DownloadError,
     PipelineResolutionError,
 )
 from bot.pipeline_resolver import PipelineRequest, RequestMode
-from bot.providers import RefineStreamEvent, TextProcessor, Transcriber, TranscriptionResult
-from bot.ui.progress import update_progress, get_progress_message, clear_progress_cache, remember_progress_message
+from bot.pipeline_stages import StagedPipelineEngine
+from bot.providers import (
+    RefineStreamEvent,
+    SinglePassProcessor,
+    TextProcessor,
+    Transcriber,
+    TranscriptionResult,
+    is_throttling_error,
+)
+from bot.ui.progress import (
+    clear_progress_cache,
+    get_progress_message,
+    remember_progress_message,
+    TypingHeartbeat,
+    update_progress,
+)
+from bot.ui.streaming import TRANSCRIPT_PREVIEW_INTERVAL_SECONDS
 from bot import utils
 from bot import constants as c
 logger = logging.getLogger(__name__)
@@ -54,6 +82,25 @@ def _log_pipeline_summary(user_id: int, provider_name: str, total_start_time: fl
     )
 
 
+def describe_attachment(message) -> tuple[Optional[object], Optional[str]]:
+    """Return the audio attachment of *message* and its file extension.
+
+    Returns ``(None, None)`` when the message carries no supported audio.
+    """
+    if message.voice:
+        return message.voice, 'ogg'
+    elif message.audio:
+        file_name = message.audio.file_name or 'audio.mp3'
+        ext = os.path.splitext(file_name)[1].lstrip('.') or 'mp3'
+        return message.audio, ext
+    elif message.document and message.document.mime_type.startswith('audio/'):
+        file_name = message.document.file_name or 'audio.mp3'
+        ext = os.path.splitext(file_name)[1].lstrip('.') or 'mp3'
+        return message.document, ext
+
+    return None, None
+
+
 def get_audio_processor(context: ContextTypes.DEFAULT_TYPE) -> "AudioProcessor":
     """Get the application-scoped audio processor instance."""
     processor = context.bot_data.get('audio_processor')
@@ -69,6 +116,109 @@ def get_delivery_adapter(context: ContextTypes.DEFAULT_TYPE):
     return adapter
 
 
+def get_stage_engine(context: ContextTypes.DEFAULT_TYPE) -> Optional[StagedPipelineEngine]:
+    """Get the application-scoped staged pipeline engine, if configured."""
+    return context.bot_data.get('stage_engine')
+
+
+async def _after_slot_release(work):
+    await release_rate_limit_slot()
+    return await work
+
+
+async def _run_stage(
+    engine: Optional[StagedPipelineEngine],
+    stage_name: str,
+    work,
+    heartbeat: Optional[TypingHeartbeat] = None,
+    release_slot: bool = False,
+):
+    """Run *work* in stage *stage_name*, typing only once the stage starts.
+
+    With *release_slot*, the request's global rate-limit slot is given back
+    as soon as the stage starts: while waiting for the stage the request
+    keeps its slot, so a saturated stage still pushes back on admission.
+    """
+    layers = [work]
+    if release_slot:
+        layers.append(_after_slot_release(layers[-1]))
+    if heartbeat is not None:
+        layers.append(heartbeat.during(layers[-1]))
+    try:
+        if engine is None:
+            return await layers[-1]
+        return await engine.run(stage_name, layers[-1])
+    finally:
+        # A stage rejected or cancelled before it started never awaits its work.
+        for layer in layers:
+            if inspect.iscoroutine(layer) and inspect.getcoroutinestate(layer) == inspect.CORO_CREATED:
+                layer.close()
+
+
+async def _observe_provider_call(context: ContextTypes.DEFAULT_TYPE, stage_name: str, work):
+    """Await a provider call and feed its latency/outcome to the rate limiter.
+
+    Only service time is measured — the call is wrapped inside the stage, so
+    time spent waiting for a stage slot does not count as provider latency.
+    """
+    limiter = context.bot_data.get('rate_limiter')
+    if limiter is None or getattr(limiter, "adaptive", None) is None:
+        return await work
+    start_time = time.monotonic()
+    try:
+        result = await work
+    except AudioPipelineTimeout:
+        await limiter.record_sample(stage_name, time.monotonic() - start_time, "timeout")
+        raise
+    except Exception as e:
+        outcome = "throttled" if is_throttling_error(e) else "error"
+        await limiter.record_sample(stage_name, time.monotonic() - start_time, outcome)
+        raise
+    await limiter.record_sample(stage_name, time.monotonic() - start_time, "ok")
+    return result
+
+
+async def _run_single_pass_stage(
+    context: ContextTypes.DEFAULT_TYPE,
+    processor: "AudioProcessor",
+    engine: Optional[StagedPipelineEngine],
+    chat_id: int,
+    ack_msg,
+    mp3_path: str,
+    total_stages: int,
+    heartbeat: Optional[TypingHeartbeat] = None,
+) -> tuple[str, bool]:
+    """Run a single-pass plan under the transcribe stage.
+
+    Returns ``(final_text, streamed)``; when *streamed* is ``True`` the
+    response was already delivered progressively.
+    """
+    await update_progress(
+        context, chat_id, ack_msg.message_id,
+        get_progress_message(c.MSG_PROGRESS_SINGLE_PASS, 3, total_stages)
+    )
+    delivery_adapter = get_delivery_adapter(context)
+    if processor.supports_refine_streaming and delivery_adapter.supports_live_refine_streaming(context, ack_msg):
+        final_text = await _run_stage(
+            engine,
+            "transcribe",
+            _observe_provider_call(
+                context,
+                "single_pass",
+                processor.stream_single_pass(context, chat_id, ack_msg, mp3_path),
+            ),
+            heartbeat,
+        )
+        return final_text, True
+    final_text = await _run_stage(
+        engine,
+        "transcribe",
+        _observe_provider_call(context, "single_pass", processor.process_single_pass(mp3_path)),
+        heartbeat,
+    )
+    return final_text, False
+
+
 def get_state_checker(context: ContextTypes.DEFAULT_TYPE):
     """Get the application-scoped state checker instance."""
     checker = context.bot_data.get('state_checker')
@@ -83,7 +233,9 @@ class AudioProcessor:
 
     Accepts optional :class:`Transcriber` and :class:`TextProcessor`
     instances (P1).  When not provided, falls back to the combined
-    :class:`LLMProvider` created by :func:`utils.create_provider`.
+    :class:`LLMProvider` created by :func:`utils.create_provider`.  An
+    optional :class:`SinglePassProcessor` replaces both stages with one
+    provider call.
     """
 
     def __init__(
@@ -93,6 +245,11 @@ class AudioProcessor:
         text_processor: TextProcessor | None = None,
         provider_name: str | None = None,
         model_name: str | None = None,
+        single_pass: SinglePassProcessor | None = None,
+        audio_profile: AudioProfile | None = None,
+        conversion_pool: ConversionPool | None = None,
+        preprocessing: AudioPreprocessing | None = None,
+        legacy_provider: bool = True,
     ):
         """Initialize audio processor with configuration.
 
@@ -112,28 +269,75 @@ class AudioProcessor:
         model_name:
             Model name for response formatting (required when *text_processor*
             is provided).
+        single_pass:
+            Optional :class:`SinglePassProcessor`; when set,
+            :meth:`process_single_pass` / :meth:`stream_single_pass` are
+            used instead of separate transcribe and refine calls.
+        audio_profile:
+            FFmpeg :class:`~bot.audio_profiles.AudioProfile` for the
+            conversion stage; defaults to MP3 44.1 kHz stereo.
+        conversion_pool:
+            Optional :class:`~bot.conversion.ConversionPool` setting FFmpeg
+            threads and priority; without it FFmpeg picks its own threads.
+        preprocessing:
+            Optional :class:`~bot.audio_profiles.AudioPreprocessing`
+            (silence trimming, tempo) of the pipeline profile.
+        legacy_provider:
+            When ``False``, no combined provider is created even without a
+            *transcriber*; see :meth:`unresolved`.
         """
         self.config = config
+        self.audio_profile = audio_profile or DEFAULT_AUDIO_PROFILE
+        self.conversion_pool = conversion_pool
+        self.preprocessing = preprocessing or NO_PREPROCESSING
         self._transcriber = transcriber
         self._text_processor = text_processor
+        self._single_pass = single_pass
         self._model_name_override = model_name
 
-        if transcriber is None:
+        if transcriber is None and legacy_provider:
             # Legacy mode: create the combined provider.
             self.provider = utils.create_provider(config)
             self._provider_name = config.provider_name
         else:
-            # P1 mode: use separate transcriber / text_processor.
+            # P1 mode: use separate transcriber / text_processor (or none yet).
             self.provider = object()  # sentinel for backward-compat checks
             self._provider_name = provider_name or "unknown"
 
+    @classmethod
+    def unresolved(
+        cls,
+        config,
+        provider_name: str | None = None,
+        conversion_pool: ConversionPool | None = None,
+    ) -> "AudioProcessor":
+        """Processor without providers, for apps started without a ``Config``.
+
+        ``handle_audio`` builds the real processor for each request from the
+        :class:`~bot.pipeline_resolver.PipelineResolver` plan; this one only
+        carries the configuration, the defaults and the conversion pool.
+        """
+        return cls(
+            config,
+            provider_name=provider_name,
+            conversion_pool=conversion_pool,
+            legacy_provider=False,
+        )
+
     @property
     def provider_name(self) -> str:
         return self._provider_name
 
+    @property
+    def uses_single_pass(self) -> bool:
+        """Return ``True`` when audio is transcribed and refined in one call."""
+        return self._single_pass is not None
+
     @property
     def capabilities(self) -> CapabilityModel:
         """Return the resolved :class:`CapabilityModel` for this processor."""
+        if self._single_pass is not None:
+            return self._single_pass.get_capabilities()
         if self._text_processor is not None:
             return self._text_processor.get_capabilities()
         provider = self.provider
@@ -145,6 +349,11 @@ class AudioProcessor:
             return caps()
         return CapabilityModel(transcription=True)
 
+    @property
+    def supports_transcribe_streaming(self) -> bool:
+        """Return ``True`` when the transcriber can stream partial text."""
+        return getattr(self._transcriber, "supports_transcribe_streaming", False)
+
     @property
     def supports_refine_streaming(self) -> bool:
         """Return ``True`` when the text processor supports streaming.
@@ -163,18 +372,10 @@ class AudioProcessor:
         Returns:
             Tuple of (file_object, file_extension) or (None, None) if unsupported
         """
-        if message.voice:
-            return await message.voice.get_file(), 'ogg'
-        elif message.audio:
-            file_name = message.audio.file_name or 'audio.mp3'
-            ext = os.path.splitext(file_name)[1].lstrip('.') or 'mp3'
-            return await message.audio.get_file(), ext
-        elif message.document and message.document.mime_type.startswith('audio/'):
-            file_name = message.document.file_name or 'audio.mp3'
-            ext = os.path.splitext(file_name)[1].lstrip('.') or 'mp3'
-            return await message.document.get_file(), ext
-        
-        return None, None
+        attachment, ext = describe_attachment(message)
+        if attachment is None:
+            return None, None
+        return await attachment.get_file(), ext
     
     def generate_file_paths(
         self, chat_id: int, message_id: int, unique_id: str, ext: str
@@ -187,16 +388,36 @@ class AudioProcessor:
             ext: File extension
             
         Returns:
-            Tuple of (ogg_path, mp3_path)
+            Tuple of (ogg_path, mp3_path); the converted path carries the
+            audio profile's extension.
         """
         prefix = f"{chat_id}_{message_id}_{unique_id}"
+        out_ext = getattr(self, "audio_profile", DEFAULT_AUDIO_PROFILE).extension
         ogg_path = os.path.join(self.config.audio_dir, f"{prefix}.{ext}")
-        mp3_path = os.path.join(self.config.audio_dir, f"{prefix}.mp3")
+        if out_ext == ext.lower():
+            # FFmpeg cannot convert a file onto itself.
+            prefix = f"{prefix}_converted"
+        mp3_path = os.path.join(self.config.audio_dir, f"{prefix}.{out_ext}")
         return ogg_path, mp3_path
     
-    async def download_audio(self, file_obj, file_path: str) -> None:
-        """Download audio file with timeout protection."""
+    async def download_audio(
+        self, file_obj, file_path: str, local_files_dir: str | None = None
+    ) -> None:
+        """Download audio file with timeout protection.
+
+        With a local Bot API server (``--local``) the file already sits on a
+        shared volume, so a file inside *local_files_dir* (see
+        :func:`utils.local_bot_api_files_dir`) is hardlinked instead of
+        fetched over HTTP.
+        """
         try:
+            local_path = getattr(file_obj, "file_path", None)
+            if utils.is_local_bot_api_file(local_path, local_files_dir):
+                await execute_with_timeout(
+                    "download",
+                    asyncio.to_thread(utils.link_local_file, local_path, file_path),
+                )
+                return
             await execute_with_timeout(
                 "download",
                 file_obj.download_to_drive(file_path)
@@ -206,12 +427,30 @@ class AudioProcessor:
         except Exception as e:
             raise DownloadError(f"Download failed: {e}", c.MSG_ERROR_DOWNLOAD) from e
     
-    async def convert_audio(self, ogg_path: str, mp3_path: str) -> None:
-        """Convert audio to MP3 with timeout protection."""
-        await execute_with_timeout(
+    async def convert_audio(self, ogg_path: str, mp3_path: str) -> Optional[utils.ConversionResult]:
+        """Convert audio with the processor's profile and timeout protection.
+
+        Returns the audio duration before and after preprocessing, when
+        FFmpeg reported it.
+        """
+        profile = getattr(self, "audio_profile", DEFAULT_AUDIO_PROFILE)
+        preprocessing = getattr(self, "preprocessing", NO_PREPROCESSING)
+        pool = getattr(self, "conversion_pool", None)
+        result = await execute_with_timeout(
             "convert",
-            utils.convert_to_mp3(ogg_path, mp3_path)
+            pool.convert(ogg_path, mp3_path, profile, preprocessing)
+            if pool is not None
+            else utils.convert_to_mp3(ogg_path, mp3_path, profile, preprocessing=preprocessing),
         )
+        if preprocessing.enabled and result is not None and result.removed_seconds is not None:
+            logger.info(
+                "Audio preprocessed | filters=%s input_s=%s output_s=%s removed_s=%s",
+                preprocessing.label,
+                result.input_seconds,
+                result.output_seconds,
+                round(result.removed_seconds, 2),
+            )
+        return result
     
     async def transcribe_audio(self, mp3_path: str) -> str:
         """Transcribe audio with timeout protection."""
@@ -226,6 +465,45 @@ class AudioProcessor:
             self.provider.transcribe_audio(mp3_path),
         )
 
+    async def stream_transcribe_audio(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        ack_msg,
+        mp3_path: str,
+        status_text: str,
+    ) -> str:
+        """Transcribe audio, previewing the partial transcript as it arrives."""
+        return await execute_with_timeout(
+            "transcribe",
+            self._preview_transcript(context, chat_id, ack_msg, mp3_path, status_text),
+        )
+
+    async def _preview_transcript(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        ack_msg,
+        mp3_path: str,
+        status_text: str,
+    ) -> str:
+        delivery_adapter = get_delivery_adapter(context)
+        partial = ""
+        final_text = None
+        last_shown = 0.0
+        async for event in self._transcriber.stream_transcribe(mp3_path):
+            if event.type == "done":
+                final_text = event.text
+                continue
+            partial = partial + event.text if event.type == "delta" else ""
+            now = time.monotonic()
+            if partial and now - last_shown >= TRANSCRIPT_PREVIEW_INTERVAL_SECONDS:
+                last_shown = now
+                await delivery_adapter.show_transcript_preview(
+                    context, chat_id, ack_msg, status_text, partial
+                )
+        return final_text if final_text is not None else partial
+
     async def refine_text(self, raw_text: str) -> str:
         """Refine transcribed text with timeout protection."""
         if self._text_processor is not None:
@@ -245,15 +523,41 @@ class AudioProcessor:
         ack_msg,
         raw_text: str,
     ) -> str:
-        delivery_adapter = get_delivery_adapter(context)
-        session = delivery_adapter.start_progressive_response(context, chat_id, ack_msg)
-        final_text = ""
-
         stream = (
             self._text_processor.stream_process(raw_text)
             if self._text_processor is not None
             else self.provider.stream_refine_text(raw_text)
         )
+        return await self._deliver_stream(context, chat_id, ack_msg, stream)
+
+    async def process_single_pass(self, mp3_path: str) -> str:
+        """Transcribe and refine in one provider call with timeout protection."""
+        return await execute_with_timeout(
+            "single_pass",
+            self._single_pass.process_audio(mp3_path),
+            default_timeout=c.SINGLE_PASS_TIMEOUT_SECONDS,
+        )
+
+    async def stream_single_pass(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        ack_msg,
+        mp3_path: str,
+    ) -> str:
+        """Stream a single-pass response to the chat as it is generated."""
+        return await execute_with_timeout(
+            "single_pass",
+            self._deliver_stream(
+                context, chat_id, ack_msg, self._single_pass.stream_process_audio(mp3_path)
+            ),
+            default_timeout=c.SINGLE_PASS_TIMEOUT_SECONDS,
+        )
+
+    async def _deliver_stream(self, context: ContextTypes.DEFAULT_TYPE, chat_id: int, ack_msg, stream) -> str:
+        delivery_adapter = get_delivery_adapter(context)
+        session = delivery_adapter.start_progressive_response(context, chat_id, ack_msg)
+        final_text = ""
 
         async for event in stream:
             if event.type == "delta":
@@ -282,6 +586,15 @@ class AudioProcessor:
 
         header = c.MSG_COMPLETION_HEADER.format(model_name=model_name)
         return f"{header}\n\n{final_text}"
+
+    def format_raw_response(self, raw_text: str, refine_failed: bool = False) -> str:
+        """Format the raw transcript shown before (or instead of) refinement."""
+        header = (
+            c.MSG_RAW_TRANSCRIPT_UNREFINED_HEADER
+            if refine_failed
+            else c.MSG_RAW_TRANSCRIPT_HEADER
+        )
+        return f"{header}\n\n{raw_text}"
     
     async def send_response(self, context: ContextTypes.DEFAULT_TYPE, 
                           chat_id: int, ack_msg, full_text: str) -> None:
@@ -324,6 +637,12 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     except RuntimeError:
         logger.warning("StateChecker not available; allowing audio processing")
 
+    # Worker-process mode: queue the job and let bot.workers run the pipeline.
+    dispatcher = context.bot_data.get('job_dispatcher')
+    if dispatcher is not None:
+        await dispatcher.submit(message)
+        return
+
     user_id = message.from_user.id
     chat_id = message.chat_id
 
@@ -343,6 +662,13 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
                 text_processor=plan.text_processor,
                 provider_name=plan.provider_name,
                 model_name=plan.model_name,
+                single_pass=plan.single_pass,
+                audio_profile=profile_for(
+                    getattr(plan.transcript_model, "adapter_type", None),
+                    context.bot_data.get('audio_profiles'),
+                ),
+                conversion_pool=context.bot_data.get('conversion_pool'),
+                preprocessing=getattr(plan, "preprocessing", None),
             )
             logger.info(
                 "Pipeline resolved for user=%s: %s",
@@ -361,6 +687,7 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     total_start_time = time.monotonic()
     streamed_refine_delivery = False
+    stage_engine = get_stage_engine(context)
     
     # Determine file type and get file object
     file_obj, ext = await processor.determine_file_type(message)
@@ -379,6 +706,7 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     initial_progress = get_progress_message(c.MSG_PROGRESS_DOWNLOAD, 1, total_stages)
     ack_msg = await message.reply_text(initial_progress)
     remember_progress_message(message.chat_id, ack_msg.message_id, initial_progress)
+    typing_heartbeat = TypingHeartbeat(context, message.chat_id)
     
     try:
         # Stage 1: Download
@@ -387,7 +715,14 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             get_progress_message(c.MSG_PROGRESS_DOWNLOAD, 1, total_stages)
         )
         stage_start_time = time.monotonic()
-        await processor.download_audio(file_obj, ogg_path)
+        await _run_stage(
+            stage_engine,
+            "download",
+            processor.download_audio(
+                file_obj, ogg_path, context.bot_data.get('local_bot_api_files_dir')
+            ),
+            typing_heartbeat,
+        )
         _log_stage_success(user_id, "download", stage_start_time)
         
         # Stage 2: Convert to MP3
@@ -396,42 +731,140 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             get_progress_message(c.MSG_PROGRESS_CONVERT, 2, total_stages)
         )
         stage_start_time = time.monotonic()
-        await processor.convert_audio(ogg_path, mp3_path)
-        _log_stage_success(user_id, "convert", stage_start_time)
-        
-        # Stage 3: Transcribe
-        await update_progress(
-            context, message.chat_id, ack_msg.message_id,
-            get_progress_message(c.MSG_PROGRESS_TRANSCRIBE, 3, total_stages)
+        await _run_stage(
+            stage_engine, "convert", processor.convert_audio(ogg_path, mp3_path), typing_heartbeat
         )
+        _log_stage_success(user_id, "convert", stage_start_time)
+
+        # Requests prepared ahead of their rate-limit slot take it here;
+        # queued ones may still have to wait for their turn.
+        queued = provider_turn_pending()
+        if queued:
+            await update_progress(
+                context, message.chat_id, ack_msg.message_id,
+                get_progress_message(c.MSG_PROGRESS_WAITING_TURN, 2, total_stages)
+            )
         stage_start_time = time.monotonic()
-        raw_text = await processor.transcribe_audio(mp3_path)
-        _log_stage_success(user_id, "transcribe", stage_start_time)
+        await wait_for_provider_turn(ogg_path, mp3_path)
+        if queued:
+            _log_stage_success(user_id, "queue_wait", stage_start_time)
         
-        # Stage 4: Refine text
-        await update_progress(
-            context, message.chat_id, ack_msg.message_id,
-            get_progress_message(c.MSG_PROGRESS_REFINE, 4, total_stages)
-        )
-        stage_start_time = time.monotonic()
-        delivery_adapter = get_delivery_adapter(context)
-        if getattr(processor, "supports_refine_streaming", False) and delivery_adapter.supports_live_refine_streaming(context, ack_msg):
-            final_text = await processor.stream_refine_text(context, message.chat_id, ack_msg, raw_text)
-            streamed_refine_delivery = True
+        if getattr(processor, "uses_single_pass", False):
+            # Stage 3: Transcribe and refine in one provider call
+            raw_first = False
+            stage_start_time = time.monotonic()
+            final_text, streamed_refine_delivery = await _run_single_pass_stage(
+                context, processor, stage_engine, message.chat_id, ack_msg, mp3_path, total_stages,
+                heartbeat=typing_heartbeat,
+            )
+            _log_stage_success(user_id, "single_pass", stage_start_time)
         else:
-            final_text = await processor.refine_text(raw_text)
-        _log_stage_success(user_id, "refine", stage_start_time)
+            # Stage 3: Transcribe
+            transcribe_status = get_progress_message(c.MSG_PROGRESS_TRANSCRIBE, 3, total_stages)
+            await update_progress(context, message.chat_id, ack_msg.message_id, transcribe_status)
+            delivery_adapter = get_delivery_adapter(context)
+            stage_start_time = time.monotonic()
+            if getattr(processor, "supports_transcribe_streaming", False) and delivery_adapter.is_progressive_enabled():
+                transcription = processor.stream_transcribe_audio(
+                    context, message.chat_id, ack_msg, mp3_path, transcribe_status
+                )
+            else:
+                transcription = processor.transcribe_audio(mp3_path)
+            raw_text = await _run_stage(
+                stage_engine,
+                "transcribe",
+                _observe_provider_call(context, "transcribe", transcription),
+                typing_heartbeat,
+            )
+            _log_stage_success(user_id, "transcribe", stage_start_time)
+
+            raw_first = delivery_adapter.is_raw_first_enabled()
+            if raw_first:
+                # Raw-first delivery: show the transcript now and upgrade it in
+                # place once refinement completes.
+                stage_start_time = time.monotonic()
+                await _run_stage(
+                    stage_engine,
+                    "deliver",
+                    delivery_adapter.send_raw_preview(
+                        context, message.chat_id, ack_msg, processor.format_raw_response(raw_text)
+                    ),
+                    release_slot=True,
+                )
+                _log_stage_success(user_id, "send_raw_preview", stage_start_time)
+            else:
+                await update_progress(
+                    context, message.chat_id, ack_msg.message_id,
+                    get_progress_message(c.MSG_PROGRESS_REFINE, 4, total_stages)
+                )
+
+            # Stage 4: Refine text
+            stage_start_time = time.monotonic()
+            try:
+                if getattr(processor, "supports_refine_streaming", False) and delivery_adapter.supports_live_refine_streaming(context, ack_msg):
+                    final_text = await _run_stage(
+                        stage_engine,
+                        "refine",
+                        _observe_provider_call(
+                            context,
+                            "refine",
+                            processor.stream_refine_text(context, message.chat_id, ack_msg, raw_text),
+                        ),
+                        typing_heartbeat,
+                        release_slot=True,
+                    )
+                    streamed_refine_delivery = True
+                else:
+                    final_text = await _run_stage(
+                        stage_engine,
+                        "refine",
+                        _observe_provider_call(context, "refine", processor.refine_text(raw_text)),
+                        typing_heartbeat,
+                        release_slot=True,
+                    )
+            except Exception as e:
+                # The user already has the raw transcript: keep it, marked as
+                # unrefined, whatever made refinement fail.
+                if not raw_first:
+                    raise
+                logger.warning(
+                    "Refine failed after raw delivery | user_id=%s provider=%s error=%s duration_ms=%s",
+                    user_id,
+                    processor.provider_name,
+                    e.__class__.__name__,
+                    _elapsed_ms(stage_start_time),
+                )
+                await _run_stage(
+                    stage_engine,
+                    "deliver",
+                    processor.send_response(
+                        context,
+                        message.chat_id,
+                        ack_msg,
+                        processor.format_raw_response(raw_text, refine_failed=True),
+                    ),
+                    release_slot=True,
+                )
+                _log_pipeline_summary(user_id, processor.provider_name, total_start_time, "raw_only")
+                return
+            _log_stage_success(user_id, "refine", stage_start_time)
 
         if not streamed_refine_delivery:
             # Final: Send response
-            await update_progress(
-                context, message.chat_id, ack_msg.message_id,
-                get_progress_message(c.MSG_PROGRESS_FINALIZING, 4, total_stages)
-            )
+            if not raw_first:
+                await update_progress(
+                    context, message.chat_id, ack_msg.message_id,
+                    get_progress_message(c.MSG_PROGRESS_FINALIZING, 4, total_stages)
+                )
 
             full_text = processor.format_response(final_text)
             stage_start_time = time.monotonic()
-            await processor.send_response(context, message.chat_id, ack_msg, full_text)
+            await _run_stage(
+                stage_engine,
+                "deliver",
+                processor.send_response(context, message.chat_id, ack_msg, full_text),
+                release_slot=True,
+            )
             _log_stage_success(user_id, "send_response", stage_start_time)
         
         _log_pipeline_summary(user_id, processor.provider_name, total_start_time, "success")
@@ -473,6 +906,8 @@ async def handle_audio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         _log_pipeline_summary(user_id, processor.provider_name, total_start_time, "unexpected_error")
         
     finally:
+        await typing_heartbeat.stop()
+
         # Always cleanup temporary files
         processor.cleanup_files(ogg_path, mp3_path)
         
@@ -0,0 +1,196 @@
+"""
+Hedged requests for the fallback wrappers.
+
+When the primary model of a fallback chain has not answered by its observed
+p90/p95 latency, the same request is fired at the first fallback; the first
+success wins and the loser is cancelled.  A budget caps hedges at a fraction
+of all requests so the extra provider cost stays bounded.
+
+The policy is application-scoped (owned by ``PipelineResolver``), because
+the fallback wrappers are rebuilt for every request while latency history
+and budget must persist.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple, TypeVar
+
+from bot import constants as c
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """Decides when to hedge and keeps latency history and counters.
+
+    Parameters
+    ----------
+    enabled:
+        Master switch; when ``False`` :meth:`run` behaves like a plain
+        primary-then-fallback call.
+    percentile:
+        Primary latency percentile after which the hedge is fired.
+    budget_percent:
+        Maximum hedges as a percentage of all requests seen.
+    min_samples:
+        Primary latencies needed before the percentile is trusted.
+    window:
+        Number of recent primary latencies kept per operation/model.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: int = c.PROVIDER_HEDGING_DEFAULTS["hedging_percentile"],
+        budget_percent: int = c.PROVIDER_HEDGING_DEFAULTS["hedging_budget_percent"],
+        min_samples: int = c.PROVIDER_HEDGING_MIN_SAMPLES,
+        window: int = c.PROVIDER_HEDGING_WINDOW,
+    ):
+        self.enabled = enabled
+        self.percentile = min(99, max(50, int(percentile)))
+        self.budget_percent = min(100, max(0, int(budget_percent)))
+        self.min_samples = max(1, int(min_samples))
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_skipped_budget = 0
+        self.latency_saved_s = 0.0
+
+    @classmethod
+    def from_config(cls, resilience_config: Dict[str, Any]) -> "HedgingPolicy":
+        """Build the policy from ``RuntimeSnapshot.provider_resilience_config``."""
+        defaults = c.PROVIDER_HEDGING_DEFAULTS
+        return cls(
+            enabled=bool(resilience_config.get("hedging_enabled", defaults["hedging_enabled"])),
+            percentile=resilience_config.get("hedging_percentile", defaults["hedging_percentile"]),
+            budget_percent=resilience_config.get(
+                "hedging_budget_percent", defaults["hedging_budget_percent"]
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Latency model
+    # ------------------------------------------------------------------
+
+    def record_latency(self, key: str, seconds: float) -> None:
+        samples = self._latencies.get(key)
+        if samples is None:
+            samples = deque(maxlen=self._window)
+            self._latencies[key] = samples
+        samples.append(seconds)
+
+    def hedge_delay(self, key: str) -> float | None:
+        """Return the primary's latency percentile, or ``None`` if unknown."""
+        samples = self._latencies.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def _tail_latency(self, key: str, delay: float) -> float:
+        """Mean primary latency of requests slower than the hedge delay."""
+        tail = [s for s in self._latencies.get(key, ()) if s > delay]
+        return sum(tail) / len(tail) if tail else delay
+
+    def _take_budget(self) -> bool:
+        if self.hedges_fired + 1 > self.requests * self.budget_percent / 100:
+            self.hedges_skipped_budget += 1
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def run(
+        self,
+        key: str,
+        primary: Callable[[], Awaitable[T]],
+        secondary: Callable[[], Awaitable[T]],
+    ) -> Tuple[T, int]:
+        """Return ``(result, index)`` of the first success of the pair.
+
+        *secondary* starts as soon as *primary* fails, or — when hedging is
+        enabled, the latency model is warm and budget remains — once
+        *primary* has been running for longer than :meth:`hedge_delay`.
+        ``index`` is ``0`` when the primary answered and ``1`` otherwise.
+        When both fail the secondary's exception is raised.
+        """
+        self.requests += 1
+        start_time = time.monotonic()
+        delay = self.hedge_delay(key) if self.enabled else None
+        primary_task = asyncio.ensure_future(primary())
+        hedge_task: asyncio.Future | None = None
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if not done and self._take_budget():
+                self.hedges_fired += 1
+                logger.info(
+                    "Hedge fired | key=%s delay_ms=%s", key, round(delay * 1000)
+                )
+                hedge_task = asyncio.ensure_future(secondary())
+                return await self._race(key, start_time, delay, primary_task, hedge_task)
+
+            try:
+                result = await primary_task
+            except Exception:
+                return await secondary(), 1
+            self.record_latency(key, time.monotonic() - start_time)
+            return result, 0
+        finally:
+            for task in (primary_task, hedge_task):
+                if task is not None and not task.done():
+                    task.cancel()
+            pending = [t for t in (primary_task, hedge_task) if t is not None]
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _race(
+        self,
+        key: str,
+        start_time: float,
+        delay: float,
+        primary_task: asyncio.Future,
+        hedge_task: asyncio.Future,
+    ) -> Tuple[Any, int]:
+        pending = {primary_task, hedge_task}
+        errors: Dict[asyncio.Future, BaseException] = {}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is not None:
+                    errors[task] = error
+                    continue
+                elapsed = time.monotonic() - start_time
+                if task is hedge_task:
+                    self.hedges_won += 1
+                    self.latency_saved_s += max(0.0, self._tail_latency(key, delay) - elapsed)
+                    logger.info("Hedge won | key=%s elapsed_ms=%s", key, round(elapsed * 1000))
+                    # The primary took at least this long; keep it in the model.
+                    self.record_latency(key, elapsed)
+                    return task.result(), 1
+                self.record_latency(key, elapsed)
+                return task.result(), 0
+        raise errors.get(hedge_task) or errors[primary_task]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            "budget_percent": self.budget_percent,
+            "requests": self.requests,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "hedges_skipped_budget": self.hedges_skipped_budget,
+            "latency_saved_ms": round(self.latency_saved_s * 1000),
+        }
@@ -16,24 +16,37 @@ produces an immutable :class:`ExecutionPlan` for each accepted request.
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from bot.adapters import text_processor_registry, transcriber_registry
+from bot.adapters import single_pass_registry, text_processor_registry, transcriber_registry
+from bot.audio_profiles import AudioPreprocessing
 from bot.capabilities import CapabilityModel, detect_capabilities, merge_capabilities
 from bot.database import DatabaseManager
 from bot.exceptions import PipelineResolutionError
+from bot.hedging import HedgingPolicy
+from bot.constants import LOCAL_WHISPER_DEFAULT_MODEL, PROVIDER_RANKING_TIE_RATIO
 from bot.providers import (
+    Bulkhead,
+    BulkheadRegistry,
+    CircuitBreakerRegistry,
+    EndpointHealth,
+    EndpointHealthRegistry,
+    ProviderRateBudget,
+    RateBudgetRegistry,
     RefineError,
     RefineStreamEvent,
+    ResilientSinglePassProcessor,
     ResilientTextProcessor,
     ResilientTranscriber,
+    SinglePassProcessor,
     TextProcessor,
     TranscribeError,
     Transcriber,
     TranscriptionResult,
 )
+from bot.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +60,8 @@ _DEFAULT_MODELS: dict[str, str] = {
     "gemini": "gemini-2.0-flash",
     "gemini-native": "gemini-2.0-flash",
     "openai-compat": "gpt-4o-mini",
+    "local-whisper": LOCAL_WHISPER_DEFAULT_MODEL,
+    "mock": "mock",
 }
 
 _RESILIENCE_DEFAULTS = {
@@ -64,25 +79,54 @@ class FallbackTranscriber(Transcriber):
     """Wrapper that tries a primary transcriber then fallbacks in order.
 
     Logs which model was used on success.  If all models fail, raises
-    the last exception with a user-facing message.
+    the last exception with a user-facing message.  With a *hedging*
+    policy the first fallback may be fired while the primary is still
+    running (see :class:`~bot.hedging.HedgingPolicy`).
     """
 
-    def __init__(self, primary: Transcriber, fallbacks: list[Transcriber]):
+    def __init__(
+        self,
+        primary: Transcriber,
+        fallbacks: list[Transcriber],
+        hedging: HedgingPolicy | None = None,
+    ):
         self._primary = primary
         self._fallbacks = fallbacks
+        self._hedging = hedging
 
     async def transcribe(self, file_path: str) -> TranscriptionResult:
         first_name = getattr(self._primary, "provider_name", "primary")
-        try:
-            result = await self._primary.transcribe(file_path)
-            logger.info("Transcription succeeded | model=%s", first_name)
-            return result
-        except Exception as exc:
-            logger.warning(
-                "Transcription primary failed | model=%s error=%s",
-                first_name, exc.__class__.__name__,
-            )
-        for i, fb in enumerate(self._fallbacks):
+        fallbacks = self._fallbacks
+        if self._hedging is not None and fallbacks:
+            pair = (self._primary, fallbacks[0])
+            try:
+                result, index = await self._hedging.run(
+                    f"transcribe:{first_name}",
+                    lambda: pair[0].transcribe(file_path),
+                    lambda: pair[1].transcribe(file_path),
+                )
+                logger.info(
+                    "Transcription succeeded | model=%s",
+                    getattr(pair[index], "provider_name", "fallback-0" if index else "primary"),
+                )
+                return result
+            except Exception as exc:
+                logger.warning(
+                    "Transcription primary and first fallback failed | model=%s error=%s",
+                    first_name, exc.__class__.__name__,
+                )
+            fallbacks = fallbacks[1:]
+        else:
+            try:
+                result = await self._primary.transcribe(file_path)
+                logger.info("Transcription succeeded | model=%s", first_name)
+                return result
+            except Exception as exc:
+                logger.warning(
+                    "Transcription primary failed | model=%s error=%s",
+                    first_name, exc.__class__.__name__,
+                )
+        for i, fb in enumerate(fallbacks, start=len(self._fallbacks) - len(fallbacks)):
             fb_name = getattr(fb, "provider_name", f"fallback-{i}")
             try:
                 result = await fb.transcribe(file_path)
@@ -100,6 +144,41 @@ class FallbackTranscriber(Transcriber):
             "Riprova più tardi o contatta l'amministratore.",
         )
 
+    async def stream_transcribe(self, file_path: str):
+        """Stream from the first model that works.
+
+        A partial transcript is only a preview, so a model that fails
+        mid-stream is still replaced: a ``reset`` event tells the consumer
+        to drop the partial text before the next model's deltas.
+        """
+        chain = [(getattr(self._primary, "provider_name", "primary"), self._primary)]
+        chain += [(getattr(fb, "provider_name", f"fallback-{i}"), fb) for i, fb in enumerate(self._fallbacks)]
+        for i, (name, transcriber) in enumerate(chain):
+            started = False
+            try:
+                async for event in transcriber.stream_transcribe(file_path):
+                    started = True
+                    yield event
+                logger.info("Transcription streaming succeeded | model=%s", name)
+                return
+            except Exception as exc:
+                logger.warning(
+                    "Transcription streaming attempt %s failed | model=%s error=%s",
+                    i + 1, name, exc.__class__.__name__,
+                )
+                if started:
+                    yield RefineStreamEvent(type="reset", text="")
+        raise TranscribeError(
+            "All transcription models failed",
+            "Nessun modello di trascrizione disponibile. "
+            "Tutti i modelli configurati hanno fallito. "
+            "Riprova più tardi o contatta l'amministratore.",
+        )
+
+    @property
+    def supports_transcribe_streaming(self) -> bool:
+        return getattr(self._primary, "supports_transcribe_streaming", False)
+
     def get_capabilities(self):
         return self._primary.get_capabilities()
 
@@ -108,25 +187,54 @@ class FallbackTextProcessor(TextProcessor):
     """Wrapper that tries a primary text processor then fallbacks in order.
 
     Logs which model was used on success.  If all models fail, raises
-    the last exception with a user-facing message.
+    the last exception with a user-facing message.  :meth:`process` may
+    hedge onto the first fallback like :class:`FallbackTranscriber`;
+    streaming is never hedged because deltas are already on screen.
     """
 
-    def __init__(self, primary: TextProcessor, fallbacks: list[TextProcessor]):
+    def __init__(
+        self,
+        primary: TextProcessor,
+        fallbacks: list[TextProcessor],
+        hedging: HedgingPolicy | None = None,
+    ):
         self._primary = primary
         self._fallbacks = fallbacks
+        self._hedging = hedging
 
     async def process(self, raw_text: str) -> str:
         first_name = getattr(self._primary, "provider_name", "primary")
-        try:
-            result = await self._primary.process(raw_text)
-            logger.info("Refinement succeeded | model=%s", first_name)
-            return result
-        except Exception as exc:
-            logger.warning(
-                "Refinement primary failed | model=%s error=%s",
-                first_name, exc.__class__.__name__,
-            )
-        for i, fb in enumerate(self._fallbacks):
+        fallbacks = self._fallbacks
+        if self._hedging is not None and fallbacks:
+            pair = (self._primary, fallbacks[0])
+            try:
+                result, index = await self._hedging.run(
+                    f"refine:{first_name}",
+                    lambda: pair[0].process(raw_text),
+                    lambda: pair[1].process(raw_text),
+                )
+                logger.info(
+                    "Refinement succeeded | model=%s",
+                    getattr(pair[index], "provider_name", "fallback-0" if index else "primary"),
+                )
+                return result
+            except Exception as exc:
+                logger.warning(
+                    "Refinement primary and first fallback failed | model=%s error=%s",
+                    first_name, exc.__class__.__name__,
+                )
+            fallbacks = fallbacks[1:]
+        else:
+            try:
+                result = await self._primary.process(raw_text)
+                logger.info("Refinement succeeded | model=%s", first_name)
+                return result
+            except Exception as exc:
+                logger.warning(
+                    "Refinement primary failed | model=%s error=%s",
+                    first_name, exc.__class__.__name__,
+                )
+        for i, fb in enumerate(fallbacks, start=len(self._fallbacks) - len(fallbacks)):
             fb_name = getattr(fb, "provider_name", f"fallback-{i}")
             try:
                 result = await fb.process(raw_text)
@@ -187,6 +295,76 @@ class FallbackTextProcessor(TextProcessor):
         return self._primary.get_capabilities()
 
 
+class FallbackSinglePassProcessor(SinglePassProcessor):
+    """Wrapper that tries a primary single-pass processor then fallbacks.
+
+    Unlike :class:`FallbackTextProcessor`, a stream only moves on to the
+    next model while nothing has been yielded yet, so the user never sees
+    the text twice.  Not hedged: every attempt uploads the whole audio.
+    """
+
+    def __init__(
+        self,
+        primary: SinglePassProcessor,
+        fallbacks: list[SinglePassProcessor],
+    ):
+        self._primary = primary
+        self._fallbacks = fallbacks
+
+    def _chain(self) -> list[tuple[str, SinglePassProcessor]]:
+        chain = [(getattr(self._primary, "provider_name", "primary"), self._primary)]
+        for i, fb in enumerate(self._fallbacks):
+            chain.append((getattr(fb, "provider_name", f"fallback-{i}"), fb))
+        return chain
+
+    @staticmethod
+    def _all_failed() -> TranscribeError:
+        return TranscribeError(
+            "All single-pass models failed",
+            "Nessun modello single-pass disponibile. "
+            "Tutti i modelli configurati hanno fallito. "
+            "Riprova più tardi o contatta l'amministratore.",
+        )
+
+    async def process_audio(self, file_path: str) -> str:
+        for i, (name, processor) in enumerate(self._chain()):
+            try:
+                result = await processor.process_audio(file_path)
+                logger.info("Single-pass succeeded | model=%s", name)
+                return result
+            except Exception as exc:
+                logger.warning(
+                    "Single-pass attempt %s failed | model=%s error=%s",
+                    i + 1, name, exc.__class__.__name__,
+                )
+        raise self._all_failed()
+
+    async def stream_process_audio(self, file_path: str):
+        for i, (name, processor) in enumerate(self._chain()):
+            started = False
+            try:
+                async for event in processor.stream_process_audio(file_path):
+                    started = True
+                    yield event
+                logger.info("Single-pass streaming succeeded | model=%s", name)
+                return
+            except Exception as exc:
+                logger.warning(
+                    "Single-pass streaming attempt %s failed | model=%s error=%s",
+                    i + 1, name, exc.__class__.__name__,
+                )
+                if started:
+                    raise
+        raise self._all_failed()
+
+    @property
+    def supports_refine_streaming(self) -> bool:
+        return getattr(self._primary, "supports_refine_streaming", False)
+
+    def get_capabilities(self):
+        return self._primary.get_capabilities()
+
+
 # ---------------------------------------------------------------------------
 # Public types
 # ---------------------------------------------------------------------------
@@ -274,6 +452,15 @@ class ExecutionPlan:
     resolution_log:
         Ordered list of human-readable steps the resolver took to
         reach this plan (for debugging and auditing).
+    single_pass:
+        :class:`~bot.providers.SinglePassProcessor` that transcribes and
+        refines in one provider call, set for single-pass profiles whose
+        adapter supports it.  When present it replaces *transcriber* and
+        *text_processor* at execution time.
+    preprocessing:
+        :class:`~bot.audio_profiles.AudioPreprocessing` of the active
+        pipeline profile, applied by the convert stage; ``None`` when the
+        profile sets none.
     """
 
     transcriber: Transcriber
@@ -283,6 +470,8 @@ class ExecutionPlan:
     transcript_model: ModelRef | None = None
     refine_model: ModelRef | None = None
     resolution_log: List[str] = field(default_factory=list)
+    single_pass: SinglePassProcessor | None = None
+    preprocessing: AudioPreprocessing | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -331,8 +520,48 @@ class PipelineResolver:
         Initialised :class:`~bot.database.DatabaseManager`.
     """
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        hedging: HedgingPolicy | None = None,
+        retry: RetryPolicy | None = None,
+    ):
         self._db = db_manager
+        self._bulkheads = BulkheadRegistry()
+        self._circuits = CircuitBreakerRegistry()
+        self._health = EndpointHealthRegistry()
+        self._rate_budgets = RateBudgetRegistry()
+        self._hedging = hedging if hedging is not None else HedgingPolicy()
+        self._retry = retry if retry is not None else RetryPolicy()
+
+    def get_bulkhead_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return live usage of the provider/model bulkheads.
+
+        Keys are ``"provider:<id>"`` and ``"model:<entry id>"``.
+        """
+        return self._bulkheads.get_stats()
+
+    def get_endpoint_health_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return EWMA latency and error rate per provider/model endpoint."""
+        return self._health.get_stats()
+
+    def get_rate_budget_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return remaining RPM/TPM budget per provider (``"provider:<id>"``)."""
+        return self._rate_budgets.get_stats()
+
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """Return hedges fired/won and the estimated latency saved."""
+        return self._hedging.get_stats()
+
+    def _hedging_for_chain(self) -> HedgingPolicy | None:
+        return self._hedging if self._hedging.enabled else None
+
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """Return provider retries made, recovered and skipped (by cause)."""
+        return self._retry.get_stats()
+
+    def _retry_for_call(self) -> RetryPolicy | None:
+        return self._retry if self._retry.enabled else None
 
     # ------------------------------------------------------------------
     # Public API
@@ -399,7 +628,7 @@ class PipelineResolver:
 
         # 3. Resolve based on pipeline mode.
         if pipeline_mode == "single_pass":
-            return self._resolve_single_pass(profile, log)
+            return self._resolve_single_pass(profile, log, needs_refinement)
         else:
             return self._resolve_two_stage(profile, needs_refinement, log)
 
@@ -407,12 +636,15 @@ class PipelineResolver:
         self,
         profile: Dict[str, Any],
         log: list[str],
+        needs_refinement: bool = True,
     ) -> ExecutionPlan:
         """Resolve a single-pass pipeline: one model that does both
         transcription and refinement in a single API call.
 
         Uses the transcription_provider and finds a model with
-        ``single_pass_audio_to_text`` capability.
+        ``single_pass_audio_to_text`` capability.  The plan carries a
+        :class:`SinglePassProcessor` when refinement is needed and the
+        adapter implements one.
         """
         # 1. Check if profile has explicit stages.
         stages = profile.get("stages", [])
@@ -473,7 +705,7 @@ class PipelineResolver:
                 f"({len(fallback_ids)} fallback(s))"
             )
 
-            return self._build_plan_from_model_ref(
+            plan = self._build_plan_from_model_ref(
                 model_ref,
                 provider,
                 model_ref,
@@ -481,6 +713,9 @@ class PipelineResolver:
                 needs_refinement=True,
                 log=log,
             )
+            if not needs_refinement:
+                return plan
+            return self._with_single_pass(plan, model_ref, provider, log)
 
         # 2. Fallback to legacy provider-level resolution.
         tx_id = profile.get("transcription_provider_id")
@@ -513,7 +748,41 @@ class PipelineResolver:
             f"Single-pass: using provider '{provider['name']}' "
             f"(adapter: {adapter})"
         )
-        return self._build_plan(provider, needs_refinement=True, log=log)
+        plan = self._build_plan(provider, needs_refinement=True, log=log)
+        if not needs_refinement:
+            return plan
+        return self._with_single_pass(plan, plan.transcript_model, provider, log)
+
+    def _with_single_pass(
+        self,
+        plan: ExecutionPlan,
+        model_ref: ModelRef,
+        provider: Dict[str, Any],
+        log: list[str],
+    ) -> ExecutionPlan:
+        """Return *plan* with a single-pass processor for *model_ref*, or
+        unchanged when its adapter has no single-pass implementation."""
+        if not single_pass_registry.has_type(model_ref.adapter_type):
+            log.append(
+                f"Adapter '{model_ref.adapter_type}' has no single-pass "
+                f"implementation; running transcription and refinement separately"
+            )
+            return plan
+        log.append("Single-pass execution: audio and refinement prompt in one call")
+        return replace(
+            plan,
+            single_pass=self._create_fallback_chain_sp(model_ref, provider),
+        )
+
+    def _active_single_pass_profile_id(self) -> int | None:
+        """Return the active pipeline profile ID when it is in
+        ``single_pass`` mode, otherwise ``None``."""
+        profile_id = self._db.get_active_pipeline_profile_id()
+        if profile_id is None:
+            return None
+        if self._db.get_pipeline_profile_mode(profile_id) != "single_pass":
+            return None
+        return profile_id
 
     def _resolve_two_stage(
         self,
@@ -820,6 +1089,9 @@ class PipelineResolver:
         """Resolve the simplest valid pipeline and return an immutable
         execution plan.
 
+        The plan carries the audio preprocessing of the active pipeline
+        profile, whichever providers were selected.
+
         Parameters
         ----------
         request:
@@ -841,6 +1113,35 @@ class PipelineResolver:
             When no valid pipeline can be resolved (e.g. no provider
             supports transcription).
         """
+        plan = self._resolve_providers(request, refinement_globally_disabled)
+        preprocessing = self._active_preprocessing()
+        if preprocessing is None:
+            return plan
+        plan.resolution_log.append(f"Audio preprocessing: {preprocessing.label}")
+        return replace(plan, preprocessing=preprocessing)
+
+    def _active_preprocessing(self) -> AudioPreprocessing | None:
+        """Preprocessing of the active profile; invalid values are ignored."""
+        profile_id = self._db.get_active_pipeline_profile_id()
+        if profile_id is None:
+            return None
+        data = self._db.get_pipeline_profile_preprocessing(profile_id)
+        if not data:
+            return None
+        try:
+            preprocessing = AudioPreprocessing.from_dict(data)
+        except ValueError as e:
+            logger.warning(
+                "Ignoring invalid audio preprocessing | profile_id=%s error=%s", profile_id, e
+            )
+            return None
+        return preprocessing if preprocessing.enabled else None
+
+    def _resolve_providers(
+        self,
+        request: PipelineRequest | None,
+        refinement_globally_disabled: bool,
+    ) -> ExecutionPlan:
         log: list[str] = []
         mode = (request or PipelineRequest()).mode
 
@@ -865,6 +1166,17 @@ class PipelineResolver:
             f"refinement={'enabled' if needs_refinement else 'disabled'}"
         )
 
+        # An active single-pass profile opts into one provider call per
+        # request; everything else keeps the automatic resolution below.
+        if needs_refinement:
+            profile_id = self._active_single_pass_profile_id()
+            if profile_id is not None:
+                return self.resolve_from_profile(
+                    profile_id,
+                    request,
+                    refinement_globally_disabled=refinement_globally_disabled,
+                )
+
         # 3. Build capability profiles for each provider.
         profiles: list[tuple[dict[str, Any], CapabilityModel]] = []
         for p in enabled:
@@ -877,7 +1189,7 @@ class PipelineResolver:
             profiles.append((p, effective))
 
         # 4. Try to find a single provider that can do everything.
-        single = self._find_single_provider(profiles, needs_refinement)
+        single = self._find_single_provider(profiles, needs_refinement, log)
         if single is not None:
             provider, caps = single
             log.append(
@@ -889,7 +1201,7 @@ class PipelineResolver:
 
         # 5. Could not find a single provider. Try separate providers.
         if needs_refinement:
-            separate = self._find_separate_providers(profiles)
+            separate = self._find_separate_providers(profiles, log)
             if separate is not None:
                 tx_provider, ref_provider = separate
                 log.append(
@@ -930,46 +1242,114 @@ class PipelineResolver:
     # Internal resolution helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
     def _find_single_provider(
+        self,
         profiles: list[tuple[dict[str, Any], CapabilityModel]],
         needs_refinement: bool,
+        log: list[str],
     ) -> tuple[dict[str, Any], CapabilityModel] | None:
-        """Return the first provider that satisfies all required
+        """Return the best provider that satisfies all required
         capabilities, or ``None``.
 
-        Prefers providers with both transcription + refinement when
-        refinement is needed.  Otherwise returns the first provider
-        with at least transcription.
+        When refinement is needed only providers with both transcription
+        and refinement qualify.  Candidates are ranked by
+        :meth:`_rank_providers`.
         """
-        for provider, caps in profiles:
-            if caps.transcription:
-                if not needs_refinement or caps.refinement:
-                    return provider, caps
-        return None
+        candidates = [
+            (provider, caps)
+            for provider, caps in profiles
+            if caps.transcription and (not needs_refinement or caps.refinement)
+        ]
+        if not candidates:
+            return None
+        operations = ("transcribe", "refine") if needs_refinement else ("transcribe",)
+        ranked = self._rank_providers([p for p, _ in candidates], operations, log)
+        best_id = ranked[0]["id"]
+        return next((p, caps) for p, caps in candidates if p["id"] == best_id)
 
-    @staticmethod
     def _find_separate_providers(
+        self,
         profiles: list[tuple[dict[str, Any], CapabilityModel]],
+        log: list[str],
     ) -> tuple[dict[str, Any], dict[str, Any]] | None:
         """Return ``(transcription_provider, refinement_provider)`` when
         two different providers can satisfy each stage, or ``None``.
-        """
-        tx_provider: dict[str, Any] | None = None
-        ref_provider: dict[str, Any] | None = None
 
-        for provider, caps in profiles:
-            if caps.transcription and tx_provider is None:
-                tx_provider = provider
-            if caps.refinement and ref_provider is None:
-                ref_provider = provider
+        Each stage's candidates are ranked independently.
+        """
+        tx_candidates = [p for p, caps in profiles if caps.transcription]
+        ref_candidates = [p for p, caps in profiles if caps.refinement]
+        if not tx_candidates or not ref_candidates:
+            return None
 
-        if tx_provider is not None and ref_provider is not None:
-            if tx_provider["id"] != ref_provider["id"]:
-                return tx_provider, ref_provider
+        tx_provider = self._rank_providers(tx_candidates, ("transcribe",), log)[0]
+        ref_provider = self._rank_providers(ref_candidates, ("refine",), log)[0]
+        if tx_provider["id"] != ref_provider["id"]:
+            return tx_provider, ref_provider
 
         return None
 
+    def _rank_providers(
+        self,
+        providers: list[dict[str, Any]],
+        operations: tuple[str, ...],
+        log: list[str],
+    ) -> list[dict[str, Any]]:
+        """Order *providers* by expected completion time of *operations*.
+
+        Expected time is the EWMA latency inflated by the EWMA error rate
+        (see :meth:`EndpointHealth.expected_seconds`); providers without
+        samples are assumed as fast as the average measured candidate, so
+        new connections get tried.  Candidates within
+        ``PROVIDER_RANKING_TIE_RATIO`` of the fastest count as tied and are
+        ordered by their admin-pinned ``priority`` (higher first), then by
+        id, which is also the order when no statistics exist yet.
+        """
+        unknown_latency: dict[str, float] = {}
+        for operation in operations:
+            measured = [
+                latency
+                for p in providers
+                if (endpoint := self._health.peek(f"provider:{p['id']}")) is not None
+                and (latency := endpoint.latency(operation)) is not None
+            ]
+            unknown_latency[operation] = sum(measured) / len(measured) if measured else 0.0
+
+        def expected(provider: dict[str, Any]) -> float:
+            endpoint = self._health.peek(f"provider:{provider['id']}")
+            if endpoint is None:
+                return sum(unknown_latency.values())
+            return sum(
+                endpoint.expected_seconds(operation, unknown_latency[operation])
+                for operation in operations
+            )
+
+        estimates = {p["id"]: expected(p) for p in providers}
+        fastest = min(estimates.values())
+
+        def sort_key(provider: dict[str, Any]):
+            estimate = estimates[provider["id"]]
+            tied = estimate <= fastest * PROVIDER_RANKING_TIE_RATIO
+            return (
+                0 if tied else 1,
+                -int(provider.get("priority") or 0) if tied else 0,
+                estimate,
+                provider["id"],
+            )
+
+        ranked = sorted(providers, key=sort_key)
+        if len(ranked) > 1:
+            log.append(
+                f"Ranked {len(ranked)} candidate(s) for {'+'.join(operations)} "
+                "by expected completion time: "
+                + ", ".join(
+                    f"'{p['name']}' ~{estimates[p['id']]:.2f}s "
+                    f"(priority {int(p.get('priority') or 0)})"
+                    for p in ranked
+                )
+            )
+        return ranked
+
     # ------------------------------------------------------------------
     # Instance creation
     # ------------------------------------------------------------------
@@ -998,11 +1378,19 @@ class PipelineResolver:
             capabilities=effective,
         )
 
+        bulkheads = self._bulkheads_for(provider)
+        health = self._health_for(provider)
+        rate_budget = self._rate_budget_for(provider)
         transcriber = self._create_transcriber(
             adapter_type,
             credentials,
             endpoint,
             model_name,
+            bulkheads,
+            health,
+            rate_budget,
+            streaming=effective.streaming_transcription,
+            circuit=self._circuit_for(provider, None, "transcribe"),
         )
 
         text_processor: TextProcessor | None = None
@@ -1012,6 +1400,10 @@ class PipelineResolver:
                 credentials,
                 endpoint,
                 model_name,
+                bulkheads,
+                health,
+                rate_budget,
+                circuit=self._circuit_for(provider, None, "refine"),
             )
 
         return ExecutionPlan(
@@ -1065,9 +1457,18 @@ class PipelineResolver:
             capabilities=ref_effective,
         )
 
-        transcriber = self._create_transcriber(tx_type, tx_creds, tx_endpoint, tx_model)
+        transcriber = self._create_transcriber(
+            tx_type, tx_creds, tx_endpoint, tx_model,
+            self._bulkheads_for(tx_provider), self._health_for(tx_provider),
+            self._rate_budget_for(tx_provider),
+            streaming=tx_effective.streaming_transcription,
+            circuit=self._circuit_for(tx_provider, None, "transcribe"),
+        )
         text_processor = self._create_text_processor(
-            ref_type, ref_creds, ref_endpoint, ref_model
+            ref_type, ref_creds, ref_endpoint, ref_model,
+            self._bulkheads_for(ref_provider), self._health_for(ref_provider),
+            self._rate_budget_for(ref_provider),
+            circuit=self._circuit_for(ref_provider, None, "refine"),
         )
 
         return ExecutionPlan(
@@ -1080,16 +1481,90 @@ class PipelineResolver:
             resolution_log=log,
         )
 
+    def _bulkheads_for(
+        self,
+        provider: Dict[str, Any],
+        model_entry: Dict[str, Any] | None = None,
+    ) -> List[Bulkhead]:
+        """Return the shared bulkheads limiting calls to *provider* and
+        *model_entry* (provider first, so both are always taken in order)."""
+        max_queued = int(provider.get("max_queued") or 0)
+        bulkheads: List[Bulkhead] = []
+        provider_bulkhead = self._bulkheads.get(
+            f"provider:{provider.get('id')}",
+            int(provider.get("max_concurrent") or 0),
+            max_queued,
+        )
+        if provider_bulkhead is not None:
+            bulkheads.append(provider_bulkhead)
+        if model_entry is not None:
+            model_bulkhead = self._bulkheads.get(
+                f"model:{model_entry.get('id')}",
+                int(model_entry.get("max_concurrent") or 0),
+                max_queued,
+            )
+            if model_bulkhead is not None:
+                bulkheads.append(model_bulkhead)
+        return bulkheads
+
+    def _rate_budget_for(self, provider: Dict[str, Any]) -> ProviderRateBudget | None:
+        """Return the shared RPM/TPM budget of *provider*, or ``None`` when
+        neither limit is set."""
+        return self._rate_budgets.get(
+            f"provider:{provider.get('id')}",
+            int(provider.get("rpm_limit") or 0),
+            int(provider.get("tpm_limit") or 0),
+        )
+
+    def _health_for(
+        self,
+        provider: Dict[str, Any],
+        model_entry: Dict[str, Any] | None = None,
+    ) -> List[EndpointHealth]:
+        """Return the shared EWMA trackers fed by calls to *provider* and
+        *model_entry* (keyed like :meth:`_bulkheads_for`)."""
+        health = [self._health.get(f"provider:{provider.get('id')}")]
+        if model_entry is not None:
+            health.append(self._health.get(f"model:{model_entry.get('id')}"))
+        return health
+
+    def _circuit_for(
+        self,
+        provider: Dict[str, Any],
+        model_entry: Dict[str, Any] | None,
+        operation: str,
+    ) -> Any:
+        """Return the shared circuit breaker of *operation* on the model
+        entry (or, without one, the provider), so failures count across
+        requests."""
+        key = (
+            f"model:{model_entry.get('id')}"
+            if model_entry is not None
+            else f"provider:{provider.get('id')}"
+        )
+        return self._circuits.get(
+            f"{key}:{operation}",
+            _RESILIENCE_DEFAULTS["failure_threshold"],
+            _RESILIENCE_DEFAULTS["cooldown_seconds"],
+        )
+
     def _create_transcriber(
         self,
         adapter_type: str,
         credentials: str,
         endpoint: str,
         model_name: str,
+        bulkheads: List[Bulkhead] | None = None,
+        health: List[EndpointHealth] | None = None,
+        rate_budget: ProviderRateBudget | None = None,
+        streaming: bool = False,
+        circuit: Any = None,
     ) -> Transcriber:
         """Create a :class:`~bot.providers.Transcriber` instance for
         *adapter_type* with the given parameters, wrapped in a circuit
-        breaker by default."""
+        breaker with retries (and the given *bulkheads* / *health*
+        trackers / *rate_budget*) by default.  *streaming* mirrors the
+        model's ``streaming_transcription`` capability."""
         if not transcriber_registry.has_type(adapter_type):
             raise PipelineResolutionError(
                 f"Adapter sconosciuto: {adapter_type}",
@@ -1102,6 +1577,7 @@ class PipelineResolver:
             api_key=credentials,
             endpoint=endpoint,
             model_name=model_name,
+            streaming_transcription=streaming,
         )
 
         return ResilientTranscriber(
@@ -1109,6 +1585,11 @@ class PipelineResolver:
             provider_name=adapter_type,
             failure_threshold=_RESILIENCE_DEFAULTS["failure_threshold"],
             cooldown_seconds=_RESILIENCE_DEFAULTS["cooldown_seconds"],
+            bulkheads=bulkheads or (),
+            health=health or (),
+            retry=self._retry_for_call(),
+            rate_budget=rate_budget,
+            circuit=circuit,
         )
 
     def _create_text_processor(
@@ -1117,10 +1598,15 @@ class PipelineResolver:
         credentials: str,
         endpoint: str,
         model_name: str,
+        bulkheads: List[Bulkhead] | None = None,
+        health: List[EndpointHealth] | None = None,
+        rate_budget: ProviderRateBudget | None = None,
+        circuit: Any = None,
     ) -> TextProcessor:
         """Create a :class:`~bot.providers.TextProcessor` instance for
         *adapter_type* with the given parameters, wrapped in a circuit
-        breaker by default."""
+        breaker with retries (and the given *bulkheads* / *health*
+        trackers / *rate_budget*) by default."""
         if not text_processor_registry.has_type(adapter_type):
             raise PipelineResolutionError(
                 f"Adapter sconosciuto: {adapter_type}",
@@ -1140,6 +1626,50 @@ class PipelineResolver:
             provider_name=adapter_type,
             failure_threshold=_RESILIENCE_DEFAULTS["failure_threshold"],
             cooldown_seconds=_RESILIENCE_DEFAULTS["cooldown_seconds"],
+            bulkheads=bulkheads or (),
+            health=health or (),
+            retry=self._retry_for_call(),
+            rate_budget=rate_budget,
+            circuit=circuit,
+        )
+
+    def _create_single_pass(
+        self,
+        adapter_type: str,
+        credentials: str,
+        endpoint: str,
+        model_name: str,
+        bulkheads: List[Bulkhead] | None = None,
+        health: List[EndpointHealth] | None = None,
+        rate_budget: ProviderRateBudget | None = None,
+        circuit: Any = None,
+    ) -> SinglePassProcessor:
+        """Create a :class:`~bot.providers.SinglePassProcessor` for
+        *adapter_type*, wrapped like :meth:`_create_transcriber`."""
+        if not single_pass_registry.has_type(adapter_type):
+            raise PipelineResolutionError(
+                f"Adapter sconosciuto: {adapter_type}",
+                f"Il provider configurato con adapter '{adapter_type}' "
+                f"non supporta la modalità single-pass.",
+            )
+
+        inner = single_pass_registry.create(
+            adapter_type,
+            api_key=credentials,
+            endpoint=endpoint,
+            model_name=model_name,
+        )
+
+        return ResilientSinglePassProcessor(
+            inner,
+            provider_name=adapter_type,
+            failure_threshold=_RESILIENCE_DEFAULTS["failure_threshold"],
+            cooldown_seconds=_RESILIENCE_DEFAULTS["cooldown_seconds"],
+            bulkheads=bulkheads or (),
+            health=health or (),
+            retry=self._retry_for_call(),
+            rate_budget=rate_budget,
+            circuit=circuit,
         )
 
     def _create_fallback_chain_tx(
@@ -1152,11 +1682,21 @@ class PipelineResolver:
         Returns a :class:`FallbackTranscriber` when the ref has fallbacks,
         otherwise a plain :class:`ResilientTranscriber`.
         """
+        primary_entry = (
+            self._db.get_provider_model(primary_ref.model_entry_id)
+            if primary_ref.model_entry_id is not None
+            else None
+        )
         primary = self._create_transcriber(
             primary_ref.adapter_type,
             provider.get("credentials") or "",
             provider.get("endpoint") or "",
             primary_ref.model_id,
+            self._bulkheads_for(provider, primary_entry),
+            self._health_for(provider, primary_entry),
+            self._rate_budget_for(provider),
+            streaming=primary_ref.capabilities.streaming_transcription,
+            circuit=self._circuit_for(provider, primary_entry, "transcribe"),
         )
         if not primary_ref.fallback_entry_ids:
             return primary
@@ -1174,13 +1714,20 @@ class PipelineResolver:
                 fb_provider.get("credentials") or "",
                 fb_provider.get("endpoint") or "",
                 fb_entry["model_id"],
+                self._bulkheads_for(fb_provider, fb_entry),
+                self._health_for(fb_provider, fb_entry),
+                self._rate_budget_for(fb_provider),
+                streaming=CapabilityModel.from_dict(
+                    fb_entry.get("capabilities")
+                ).streaming_transcription,
+                circuit=self._circuit_for(fb_provider, fb_entry, "transcribe"),
             )
             fallback_list.append(fb_instance)
 
         if not fallback_list:
             return primary
 
-        return FallbackTranscriber(primary, fallback_list)
+        return FallbackTranscriber(primary, fallback_list, hedging=self._hedging_for_chain())
 
     def _create_fallback_chain_tp(
         self,
@@ -1192,11 +1739,20 @@ class PipelineResolver:
         Returns a :class:`FallbackTextProcessor` when the ref has fallbacks,
         otherwise a plain :class:`ResilientTextProcessor`.
         """
+        primary_entry = (
+            self._db.get_provider_model(primary_ref.model_entry_id)
+            if primary_ref.model_entry_id is not None
+            else None
+        )
         primary = self._create_text_processor(
             primary_ref.adapter_type,
             provider.get("credentials") or "",
             provider.get("endpoint") or "",
             primary_ref.model_id,
+            self._bulkheads_for(provider, primary_entry),
+            self._health_for(provider, primary_entry),
+            self._rate_budget_for(provider),
+            circuit=self._circuit_for(provider, primary_entry, "refine"),
         )
         if not primary_ref.fallback_entry_ids:
             return primary
@@ -1214,10 +1770,71 @@ class PipelineResolver:
                 fb_provider.get("credentials") or "",
                 fb_provider.get("endpoint") or "",
                 fb_entry["model_id"],
+                self._bulkheads_for(fb_provider, fb_entry),
+                self._health_for(fb_provider, fb_entry),
+                self._rate_budget_for(fb_provider),
+                circuit=self._circuit_for(fb_provider, fb_entry, "refine"),
             )
             fallback_list.append(fb_instance)
 
         if not fallback_list:
             return primary
 
-        return FallbackTextProcessor(primary, fallback_list)
+        return FallbackTextProcessor(primary, fallback_list, hedging=self._hedging_for_chain())
+
+    def _create_fallback_chain_sp(
+        self,
+        primary_ref: ModelRef,
+        provider: Dict[str, Any],
+    ) -> SinglePassProcessor:
+        """Create a :class:`SinglePassProcessor` with runtime fallback support.
+
+        Fallbacks whose adapter has no single-pass implementation are
+        skipped.  Returns a :class:`FallbackSinglePassProcessor` when any
+        fallback remains, otherwise a plain
+        :class:`~bot.providers.ResilientSinglePassProcessor`.
+        """
+        primary_entry = (
+            self._db.get_provider_model(primary_ref.model_entry_id)
+            if primary_ref.model_entry_id is not None
+            else None
+        )
+        primary = self._create_single_pass(
+            primary_ref.adapter_type,
+            provider.get("credentials") or "",
+            provider.get("endpoint") or "",
+            primary_ref.model_id,
+            self._bulkheads_for(provider, primary_entry),
+            self._health_for(provider, primary_entry),
+            self._rate_budget_for(provider),
+            circuit=self._circuit_for(provider, primary_entry, "single_pass"),
+        )
+
+        fallback_list: list[SinglePassProcessor] = []
+        for fb_entry_id in primary_ref.fallback_entry_ids:
+            fb_entry = self._db.get_provider_model(fb_entry_id)
+            if fb_entry is None or not fb_entry.get("enabled"):
+                continue
+            fb_provider = self._db.get_provider(fb_entry["provider_id"])
+            if fb_provider is None or not fb_provider.get("enabled"):
+                continue
+            fb_adapter = fb_provider.get("adapter_type", primary_ref.adapter_type)
+            if not single_pass_registry.has_type(fb_adapter):
+                continue
+            fallback_list.append(
+                self._create_single_pass(
+                    fb_adapter,
+                    fb_provider.get("credentials") or "",
+                    fb_provider.get("endpoint") or "",
+                    fb_entry["model_id"],
+                    self._bulkheads_for(fb_provider, fb_entry),
+                    self._health_for(fb_provider, fb_entry),
+                    self._rate_budget_for(fb_provider),
+                    circuit=self._circuit_for(fb_provider, fb_entry, "single_pass"),
+                )
+            )
+
+        if not fallback_list:
+            return primary
+
+        return FallbackSinglePassProcessor(primary, fallback_list)
@@ -0,0 +1,177 @@
+"""
+Staged pipeline engine (SEDA-style).
+
+Each audio pipeline stage — download, convert, transcribe, refine and
+deliver — has its own concurrency limit, so a request stuck on a slow LLM
+refine does not occupy capacity another request could use to download or
+convert.  ``AudioProcessor`` methods are the stage handlers; ``handle_audio``
+submits each of them through :meth:`StagedPipelineEngine.run`.
+
+Only the entry stage (download) has a bounded waiting queue and turns work
+away when it is full.  Later stages apply backpressure instead: a request
+that already downloaded, or paid for a transcription, waits for a slot
+rather than being thrown away.
+
+The engine is application-scoped (``Application.bot_data['stage_engine']``)
+and reports per-stage queue depth, wait and service time (average over the
+lifetime, 95th percentile over the last
+:data:`~bot.constants.PIPELINE_STAGE_STATS_WINDOW` requests) via
+:meth:`get_stats`.  The ``convert`` concurrency comes from the
+:class:`~bot.conversion.ConversionPool`: ``0`` means one FFmpeg process per
+core.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Dict, Mapping, TypeVar
+
+from bot import constants as c
+from bot.conversion import available_cpus
+from bot.exceptions import StageQueueFull
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGE_NAMES = ("download", "convert", "transcribe", "refine", "deliver")
+
+T = TypeVar("T")
+
+
+def _p95(samples: "deque[float]") -> float | None:
+    """95th percentile of the recent samples (nearest rank)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1)
+
+
+class PipelineStage:
+    """One stage: a concurrency limit plus a FIFO of waiting work.
+
+    With *max_queue* set the queue is bounded and the stage rejects work
+    beyond it; with ``None`` callers always wait for a slot.
+    """
+
+    def __init__(self, name: str, concurrency: int, max_queue: int | None = None):
+        self.name = name
+        self.concurrency = max(1, int(concurrency))
+        self.max_queue = None if max_queue is None else max(0, int(max_queue))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._service_ms_total = 0.0
+        self._wait_ms_total = 0.0
+        self._recent_service_ms: deque[float] = deque(maxlen=c.PIPELINE_STAGE_STATS_WINDOW)
+        self._recent_wait_ms: deque[float] = deque(maxlen=c.PIPELINE_STAGE_STATS_WINDOW)
+
+    async def run(self, work: Awaitable[T]) -> T:
+        """Wait for a free slot, then run *work*.
+
+        Raises :class:`StageQueueFull` when the queue is bounded, every slot
+        is busy and the waiting queue already holds ``max_queue`` requests.
+        """
+        if (
+            self.max_queue is not None
+            and self._semaphore.locked()
+            and self.queued >= self.max_queue
+        ):
+            self.rejected += 1
+            if inspect.iscoroutine(work):
+                work.close()
+            logger.warning(
+                "Pipeline stage queue full | stage=%s active=%s queued=%s",
+                self.name,
+                self.active,
+                self.queued,
+            )
+            raise StageQueueFull(f"Stage {self.name} queue is full", c.MSG_QUEUE_FULL)
+
+        wait_start = time.monotonic()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            if inspect.iscoroutine(work):
+                work.close()
+            raise
+        finally:
+            self.queued -= 1
+        wait_ms = (time.monotonic() - wait_start) * 1000
+        self._wait_ms_total += wait_ms
+        self._recent_wait_ms.append(wait_ms)
+
+        self.active += 1
+        service_start = time.monotonic()
+        try:
+            result = await work
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            service_ms = (time.monotonic() - service_start) * 1000
+            self._service_ms_total += service_ms
+            self._recent_service_ms.append(service_ms)
+            self.active -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_service_ms": round(self._service_ms_total / finished, 1) if finished else None,
+            "avg_wait_ms": round(self._wait_ms_total / finished, 1) if finished else None,
+            "p95_service_ms": _p95(self._recent_service_ms),
+            "p95_wait_ms": _p95(self._recent_wait_ms),
+        }
+
+
+class StagedPipelineEngine:
+    """Holds one :class:`PipelineStage` per pipeline stage.
+
+    Parameters
+    ----------
+    stage_config:
+        ``{stage_name: concurrency, ..., "queue_size": n}`` as resolved into
+        ``RuntimeSnapshot.pipeline_stage_config``.  Missing entries use
+        :data:`bot.constants.PIPELINE_STAGE_DEFAULTS`.  ``queue_size``
+        bounds the queue of the entry stage only.
+    """
+
+    def __init__(self, stage_config: Mapping[str, int] | None = None):
+        config = {**c.PIPELINE_STAGE_DEFAULTS, **(stage_config or {})}
+        if not config["convert"]:
+            config["convert"] = available_cpus()
+        entry = PIPELINE_STAGE_NAMES[0]
+        self._stages = {
+            name: PipelineStage(
+                name, config[name], config["queue_size"] if name == entry else None
+            )
+            for name in PIPELINE_STAGE_NAMES
+        }
+
+    def stage(self, name: str) -> PipelineStage:
+        return self._stages[name]
+
+    async def run(self, name: str, work: Awaitable[T]) -> T:
+        """Run *work* as part of stage *name*."""
+        return await self._stages[name].run(work)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return ``{stage: stats}`` for every stage, in pipeline order."""
+        return {name: stage.get_stats() for name, stage in self._stages.items()}
@@ -5,6 +5,7 @@ Architecture (P1 — Phase 3)
 ---------------------------
 Transcriber  ──>  TranscriptionResult  (audio → text)
 TextProcessor ──>  str                 (text → refined text)
+SinglePassProcessor ──>  str           (audio → refined text, one call)
 
 Legacy :class:`LLMProvider` is retained for backward compatibility.
 New code should depend on :class:`Transcriber` and :class:`TextProcessor`
@@ -15,12 +16,18 @@ text processing, or both.
 from __future__ import annotations
 
 import asyncio
+import base64
 import logging
+import math
+import mimetypes
 import os
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any, AsyncIterator, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence
 
 import google.genai as genai
 import openai
@@ -28,12 +35,15 @@ from openai import AsyncOpenAI, OpenAI
 
 from bot import constants as c
 from bot.exceptions import (
+    ProviderBulkheadFull,
     ProviderCircuitOpen,
+    ProviderRateLimited,
     RefineError,
     RefineTimeout,
     TranscribeError,
     TranscribeTimeout,
 )
+from bot.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -45,10 +55,15 @@ logger = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class RefineStreamEvent:
-    """Normalized provider-agnostic refine streaming event."""
+    """Normalized provider-agnostic streaming event.
 
-    type: str  # "delta" | "done"
+    Used for refined text, single-pass output and partial transcripts.
+    """
+
+    type: str  # "delta" | "done" | "reset" (drop partial transcript, see FallbackTranscriber)
     text: str
+    # Tokens the provider reported for the whole response ("done" only).
+    total_tokens: Optional[int] = None
 
 
 @dataclass(frozen=True)
@@ -80,6 +95,25 @@ def _log_provider_failure(provider_name: str, operation: str, error: Exception)
     )
 
 
+def is_throttling_error(error: BaseException) -> bool:
+    """Return ``True`` when *error* (or its cause chain) is an HTTP 429.
+
+    Works for the OpenAI SDK (``status_code``), google-genai (``code``)
+    and ``httpx.HTTPStatusError`` (``response.status_code``) exceptions,
+    which the adapters wrap with ``raise ... from``.
+    """
+    seen = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if getattr(current, "status_code", None) == 429 or getattr(current, "code", None) == 429:
+            return True
+        if getattr(getattr(current, "response", None), "status_code", None) == 429:
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
 def _allow_sensitive_logging() -> bool:
     return os.getenv("LOG_SENSITIVE_TEXT", "0").strip().lower() in {"1", "true", "yes"}
 
@@ -111,6 +145,10 @@ class _CircuitBreaker:
         self._failure_count = 0
         self._opened_at = 0.0
 
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at > 0 and time.monotonic() - self._opened_at < self.cooldown_seconds
+
     def check(self) -> None:
         if self._opened_at <= 0:
             return
@@ -150,6 +188,467 @@ class _CircuitBreaker:
         return result
 
 
+class CircuitBreakerRegistry:
+    """Process-wide circuit breakers keyed by endpoint and operation.
+
+    Pipeline wrappers are rebuilt for every request, so the failure count
+    must live here (owned by the application-scoped ``PipelineResolver``)
+    to carry over between requests and open the circuit under sustained
+    failure.
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, _CircuitBreaker] = {}
+
+    def get(self, key: str, failure_threshold: int, cooldown_seconds: int) -> _CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = _CircuitBreaker(failure_threshold, cooldown_seconds)
+            self._breakers[key] = breaker
+        return breaker
+
+
+# ---------------------------------------------------------------------------
+# Bulkheads — per-provider / per-model concurrency isolation
+# ---------------------------------------------------------------------------
+
+
+class Bulkhead:
+    """Concurrency limit with a bounded FIFO of waiting callers.
+
+    Unlike :class:`asyncio.Semaphore` the limits can be changed while work
+    is in flight (see :meth:`resize`), so edits from the admin UI apply to
+    the next request without a restart.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queued: int):
+        self.name = name
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queued = max(0, int(max_queued))
+        self.active = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def resize(self, max_concurrent: int, max_queued: int) -> None:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queued = max(0, int(max_queued))
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.active < self.max_concurrent:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.active += 1
+            waiter.set_result(None)
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot for the duration of the ``async with`` block.
+
+        Raises :class:`ProviderBulkheadFull` when every slot is busy and
+        ``max_queued`` callers are already waiting, so fallback wrappers can
+        move on to another provider.
+        """
+        if self.active < self.max_concurrent and not self.waiting:
+            self.active += 1
+        else:
+            if self.waiting >= self.max_queued:
+                self.rejected += 1
+                logger.warning(
+                    "Provider bulkhead full | bulkhead=%s active=%s waiting=%s",
+                    self.name,
+                    self.active,
+                    self.waiting,
+                )
+                raise ProviderBulkheadFull(
+                    f"Bulkhead {self.name} is full", c.MSG_PROVIDER_BUSY
+                )
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just before cancellation.
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+class BulkheadRegistry:
+    """Process-wide :class:`Bulkhead` instances keyed by provider/model.
+
+    Pipeline wrappers are rebuilt for every request, so limits must live in
+    a shared registry (owned by the application-scoped ``PipelineResolver``).
+    """
+
+    def __init__(self):
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+    def get(self, key: str, max_concurrent: int, max_queued: int) -> Optional[Bulkhead]:
+        """Return the bulkhead for *key*, or ``None`` when unlimited (``0``)."""
+        if not max_concurrent or max_concurrent <= 0:
+            self._bulkheads.pop(key, None)
+            return None
+        bulkhead = self._bulkheads.get(key)
+        if bulkhead is None:
+            bulkhead = Bulkhead(key, max_concurrent, max_queued)
+            self._bulkheads[key] = bulkhead
+        elif (bulkhead.max_concurrent, bulkhead.max_queued) != (max_concurrent, max_queued):
+            bulkhead.resize(max_concurrent, max_queued)
+        return bulkhead
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {key: bulkhead.get_stats() for key, bulkhead in self._bulkheads.items()}
+
+
+@asynccontextmanager
+async def _hold_bulkheads(bulkheads: Sequence[Bulkhead]):
+    async with AsyncExitStack() as stack:
+        for bulkhead in bulkheads:
+            await stack.enter_async_context(bulkhead.slot())
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Rate budgets — client-side RPM / TPM token buckets per provider connection
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Bucket of *per_minute* units refilled continuously.
+
+    The level may go negative when a request turns out to cost more than
+    was pre-charged; later requests then wait until the debt is repaid.
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = max(1, int(per_minute))
+        self._level = float(self.per_minute)
+        self._updated_at = time.monotonic()
+
+    @property
+    def level(self) -> float:
+        now = time.monotonic()
+        self._level = min(
+            self.per_minute, self._level + (now - self._updated_at) * self.per_minute / 60
+        )
+        self._updated_at = now
+        return self._level
+
+    def wait_seconds(self, amount: float) -> float:
+        """Seconds until *amount* (capped at the bucket size) is available."""
+        missing = min(amount, self.per_minute) - self.level
+        return max(0.0, missing * 60 / self.per_minute)
+
+    def take(self, amount: float) -> None:
+        self._level = self.level - amount
+
+    def resize(self, per_minute: int) -> None:
+        per_minute = max(1, int(per_minute))
+        self._level = min(per_minute, self.level)
+        self.per_minute = per_minute
+
+
+class ProviderRateBudget:
+    """Requests-per-minute and tokens-per-minute budget of one provider.
+
+    Each call takes one request and its estimated tokens up front
+    (:meth:`acquire`); :meth:`settle` then corrects the token bucket with
+    the ``usage`` the provider reported.  Calls wait for budget for up to
+    ``c.PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS`` and then raise
+    :class:`ProviderRateLimited`, so fallback wrappers can move on instead
+    of provoking a 429.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        tpm: int,
+        max_wait_seconds: float = c.PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS,
+    ):
+        self.name = name
+        self.max_wait_seconds = max_wait_seconds
+        self._rpm = TokenBucket(rpm) if rpm > 0 else None
+        self._tpm = TokenBucket(tpm) if tpm > 0 else None
+        self.waited = 0
+        self.rejected = 0
+        self._wait_s_total = 0.0
+
+    @property
+    def limits(self) -> tuple[int, int]:
+        return (
+            self._rpm.per_minute if self._rpm else 0,
+            self._tpm.per_minute if self._tpm else 0,
+        )
+
+    def resize(self, rpm: int, tpm: int) -> None:
+        self._rpm = self._resized(self._rpm, rpm)
+        self._tpm = self._resized(self._tpm, tpm)
+
+    @staticmethod
+    def _resized(bucket: Optional[TokenBucket], per_minute: int) -> Optional[TokenBucket]:
+        if per_minute <= 0:
+            return None
+        if bucket is None:
+            return TokenBucket(per_minute)
+        bucket.resize(per_minute)
+        return bucket
+
+    def _wait_seconds(self, tokens: int) -> float:
+        waits = [0.0]
+        if self._rpm is not None:
+            waits.append(self._rpm.wait_seconds(1))
+        if self._tpm is not None:
+            waits.append(self._tpm.wait_seconds(tokens))
+        return max(waits)
+
+    async def acquire(self, tokens: int) -> None:
+        start_time = time.monotonic()
+        while True:
+            wait = self._wait_seconds(tokens)
+            if wait <= 0:
+                break
+            waited = time.monotonic() - start_time
+            if waited + wait > self.max_wait_seconds:
+                self.rejected += 1
+                logger.warning(
+                    "Provider rate budget exhausted | budget=%s wait_s=%.1f", self.name, wait
+                )
+                raise ProviderRateLimited(
+                    f"Rate budget {self.name} exhausted", c.MSG_PROVIDER_RATE_LIMITED
+                )
+            await asyncio.sleep(wait)
+        elapsed = time.monotonic() - start_time
+        if elapsed > 0.001:
+            self.waited += 1
+            self._wait_s_total += elapsed
+        if self._rpm is not None:
+            self._rpm.take(1)
+        if self._tpm is not None:
+            self._tpm.take(tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Replace the pre-charged estimate with the reported usage."""
+        if self._tpm is not None and actual_tokens is not None:
+            self._tpm.take(actual_tokens - estimated_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        rpm, tpm = self.limits
+        return {
+            "rpm_limit": rpm,
+            "rpm_remaining": math.floor(self._rpm.level) if self._rpm else None,
+            "tpm_limit": tpm,
+            "tpm_remaining": math.floor(self._tpm.level) if self._tpm else None,
+            "waited": self.waited,
+            "avg_wait_ms": round(self._wait_s_total * 1000 / self.waited) if self.waited else None,
+            "rejected": self.rejected,
+        }
+
+
+class RateBudgetRegistry:
+    """Process-wide :class:`ProviderRateBudget` per provider connection
+    (``"provider:<id>"``), shared by its transcription and refine calls."""
+
+    def __init__(self):
+        self._budgets: Dict[str, ProviderRateBudget] = {}
+
+    def get(self, key: str, rpm: int, tpm: int) -> Optional[ProviderRateBudget]:
+        """Return the budget for *key*, or ``None`` when unlimited (both ``0``)."""
+        rpm, tpm = max(0, int(rpm or 0)), max(0, int(tpm or 0))
+        if not rpm and not tpm:
+            self._budgets.pop(key, None)
+            return None
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = ProviderRateBudget(key, rpm, tpm)
+            self._budgets[key] = budget
+        elif budget.limits != (rpm, tpm):
+            budget.resize(rpm, tpm)
+        return budget
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: budget.get_stats() for key, budget in self._budgets.items()}
+
+
+class _TokenUsage:
+    def __init__(self):
+        self.total_tokens: Optional[int] = None
+
+
+_token_usage: ContextVar[Optional[_TokenUsage]] = ContextVar("token_usage", default=None)
+
+
+def usage_total_tokens(usage: Any) -> Optional[int]:
+    """Total tokens of an OpenAI-style (``total_tokens``) or google-genai
+    (``total_token_count``) usage object, or ``None``."""
+    total = getattr(usage, "total_tokens", None)
+    if total is None:
+        total = getattr(usage, "total_token_count", None)
+    return total if isinstance(total, int) else None
+
+
+def record_token_usage(usage: Any) -> None:
+    """Report the ``usage`` of a provider response to the active rate budget."""
+    recorder = _token_usage.get()
+    total = usage_total_tokens(usage)
+    if recorder is None or total is None:
+        return
+    recorder.total_tokens = (recorder.total_tokens or 0) + total
+
+
+def estimate_refine_tokens(raw_text: str) -> int:
+    """Tokens a refine call is expected to use: the prompt plus an answer
+    about as long as the transcript."""
+    return c.PROVIDER_REFINE_PROMPT_TOKENS + math.ceil(2 * len(raw_text) * c.PROVIDER_TOKENS_PER_CHAR)
+
+
+@asynccontextmanager
+async def _charge_rate_budget(budget: Optional[ProviderRateBudget], estimated_tokens: int):
+    """Take budget before the call and settle it with the reported usage."""
+    if budget is None:
+        yield
+        return
+    await budget.acquire(estimated_tokens)
+    recorder = _TokenUsage()
+    token = _token_usage.set(recorder)
+    try:
+        yield
+    finally:
+        _token_usage.reset(token)
+        budget.settle(estimated_tokens, recorder.total_tokens)
+
+
+# ---------------------------------------------------------------------------
+# Endpoint health — EWMA latency / error rate for provider selection
+# ---------------------------------------------------------------------------
+
+
+class EndpointHealth:
+    """EWMA latency and error rate of one provider or model, per operation.
+
+    Latency is smoothed over successful calls only.  The error rate decays
+    towards zero with a half-life of ``c.PROVIDER_HEALTH_ERROR_HALF_LIFE_SECONDS``
+    while the endpoint is not called, so a provider that stopped receiving
+    traffic after a bad spell is eventually tried again.
+    """
+
+    def __init__(self, name: str, alpha: float = c.PROVIDER_HEALTH_EWMA_ALPHA):
+        self.name = name
+        self.alpha = alpha
+        self._latency: Dict[str, float] = {}
+        self._error_rate: Dict[str, float] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+
+    def record(self, operation: str, latency_s: float, ok: bool) -> None:
+        error_rate = self.error_rate(operation)
+        self._error_rate[operation] = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * error_rate
+        self._updated_at[operation] = time.monotonic()
+        self._samples[operation] = self._samples.get(operation, 0) + 1
+        if ok:
+            previous = self._latency.get(operation)
+            self._latency[operation] = latency_s if previous is None else (
+                self.alpha * latency_s + (1 - self.alpha) * previous
+            )
+
+    def latency(self, operation: str) -> Optional[float]:
+        return self._latency.get(operation)
+
+    def error_rate(self, operation: str) -> float:
+        error_rate = self._error_rate.get(operation, 0.0)
+        updated_at = self._updated_at.get(operation)
+        if not error_rate or updated_at is None:
+            return error_rate
+        age = time.monotonic() - updated_at
+        return error_rate * 0.5 ** (age / c.PROVIDER_HEALTH_ERROR_HALF_LIFE_SECONDS)
+
+    def expected_seconds(self, operation: str, unknown_latency: float) -> float:
+        """Expected completion time, counting the retries errors imply.
+
+        With error rate ``p`` a call needs ``1 / (1 - p)`` attempts on
+        average; ``p`` is capped at 0.9.  *unknown_latency* stands in for
+        endpoints without a successful sample yet.
+        """
+        latency = self._latency.get(operation, unknown_latency)
+        return latency / (1 - min(self.error_rate(operation), 0.9))
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            operation: {
+                "samples": samples,
+                "latency_ms": round(self._latency[operation] * 1000) if operation in self._latency else None,
+                "error_rate": round(self.error_rate(operation), 3),
+            }
+            for operation, samples in self._samples.items()
+        }
+
+
+class EndpointHealthRegistry:
+    """Process-wide :class:`EndpointHealth` keyed like the bulkheads
+    (``"provider:<id>"`` / ``"model:<entry id>"``)."""
+
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointHealth] = {}
+
+    def get(self, key: str) -> EndpointHealth:
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = EndpointHealth(key)
+            self._endpoints[key] = endpoint
+        return endpoint
+
+    def peek(self, key: str) -> Optional[EndpointHealth]:
+        return self._endpoints.get(key)
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {key: endpoint.get_stats() for key, endpoint in self._endpoints.items()}
+
+
+async def _observe_call(health: Sequence[EndpointHealth], operation: str, call: Awaitable[Any]):
+    """Await *call* and record its latency/outcome on every *health* entry.
+
+    Circuit, bulkhead and rate-budget rejections never reached the
+    endpoint, so they are not recorded.
+    """
+    if not health:
+        return await call
+    start_time = time.monotonic()
+    try:
+        result = await call
+    except (ProviderCircuitOpen, ProviderBulkheadFull, ProviderRateLimited):
+        raise
+    except Exception:
+        for endpoint in health:
+            endpoint.record(operation, time.monotonic() - start_time, ok=False)
+        raise
+    for endpoint in health:
+        endpoint.record(operation, time.monotonic() - start_time, ok=True)
+    return result
+
+
 # ===================================================================
 # NEW (P1) — Transcriber & TextProcessor interfaces
 # ===================================================================
@@ -162,18 +661,32 @@ class Transcriber(ABC):
     :class:`TranscriptionResult`.
     """
 
+    supports_transcribe_streaming = False
+
     @abstractmethod
     async def transcribe(self, file_path: str) -> TranscriptionResult:
         """Transcribe *file_path* and return a normalized result."""
         ...
 
+    async def stream_transcribe(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        """Yield partial transcript deltas, then ``done`` with the full text.
+
+        Default fallback: single delta followed by done.
+        """
+        result = await self.transcribe(file_path)
+        yield RefineStreamEvent(type="delta", text=result.text)
+        yield RefineStreamEvent(type="done", text=result.text)
+
     def get_capabilities(self) -> CapabilityModel:
         """Return the capabilities this transcriber provides.
 
         Override in subclasses that know their capabilities statically.
         """
         from bot.capabilities import CapabilityModel  # avoid circular import in module scope
-        return CapabilityModel(transcription=True)
+        return CapabilityModel(
+            transcription=True,
+            streaming_transcription=self.supports_transcribe_streaming,
+        )
 
 
 class TextProcessor(ABC):
@@ -211,13 +724,155 @@ class TextProcessor(ABC):
         )
 
 
+class SinglePassProcessor(ABC):
+    """Single-pass audio-to-text interface.
+
+    Implementations send the audio together with the refinement prompt in
+    one provider request and return the refined text directly, so the raw
+    transcript never leaves the provider.
+    """
+
+    supports_refine_streaming = False
+
+    @abstractmethod
+    async def process_audio(self, file_path: str) -> str:
+        """Transcribe and refine *file_path* in one call."""
+        ...
+
+    async def stream_process_audio(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        """Yield stream events for the refined text.
+
+        Default fallback: single delta followed by done.
+        """
+        result = await self.process_audio(file_path)
+        yield RefineStreamEvent(type="delta", text=result)
+        yield RefineStreamEvent(type="done", text=result)
+
+    def get_capabilities(self) -> CapabilityModel:
+        from bot.capabilities import CapabilityModel
+        return CapabilityModel(
+            transcription=True,
+            refinement=True,
+            streaming_refinement=self.supports_refine_streaming,
+            single_pass_audio_to_text=True,
+        )
+
+
 # ===================================================================
 # NEW (P1) — Resilience wrappers for the split interfaces
 # ===================================================================
 
 
-class ResilientTranscriber(Transcriber):
-    """Circuit-breaker wrapper around a :class:`Transcriber`."""
+class _ResilientCalls:
+    """Call path shared by the resilient wrappers.
+
+    Every call checks the circuit breaker, holds the *bulkheads* (provider,
+    then model) for its whole duration and lets the *retry* policy repeat
+    transient failures; every attempt is charged to the *rate_budget*,
+    recorded on the *health* trackers and counted by the circuit breaker.
+    The breaker is the shared *circuit* when given (see
+    :class:`CircuitBreakerRegistry`), else one private to this wrapper.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        provider_name: str,
+        failure_threshold: int,
+        cooldown_seconds: int,
+        bulkheads: Sequence[Bulkhead],
+        health: Sequence[EndpointHealth],
+        retry: RetryPolicy | None,
+        rate_budget: ProviderRateBudget | None,
+        circuit: _CircuitBreaker | None = None,
+    ):
+        self._inner = inner
+        self.provider_name = provider_name
+        self._cb = circuit or _CircuitBreaker(failure_threshold, cooldown_seconds)
+        self._bulkheads = tuple(bulkheads)
+        self._health = tuple(health)
+        self._retry = retry
+        self._rate_budget = rate_budget
+
+    async def _call(self, operation: str, fn, arg: Any, estimated_tokens: int):
+        self._cb.check()
+
+        async def attempt():
+            async with _charge_rate_budget(self._rate_budget, estimated_tokens):
+                return await _observe_call(
+                    self._health,
+                    operation,
+                    self._cb.call(operation, fn, arg),
+                )
+
+        async with _hold_bulkheads(self._bulkheads):
+            if self._retry is None:
+                return await attempt()
+            return await self._retry.run(operation, attempt, circuit=self._cb)
+
+    async def _stream(
+        self,
+        operation: str,
+        open_stream: Callable[[], AsyncIterator[RefineStreamEvent]],
+        estimated_tokens: int,
+    ) -> AsyncIterator[RefineStreamEvent]:
+        """Yield the events of ``open_stream()``, retrying only before the
+        first event — later deltas already reached the user."""
+        self._cb.check()
+        async with _hold_bulkheads(self._bulkheads):
+            deadline = self._retry.begin(operation) if self._retry is not None else 0.0
+            attempt = 1
+            delay = self._retry.base_delay if self._retry is not None else 0.0
+            while True:
+                if self._rate_budget is not None:
+                    await self._rate_budget.acquire(estimated_tokens)
+                start_time = time.monotonic()
+                started_streaming = False
+                used_tokens = None
+                try:
+                    async for event in open_stream():
+                        started_streaming = True
+                        if event.type == "done":
+                            used_tokens = event.total_tokens
+                        yield event
+                except ProviderCircuitOpen:
+                    raise
+                except Exception as error:
+                    self._cb.record_failure()
+                    elapsed = time.monotonic() - start_time
+                    for endpoint in self._health:
+                        endpoint.record(operation, elapsed, ok=False)
+                    # Deltas already reached the user; a retry would repeat them.
+                    if started_streaming or self._retry is None:
+                        raise
+                    delay = await self._retry.pause(
+                        operation, error, attempt, elapsed, deadline, delay, circuit=self._cb
+                    )
+                    if delay is None:
+                        raise
+                    self._cb.check()
+                    attempt += 1
+                    continue
+                finally:
+                    if self._rate_budget is not None:
+                        self._rate_budget.settle(estimated_tokens, used_tokens)
+                self._cb.record_success()
+                for endpoint in self._health:
+                    endpoint.record(operation, time.monotonic() - start_time, ok=True)
+                if attempt > 1:
+                    self._retry.recovered += 1
+                return
+
+
+class ResilientTranscriber(_ResilientCalls, Transcriber):
+    """Circuit-breaker wrapper around a :class:`Transcriber`.
+
+    Optional *bulkheads* (provider, then model) bound concurrent calls;
+    optional *health* entries record each call's latency and outcome;
+    an optional *retry* policy retries transient failures, each failed
+    attempt counting towards the circuit breaker; an optional
+    *rate_budget* charges every attempt against the provider's RPM/TPM.
+    """
 
     def __init__(
         self,
@@ -225,21 +880,48 @@ class ResilientTranscriber(Transcriber):
         provider_name: str = "",
         failure_threshold: int = 3,
         cooldown_seconds: int = 60,
+        bulkheads: Sequence[Bulkhead] = (),
+        health: Sequence[EndpointHealth] = (),
+        retry: RetryPolicy | None = None,
+        rate_budget: ProviderRateBudget | None = None,
+        circuit: _CircuitBreaker | None = None,
     ):
-        self._inner = transcriber
-        self.provider_name = provider_name
-        self._cb = _CircuitBreaker(failure_threshold, cooldown_seconds)
+        super().__init__(
+            transcriber, provider_name, failure_threshold, cooldown_seconds,
+            bulkheads, health, retry, rate_budget, circuit,
+        )
+
+    @property
+    def supports_transcribe_streaming(self) -> bool:
+        return getattr(self._inner, "supports_transcribe_streaming", False)
 
     def get_capabilities(self) -> CapabilityModel:
         """Delegate to inner transcriber."""
         return self._inner.get_capabilities()
 
     async def transcribe(self, file_path: str) -> TranscriptionResult:
-        return await self._cb.call("transcribe", self._inner.transcribe, file_path)
+        # Audio length is unknown up front: charge one request and settle
+        # tokens with the reported usage, if any.
+        return await self._call("transcribe", self._inner.transcribe, file_path, 0)
+
+    async def stream_transcribe(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        async for event in self._stream(
+            "transcribe", lambda: self._inner.stream_transcribe(file_path), 0
+        ):
+            yield event
 
 
-class ResilientTextProcessor(TextProcessor):
-    """Circuit-breaker wrapper around a :class:`TextProcessor`."""
+class ResilientTextProcessor(_ResilientCalls, TextProcessor):
+    """Circuit-breaker wrapper around a :class:`TextProcessor`.
+
+    Optional *bulkheads* (provider, then model) bound concurrent calls;
+    optional *health* entries record each call's latency and outcome;
+    an optional *retry* policy retries transient failures (for streams,
+    only before the first event), each failed attempt counting towards
+    the circuit breaker; an optional *rate_budget* pre-charges every
+    attempt with :func:`estimate_refine_tokens` and settles it with the
+    reported usage.
+    """
 
     def __init__(
         self,
@@ -247,10 +929,16 @@ class ResilientTextProcessor(TextProcessor):
         provider_name: str = "",
         failure_threshold: int = 3,
         cooldown_seconds: int = 60,
+        bulkheads: Sequence[Bulkhead] = (),
+        health: Sequence[EndpointHealth] = (),
+        retry: RetryPolicy | None = None,
+        rate_budget: ProviderRateBudget | None = None,
+        circuit: _CircuitBreaker | None = None,
     ):
-        self._inner = processor
-        self.provider_name = provider_name
-        self._cb = _CircuitBreaker(failure_threshold, cooldown_seconds)
+        super().__init__(
+            processor, provider_name, failure_threshold, cooldown_seconds,
+            bulkheads, health, retry, rate_budget, circuit,
+        )
 
     @property
     def supports_refine_streaming(self) -> bool:
@@ -261,19 +949,59 @@ class ResilientTextProcessor(TextProcessor):
         return self._inner.get_capabilities()
 
     async def process(self, raw_text: str) -> str:
-        return await self._cb.call("refine", self._inner.process, raw_text)
+        return await self._call(
+            "refine", self._inner.process, raw_text, estimate_refine_tokens(raw_text)
+        )
 
     async def stream_process(self, raw_text: str) -> AsyncIterator[RefineStreamEvent]:
-        self._cb.check()
-        try:
-            async for event in self._inner.stream_process(raw_text):
-                yield event
-        except ProviderCircuitOpen:
-            raise
-        except Exception:
-            self._cb.record_failure()
-            raise
-        self._cb.record_success()
+        async for event in self._stream(
+            "refine",
+            lambda: self._inner.stream_process(raw_text),
+            estimate_refine_tokens(raw_text),
+        ):
+            yield event
+
+
+class ResilientSinglePassProcessor(_ResilientCalls, SinglePassProcessor):
+    """Circuit-breaker wrapper around a :class:`SinglePassProcessor`.
+
+    Same protections as :class:`ResilientTranscriber`; calls are recorded
+    on the *health* trackers as the ``single_pass`` operation.
+    """
+
+    def __init__(
+        self,
+        processor: SinglePassProcessor,
+        provider_name: str = "",
+        failure_threshold: int = 3,
+        cooldown_seconds: int = 60,
+        bulkheads: Sequence[Bulkhead] = (),
+        health: Sequence[EndpointHealth] = (),
+        retry: RetryPolicy | None = None,
+        rate_budget: ProviderRateBudget | None = None,
+        circuit: _CircuitBreaker | None = None,
+    ):
+        super().__init__(
+            processor, provider_name, failure_threshold, cooldown_seconds,
+            bulkheads, health, retry, rate_budget, circuit,
+        )
+
+    @property
+    def supports_refine_streaming(self) -> bool:
+        return getattr(self._inner, "supports_refine_streaming", False)
+
+    def get_capabilities(self) -> CapabilityModel:
+        """Delegate to inner processor."""
+        return self._inner.get_capabilities()
+
+    async def process_audio(self, file_path: str) -> str:
+        return await self._call("single_pass", self._inner.process_audio, file_path, 0)
+
+    async def stream_process_audio(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        async for event in self._stream(
+            "single_pass", lambda: self._inner.stream_process_audio(file_path), 0
+        ):
+            yield event
 
 
 # ===================================================================
@@ -467,6 +1195,7 @@ class OpenAIWhisperTranscriber(Transcriber):
             _log_provider_failure("openai", "transcribe", e)
             raise TranscribeError(f"OpenAI transcription failed: {e}", c.MSG_ERROR_TRANSCRIBE) from e
 
+        record_token_usage(getattr(result, "usage", None))
         text = result.text
         _log_text_preview("Raw text", text)
         return TranscriptionResult(
@@ -548,6 +1277,7 @@ class OpenAITextProcessor(TextProcessor):
             _log_provider_failure("openai", "refine", e)
             raise RefineError(f"OpenAI refinement failed: {e}", c.MSG_ERROR_REFINE) from e
 
+        record_token_usage(getattr(resp, "usage", None))
         content = resp.choices[0].message.content
         out = content.strip() if content else ""
         _log_text_preview("Refined text", out)
@@ -584,7 +1314,13 @@ class OpenAITextProcessor(TextProcessor):
                 elif event.type == "response.completed":
                     completed = finalized_text if finalized_text is not None else "".join(accumulated)
                     _log_text_preview("Refined text", completed)
-                    yield RefineStreamEvent(type="done", text=completed)
+                    yield RefineStreamEvent(
+                        type="done",
+                        text=completed,
+                        total_tokens=usage_total_tokens(
+                            getattr(getattr(event, "response", None), "usage", None)
+                        ),
+                    )
                     return
         except openai.APITimeoutError as e:
             _log_provider_failure("openai", "stream_refine", e)
@@ -657,11 +1393,259 @@ class OpenAIProvider(LLMProvider, Transcriber, TextProcessor):
             yield event
 
 
+class OpenAISinglePassProcessor(SinglePassProcessor):
+    """OpenAI single-pass adapter for audio-capable chat models.
+
+    Sends the audio as an ``input_audio`` content part of a Chat
+    Completions request together with the refinement prompt (e.g.
+    ``gpt-4o-audio-preview``).  *base_url* points the same request at an
+    OpenAI-compatible endpoint.
+    """
+
+    supports_refine_streaming = True
+    provider_label = "openai"
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gpt-4o-audio-preview",
+        prompts: dict | None = None,
+        base_url: str | None = None,
+    ):
+        self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.model_name = model_name
+        self.prompts = prompts or {}
+
+    def _messages(self, file_path: str) -> list[dict[str, Any]]:
+        with open(file_path, "rb") as audio:
+            data = base64.b64encode(audio.read()).decode("ascii")
+        audio_format = os.path.splitext(file_path)[1].lstrip(".").lower() or "mp3"
+        return [
+            {"role": "system", "content": self.prompts.get("system", c.DEFAULT_PROMPT_SYSTEM)},
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": self.prompts.get("single_pass", c.DEFAULT_PROMPT_SINGLE_PASS),
+                    },
+                    {"type": "input_audio", "input_audio": {"data": data, "format": audio_format}},
+                ],
+            },
+        ]
+
+    async def process_audio(self, file_path: str) -> str:
+        logger.info("Single-pass audio %s with %s chat completions", file_path, self.provider_label)
+
+        def _sync():
+            client = self.client.with_options(
+                timeout=c.SINGLE_PASS_TIMEOUT_SECONDS,
+                max_retries=0,
+            )
+            return client.chat.completions.create(
+                model=self.model_name,
+                messages=self._messages(file_path),
+                temperature=0.3,
+            )
+
+        try:
+            resp = await asyncio.to_thread(_sync)
+        except openai.APITimeoutError as e:
+            _log_provider_failure(self.provider_label, "single_pass", e)
+            raise TranscribeTimeout("Timeout in single_pass", c.MSG_TIMEOUT_SINGLE_PASS) from e
+        except Exception as e:
+            _log_provider_failure(self.provider_label, "single_pass", e)
+            raise TranscribeError(f"Single-pass audio failed: {e}", c.MSG_ERROR_SINGLE_PASS) from e
+
+        record_token_usage(getattr(resp, "usage", None))
+        content = resp.choices[0].message.content
+        out = content.strip() if content else ""
+        _log_text_preview("Single-pass text", out)
+        return out
+
+    async def stream_process_audio(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        logger.info(
+            "Stream single-pass audio %s with %s chat completions", file_path, self.provider_label
+        )
+        accumulated: list[str] = []
+        usage = None
+        try:
+            messages = await asyncio.to_thread(self._messages, file_path)
+            client = self.async_client.with_options(
+                timeout=c.SINGLE_PASS_TIMEOUT_SECONDS,
+                max_retries=0,
+            )
+            stream = await client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=0.3,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            async for chunk in stream:
+                # The last chunk has no choices and carries the usage.
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                accumulated.append(delta)
+                yield RefineStreamEvent(type="delta", text=delta)
+        except openai.APITimeoutError as e:
+            _log_provider_failure(self.provider_label, "stream_single_pass", e)
+            raise TranscribeTimeout("Timeout in single_pass", c.MSG_TIMEOUT_SINGLE_PASS) from e
+        except Exception as e:
+            _log_provider_failure(self.provider_label, "stream_single_pass", e)
+            raise TranscribeError(
+                f"Streaming single-pass audio failed: {e}", c.MSG_ERROR_SINGLE_PASS
+            ) from e
+
+        completed = "".join(accumulated).strip()
+        _log_text_preview("Single-pass text", completed)
+        yield RefineStreamEvent(type="done", text=completed, total_tokens=usage_total_tokens(usage))
+
+
 # ===================================================================
 # ADAPTERS — Gemini
 # ===================================================================
 
 
+async def _gemini_call(fn, timeout_seconds: float, operation: str, timeout_message: str, *args, **kwargs):
+    """Run a blocking google-genai call in a thread with a timeout."""
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(fn, *args, **kwargs),
+            timeout=timeout_seconds,
+        )
+    except asyncio.TimeoutError as e:
+        raise TranscribeTimeout(f"Timeout in {operation}", timeout_message) from e
+
+
+# Strong references to in-flight remote deletions, so the event loop does
+# not garbage-collect them before they finish.
+_gemini_cleanup_tasks: set[asyncio.Task] = set()
+
+
+async def _gemini_delete_file(client, name: str) -> None:
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(client.files.delete, name=name),
+            timeout=c.GEMINI_FILE_DELETE_TIMEOUT_SECONDS,
+        )
+        logger.debug("Remote file %s deleted successfully", name)
+    except Exception as e:
+        logger.warning("Failed to cleanup remote file: %s", e)
+
+
+def _schedule_gemini_delete(client, name: str) -> None:
+    """Delete an uploaded file without holding up the response."""
+    task = asyncio.get_running_loop().create_task(_gemini_delete_file(client, name))
+    _gemini_cleanup_tasks.add(task)
+    task.add_done_callback(_gemini_cleanup_tasks.discard)
+
+
+async def drain_gemini_cleanup() -> None:
+    """Wait for pending remote file deletions (used on shutdown and in tests)."""
+    if _gemini_cleanup_tasks:
+        await asyncio.gather(*list(_gemini_cleanup_tasks), return_exceptions=True)
+
+
+@asynccontextmanager
+async def _gemini_uploaded_audio(
+    client,
+    file_path: str,
+    operation: str,
+    stage_timeout: float,
+    timeout_message: str,
+    error_message: str,
+):
+    """Upload *file_path* through the Gemini Files API, wait until it is
+    processed and yield it; the remote copy is deleted in the background
+    on exit."""
+    upload_timeout = min(30, stage_timeout)
+    poll_timeout = min(10, stage_timeout)
+
+    audio_file = None
+    try:
+        try:
+            audio_file = await _gemini_call(
+                client.files.upload, upload_timeout, operation, timeout_message, file=file_path
+            )
+        except TranscribeTimeout:
+            raise
+        except Exception as e:
+            _log_provider_failure("gemini", "upload_audio", e)
+            raise TranscribeError(f"Google AI File Upload failed: {e}", error_message) from e
+
+        # Wait for processing: short files are usually ready after the first
+        # short pause, long ones back off to GEMINI_FILE_POLL_MAX_SECONDS.
+        delay = c.GEMINI_FILE_POLL_INITIAL_SECONDS
+        while audio_file.state == "PROCESSING":
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, c.GEMINI_FILE_POLL_MAX_SECONDS)
+            try:
+                audio_file = await _gemini_call(
+                    client.files.get, poll_timeout, operation, timeout_message, name=audio_file.name
+                )
+            except TranscribeTimeout:
+                raise
+            except Exception as e:
+                _log_provider_failure("gemini", "check_upload_status", e)
+                raise TranscribeError(f"Failed to check file status: {e}", error_message) from e
+
+        if audio_file.state == "FAILED":
+            raise TranscribeError("Google AI File Upload failed.", error_message)
+
+        yield audio_file
+
+    finally:
+        if audio_file:
+            _schedule_gemini_delete(client, audio_file.name)
+
+
+@asynccontextmanager
+async def _gemini_audio(
+    client,
+    file_path: str,
+    operation: str,
+    stage_timeout: float,
+    timeout_message: str,
+    error_message: str,
+):
+    """Yield *file_path* as a ``generate_content`` part.
+
+    Files up to ``c.GEMINI_INLINE_AUDIO_MAX_BYTES`` are sent inline, which
+    saves the upload, status polling and delete round trips; larger ones
+    go through :func:`_gemini_uploaded_audio`.
+    """
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = None
+    if size is not None and size <= c.GEMINI_INLINE_AUDIO_MAX_BYTES:
+        data = await asyncio.to_thread(_read_bytes, file_path)
+        logger.debug("Gemini inline audio | operation=%s bytes=%s", operation, size)
+        yield genai.types.Part.from_bytes(data=data, mime_type=_audio_mime_type(file_path))
+        return
+    async with _gemini_uploaded_audio(
+        client, file_path, operation, stage_timeout, timeout_message, error_message
+    ) as audio_file:
+        yield audio_file
+
+
+def _read_bytes(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def _audio_mime_type(file_path: str) -> str:
+    mime_type, _ = mimetypes.guess_type(file_path)
+    return mime_type if mime_type and mime_type.startswith("audio/") else "audio/mpeg"
+
+
 class GeminiTranscriber(Transcriber):
     """Google Gemini transcription adapter."""
 
@@ -676,54 +1660,22 @@ class GeminiTranscriber(Transcriber):
     async def transcribe(self, file_path: str) -> TranscriptionResult:
         logger.info("Transcribe %s with Gemini (P1 adapter)", file_path)
 
-        from bot import constants as c
-
         stage_timeout = c.PROGRESS_TIMEOUTS.get("transcribe", 120)
-        upload_timeout = min(30, stage_timeout)
-        poll_timeout = min(10, stage_timeout)
-        generate_timeout = stage_timeout
-        cleanup_timeout = min(10, stage_timeout)
-
-        async def _call(fn, timeout_seconds: int, *args, **kwargs):
-            try:
-                return await asyncio.wait_for(
-                    asyncio.to_thread(fn, *args, **kwargs),
-                    timeout=timeout_seconds,
-                )
-            except asyncio.TimeoutError as e:
-                raise TranscribeTimeout("Timeout in transcribe", c.MSG_TIMEOUT_TRANSCRIBE) from e
-
-        audio_file = None
-        try:
-            # Upload
-            try:
-                audio_file = await _call(self.client.files.upload, upload_timeout, file=file_path)
-            except TranscribeTimeout:
-                raise
-            except Exception as e:
-                _log_provider_failure("gemini", "upload_audio", e)
-                raise TranscribeError(f"Google AI File Upload failed: {e}", c.MSG_ERROR_TRANSCRIBE) from e
-
-            # Wait for processing
-            while audio_file.state == "PROCESSING":
-                await asyncio.sleep(1)
-                try:
-                    audio_file = await _call(self.client.files.get, poll_timeout, audio_file.name)
-                except TranscribeTimeout:
-                    raise
-                except Exception as e:
-                    _log_provider_failure("gemini", "check_upload_status", e)
-                    raise TranscribeError(f"Failed to check file status: {e}", c.MSG_ERROR_TRANSCRIBE) from e
-
-            if audio_file.state == "FAILED":
-                raise TranscribeError("Google AI File Upload failed.", c.MSG_ERROR_TRANSCRIBE)
-
-            # Transcribe
+        async with _gemini_audio(
+            self.client,
+            file_path,
+            "transcribe",
+            stage_timeout,
+            c.MSG_TIMEOUT_TRANSCRIBE,
+            c.MSG_ERROR_TRANSCRIBE,
+        ) as audio_file:
             prompt = "Transcribe this audio file accurately. Output only text."
             try:
-                response = await _call(
+                response = await _gemini_call(
                     self.client.models.generate_content,
-                    generate_timeout,
+                    stage_timeout,
+                    "transcribe",
+                    c.MSG_TIMEOUT_TRANSCRIBE,
                     model=self.model_name,
                     contents=[prompt, audio_file],
                 )
@@ -733,20 +1685,10 @@ class GeminiTranscriber(Transcriber):
                 _log_provider_failure("gemini", "transcribe", e)
                 raise TranscribeError(f"Google AI Transcription failed: {e}", c.MSG_ERROR_TRANSCRIBE) from e
 
-            text = response.text
-            _log_text_preview("Gemini Raw text", text)
-            return TranscriptionResult(text=text)
-
-        finally:
-            if audio_file:
-                try:
-                    await asyncio.wait_for(
-                        asyncio.to_thread(self.client.files.delete, name=audio_file.name),
-                        timeout=cleanup_timeout,
-                    )
-                    logger.debug("Remote file %s deleted successfully", audio_file.name)
-                except Exception as e:
-                    logger.warning("Failed to cleanup remote file: %s", e)
+        record_token_usage(getattr(response, "usage_metadata", None))
+        text = response.text
+        _log_text_preview("Gemini Raw text", text)
+        return TranscriptionResult(text=text)
 
 
 class GeminiTextProcessor(TextProcessor):
@@ -816,6 +1758,7 @@ class GeminiTextProcessor(TextProcessor):
             _log_provider_failure("gemini", "refine", e)
             raise RefineError(f"Google AI Refinement failed: {e}", c.MSG_ERROR_REFINE) from e
 
+        record_token_usage(getattr(response, "usage_metadata", None))
         out = response.text.strip()
         _log_text_preview("Gemini Refined text", out)
         return out
@@ -838,10 +1781,13 @@ class GeminiTextProcessor(TextProcessor):
             )
 
         accumulated: list[str] = []
+        usage = None
         try:
             stream = await asyncio.wait_for(asyncio.to_thread(_sync_stream), timeout=refine_timeout)
 
             for chunk in stream:
+                # The last chunk carries the usage of the whole response.
+                usage = getattr(chunk, "usage_metadata", None) or usage
                 chunk_text = getattr(chunk, "text", None) or ""
                 if not chunk_text:
                     continue
@@ -850,7 +1796,9 @@ class GeminiTextProcessor(TextProcessor):
 
             completed = "".join(accumulated).strip()
             _log_text_preview("Gemini Refined text", completed)
-            yield RefineStreamEvent(type="done", text=completed)
+            yield RefineStreamEvent(
+                type="done", text=completed, total_tokens=usage_total_tokens(usage)
+            )
         except asyncio.TimeoutError as e:
             _log_provider_failure("gemini", "stream_refine", e)
             raise RefineTimeout("Timeout in refine", c.MSG_TIMEOUT_REFINE) from e
@@ -859,6 +1807,107 @@ class GeminiTextProcessor(TextProcessor):
             raise RefineError(f"Google AI Streaming Refinement failed: {e}", c.MSG_ERROR_REFINE) from e
 
 
+class GeminiSinglePassProcessor(SinglePassProcessor):
+    """Google Gemini single-pass adapter.
+
+    The uploaded audio and the refinement prompt go in the same
+    ``generate_content`` request.
+    """
+
+    supports_refine_streaming = True
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gemini-2.0-flash",
+        prompts: dict | None = None,
+    ):
+        self.client = genai.Client(api_key=api_key)
+        self.model_name = model_name
+        self.prompts = prompts or {}
+
+    def _prompt(self) -> str:
+        return (
+            f"{self.prompts.get('system', c.DEFAULT_PROMPT_SYSTEM)}\n\n"
+            f"{self.prompts.get('single_pass', c.DEFAULT_PROMPT_SINGLE_PASS)}"
+        )
+
+    def _audio(self, file_path: str):
+        return _gemini_audio(
+            self.client,
+            file_path,
+            "single_pass",
+            c.SINGLE_PASS_TIMEOUT_SECONDS,
+            c.MSG_TIMEOUT_SINGLE_PASS,
+            c.MSG_ERROR_SINGLE_PASS,
+        )
+
+    async def process_audio(self, file_path: str) -> str:
+        logger.info("Single-pass audio %s with Gemini", file_path)
+
+        async with self._audio(file_path) as audio_file:
+            try:
+                response = await _gemini_call(
+                    self.client.models.generate_content,
+                    c.SINGLE_PASS_TIMEOUT_SECONDS,
+                    "single_pass",
+                    c.MSG_TIMEOUT_SINGLE_PASS,
+                    model=self.model_name,
+                    contents=[self._prompt(), audio_file],
+                )
+            except TranscribeTimeout:
+                raise
+            except Exception as e:
+                _log_provider_failure("gemini", "single_pass", e)
+                raise TranscribeError(
+                    f"Google AI single-pass failed: {e}", c.MSG_ERROR_SINGLE_PASS
+                ) from e
+
+        record_token_usage(getattr(response, "usage_metadata", None))
+        out = (response.text or "").strip()
+        _log_text_preview("Gemini Single-pass text", out)
+        return out
+
+    async def stream_process_audio(self, file_path: str) -> AsyncIterator[RefineStreamEvent]:
+        logger.info("Stream single-pass audio %s with Gemini", file_path)
+
+        accumulated: list[str] = []
+        usage = None
+        async with self._audio(file_path) as audio_file:
+            try:
+                stream = await _gemini_call(
+                    self.client.models.generate_content_stream,
+                    c.SINGLE_PASS_TIMEOUT_SECONDS,
+                    "single_pass",
+                    c.MSG_TIMEOUT_SINGLE_PASS,
+                    model=self.model_name,
+                    contents=[self._prompt(), audio_file],
+                )
+                chunks = iter(stream)
+                while True:
+                    # Each chunk is a blocking network read.
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    chunk_text = getattr(chunk, "text", None) or ""
+                    if not chunk_text:
+                        continue
+                    accumulated.append(chunk_text)
+                    yield RefineStreamEvent(type="delta", text=chunk_text)
+            except TranscribeTimeout:
+                raise
+            except Exception as e:
+                _log_provider_failure("gemini", "stream_single_pass", e)
+                raise TranscribeError(
+                    f"Google AI streaming single-pass failed: {e}", c.MSG_ERROR_SINGLE_PASS
+                ) from e
+
+        completed = "".join(accumulated).strip()
+        _log_text_preview("Gemini Single-pass text", completed)
+        yield RefineStreamEvent(type="done", text=completed, total_tokens=usage_total_tokens(usage))
+
+
 class GeminiProvider(LLMProvider, Transcriber, TextProcessor):
     """Google Gemini Implementation.
 
@@ -1,9 +1,10 @@
 import asyncio
+import os
 import time
 import logging
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Dict
+from typing import Any, Deque, Dict, List, Optional
 from bot import constants as c
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,12 @@ class QueueEntry:
     position: int
     granted: bool = False
     activated: bool = False
+    # False while the request downloads and converts ahead of its turn;
+    # only ready entries are handed a slot.
+    ready: bool = True
+    # Admitted without queueing: counts as active for its user from the
+    # start and only waits here for its provider slot.
+    direct: bool = False
 
 
 @dataclass
@@ -25,11 +32,201 @@ class AdmissionResult:
     queued: bool = False
     queue_entry: QueueEntry | None = None
 
+
+class AdaptiveConcurrencyLimit:
+    """AIMD controller for the global concurrency limit.
+
+    Fed one sample per provider call (transcribe / refine) with its latency
+    and outcome:
+
+    - ``"timeout"`` and ``"throttled"`` (HTTP 429) multiply the limit by
+      ``backoff_ratio``;
+    - an ``"ok"`` call whose smoothed latency exceeds ``latency_tolerance``
+      times the stage's baseline (lowest smoothed latency seen, drifting
+      slowly upward) also backs off — queueing inside the provider is the
+      first sign of the throughput knee;
+    - after ``limit`` consecutive healthy samples taken while demand filled
+      the current limit, the limit grows by one.
+
+    Decreases closer than ``decrease_cooldown`` seconds apart count once, so
+    one overload episode hitting every in-flight call does not collapse the
+    limit to ``min_limit``.  The limit always stays within
+    ``[min_limit, max_limit]``.
+    """
+
+    EWMA_ALPHA = 0.3
+    BASELINE_DRIFT = 0.02
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float = c.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE,
+        backoff_ratio: float = c.ADAPTIVE_CONCURRENCY_BACKOFF_RATIO,
+        decrease_cooldown: float = c.ADAPTIVE_CONCURRENCY_DECREASE_COOLDOWN_SECONDS,
+        history_size: int = 10,
+    ):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = min(self.max_limit, max(self.min_limit, int(initial)))
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.decrease_cooldown = decrease_cooldown
+        self.changes: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._smoothed: Dict[str, float] = {}
+        self._baseline: Dict[str, float] = {}
+        self._healthy_streak = 0
+        self._last_decrease: float | None = None
+        self._counts = {"ok": 0, "timeout": 0, "throttled": 0, "error": 0}
+
+    def on_sample(self, stage: str, latency_s: float, outcome: str, demand: int) -> bool:
+        """Record one provider call; return ``True`` when the limit changed.
+
+        *demand* is the number of requests running or queued when the call
+        finished; the limit only grows while demand actually reaches it.
+        """
+        self._counts[outcome] = self._counts.get(outcome, 0) + 1
+        if outcome in ("timeout", "throttled"):
+            return self._decrease(outcome)
+        if outcome != "ok":
+            # Ordinary provider errors say nothing about load.
+            return False
+
+        smoothed = self._smoothed.get(stage)
+        smoothed = latency_s if smoothed is None else (
+            self.EWMA_ALPHA * latency_s + (1 - self.EWMA_ALPHA) * smoothed
+        )
+        self._smoothed[stage] = smoothed
+        baseline = self._baseline.get(stage)
+        if baseline is None or smoothed < baseline:
+            baseline = smoothed
+        else:
+            baseline += (smoothed - baseline) * self.BASELINE_DRIFT
+        self._baseline[stage] = baseline
+
+        if baseline > 0 and smoothed > baseline * self.latency_tolerance:
+            return self._decrease("latency", stage=stage, ratio=smoothed / baseline)
+
+        if demand < self.limit:
+            return False
+        self._healthy_streak += 1
+        if self._healthy_streak < self.limit or self.limit >= self.max_limit:
+            return False
+        return self._change(self.limit + 1, "healthy")
+
+    def _decrease(self, reason: str, **detail: Any) -> bool:
+        now = time.monotonic()
+        if self._last_decrease is not None and now - self._last_decrease < self.decrease_cooldown:
+            return False
+        self._last_decrease = now
+        return self._change(max(self.min_limit, int(self.limit * self.backoff_ratio)), reason, **detail)
+
+    def _change(self, new_limit: int, reason: str, **detail: Any) -> bool:
+        self._healthy_streak = 0
+        if new_limit == self.limit:
+            return False
+        event = {"at": time.time(), "from": self.limit, "to": new_limit, "reason": reason}
+        if "stage" in detail:
+            event["stage"] = detail["stage"]
+            event["latency_ratio"] = round(detail["ratio"], 2)
+        self.changes.append(event)
+        logger.info(
+            "Adaptive concurrency limit changed | from=%s to=%s reason=%s",
+            self.limit,
+            new_limit,
+            reason,
+        )
+        self.limit = new_limit
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        changes: List[Dict[str, Any]] = list(reversed(self.changes))
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "samples": dict(self._counts),
+            "latency_ms": {
+                stage: {
+                    "smoothed": round(self._smoothed[stage] * 1000),
+                    "baseline": round(self._baseline[stage] * 1000),
+                }
+                for stage in self._smoothed
+            },
+            "changes": changes,
+        }
+
+
+@dataclass
+class PreparationTicket:
+    size_bytes: int
+    released: bool = False
+
+
+class PreparationBudget:
+    """Bound on the work requests do before taking a global slot.
+
+    A request, queued or not, may download and convert its audio before
+    its slot, so the slot is only held while the provider works.  At most
+    ``max_jobs`` requests prepare ahead and their files may take at most
+    ``max_mb`` of disk.  A reservation starts from the Telegram file size;
+    :meth:`track` replaces it with the size of the prepared files.  A
+    request that gets no reservation takes its slot, or waits for its
+    turn, before downloading, as before.
+    """
+
+    def __init__(self, max_jobs: int = 4, max_mb: int = 200):
+        self.max_jobs = max(0, int(max_jobs))
+        self.max_bytes = max(0, int(max_mb)) * 1024 * 1024
+        self.jobs = 0
+        self.bytes = 0
+        self.prepared = 0
+        self.skipped = 0
+
+    def reserve(self, size_bytes: int) -> PreparationTicket | None:
+        """Reserve room for one request, or ``None`` when the budget is full."""
+        size_bytes = max(0, int(size_bytes))
+        if self.jobs >= self.max_jobs or self.bytes + size_bytes > self.max_bytes:
+            self.skipped += 1
+            return None
+        self.jobs += 1
+        self.bytes += size_bytes
+        self.prepared += 1
+        return PreparationTicket(size_bytes)
+
+    def track(self, ticket: PreparationTicket, *paths: str) -> None:
+        """Charge *ticket* with the actual size of the prepared files."""
+        if ticket.released:
+            return
+        size_bytes = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+        self.bytes += size_bytes - ticket.size_bytes
+        ticket.size_bytes = size_bytes
+
+    def release(self, ticket: PreparationTicket) -> None:
+        if ticket.released:
+            return
+        ticket.released = True
+        self.jobs -= 1
+        self.bytes = max(0, self.bytes - ticket.size_bytes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_jobs": self.max_jobs,
+            "max_mb": self.max_bytes // (1024 * 1024),
+            "jobs": self.jobs,
+            "mb": round(self.bytes / (1024 * 1024), 1),
+            "prepared": self.prepared,
+            "skipped": self.skipped,
+        }
+
+
 class RateLimiter:
-    def __init__(self, max_per_user=2, cooldown=30, max_global=6, max_file_size_mb=20, queue_enabled=True, max_queue_size=10, max_queued_per_user=1):
+    def __init__(self, max_per_user=2, cooldown=30, max_global=6, max_file_size_mb=20, queue_enabled=True, max_queue_size=10, max_queued_per_user=1, adaptive: Optional[AdaptiveConcurrencyLimit] = None):
         self.max_per_user = max_per_user
         self.cooldown = cooldown
-        self.max_global = max_global
+        self._max_global = max_global
+        self.adaptive = adaptive
         self.max_file_size_mb = max_file_size_mb
         self.queue_enabled = queue_enabled
         self.max_queue_size = max_queue_size
@@ -44,23 +241,44 @@ class RateLimiter:
         self._global_count = 0
         self._lock = asyncio.Lock()  # For thread safety
 
+    @property
+    def max_global(self) -> int:
+        """Global concurrency limit — the adaptive one when enabled."""
+        if self.adaptive is not None:
+            return self.adaptive.limit
+        return self._max_global
+
+    @max_global.setter
+    def max_global(self, value: int) -> None:
+        self._max_global = value
+
     def _activate_request_locked(self, user_id: int, now: float, increment_global: bool) -> None:
         self._active_requests[user_id] = self._active_requests.get(user_id, 0) + 1
         if increment_global:
             self._global_count += 1
         self._last_request_time[user_id] = now
 
-    def _pop_next_queue_entry_locked(self) -> QueueEntry | None:
-        while self._wait_queue:
-            entry = self._wait_queue.popleft()
-            queued_count = self._queued_requests.get(entry.user_id, 0)
-            if queued_count > 0:
-                self._queued_requests[entry.user_id] = queued_count - 1
-                if self._queued_requests[entry.user_id] <= 0:
-                    self._queued_requests.pop(entry.user_id, None)
+    def _release_user_locked(self, user_id: int) -> None:
+        if user_id in self._active_requests:
+            self._active_requests[user_id] -= 1
+            if self._active_requests[user_id] <= 0:
+                del self._active_requests[user_id]
+
+    def _grant_free_slots_locked(self) -> None:
+        """Hand free slots to waiting requests in arrival order.
+
+        A request still preparing keeps a slot reserved: the ones behind it
+        only take the slots left over, so none of them overtakes it.
+        """
+        free = self.max_global - self._global_count
+        for entry in list(self._wait_queue):
+            if free <= 0:
+                break
+            free -= 1
+            if entry.ready and self._remove_queue_entry_locked(entry):
                 entry.granted = True
-                return entry
-        return None
+                self._global_count += 1
+                entry.event.set()
 
     def _remove_queue_entry_locked(self, target: QueueEntry) -> bool:
         removed = False
@@ -69,6 +287,8 @@ class RateLimiter:
             entry = self._wait_queue.popleft()
             if entry is target and not removed:
                 removed = True
+                if entry.direct:
+                    continue
                 queued_count = self._queued_requests.get(entry.user_id, 0)
                 if queued_count > 0:
                     self._queued_requests[entry.user_id] = queued_count - 1
@@ -115,7 +335,19 @@ class RateLimiter:
             logger.debug(f"Request allowed for user {user_id}. Active: {self._active_requests[user_id]}, Global: {self._global_count}")
             return True, ""
 
-    async def request_admission(self, user_id: int, file_size_mb: float) -> AdmissionResult:
+    async def request_admission(
+        self, user_id: int, file_size_mb: float, prepare: bool = False
+    ) -> AdmissionResult:
+        """Admit, queue or reject a request.
+
+        A request is admitted directly only when a slot is left once every
+        waiting request has one reserved, so it never overtakes the queue.
+
+        With *prepare*, no request takes a slot on arrival: it gets a
+        ``queue_entry`` (``queued`` only when it had to queue), downloads
+        and converts, and is handed a slot once :meth:`mark_ready` says it
+        is prepared.  Slots are then only held during the provider stages.
+        """
         async with self._lock:
             now = time.time()
 
@@ -135,7 +367,16 @@ class RateLimiter:
                     self._last_rejection_time[user_id] = now
                 return AdmissionResult(False, c.MSG_CONCURRENT_LIMIT.format(max_concurrent=self.max_per_user))
 
-            if self._global_count < self.max_global:
+            if self._global_count + len(self._wait_queue) < self.max_global:
+                if prepare:
+                    entry = QueueEntry(
+                        user_id=user_id, event=asyncio.Event(), position=0,
+                        ready=False, direct=True,
+                    )
+                    self._wait_queue.append(entry)
+                    self._activate_request_locked(user_id, now, increment_global=False)
+                    logger.debug(f"Request admitted to prepare for user {user_id}. Active: {self._active_requests[user_id]}, Global: {self._global_count}")
+                    return AdmissionResult(True, queue_entry=entry)
                 self._activate_request_locked(user_id, now, increment_global=True)
                 logger.debug(f"Request allowed for user {user_id}. Active: {self._active_requests[user_id]}, Global: {self._global_count}")
                 return AdmissionResult(True)
@@ -146,11 +387,14 @@ class RateLimiter:
             if self._queued_requests.get(user_id, 0) >= self.max_queued_per_user:
                 return AdmissionResult(False, c.MSG_ALREADY_QUEUED)
 
-            if len(self._wait_queue) >= self.max_queue_size:
+            queued = sum(self._queued_requests.values())
+            if queued >= self.max_queue_size:
                 return AdmissionResult(False, c.MSG_QUEUE_FULL)
 
-            position = len(self._wait_queue) + 1
-            entry = QueueEntry(user_id=user_id, event=asyncio.Event(), position=position)
+            position = queued + 1
+            entry = QueueEntry(
+                user_id=user_id, event=asyncio.Event(), position=position, ready=not prepare
+            )
             self._wait_queue.append(entry)
             self._queued_requests[user_id] = self._queued_requests.get(user_id, 0) + 1
             logger.info(f"Request queued for user {user_id}. Position: {position}")
@@ -161,36 +405,73 @@ class RateLimiter:
             await entry.event.wait()
             async with self._lock:
                 entry.activated = True
-                self._activate_request_locked(entry.user_id, time.time(), increment_global=False)
+                if entry.direct:
+                    # Counted as active when it was admitted.
+                    self._last_request_time[entry.user_id] = time.time()
+                else:
+                    self._activate_request_locked(entry.user_id, time.time(), increment_global=False)
                 logger.debug(
                     f"Queued request activated for user {entry.user_id}. "
                     f"Active: {self._active_requests[entry.user_id]}, Global: {self._global_count}"
                 )
         except asyncio.CancelledError:
-            async with self._lock:
-                removed = self._remove_queue_entry_locked(entry)
-                if not removed and entry.granted and not entry.activated:
-                    next_entry = self._pop_next_queue_entry_locked()
-                    if next_entry is not None:
-                        next_entry.event.set()
-                    else:
-                        self._global_count = max(0, self._global_count - 1)
+            await self.cancel_queue_entry(entry)
             raise
+
+    async def mark_ready(self, entry: QueueEntry) -> None:
+        """Let a prepared request take its slot once its turn comes."""
+        async with self._lock:
+            entry.ready = True
+            self._grant_free_slots_locked()
+
+    async def cancel_queue_entry(self, entry: QueueEntry) -> None:
+        """Withdraw a queued request that will not wait for its turn.
+
+        A slot granted or reserved for it passes to the next queued request.
+        """
+        async with self._lock:
+            self._remove_queue_entry_locked(entry)
+            if entry.activated:
+                return
+            if entry.granted:
+                entry.granted = False
+                self._global_count = max(0, self._global_count - 1)
+            if entry.direct:
+                entry.direct = False
+                self._release_user_locked(entry.user_id)
+            self._grant_free_slots_locked()
     
     async def release_async(self, user_id: int):
         async with self._lock:
-            if user_id in self._active_requests:
-                self._active_requests[user_id] -= 1
-                if self._active_requests[user_id] <= 0:
-                    del self._active_requests[user_id]
-
-            next_entry = self._pop_next_queue_entry_locked()
-            if next_entry is not None:
-                next_entry.event.set()
-            else:
-                self._global_count = max(0, self._global_count - 1)
+            self._release_user_locked(user_id)
+            # Hand the slot to the next queued request unless the adaptive
+            # limit has shrunk below the number of requests in flight.
+            self._global_count = max(0, self._global_count - 1)
+            self._grant_free_slots_locked()
             logger.debug(f"Request released for user {user_id}. Active: {self._active_requests.get(user_id, 0)}, Global: {self._global_count}")
 
+    async def record_sample(self, stage: str, latency_s: float, outcome: str) -> None:
+        """Feed one provider call to the adaptive limit, if enabled.
+
+        When the limit grows, queued requests are admitted straight away.
+        """
+        if self.adaptive is None:
+            return
+        async with self._lock:
+            demand = self._global_count + len(self._wait_queue)
+            if not self.adaptive.on_sample(stage, latency_s, outcome, demand):
+                return
+            self._grant_free_slots_locked()
+
+    def get_adaptive_stats(self) -> Optional[Dict[str, Any]]:
+        """Return the adaptive limit state, or ``None`` when disabled."""
+        if self.adaptive is None:
+            return None
+        stats = self.adaptive.get_stats()
+        stats["in_flight"] = self._global_count
+        stats["queued"] = len(self._wait_queue)
+        return stats
+
     async def cleanup_expired_async(self, max_age_seconds: int = 3600) -> None:
         """Clean up old rate limit records (run periodically)."""
         async with self._lock:
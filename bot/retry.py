@@ -0,0 +1,345 @@
+"""
+Retry policy for provider calls.
+
+The provider SDK clients are built with ``max_retries=0`` so that every
+attempt goes through the circuit breaker, bulkheads and health trackers of
+the resilient wrappers.  :class:`RetryPolicy` adds retries on top of that:
+
+* only transient failures are retried — HTTP 408/429/5xx, connection
+  errors and timeouts; other 4xx responses and local rejections (open
+  circuit, full bulkhead, exhausted rate budget) fail immediately;
+* pauses use decorrelated jitter and honor ``Retry-After`` /
+  ``x-ratelimit-reset`` hints from the provider;
+* a retry is only made when the pause plus the duration of the failed
+  attempt still fits inside the stage deadline, so retries never push a
+  request past the timeout the user would hit anyway;
+* a budget refilled by every request caps retries at a percentage of
+  traffic, so an overloaded provider is not hit by a retry storm.
+
+Like :class:`~bot.hedging.HedgingPolicy` the policy is application-scoped
+(owned by ``PipelineResolver``) so its budget and counters persist across
+the per-request wrappers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, Mapping, TypeVar
+
+import httpx
+import openai
+
+from bot import constants as c
+from bot.decorators.timeout import remaining_stage_time
+from bot.exceptions import (
+    AudioPipelineTimeout,
+    ProviderBulkheadFull,
+    ProviderCircuitOpen,
+    ProviderRateLimited,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+# x-ratelimit-reset values above this are absolute epoch timestamps.
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def _status_of(error: BaseException) -> int | None:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    for value in (getattr(error, "status_code", None), getattr(error, "code", None)):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _headers_of(error: BaseException) -> Mapping[str, str]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return {}
+    try:
+        return {str(key).lower(): str(value) for key, value in headers.items()}
+    except AttributeError:
+        return {}
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse ``"2"``, ``"1.5"``, ``"250ms"`` or ``"1m30s"`` into seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _parse_retry_after(value: str) -> float | None:
+    seconds = _parse_duration(value)
+    if seconds is not None:
+        return seconds
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return moment.timestamp() - time.time()
+
+
+def retry_after_hint(error: BaseException) -> float | None:
+    """Return the pause the provider asked for, in seconds, if any.
+
+    Looks at ``retry-after-ms``, ``retry-after`` (seconds or HTTP date) and
+    the ``x-ratelimit-reset*`` family (seconds, Go-style durations such as
+    ``"6m0s"`` or epoch timestamps) on the response of *error* or any
+    exception in its cause chain.
+    """
+    for current in _error_chain(error):
+        headers = _headers_of(current)
+        if not headers:
+            continue
+        if "retry-after-ms" in headers:
+            seconds = _parse_duration(headers["retry-after-ms"])
+            if seconds is not None:
+                return max(0.0, seconds / 1000)
+        if "retry-after" in headers:
+            seconds = _parse_retry_after(headers["retry-after"])
+            if seconds is not None:
+                return max(0.0, seconds)
+        resets = []
+        for key, value in headers.items():
+            if not key.startswith("x-ratelimit-reset"):
+                continue
+            seconds = _parse_duration(value)
+            if seconds is None:
+                continue
+            if seconds > _EPOCH_THRESHOLD:
+                seconds -= time.time()
+            resets.append(max(0.0, seconds))
+        if resets:
+            return max(resets)
+    return None
+
+
+def classify_retryable(error: BaseException) -> str | None:
+    """Return why *error* is worth retrying, or ``None`` when it is not.
+
+    Reasons are ``"throttled"`` (HTTP 429), ``"server"`` (HTTP 5xx),
+    ``"timeout"`` and ``"connection"``.  The adapters wrap SDK errors with
+    ``raise ... from``, so the whole cause chain is inspected.
+    """
+    if isinstance(error, (ProviderCircuitOpen, ProviderBulkheadFull, ProviderRateLimited)):
+        return None
+    for current in _error_chain(error):
+        status = _status_of(current)
+        if status is not None:
+            if status == 429:
+                return "throttled"
+            if status == 408:
+                return "timeout"
+            if 500 <= status <= 599:
+                return "server"
+            if 400 <= status <= 499:
+                return None
+        if isinstance(current, (
+            openai.APITimeoutError, httpx.TimeoutException, asyncio.TimeoutError, AudioPipelineTimeout
+        )):
+            return "timeout"
+        if isinstance(current, (openai.APIConnectionError, httpx.TransportError, ConnectionError)):
+            return "connection"
+    return None
+
+
+class RetryPolicy:
+    """Retries transient provider failures within deadline and budget.
+
+    Parameters
+    ----------
+    enabled:
+        Master switch; when ``False`` :meth:`run` makes a single attempt.
+    max_attempts:
+        Attempts per call, including the first one.
+    budget_percent:
+        Retries allowed as a percentage of calls, on top of a burst of
+        ``c.PROVIDER_RETRY_BUDGET_BURST``.
+    base_delay / max_delay:
+        Bounds of the decorrelated-jitter pause, in seconds.  A
+        ``Retry-After`` longer than *max_delay* is not waited for.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_attempts: int = c.PROVIDER_RETRY_DEFAULTS["retry_max_attempts"],
+        budget_percent: int = c.PROVIDER_RETRY_DEFAULTS["retry_budget_percent"],
+        base_delay: float = c.PROVIDER_RETRY_BASE_DELAY_SECONDS,
+        max_delay: float = c.PROVIDER_RETRY_MAX_DELAY_SECONDS,
+        rng: random.Random | None = None,
+    ):
+        self.enabled = enabled
+        self.max_attempts = max(1, int(max_attempts))
+        self.budget_percent = min(100, max(0, int(budget_percent)))
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self._rng = rng or random.Random()
+        self._burst = c.PROVIDER_RETRY_BUDGET_BURST
+        self._tokens = float(self._burst)
+        self.calls = 0
+        self.retries = 0
+        self.recovered = 0
+        self.retries_by_reason: Dict[str, int] = {}
+        self.gave_up: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, resilience_config: Dict[str, Any]) -> "RetryPolicy":
+        """Build the policy from ``RuntimeSnapshot.provider_resilience_config``."""
+        defaults = c.PROVIDER_RETRY_DEFAULTS
+        return cls(
+            enabled=bool(resilience_config.get("retry_enabled", defaults["retry_enabled"])),
+            max_attempts=resilience_config.get("retry_max_attempts", defaults["retry_max_attempts"]),
+            budget_percent=resilience_config.get(
+                "retry_budget_percent", defaults["retry_budget_percent"]
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+
+    def begin(self, operation: str) -> float:
+        """Register a new call and return its monotonic deadline.
+
+        The deadline is the enclosing stage timeout when there is one,
+        otherwise ``c.PROGRESS_TIMEOUTS[operation]`` from now.
+        """
+        self.calls += 1
+        self._tokens = min(self._burst, self._tokens + self.budget_percent / 100)
+        remaining = remaining_stage_time()
+        if remaining is None:
+            remaining = c.PROGRESS_TIMEOUTS.get(operation, 60)
+        return time.monotonic() + remaining
+
+    def _jitter(self, previous: float) -> float:
+        return min(self.max_delay, self._rng.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    def _give_up(self, operation: str, reason: str, why: str) -> None:
+        self.gave_up[why] = self.gave_up.get(why, 0) + 1
+        logger.info(
+            "Provider retry skipped | operation=%s reason=%s cause=%s", operation, reason, why
+        )
+
+    async def pause(
+        self,
+        operation: str,
+        error: BaseException,
+        attempt: int,
+        attempt_seconds: float,
+        deadline: float,
+        previous_delay: float,
+        circuit: Any = None,
+    ) -> float | None:
+        """Sleep before attempt ``attempt + 1`` and return the pause taken.
+
+        Returns ``None`` — without sleeping — when *error* must propagate:
+        it is not transient, attempts are exhausted, the circuit opened,
+        the provider asked for a longer pause than ``max_delay``, another
+        attempt would not fit before *deadline*, or the budget is spent.
+        """
+        if not self.enabled:
+            return None
+        reason = classify_retryable(error)
+        if reason is None:
+            return None
+        if attempt >= self.max_attempts:
+            return self._give_up(operation, reason, "attempts")
+        if circuit is not None and circuit.is_open:
+            return self._give_up(operation, reason, "circuit")
+
+        delay = self._jitter(previous_delay)
+        hint = retry_after_hint(error)
+        if hint is not None:
+            if hint > self.max_delay:
+                return self._give_up(operation, reason, "retry_after")
+            delay = max(delay, hint)
+        if time.monotonic() + delay + attempt_seconds > deadline:
+            return self._give_up(operation, reason, "deadline")
+        if self._tokens < 1:
+            return self._give_up(operation, reason, "budget")
+
+        self._tokens -= 1
+        self.retries += 1
+        self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+        logger.info(
+            "Provider retry | operation=%s attempt=%s reason=%s delay_ms=%s",
+            operation,
+            attempt + 1,
+            reason,
+            round(delay * 1000),
+        )
+        await asyncio.sleep(delay)
+        return delay
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def run(
+        self,
+        operation: str,
+        attempt_call: Callable[[], Awaitable[T]],
+        circuit: Any = None,
+    ) -> T:
+        """Await ``attempt_call()`` until it succeeds or must not be retried.
+
+        *circuit* (a circuit breaker with ``is_open``) stops retries as soon
+        as the failures recorded by the attempts open it.
+        """
+        deadline = self.begin(operation)
+        attempt = 1
+        delay = self.base_delay
+        while True:
+            started = time.monotonic()
+            try:
+                result = await attempt_call()
+            except Exception as error:
+                delay = await self.pause(
+                    operation, error, attempt, time.monotonic() - started, deadline, delay, circuit
+                )
+                if delay is None:
+                    raise
+                attempt += 1
+                continue
+            if attempt > 1:
+                self.recovered += 1
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_attempts": self.max_attempts,
+            "budget_percent": self.budget_percent,
+            "calls": self.calls,
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "retries_by_reason": dict(self.retries_by_reason),
+            "gave_up": dict(self.gave_up),
+        }
@@ -13,9 +13,12 @@ from __future__ import annotations
 
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+from bot import constants as c
+from bot.admission import DEFAULT_ALLOWED_EXTENSIONS, parse_duration_tiers, parse_extensions
+from bot.audio_profiles import AudioProfile, parse_profile_map
 from bot.config import Config
 from bot.config_service import ConfigService
 
@@ -44,6 +47,25 @@ class RuntimeSnapshot:
         Resolved Telegram progressive-delivery feature flags.
     audio_dir:
         Path to the temporary audio file directory.
+    telegram_bot_api_config:
+        Optional self-hosted Bot API server (``base_url``, ``local_mode``,
+        ``files_dir``).
+    pipeline_stage_config:
+        Per-stage concurrency limits and waiting-queue size for the staged
+        pipeline engine.
+    pipeline_dispatch_enabled:
+        Hand audio jobs to ``bot.workers`` processes instead of running the
+        pipeline inside the bot process.
+    audio_profiles:
+        FFmpeg :class:`~bot.audio_profiles.AudioProfile` per transcriber
+        adapter type; adapters without an entry use the default profile.
+    conversion_nice:
+        ``nice`` increment of the FFmpeg processes (``0`` = unchanged).
+    conversion_backend:
+        ``"ffmpeg"`` (subprocess per file) or ``"pyav"`` (in-process).
+    admission_config:
+        Metadata admission rules (``max_duration_seconds``,
+        ``duration_tiers``, ``allowed_extensions``) checked before download.
     """
 
     provider_name: str
@@ -54,6 +76,23 @@ class RuntimeSnapshot:
     provider_resilience_config: Dict[str, Any]
     telegram_progressive_output_config: Dict[str, Any]
     audio_dir: str
+    telegram_bot_api_config: Dict[str, Any] = field(
+        default_factory=lambda: {"base_url": "", "local_mode": False, "files_dir": ""}
+    )
+    pipeline_stage_config: Dict[str, int] = field(
+        default_factory=lambda: dict(c.PIPELINE_STAGE_DEFAULTS)
+    )
+    pipeline_dispatch_enabled: bool = False
+    audio_profiles: Dict[str, AudioProfile] = field(default_factory=dict)
+    conversion_nice: int = 0
+    conversion_backend: str = "ffmpeg"
+    admission_config: Dict[str, Any] = field(
+        default_factory=lambda: {
+            "max_duration_seconds": 0,
+            "duration_tiers": {},
+            "allowed_extensions": list(DEFAULT_ALLOWED_EXTENSIONS),
+        }
+    )
 
     # ------------------------------------------------------------------
     # Factory methods
@@ -78,6 +117,13 @@ class RuntimeSnapshot:
                 config.telegram_progressive_output_config
             ),
             audio_dir=config.audio_dir,
+            telegram_bot_api_config=dict(
+                getattr(config, "telegram_bot_api_config", None)
+                or {"base_url": "", "local_mode": False, "files_dir": ""}
+            ),
+            pipeline_dispatch_enabled=bool(
+                getattr(config, "pipeline_dispatch_enabled", False)
+            ),
         )
 
     @classmethod
@@ -148,7 +194,32 @@ class RuntimeSnapshot:
             )
         else:
             streaming_enabled = False
-        telegram_progressive_output = {"enabled": streaming_enabled}
+
+        db_raw_first = config_service._db.get_setting("telegram_raw_first_delivery")
+        if db_raw_first is not None:
+            raw_first_enabled = db_raw_first.lower() in ("1", "true", "yes")
+        elif config is not None:
+            raw_first_enabled = config.telegram_progressive_output_config.get(
+                "raw_first", False
+            )
+        else:
+            raw_first_enabled = False
+        telegram_progressive_output = {
+            "enabled": streaming_enabled,
+            "raw_first": raw_first_enabled,
+        }
+
+        # Self-hosted Bot API server
+        bot_api = cls._resolve_bot_api(config_service, config)
+
+        # Staged pipeline engine limits (managed only by ConfigService)
+        stage_config = cls._resolve_pipeline_stages(config_service)
+
+        db_dispatch = config_service._db.get_setting("pipeline_dispatch_enabled")
+        if db_dispatch is not None:
+            dispatch_enabled = db_dispatch.lower() in ("1", "true", "yes")
+        else:
+            dispatch_enabled = bool(getattr(config, "pipeline_dispatch_enabled", False))
 
         # Audio dir — prefer Config, fallback to env/default
         if config is not None:
@@ -165,6 +236,13 @@ class RuntimeSnapshot:
             provider_resilience_config=resilience,
             telegram_progressive_output_config=telegram_progressive_output,
             audio_dir=audio_dir,
+            telegram_bot_api_config=bot_api,
+            pipeline_stage_config=stage_config,
+            pipeline_dispatch_enabled=dispatch_enabled,
+            audio_profiles=cls._resolve_audio_profiles(config_service),
+            conversion_nice=int(config_service._db.get_setting("conversion_nice") or 0),
+            conversion_backend=config_service._db.get_setting("conversion_backend") or "ffmpeg",
+            admission_config=cls._resolve_admission(config_service),
         )
 
     # ------------------------------------------------------------------
@@ -186,6 +264,10 @@ class RuntimeSnapshot:
             ("rate_limit_max_file_size_mb", "max_file_size_mb", 20),
             ("rate_limit_max_queue_size", "max_queue_size", 10),
             ("rate_limit_max_queued_per_user", "max_queued_per_user", 1),
+            ("rate_limit_adaptive_min", "adaptive_min", c.ADAPTIVE_CONCURRENCY_DEFAULTS["adaptive_min"]),
+            ("rate_limit_adaptive_max", "adaptive_max", c.ADAPTIVE_CONCURRENCY_DEFAULTS["adaptive_max"]),
+            ("rate_limit_prepare_max_jobs", "prepare_max_jobs", c.PREPARATION_DEFAULTS["prepare_max_jobs"]),
+            ("rate_limit_prepare_max_mb", "prepare_max_mb", c.PREPARATION_DEFAULTS["prepare_max_mb"]),
         ]
         for key, attr, default in int_keys:
             db_val = config_service._db.get_setting(key)
@@ -198,6 +280,7 @@ class RuntimeSnapshot:
 
         bool_keys = [
             ("rate_limit_queue_enabled", "queue_enabled", True),
+            ("rate_limit_adaptive_enabled", "adaptive_enabled", False),
         ]
         for key, attr, default in bool_keys:
             db_val = config_service._db.get_setting(key)
@@ -218,7 +301,11 @@ class RuntimeSnapshot:
         """Resolve provider-resilience settings from ConfigService or Config."""
         result: Dict[str, Any] = {}
 
-        bool_keys = [("provider_resilience_enabled", "enabled", True)]
+        bool_keys = [
+            ("provider_resilience_enabled", "enabled", True),
+            ("provider_retry_enabled", "retry_enabled", True),
+            ("provider_hedging_enabled", "hedging_enabled", False),
+        ]
         for key, attr, default in bool_keys:
             db_val = config_service._db.get_setting(key)
             if db_val is not None:
@@ -231,6 +318,14 @@ class RuntimeSnapshot:
         int_keys = [
             ("provider_resilience_failure_threshold", "failure_threshold", 3),
             ("provider_resilience_cooldown_seconds", "cooldown_seconds", 60),
+            ("provider_retry_max_attempts", "retry_max_attempts",
+             c.PROVIDER_RETRY_DEFAULTS["retry_max_attempts"]),
+            ("provider_retry_budget_percent", "retry_budget_percent",
+             c.PROVIDER_RETRY_DEFAULTS["retry_budget_percent"]),
+            ("provider_hedging_percentile", "hedging_percentile",
+             c.PROVIDER_HEDGING_DEFAULTS["hedging_percentile"]),
+            ("provider_hedging_budget_percent", "hedging_budget_percent",
+             c.PROVIDER_HEDGING_DEFAULTS["hedging_budget_percent"]),
         ]
         for key, attr, default in int_keys:
             db_val = config_service._db.get_setting(key)
@@ -242,3 +337,78 @@ class RuntimeSnapshot:
                 result[attr] = default
 
         return result
+
+    @staticmethod
+    def _resolve_bot_api(
+        config_service: ConfigService,
+        config: Config | None = None,
+    ) -> Dict[str, Any]:
+        """Resolve self-hosted Bot API server settings from ConfigService or Config."""
+        legacy = getattr(config, "telegram_bot_api_config", None) or {}
+
+        db_url = config_service._db.get_setting("telegram_bot_api_url")
+        base_url = db_url if db_url is not None else legacy.get("base_url", "")
+
+        db_local = config_service._db.get_setting("telegram_bot_api_local_mode")
+        if db_local is not None:
+            local_mode = db_local.lower() in ("1", "true", "yes")
+        else:
+            local_mode = bool(legacy.get("local_mode", False))
+
+        db_dir = config_service._db.get_setting("telegram_bot_api_files_dir")
+        files_dir = db_dir if db_dir is not None else legacy.get("files_dir", "")
+
+        return {
+            "base_url": (base_url or "").strip().rstrip("/"),
+            "local_mode": local_mode,
+            "files_dir": (files_dir or "").strip(),
+        }
+
+    @staticmethod
+    def _resolve_pipeline_stages(config_service: ConfigService) -> Dict[str, int]:
+        """Resolve staged-pipeline limits from ConfigService or the defaults."""
+        result: Dict[str, int] = {}
+        for attr, default in c.PIPELINE_STAGE_DEFAULTS.items():
+            key = (
+                "pipeline_stage_queue_size"
+                if attr == "queue_size"
+                else f"pipeline_stage_{attr}_concurrency"
+            )
+            db_val = config_service._db.get_setting(key)
+            result[attr] = int(db_val) if db_val is not None else default
+        return result
+
+    @staticmethod
+    def _resolve_audio_profiles(config_service: ConfigService) -> Dict[str, AudioProfile]:
+        """Resolve per-transcriber conversion profiles (ConfigService only).
+
+        An invalid stored value is logged and ignored, so conversion falls
+        back to the default profile instead of blocking startup.
+        """
+        try:
+            return parse_profile_map(config_service._db.get_setting("audio_conversion_profiles"))
+        except ValueError as e:
+            logger.warning("Ignoring invalid audio_conversion_profiles | error=%s", e)
+            return {}
+
+    @staticmethod
+    def _resolve_admission(config_service: ConfigService) -> Dict[str, Any]:
+        """Resolve metadata admission rules (ConfigService only).
+
+        Invalid duration tiers are logged and ignored, leaving the default
+        maximum duration in force.
+        """
+        db = config_service._db
+        try:
+            tiers = parse_duration_tiers(db.get_setting("admission_duration_tiers"))
+        except ValueError as e:
+            logger.warning("Ignoring invalid admission_duration_tiers | error=%s", e)
+            tiers = {}
+        extensions = db.get_setting("admission_allowed_extensions")
+        return {
+            "max_duration_seconds": int(db.get_setting("admission_max_duration_seconds") or 0),
+            "duration_tiers": tiers,
+            "allowed_extensions": list(
+                parse_extensions(extensions) if extensions is not None else DEFAULT_ALLOWED_EXTENSIONS
+            ),
+        }
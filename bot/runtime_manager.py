@@ -7,7 +7,7 @@ independently.
 
 Responsibilities
 ----------------
-- Start, stop, and restart Telegram polling.
+- Start, stop, and restart Telegram polling or webhook delivery.
 - Verify prerequisites before starting (state must be READY).
 - Expose health and state information for dashboards and health checks.
 - Support both blocking (legacy CLI) and non-blocking (frontend) modes.
@@ -17,16 +17,27 @@ Thread safety
 The ``_app`` reference is protected by a lock so that ``start()`` and
 ``stop()`` can be called from different threads.  This is relevant when
 the web frontend calls the manager from a request handler.
+
+Webhook mode
+------------
+When the ``telegram_update_mode`` setting is ``"webhook"`` and the bot is
+started from the web server (:meth:`start_async`), the manager registers a
+webhook on a secret, per-start path under :data:`WEBHOOK_PATH_PREFIX`.  The
+FastAPI app serves that path and hands each verified update to
+:meth:`enqueue_webhook_update`, which feeds ``Application.update_queue`` on
+the same (uvicorn) event loop.  The blocking CLI path always polls.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import secrets
 import threading
 import time
 from typing import Any, Dict, Optional
 
+from telegram import Update
 from telegram.ext import Application
 
 from bot.config import Config
@@ -37,6 +48,9 @@ from bot.state import AppState, StateChecker, StateInfo
 
 logger = logging.getLogger(__name__)
 
+UPDATE_MODES = ("polling", "webhook")
+WEBHOOK_PATH_PREFIX = "/telegram/webhook"
+
 
 class RuntimeManager:
     """Manages the Telegram bot lifecycle.
@@ -75,6 +89,12 @@ class RuntimeManager:
         self._app: Application | None = None
         self._start_time: float | None = None
 
+        # Active update delivery (set while running) and webhook secrets,
+        # regenerated on every start.
+        self._update_mode: str | None = None
+        self._webhook_path_token: str | None = None
+        self._webhook_secret: str | None = None
+
     # ------------------------------------------------------------------
     # Public API — lifecycle
     # ------------------------------------------------------------------
@@ -174,7 +194,8 @@ class RuntimeManager:
         This is the primary method for the web frontend.  Unlike
         :meth:`start` with ``block=False``, this method is a coroutine
         that awaits the PTB ``initialize()``, ``start()``, and
-        ``updater.start_polling()`` calls directly.
+        ``updater.start_polling()`` calls directly (or registers the
+        webhook when ``telegram_update_mode`` is ``"webhook"``).
 
         Raises
         ------
@@ -200,14 +221,39 @@ class RuntimeManager:
         try:
             await self._app.initialize()
             await self._app.start()
-            await self._app.updater.start_polling()
+            await self._start_receiving_updates(self._app)
         except Exception:
             logger.exception("Failed to start bot in async mode")
             with self._lock:
                 self._app = None
                 self._start_time = None
+            self._clear_webhook_state()
             raise
 
+    async def _start_receiving_updates(self, app: Application) -> None:
+        """Start polling or register the webhook, per ``telegram_update_mode``."""
+        mode = self.get_update_mode()
+        webhook_url = self.get_webhook_url()
+        if mode == "webhook" and not webhook_url:
+            logger.warning(
+                "Webhook mode selected but telegram_webhook_url is empty; "
+                "falling back to polling"
+            )
+            mode = "polling"
+
+        if mode == "webhook":
+            self._webhook_path_token = secrets.token_urlsafe(24)
+            self._webhook_secret = secrets.token_urlsafe(32)
+            await app.bot.set_webhook(
+                url=f"{webhook_url}{WEBHOOK_PATH_PREFIX}/{self._webhook_path_token}",
+                secret_token=self._webhook_secret,
+                allowed_updates=Update.ALL_TYPES,
+            )
+            logger.info("Telegram webhook registered | base_url=%s", webhook_url)
+        else:
+            await app.updater.start_polling()
+        self._update_mode = mode
+
     async def _start_async_task(self) -> None:
         """Internal wrapper that runs :meth:`start_async` and logs
         unhandled exceptions so the event loop doesn't swallow them."""
@@ -234,6 +280,7 @@ class RuntimeManager:
                 return
             self._app = None
             self._start_time = None
+        self._clear_webhook_state()
 
         logger.info("RuntimeManager stopping Telegram bot")
 
@@ -265,12 +312,49 @@ class RuntimeManager:
 
         logger.info("RuntimeManager stopping Telegram bot (async)")
 
+        was_webhook = self._update_mode == "webhook"
+        self._clear_webhook_state()
+
         if app.running:
+            if was_webhook:
+                try:
+                    await app.bot.delete_webhook()
+                except Exception:
+                    logger.warning("Failed to delete Telegram webhook on shutdown")
             try:
-                await app.stop()
-                await app.shutdown()
+                await self._shutdown_app(app)
             except Exception:
                 logger.exception("Error during bot shutdown (async)")
+        self._close_conversion_pool(app)
+
+    async def set_update_mode_async(
+        self, mode: str, webhook_url: str | None = None
+    ) -> None:
+        """Persist the update delivery mode and apply it to a running bot.
+
+        Raises
+        ------
+        ValueError:
+            If *mode* is unknown or webhook mode has no public URL.
+        """
+        if mode not in UPDATE_MODES:
+            raise ValueError(f"Unknown update mode: {mode}")
+        if webhook_url is not None:
+            errors = self._config_service.update_setting(
+                "telegram_webhook_url", webhook_url.strip().rstrip("/")
+            )
+            if errors:
+                raise ValueError("; ".join(errors))
+        if mode == "webhook" and not self.get_webhook_url():
+            raise ValueError("Webhook mode requires telegram_webhook_url")
+        errors = self._config_service.update_setting("telegram_update_mode", mode)
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        logger.info("Telegram update mode set to %s", mode)
+        if self.is_running and self._update_mode != mode:
+            await self.stop_async()
+            await self.start_async()
 
     async def _stop_async_task(self, app: Application) -> None:
         """Internal wrapper for :meth:`stop_async`."""
@@ -282,8 +366,28 @@ class RuntimeManager:
     async def _stop_async_inner(self, app: Application) -> None:
         """Stop the given *app* without touching ``self._lock``."""
         if app.running:
-            await app.stop()
-            await app.shutdown()
+            await self._shutdown_app(app)
+        self._close_conversion_pool(app)
+
+    @staticmethod
+    async def _shutdown_app(app: Application) -> None:
+        """Stop long polling, then the application itself.
+
+        ``Application.stop()`` leaves the updater polling (and
+        ``shutdown()`` then refuses to run), so a switch to webhook mode
+        would keep a stale long-poll loop competing with the webhook.
+        """
+        if app.updater is not None and app.updater.running:
+            await app.updater.stop()
+        await app.stop()
+        await app.shutdown()
+
+    @staticmethod
+    def _close_conversion_pool(app: Application) -> None:
+        """Release the in-process conversion threads of a stopped *app*."""
+        pool = app.bot_data.get("conversion_pool")
+        if pool is not None:
+            pool.close()
 
     def restart(self) -> None:
         """Stop the bot (if running) and start it again.
@@ -321,6 +425,39 @@ class RuntimeManager:
     # Public API — introspection
     # ------------------------------------------------------------------
 
+    def get_update_mode(self) -> str:
+        """Return the configured update delivery mode (``polling``/``webhook``)."""
+        value = self._config_service._db.get_setting("telegram_update_mode")
+        return value if value in UPDATE_MODES else "polling"
+
+    def get_webhook_url(self) -> str:
+        """Return the configured public base URL for the webhook, or ``""``."""
+        value = self._config_service._db.get_setting("telegram_webhook_url") or ""
+        return value.strip().rstrip("/")
+
+    @property
+    def webhook_active(self) -> bool:
+        """``True`` while the running bot receives updates by webhook."""
+        return self.is_running and self._update_mode == "webhook"
+
+    def verify_webhook_request(self, path_token: str, secret_token: str | None) -> bool:
+        """Check the secret path and ``X-Telegram-Bot-Api-Secret-Token`` header."""
+        expected_path = self._webhook_path_token
+        expected_secret = self._webhook_secret
+        if not self.webhook_active or not expected_path or not expected_secret:
+            return False
+        return secrets.compare_digest(path_token, expected_path) and secrets.compare_digest(
+            secret_token or "", expected_secret
+        )
+
+    async def enqueue_webhook_update(self, data: Dict[str, Any]) -> None:
+        """Decode a webhook payload and feed it to ``Application.update_queue``."""
+        app = self._app
+        if app is None:
+            raise RuntimeError("Telegram bot is not running")
+        update = Update.de_json(data, app.bot)
+        await app.update_queue.put(update)
+
     def get_state(self) -> StateInfo:
         """Return the current application :class:`~bot.state.StateInfo`."""
         return self._state_checker.get_state()
@@ -338,6 +475,38 @@ class RuntimeManager:
             Human-readable Italian label for the current state.
         uptime_seconds:
             Seconds since the bot was started, or ``None``.
+        update_mode:
+            Active delivery mode while running, else the configured one.
+        pipeline_stages:
+            Per-stage concurrency, queue depth, and average and p95 wait
+            and service time while running, else ``None``.
+        conversion:
+            FFmpeg process cap, threads per process and ``nice`` level of
+            the conversion pool while running, else ``None``.
+        admission:
+            Metadata admission rules (maximum duration, duration tiers,
+            allowed extensions) and how many messages were checked and
+            rejected before download, by reason, while running, else
+            ``None``.
+        preparation:
+            Preparation budget (maximum jobs and MB, jobs and MB in use,
+            requests prepared and skipped for a full budget) of requests
+            that download and convert before taking a global slot, while
+            running, else ``None``.
+        adaptive_concurrency:
+            Current adaptive global limit, its bounds and recent changes
+            with their reasons while running with the adaptive limit
+            enabled, else ``None``.
+        hedging:
+            Hedged-request counters (fired, won, skipped for budget,
+            estimated latency saved) while running, else ``None``.
+        retries:
+            Provider retry counters (by reason, recovered, skipped by
+            cause) while running, else ``None``.
+        rate_budgets:
+            Remaining RPM/TPM budget, waits and rejections per provider
+            with a client-side rate limit (see
+            :meth:`get_rate_budget_stats`) while running, else ``None``.
         """
         state = self.get_state()
         uptime: float | None = None
@@ -349,6 +518,15 @@ class RuntimeManager:
             "state": state.state.value,
             "state_label": state.label,
             "uptime_seconds": uptime,
+            "update_mode": self._update_mode or self.get_update_mode(),
+            "pipeline_stages": self._get_stage_stats(),
+            "conversion": self._get_conversion_stats(),
+            "admission": self._get_admission_stats(),
+            "preparation": self._get_preparation_stats(),
+            "adaptive_concurrency": self._get_adaptive_stats(),
+            "hedging": self._get_hedging_stats(),
+            "retries": self._get_retry_stats(),
+            "rate_budgets": self.get_rate_budget_stats() if self.is_running else None,
         }
 
     def can_start(self) -> bool:
@@ -364,6 +542,84 @@ class RuntimeManager:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def get_bulkhead_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return live provider/model bulkhead usage of the running bot.
+
+        Keys are ``"provider:<id>"`` / ``"model:<entry id>"``; empty when the
+        bot is stopped or no limit has been exercised yet.
+        """
+        if self._app is None or not self.is_running:
+            return {}
+        resolver = self._app.bot_data.get("pipeline_resolver")
+        return resolver.get_bulkhead_stats() if resolver is not None else {}
+
+    def get_endpoint_health_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return EWMA latency / error rate per provider and model endpoint.
+
+        Keyed like :meth:`get_bulkhead_stats`; empty when the bot is stopped.
+        """
+        if self._app is None or not self.is_running:
+            return {}
+        resolver = self._app.bot_data.get("pipeline_resolver")
+        return resolver.get_endpoint_health_stats() if resolver is not None else {}
+
+    def get_rate_budget_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return remaining RPM/TPM budget per provider with a rate limit.
+
+        Keyed ``"provider:<id>"``; empty when the bot is stopped.
+        """
+        if self._app is None or not self.is_running:
+            return {}
+        resolver = self._app.bot_data.get("pipeline_resolver")
+        return resolver.get_rate_budget_stats() if resolver is not None else {}
+
+    def _get_stage_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        engine = self._app.bot_data.get("stage_engine")
+        return engine.get_stats() if engine is not None else None
+
+    def _get_conversion_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        pool = self._app.bot_data.get("conversion_pool")
+        return pool.get_stats() if pool is not None else None
+
+    def _get_admission_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        admission = self._app.bot_data.get("metadata_admission")
+        return admission.get_stats() if admission is not None else None
+
+    def _get_preparation_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        budget = self._app.bot_data.get("preparation_budget")
+        return budget.get_stats() if budget is not None else None
+
+    def _get_adaptive_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        limiter = self._app.bot_data.get("rate_limiter")
+        return limiter.get_adaptive_stats() if limiter is not None else None
+
+    def _get_hedging_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        resolver = self._app.bot_data.get("pipeline_resolver")
+        return resolver.get_hedging_stats() if resolver is not None else None
+
+    def _get_retry_stats(self) -> Dict[str, Any] | None:
+        if self._app is None or not self.is_running:
+            return None
+        resolver = self._app.bot_data.get("pipeline_resolver")
+        return resolver.get_retry_stats() if resolver is not None else None
+
+    def _clear_webhook_state(self) -> None:
+        self._update_mode = None
+        self._webhook_path_token = None
+        self._webhook_secret = None
+
     def _build_app(self) -> Application:
         """Build a new :class:`telegram.ext.Application` from the current
         configuration.
@@ -2,8 +2,9 @@
 Progress UI components for Telegram bot.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict
+from typing import Awaitable, Dict, Optional, TypeVar
 
 from telegram import Update
 from telegram.constants import ChatAction
@@ -11,10 +12,15 @@ from telegram.ext import ContextTypes
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 # Cache to store last progress message for each chat:message combination
 # This prevents duplicate message updates that cause Telegram API warnings
 _progress_cache: Dict[str, str] = {}
 
+# Telegram clears a chat action after about 5 seconds; refresh just before.
+TYPING_HEARTBEAT_INTERVAL_SECONDS = 4.5
+
 
 def remember_progress_message(chat_id: int, message_id: int, status_text: str) -> None:
     """Seed the progress cache with the initial message content."""
@@ -27,8 +33,11 @@ async def update_progress(context: ContextTypes.DEFAULT_TYPE,
                          message_id: int, 
                          status_text: str) -> None:
     """
-    Updates progress message with typing indicator.
+    Updates progress message.
     Includes deduplication to prevent Telegram API warnings.
+
+    The typing indicator is kept alive separately by
+    :class:`TypingHeartbeat`, so each edit is a single API call.
     
     Args:
         context: Telegram bot context
@@ -45,9 +54,6 @@ async def update_progress(context: ContextTypes.DEFAULT_TYPE,
         return
     
     try:
-        # Show typing action
-        await context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
-        
         # Update progress message
         await context.bot.edit_message_text(
             chat_id=chat_id,
@@ -64,6 +70,81 @@ async def update_progress(context: ContextTypes.DEFAULT_TYPE,
         logger.warning(f"Failed to update progress: {e}")
 
 
+async def _typing_heartbeat(context: ContextTypes.DEFAULT_TYPE,
+                            chat_id: int,
+                            interval: float) -> None:
+    while True:
+        try:
+            await context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
+        except Exception as e:
+            logger.debug(f"Failed to send typing action: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_typing_heartbeat(context: ContextTypes.DEFAULT_TYPE,
+                           chat_id: int,
+                           interval: float = TYPING_HEARTBEAT_INTERVAL_SECONDS) -> asyncio.Task:
+    """
+    Start a background task that keeps the typing indicator visible.
+
+    The chat action is refreshed every *interval* seconds until the task is
+    stopped with :func:`stop_typing_heartbeat`.
+
+    Args:
+        context: Telegram bot context
+        chat_id: Chat ID to show the indicator in
+        interval: Refresh cadence in seconds
+
+    Returns:
+        The heartbeat task
+    """
+    return asyncio.create_task(_typing_heartbeat(context, chat_id, interval))
+
+
+async def stop_typing_heartbeat(task: Optional[asyncio.Task]) -> None:
+    """Cancel a heartbeat task started by :func:`start_typing_heartbeat`."""
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+class TypingHeartbeat:
+    """Typing indicator of one request, shown only while a stage runs.
+
+    :meth:`during` wraps the work of a pipeline stage; the indicator starts
+    when the work starts (after any wait for a stage slot) and stops when
+    the last running stage finishes, so queued requests show no typing.
+    """
+
+    def __init__(self, context: ContextTypes.DEFAULT_TYPE, chat_id: int,
+                 interval: float = TYPING_HEARTBEAT_INTERVAL_SECONDS):
+        self._context = context
+        self._chat_id = chat_id
+        self._interval = interval
+        self._running = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def during(self, work: Awaitable[T]) -> T:
+        """Await *work* with the typing indicator visible."""
+        self._running += 1
+        if self._task is None:
+            self._task = start_typing_heartbeat(self._context, self._chat_id, self._interval)
+        try:
+            return await work
+        finally:
+            self._running -= 1
+            if self._running == 0:
+                await self.stop()
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        await stop_typing_heartbeat(task)
+
+
 def get_progress_message(stage: str, stage_num: int, total_stages: int, 
                          bar_length: int = 8) -> str:
     """
@@ -7,10 +7,15 @@ from telegram.constants import ChatType
 from telegram.ext import ContextTypes
 
 from bot import constants as c
+from bot.ui.progress import update_progress
 
 
 PROGRESSIVE_DRAFT_CHUNK_SIZE = 250
 PROGRESSIVE_DRAFT_INTERVAL_SECONDS = 0.15
+# Partial transcripts: Telegram throttles frequent edits of one message, so
+# previews are refreshed at most once per interval and show only the tail.
+TRANSCRIPT_PREVIEW_INTERVAL_SECONDS = 1.0
+TRANSCRIPT_PREVIEW_MAX_CHARS = 800
 
 
 def split_text_chunks(text: str, max_length: int = c.MAX_MESSAGE_LENGTH) -> list[str]:
@@ -45,12 +50,16 @@ class ProgressiveResponseSession:
 class TelegramDeliveryAdapter:
     """Encapsulates Telegram output delivery and future draft support."""
 
-    def __init__(self, progressive_enabled: bool = False):
+    def __init__(self, progressive_enabled: bool = False, raw_first_enabled: bool = False):
         self.progressive_enabled = progressive_enabled
+        self.raw_first_enabled = raw_first_enabled
 
     def is_progressive_enabled(self) -> bool:
         return self.progressive_enabled
 
+    def is_raw_first_enabled(self) -> bool:
+        return self.raw_first_enabled
+
     def should_use_progressive_delivery(self, context: ContextTypes.DEFAULT_TYPE, ack_msg, full_text: str) -> bool:
         return (
             self.progressive_enabled
@@ -133,6 +142,51 @@ class TelegramDeliveryAdapter:
             message_thread_id=message_thread_id,
         )
 
+    async def show_transcript_preview(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        ack_msg,
+        status_text: str,
+        partial_text: str,
+    ) -> None:
+        """Show the partial transcript while transcription is still running.
+
+        In private chats with native drafts the text goes to the draft that
+        refinement streaming later overwrites; elsewhere the tail of the
+        text is appended to the progress message.
+        """
+        if self.supports_live_refine_streaming(context, ack_msg):
+            await self.send_message_draft(
+                context,
+                chat_id=chat_id,
+                draft_id=ack_msg.message_id,
+                text=partial_text[-c.MAX_MESSAGE_LENGTH:],
+            )
+            return
+        tail = partial_text
+        if len(tail) > TRANSCRIPT_PREVIEW_MAX_CHARS:
+            tail = "…" + tail[-TRANSCRIPT_PREVIEW_MAX_CHARS:]
+        await update_progress(context, chat_id, ack_msg.message_id, f"{status_text}\n\n{tail}")
+
+    async def send_raw_preview(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        ack_msg,
+        preview_text: str,
+    ) -> None:
+        """Show the interim raw transcript in place of the progress message.
+
+        The preview is replaced later by :meth:`send_final_response`, so only
+        the first chunk is shown; overflow is delivered with the final text.
+        """
+        chunks = split_text_chunks(preview_text)
+        text = chunks[0]
+        if len(chunks) > 1:
+            text = text[:c.MAX_MESSAGE_LENGTH - 1] + "…"
+        await ack_msg.edit_text(text)
+
     async def send_final_response(
         self,
         context: ContextTypes.DEFAULT_TYPE,
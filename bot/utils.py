@@ -11,12 +11,20 @@ import asyncio
 import glob
 import logging
 import os
+import re
+import shutil
 from asyncio.subprocess import PIPE
 from dataclasses import dataclass
 from typing import Iterable
 
 from bot import constants as c
 from bot.adapters import text_processor_registry, transcriber_registry
+from bot.audio_profiles import (
+    DEFAULT_AUDIO_PROFILE,
+    NO_PREPROCESSING,
+    AudioPreprocessing,
+    AudioProfile,
+)
 from bot.exceptions import ConvertError
 from bot.providers import (
     GeminiProvider,
@@ -28,6 +36,7 @@ from bot.providers import (
     TextProcessor,
     Transcriber,
 )
+from bot.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -60,26 +69,82 @@ def _get_combined_provider_class(
     return cls
 
 
-async def convert_to_mp3(src_path: str, dst_path: str) -> None:
-    """Convert audio file to MP3 using FFmpeg."""
-    logger.info("Convert %s -> %s", src_path, dst_path)
+@dataclass(frozen=True)
+class ConversionResult:
+    """Audio duration before and after a conversion, when known.
+
+    They differ when :class:`~bot.audio_profiles.AudioPreprocessing`
+    trimmed silence or changed the tempo.
+    """
+
+    input_seconds: float | None = None
+    output_seconds: float | None = None
+
+    @property
+    def removed_seconds(self) -> float | None:
+        if self.input_seconds is None or self.output_seconds is None:
+            return None
+        return max(0.0, self.input_seconds - self.output_seconds)
+
+
+_FFMPEG_DURATION_RE = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+_FFMPEG_TIME_RE = re.compile(r"time=(\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+def _parse_ffmpeg_durations(stderr: str) -> ConversionResult:
+    """Read the input ``Duration:`` and the last progress ``time=`` of FFmpeg's log."""
+
+    def seconds(match: re.Match | None) -> float | None:
+        if match is None:
+            return None
+        hours, minutes, secs = match.groups()
+        return round(int(hours) * 3600 + int(minutes) * 60 + float(secs), 2)
+
+    times = list(_FFMPEG_TIME_RE.finditer(stderr))
+    return ConversionResult(
+        input_seconds=seconds(_FFMPEG_DURATION_RE.search(stderr)),
+        output_seconds=seconds(times[-1] if times else None),
+    )
+
+
+async def convert_to_mp3(
+    src_path: str,
+    dst_path: str,
+    profile: AudioProfile | None = None,
+    nice: int = 0,
+    preprocessing: AudioPreprocessing | None = None,
+) -> ConversionResult:
+    """Convert an audio file using FFmpeg.
+
+    *profile* selects codec, sample rate, channels, bitrate and threads;
+    the default is MP3 at 44.1 kHz stereo, 192 kbps.  *dst_path* should
+    carry the profile's extension.  *nice* > 0 lowers the scheduling
+    priority of the FFmpeg process.  *preprocessing* adds the silence
+    trimming and tempo filters.  Returns the durations FFmpeg reported.
+    """
+    profile = profile or DEFAULT_AUDIO_PROFILE
+    preprocessing = preprocessing or NO_PREPROCESSING
+    logger.info(
+        "Convert %s -> %s | profile=%s preprocessing=%s",
+        src_path,
+        dst_path,
+        profile.label,
+        preprocessing.label,
+    )
 
     process = await asyncio.create_subprocess_exec(
         "ffmpeg",
         "-y",
         "-i",
         src_path,
-        "-vn",
-        "-ar",
-        "44100",
-        "-ac",
-        "2",
-        "-b:a",
-        "192k",
+        *profile.output_args(),
+        *preprocessing.output_args(),
         dst_path,
         stdout=PIPE,
         stderr=PIPE,
     )
+    if nice:
+        _lower_priority(process.pid, nice)
 
     try:
         stdout, stderr = await process.communicate()
@@ -94,10 +159,62 @@ async def convert_to_mp3(src_path: str, dst_path: str) -> None:
             pass
         raise
 
+    err = stderr.decode("utf-8", errors="replace") if stderr else ""
     if process.returncode != 0:
-        err = stderr.decode("utf-8", errors="replace") if stderr else ""
         logger.error("FFmpeg error: %s", err)
         raise ConvertError("Errore conversione audio", c.MSG_ERROR_CONVERT)
+    return _parse_ffmpeg_durations(err)
+
+
+def _lower_priority(pid: int, nice: int) -> None:
+    """Best-effort ``nice`` of a child process; unsupported platforms keep its priority."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, os.getpriority(os.PRIO_PROCESS, 0) + nice)
+    except (AttributeError, OSError) as e:
+        logger.debug("Could not lower FFmpeg priority | pid=%s error=%s", pid, e)
+
+
+def local_bot_api_files_dir(bot_api_config: dict) -> str | None:
+    """Directory whose files may be read directly, or ``None`` to always download.
+
+    Only a self-hosted server in ``--local`` mode with its working directory
+    configured (``files_dir``) qualifies.
+    """
+    if not (bot_api_config.get("base_url") and bot_api_config.get("local_mode")):
+        return None
+    return bot_api_config.get("files_dir") or None
+
+
+def is_local_bot_api_file(file_path: str | None, files_dir: str | None) -> bool:
+    """Return ``True`` when *file_path* is a file inside *files_dir*.
+
+    A Bot API server running with ``--local`` returns absolute paths from
+    ``getFile``; the cloud API returns relative paths to be fetched over HTTP.
+    Paths are resolved first, so ``..`` or symlinks cannot point outside the
+    server's working directory.
+    """
+    if not file_path or not files_dir or not os.path.isabs(file_path):
+        return False
+    root = os.path.realpath(files_dir)
+    path = os.path.realpath(file_path)
+    return os.path.commonpath([root, path]) == root and path != root and os.path.isfile(path)
+
+
+def link_local_file(src_path: str, dst_path: str) -> None:
+    """Expose *src_path* at *dst_path* without copying when possible.
+
+    Hardlinks share the inode, so the server's file is untouched when the
+    temporary link is cleaned up.  Falls back to a plain copy when the two
+    paths are on different filesystems.
+    """
+    if os.path.exists(dst_path):
+        os.remove(dst_path)
+    try:
+        os.link(src_path, dst_path)
+        logger.debug("Hardlinked local Bot API file %s -> %s", src_path, dst_path)
+    except OSError:
+        shutil.copyfile(src_path, dst_path)
+        logger.debug("Copied local Bot API file %s -> %s", src_path, dst_path)
 
 
 def create_provider(config) -> LLMProvider:
@@ -186,17 +303,21 @@ def create_provider_components(config) -> ProviderComponents:
     if resilience.get("enabled", True):
         ft = resilience.get("failure_threshold", 3)
         cd = resilience.get("cooldown_seconds", 60)
+        retry = RetryPolicy.from_config(resilience)
+        retry = retry if retry.enabled else None
         transcriber = ResilientTranscriber(
             transcriber,
             provider_name=provider_name,
             failure_threshold=ft,
             cooldown_seconds=cd,
+            retry=retry,
         )
         text_processor = ResilientTextProcessor(
             text_processor,
             provider_name=provider_name,
             failure_threshold=ft,
             cooldown_seconds=cd,
+            retry=retry,
         )
 
     return ProviderComponents(
@@ -9,6 +9,7 @@ route groups:
 - ``/login`` / ``/logout`` — authentication
 - ``/admin/*`` — administration pages
 - ``/api/*`` — JSON API endpoints for the frontend JS
+- ``/telegram/webhook/<secret>`` — Telegram update endpoint (webhook mode)
 """
 
 from __future__ import annotations
@@ -32,7 +33,7 @@ from bot.config import Config
 from bot.config_service import ConfigService
 from bot.database import DatabaseManager, SecretStore
 from bot.exceptions import ConfigError, ResourceInUseError
-from bot.runtime_manager import RuntimeManager
+from bot.runtime_manager import UPDATE_MODES, WEBHOOK_PATH_PREFIX, RuntimeManager
 from bot.setup import (
     generate_setup_code,
     invalidate_setup_code,
@@ -42,6 +43,10 @@ from bot.setup import (
 )
 from bot.state import AppState, StateChecker
 
+from bot.adapters.local_whisper import parse_endpoint as parse_local_whisper_endpoint
+from bot.adapters.local_whisper import probe_local_whisper
+from bot.adapters.mock import MockBehaviour
+from bot.audio_profiles import AudioPreprocessing
 from bot.capabilities import (
     CapabilityModel,
     _classify_openrouter_model,
@@ -64,6 +69,7 @@ from bot.web.auth import (
     validate_csrf_token,
 )
 from bot.web.setup_wizard import (
+    ADMIN_PROVIDER_PRESETS,
     PROVIDER_PRESETS,
     build_summary,
     create_pipeline_from_wizard,
@@ -814,6 +820,10 @@ def create_app(
                 "session": session,
                 "state": state,
                 "health": health,
+                "update_mode": runtime_manager.get_update_mode(),
+                "webhook_url": runtime_manager.get_webhook_url(),
+                "error": request.query_params.get("error", ""),
+                "success": request.query_params.get("success", ""),
             },
         )
 
@@ -848,6 +858,36 @@ def create_app(
         logger.info("Bot stopped from admin dashboard")
         return RedirectResponse(url="/admin/dashboard", status_code=303)
 
+    @app.post("/admin/bot/update-mode")
+    async def admin_bot_update_mode(request: Request):
+        """Switch between polling and webhook delivery."""
+        _login_required(request)
+        session = _session(request) or {}
+        form_data = await request.form()
+        csrf = form_data.get("csrf_token", "")
+        if not validate_csrf_token(session, csrf):
+            return RedirectResponse(url="/admin/dashboard?error=csrf", status_code=303)
+
+        mode = (form_data.get("update_mode") or "").strip()
+        webhook_url = (form_data.get("webhook_url") or "").strip()
+        if mode not in UPDATE_MODES:
+            return RedirectResponse(url="/admin/dashboard?error=update_mode_invalid", status_code=303)
+        if webhook_url and not webhook_url.startswith("https://"):
+            return RedirectResponse(url="/admin/dashboard?error=webhook_url_invalid", status_code=303)
+        if mode == "webhook" and not (webhook_url or runtime_manager.get_webhook_url()):
+            return RedirectResponse(url="/admin/dashboard?error=webhook_url_missing", status_code=303)
+
+        try:
+            await runtime_manager.set_update_mode_async(mode, webhook_url=webhook_url or None)
+        except ValueError as exc:
+            logger.warning("Update mode change rejected: %s", exc)
+            return RedirectResponse(url="/admin/dashboard?error=update_mode_rejected", status_code=303)
+        except RuntimeError as exc:
+            logger.warning("Bot restart after update mode change failed: %s", exc)
+            return RedirectResponse(url="/admin/dashboard?error=start_failed", status_code=303)
+
+        return RedirectResponse(url="/admin/dashboard?success=update_mode", status_code=303)
+
     # ---- Routes: Admin — Provider management (W3 foundation) ----------------
 
     @app.get("/admin/providers", response_class=HTMLResponse)
@@ -863,7 +903,7 @@ def create_app(
                 "csrf_token": session.get("csrf_token", generate_csrf_token()),
                 "session": session,
                 "providers": providers,
-                "provider_presets": PROVIDER_PRESETS,
+                "provider_presets": ADMIN_PROVIDER_PRESETS,
             },
         )
 
@@ -882,7 +922,7 @@ def create_app(
         api_key = (form_data.get("api_key") or "").strip()
         model_name = (form_data.get("model_name") or "").strip()
 
-        if provider_type not in PROVIDER_PRESETS:
+        if provider_type not in ADMIN_PROVIDER_PRESETS:
             return RedirectResponse(
                 url="/admin/providers?error=invalid_type",
                 status_code=303,
@@ -890,9 +930,9 @@ def create_app(
 
         adapter_type = _adapter_type_for_provider(provider_type)
         if not display_name:
-            display_name = PROVIDER_PRESETS[provider_type]["label"]
+            display_name = ADMIN_PROVIDER_PRESETS[provider_type]["label"]
         if not endpoint:
-            endpoint = PROVIDER_PRESETS[provider_type].get("default_endpoint", "")
+            endpoint = ADMIN_PROVIDER_PRESETS[provider_type].get("default_endpoint", "")
 
         if provider_type in {"openai", "gemini", "openrouter", "custom"} and not api_key:
             return RedirectResponse(
@@ -900,6 +940,17 @@ def create_app(
                 status_code=303,
             )
 
+        try:
+            if provider_type == "mock":
+                MockBehaviour.from_endpoint(endpoint)
+            elif provider_type == "local-whisper":
+                parse_local_whisper_endpoint(endpoint)
+        except ValueError:
+            return RedirectResponse(
+                url="/admin/providers?error=invalid_endpoint",
+                status_code=303,
+            )
+
         try:
             # For OpenRouter: probe model metadata for accurate capabilities.
             if provider_type == "openrouter":
@@ -960,7 +1011,10 @@ def create_app(
                 "session": session,
                 "provider": provider,
                 "models": models,
-                "provider_presets": PROVIDER_PRESETS,
+                "provider_presets": ADMIN_PROVIDER_PRESETS,
+                "bulkhead_stats": runtime_manager.get_bulkhead_stats(),
+                "endpoint_health": runtime_manager.get_endpoint_health_stats(),
+                "rate_budget_stats": runtime_manager.get_rate_budget_stats(),
             },
         )
 
@@ -980,8 +1034,15 @@ def create_app(
         endpoint = (form_data.get("endpoint") or "").strip()
         api_key = (form_data.get("api_key") or "").strip()
         enabled = form_data.get("enabled", "1") == "1"
+        try:
+            priority = int(form_data.get("priority") or 0)
+        except ValueError:
+            return RedirectResponse(
+                url=f"/admin/providers/{provider_id}?error=priority_invalid",
+                status_code=303,
+            )
 
-        updates: Dict[str, Any] = {}
+        updates: Dict[str, Any] = {"priority": priority}
         if name:
             updates["name"] = name
         if endpoint:
@@ -1011,6 +1072,59 @@ def create_app(
             status_code=303,
         )
 
+    @app.post("/admin/providers/{provider_id}/limits")
+    async def admin_provider_limits(request: Request, provider_id: int):
+        """Update the provider's and its models' concurrency and RPM/TPM limits."""
+        session = _login_required(request)
+        form_data = await request.form()
+        csrf = form_data.get("csrf_token", "")
+        if not validate_csrf_token(session, csrf):
+            return RedirectResponse(
+                url=f"/admin/providers/{provider_id}?error=csrf",
+                status_code=303,
+            )
+        if database_manager.get_provider(provider_id) is None:
+            return RedirectResponse(url="/admin/providers", status_code=303)
+
+        try:
+            max_concurrent = int(form_data.get("max_concurrent") or 0)
+            max_queued = int(form_data.get("max_queued") or 0)
+            rpm_limit = int(form_data.get("rpm_limit") or 0)
+            tpm_limit = int(form_data.get("tpm_limit") or 0)
+            model_limits = {
+                m["id"]: int(form_data.get(f"model_max_concurrent_{m['id']}") or 0)
+                for m in database_manager.list_provider_models(provider_id)
+            }
+        except ValueError:
+            return RedirectResponse(
+                url=f"/admin/providers/{provider_id}?error=limits_invalid",
+                status_code=303,
+            )
+        if min(max_concurrent, max_queued, rpm_limit, tpm_limit, *model_limits.values()) < 0:
+            return RedirectResponse(
+                url=f"/admin/providers/{provider_id}?error=limits_invalid",
+                status_code=303,
+            )
+
+        database_manager.update_provider(
+            provider_id,
+            max_concurrent=max_concurrent,
+            max_queued=max_queued,
+            rpm_limit=rpm_limit,
+            tpm_limit=tpm_limit,
+        )
+        for entry_id, limit in model_limits.items():
+            database_manager.update_provider_model(entry_id, max_concurrent=limit)
+        logger.info(
+            "Admin provider: limits updated id=%s max_concurrent=%s max_queued=%s "
+            "rpm_limit=%s tpm_limit=%s",
+            provider_id, max_concurrent, max_queued, rpm_limit, tpm_limit,
+        )
+        return RedirectResponse(
+            url=f"/admin/providers/{provider_id}?success=limits_updated",
+            status_code=303,
+        )
+
     @app.post("/admin/providers/{provider_id}/delete")
     async def admin_provider_delete(request: Request, provider_id: int):
         """Delete a provider connection."""
@@ -1567,8 +1681,12 @@ def create_app(
                         "primary_model_id": 8,
                         "fallback_model_ids": [9]
                     }
-                ]
+                ],
+                "preprocessing": {"trim_silence": true, "tempo": 1.25}
             }
+
+        ``preprocessing`` is optional; when present it replaces the
+        profile's audio preprocessing (``{}`` turns it off).
         """
         session = _session(request)
         if session is None or not session.get("admin"):
@@ -1591,6 +1709,15 @@ def create_app(
         if mode not in ("two_stage", "single_pass"):
             return JSONResponse({"ok": False, "error": "mode deve essere two_stage o single_pass."})
 
+        preprocessing = None
+        if body.get("preprocessing") is not None:
+            try:
+                preprocessing = AudioPreprocessing.from_dict(body["preprocessing"])
+            except ValueError as exc:
+                return JSONResponse(
+                    {"ok": False, "error": f"Pre-elaborazione audio non valida: {exc}."}
+                )
+
         profile = database_manager.get_pipeline_profile(profile_id)
         if profile is None:
             return JSONResponse({"ok": False, "error": "Profilo pipeline non trovato."},
@@ -1599,6 +1726,10 @@ def create_app(
         try:
             # Set the mode on the profile
             database_manager.set_pipeline_profile_mode(profile_id, mode)
+            if preprocessing is not None:
+                database_manager.set_pipeline_profile_preprocessing(
+                    profile_id, preprocessing.to_dict() if preprocessing.enabled else None
+                )
 
             # Delete existing stages for this profile and recreate
             existing = database_manager.list_pipeline_stages(profile_id)
@@ -1686,6 +1817,14 @@ def create_app(
 
         mode = form_data.get("pipeline_mode", "single")
         provider_id = form_data.get("provider_id", "")
+        try:
+            preprocessing = AudioPreprocessing(
+                trim_silence=form_data.get("trim_silence") == "1",
+                tempo=float(form_data.get("tempo") or 1.0),
+            )
+        except ValueError:
+            return RedirectResponse(url="/admin/pipeline?error=preprocessing", status_code=303)
+        new_id = None
 
         try:
             if mode == "two_stage":
@@ -1821,6 +1960,11 @@ def create_app(
                     ref_pid,
                 )
 
+            if new_id is not None and preprocessing.enabled:
+                database_manager.set_pipeline_profile_preprocessing(
+                    new_id, preprocessing.to_dict()
+                )
+
             return RedirectResponse(url="/admin/pipeline?success=saved", status_code=303)
 
         except Exception as exc:
@@ -1830,6 +1974,31 @@ def create_app(
                 status_code=303,
             )
 
+    # ---- Routes: Telegram webhook -------------------------------------------
+
+    @app.post(WEBHOOK_PATH_PREFIX + "/{path_token}")
+    async def telegram_webhook(request: Request, path_token: str):
+        """Receive a Telegram update and feed it to the running bot.
+
+        Both the secret path and the ``X-Telegram-Bot-Api-Secret-Token``
+        header must match the values registered at start; anything else is
+        answered with 404 so the endpoint does not reveal itself.
+        """
+        secret_header = request.headers.get("X-Telegram-Bot-Api-Secret-Token")
+        if not runtime_manager.verify_webhook_request(path_token, secret_header):
+            return Response(status_code=404)
+
+        try:
+            data = await request.json()
+        except (json.JSONDecodeError, ValueError):
+            return Response(status_code=400)
+
+        try:
+            await runtime_manager.enqueue_webhook_update(data)
+        except RuntimeError:
+            return Response(status_code=503)
+        return Response(status_code=200)
+
     # ---- Routes: API --------------------------------------------------------
 
     @app.get("/api/state")
@@ -1904,7 +2073,8 @@ def create_app(
 
         if not provider_type:
             return JSONResponse({"ok": False, "error": "Seleziona un provider."})
-        if not api_key:
+        key_optional = ADMIN_PROVIDER_PRESETS.get(provider_type, {}).get("api_key") == "optional"
+        if not api_key and not key_optional:
             return JSONResponse({"ok": False, "error": "Inserisci una chiave API."})
 
         import httpx
@@ -2286,6 +2456,50 @@ async def _test_provider_connection(
                     "Verifica la chiave API di Google Generative AI."
                 )
 
+    # ---- Local Whisper server ----
+    elif provider_type == "local-whisper":
+        try:
+            probe = await probe_local_whisper(endpoint, api_key)
+        except ValueError as exc:
+            result["user_message"] = f"❌ Endpoint non valido: {exc}"
+            return result
+
+        if probe["reachable"]:
+            result["auth_ok"] = True
+            result["models"] = probe["models"][:20]
+            # whisper.cpp has no model list: reachable is enough.
+            result["models_ok"] = True
+            if model_name and probe["models"] and model_name not in probe["models"]:
+                result["warnings"].append(
+                    f"Il modello '{model_name}' non è tra quelli esposti dal server."
+                )
+            caps = detect_capabilities("local-whisper", model_name)
+            result["capabilities"] = caps.to_dict()
+        elif probe["status_code"] in (401, 403):
+            result["user_message"] = "❌ Il server Whisper ha rifiutato la chiave API."
+        else:
+            result["user_message"] = (
+                f"❌ Server Whisper non raggiungibile (HTTP {probe['status_code']})."
+            )
+            result["warnings"].append(
+                "Verifica che il server sia avviato e che l'endpoint sia corretto."
+            )
+
+    # ---- Mock provider (no network) ----
+    elif provider_type == "mock":
+        try:
+            MockBehaviour.from_endpoint(endpoint)
+        except ValueError as exc:
+            result["user_message"] = f"❌ Configurazione mock non valida: {exc}"
+            return result
+        result["auth_ok"] = True
+        result["models_ok"] = True
+        result["models"] = ["mock"]
+        result["capabilities"] = detect_capabilities("mock", model_name or "mock").to_dict()
+        result["warnings"].append(
+            "Provider simulato: nessuna trascrizione reale. Usalo solo per test."
+        )
+
     else:
         result["user_message"] = f"❌ Provider sconosciuto: {provider_type}"
         return result
@@ -539,3 +539,27 @@ PROVIDER_PRESETS: Dict[str, Dict[str, str]] = {
         "description": "Endpoint compatibile con API OpenAI",
     },
 }
+
+# Presets offered only on the admin providers page.  A local Whisper server
+# transcribes but cannot refine, so it cannot complete the onboarding
+# pipeline on its own, and the mock provider is for load tests only;
+# ``api_key: optional`` lets the form skip the key.
+ADMIN_PROVIDER_PRESETS: Dict[str, Dict[str, str]] = {
+    **PROVIDER_PRESETS,
+    "local-whisper": {
+        "label": "Whisper locale",
+        "default_endpoint": "http://localhost:8000/v1",
+        "description": "Server Whisper self-hosted (faster-whisper-server, "
+                      "whisper.cpp): solo trascrizione, nessuna chiave richiesta. "
+                      "Formato e lingua: ?response_format=verbose_json&language=it",
+        "api_key": "optional",
+    },
+    "mock": {
+        "label": "Mock (test di carico)",
+        "default_endpoint": "mock://?latency_ms=800&jitter_ms=200",
+        "description": "Provider simulato, nessuna chiamata esterna. Latenza, "
+                      "streaming ed errori si configurano nell'endpoint "
+                      "(es. error_rate=0.05&throttle_rate=0.02). Solo per test.",
+        "api_key": "optional",
+    },
+}
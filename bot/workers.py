@@ -0,0 +1,672 @@
+"""
+Dispatcher / worker-process split for the audio pipeline.
+
+In dispatch mode (``PIPELINE_DISPATCH=1``) the bot process only receives
+updates: :class:`JobDispatcher` acknowledges each audio message and queues a
+job in the ``pipeline_jobs`` table of the application database.  Separate
+processes started with ``python -m bot.workers --processes N`` claim jobs
+with :class:`PipelineWorker`, run download → convert → transcribe → refine,
+and write the result back.  The dispatcher polls the table to mirror stage
+progress into the acknowledgement message and to deliver finished results.
+
+SQLite is the only coordination channel, so no external broker is needed;
+``BEGIN IMMEDIATE`` makes job claims exclusive across processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from telegram import Bot
+from telegram.ext import ContextTypes
+
+from bot import constants as c
+from bot.adapters.local_whisper import close_local_whisper_clients
+from bot.audio_profiles import AudioProfile, profile_for
+from bot.conversion import ConversionPool, available_cpus
+from bot.database import DatabaseManager
+from bot.exceptions import AudioPipelineError
+from bot.handlers.audio import AudioProcessor, describe_attachment
+from bot.hedging import HedgingPolicy
+from bot.retry import RetryPolicy
+from bot.pipeline_resolver import PipelineRequest, PipelineResolver, RequestMode
+from bot.providers import drain_gemini_cleanup
+from bot.ui.progress import (
+    clear_progress_cache,
+    get_progress_message,
+    remember_progress_message,
+    update_progress,
+)
+from bot.ui.streaming import split_text_chunks
+from bot.utils import create_provider_components, local_bot_api_files_dir
+
+logger = logging.getLogger(__name__)
+
+StageReporter = Callable[[str], Awaitable[None]]
+JobHandler = Callable[[Dict[str, Any], StageReporter], Awaitable[str]]
+
+# Stage name reported by workers → (progress label, stage number).
+JOB_STAGES = {
+    "download": (c.MSG_PROGRESS_DOWNLOAD, 1),
+    "convert": (c.MSG_PROGRESS_CONVERT, 2),
+    "transcribe": (c.MSG_PROGRESS_TRANSCRIBE, 3),
+    "refine": (c.MSG_PROGRESS_REFINE, 4),
+}
+
+
+def _elapsed_ms(start_time: float) -> int:
+    return int((time.monotonic() - start_time) * 1000)
+
+
+# ---------------------------------------------------------------------------
+# Bot-process side
+# ---------------------------------------------------------------------------
+
+
+class JobDispatcher:
+    """Queues audio jobs for worker processes and delivers their results.
+
+    Stored in ``Application.bot_data['job_dispatcher']``; :meth:`poll` and
+    :meth:`prune` are registered as repeating ``JobQueue`` callbacks.
+
+    The rate-limit slot of a dispatched message is released once its job is
+    queued, so *max_per_user* and *max_pending* (``0`` = no cap) bound the
+    jobs queued or running per user and in total instead.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        *,
+        stale_after_seconds: int = c.PIPELINE_JOB_STALE_SECONDS,
+        max_attempts: int = c.PIPELINE_JOB_MAX_ATTEMPTS,
+        max_per_user: int = 0,
+        max_pending: int = 0,
+        retention_seconds: int = c.PIPELINE_JOB_RETENTION_SECONDS,
+    ):
+        self._db = db
+        self._stale_after_seconds = stale_after_seconds
+        self._max_attempts = max_attempts
+        self._retention_seconds = retention_seconds
+        self.max_per_user = max(0, int(max_per_user))
+        self.max_pending = max(0, int(max_pending))
+
+    @classmethod
+    def from_rate_limits(
+        cls, db: DatabaseManager, rate_limit_config: Dict[str, Any]
+    ) -> "JobDispatcher":
+        """Cap pending jobs at what the rate limiter admits: active plus queued."""
+        queue_enabled = rate_limit_config.get("queue_enabled", False)
+        return cls(
+            db,
+            max_per_user=rate_limit_config["max_per_user"]
+            + (rate_limit_config.get("max_queued_per_user", 0) if queue_enabled else 0),
+            max_pending=rate_limit_config["max_concurrent_global"]
+            + (rate_limit_config.get("max_queue_size", 0) if queue_enabled else 0),
+        )
+
+    async def submit(self, message) -> Optional[int]:
+        """Acknowledge *message* and queue its audio for a worker process.
+
+        Returns the job ID, or ``None`` when the message has no supported
+        audio attachment or the pending-job caps are reached.
+        """
+        attachment, ext = describe_attachment(message)
+        if attachment is None:
+            await message.reply_text(c.MSG_UNSUPPORTED_TYPE)
+            return None
+
+        ack_msg = await message.reply_text(c.MSG_PIPELINE_JOB_QUEUED)
+        remember_progress_message(message.chat_id, ack_msg.message_id, c.MSG_PIPELINE_JOB_QUEUED)
+        job_id = await asyncio.to_thread(
+            self._db.enqueue_pipeline_job,
+            chat_id=message.chat_id,
+            user_id=message.from_user.id,
+            message_id=message.message_id,
+            ack_message_id=ack_msg.message_id,
+            file_id=attachment.file_id,
+            file_unique_id=attachment.file_unique_id,
+            file_ext=ext,
+            max_per_user=self.max_per_user,
+            max_pending=self.max_pending,
+        )
+        if job_id is None:
+            await self._reject(message, ack_msg)
+            return None
+        logger.info(
+            "Pipeline job queued | job_id=%s user_id=%s",
+            job_id,
+            message.from_user.id,
+        )
+        return job_id
+
+    async def _reject(self, message, ack_msg) -> None:
+        user_id = message.from_user.id
+        user_pending = await asyncio.to_thread(self._db.count_pending_pipeline_jobs, user_id)
+        if self.max_per_user and user_pending >= self.max_per_user:
+            reason = "user"
+            text = c.MSG_CONCURRENT_LIMIT.format(max_concurrent=self.max_per_user)
+        else:
+            reason = "total"
+            text = c.MSG_QUEUE_FULL
+        await ack_msg.edit_text(text)
+        clear_progress_cache(message.chat_id, ack_msg.message_id)
+        logger.info(
+            "Pipeline job rejected | user_id=%s reason=%s user_pending=%s",
+            user_id,
+            reason,
+            user_pending,
+        )
+
+    async def poll(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Mirror worker progress and deliver finished jobs."""
+        try:
+            requeued = await asyncio.to_thread(
+                self._db.requeue_stale_pipeline_jobs,
+                self._stale_after_seconds,
+                max_attempts=self._max_attempts,
+                failure_message=c.MSG_ERROR_INTERNAL,
+            )
+            if requeued:
+                logger.warning("Requeued stale pipeline jobs | count=%s", requeued)
+
+            running = await asyncio.to_thread(self._db.list_pipeline_jobs, ["running"])
+            for job in running:
+                await self._show_progress(context, job)
+
+            finished = await asyncio.to_thread(
+                self._db.list_pipeline_jobs, ["done", "failed"], undelivered_only=True
+            )
+            for job in finished:
+                await self._deliver(context, job)
+        except Exception as e:
+            logger.error(f"Error in pipeline job dispatcher: {e}")
+
+    async def prune(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Delete delivered jobs older than the retention period."""
+        try:
+            pruned = await asyncio.to_thread(
+                self._db.prune_pipeline_jobs, self._retention_seconds
+            )
+            if pruned:
+                logger.info("Pruned pipeline jobs | count=%s", pruned)
+        except Exception as e:
+            logger.error(f"Error pruning pipeline jobs: {e}")
+
+    async def _show_progress(self, context: ContextTypes.DEFAULT_TYPE, job: Dict[str, Any]) -> None:
+        stage = JOB_STAGES.get(job.get("stage") or "")
+        if stage is None:
+            return
+        label, stage_num = stage
+        # update_progress deduplicates, so unchanged stages cost no API call.
+        await update_progress(
+            context,
+            job["chat_id"],
+            job["ack_message_id"],
+            get_progress_message(label, stage_num, len(c.PROGRESS_STAGES)),
+        )
+
+    async def _deliver(self, context: ContextTypes.DEFAULT_TYPE, job: Dict[str, Any]) -> None:
+        chat_id = job["chat_id"]
+        ack_message_id = job["ack_message_id"]
+        if job["status"] == "done":
+            chunks = split_text_chunks(job["result_text"] or "")
+        else:
+            chunks = [job["user_message"] or c.MSG_ERROR_INTERNAL]
+
+        try:
+            await context.bot.edit_message_text(
+                chat_id=chat_id, message_id=ack_message_id, text=chunks[0]
+            )
+            for chunk in chunks[1:]:
+                await context.bot.send_message(chat_id=chat_id, text=chunk)
+        except Exception as e:
+            # Leave the job undelivered so the next poll retries it.
+            logger.warning(
+                "Pipeline job delivery failed | job_id=%s error=%s",
+                job["id"],
+                e.__class__.__name__,
+            )
+            return
+
+        await asyncio.to_thread(self._db.mark_pipeline_job_delivered, job["id"])
+        clear_progress_cache(chat_id, ack_message_id)
+        logger.info(
+            "Pipeline job delivered | job_id=%s user_id=%s status=%s",
+            job["id"],
+            job["user_id"],
+            job["status"],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Worker-process side
+# ---------------------------------------------------------------------------
+
+
+class PipelineWorker:
+    """Claims queued jobs and runs up to *concurrency* of them through *handler*.
+
+    *handler* is an async callable ``handler(job, set_stage) -> str`` that
+    returns the final text to deliver; it reports progress by awaiting
+    ``set_stage(name)`` with one of :data:`JOB_STAGES`.  Raising
+    :class:`AudioPipelineError` delivers its ``user_message`` instead.
+
+    Jobs share one event loop, so a worker overlaps the downloads and
+    provider calls of several jobs.  Their database calls share one SQLite
+    connection and are serialised by *db_lock*, so a claim transaction is
+    never committed halfway by another job.  Pass the handler's lock when
+    the handler reads the same connection.
+
+    While a job runs the worker refreshes its claim every
+    *heartbeat_interval* seconds.  If the dispatcher requeued the job
+    anyway, the result is dropped rather than written over the new run.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        handler: JobHandler,
+        *,
+        worker_id: str,
+        poll_interval: float = c.PIPELINE_WORKER_POLL_SECONDS,
+        concurrency: int = 1,
+        db_lock: threading.Lock | None = None,
+        heartbeat_interval: float = c.PIPELINE_JOB_HEARTBEAT_SECONDS,
+    ):
+        self._db = db
+        self._handler = handler
+        self.worker_id = worker_id
+        self._poll_interval = poll_interval
+        self.concurrency = max(1, int(concurrency))
+        self._db_lock = db_lock if db_lock is not None else threading.Lock()
+        self._heartbeat_interval = heartbeat_interval
+
+    def _locked(self, method: Callable[..., Any], *args: Any) -> Any:
+        with self._db_lock:
+            return method(*args)
+
+    async def _call_db(self, method: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.to_thread(self._locked, method, *args)
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        return await self._call_db(self._db.claim_pipeline_job, self.worker_id)
+
+    async def process_one(self) -> bool:
+        """Claim and run one job.  Returns ``False`` when the queue is empty."""
+        job = await self._claim()
+        if job is None:
+            return False
+        await self._run_job(job)
+        return True
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Keep the claim of a running job fresh until cancelled."""
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            if not await self._call_db(self._db.heartbeat_pipeline_job, job_id, self.worker_id):
+                logger.warning(
+                    "Pipeline job claim lost | job_id=%s worker_id=%s",
+                    job_id,
+                    self.worker_id,
+                )
+                return
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        async def set_stage(stage: str) -> None:
+            await self._call_db(self._db.set_pipeline_job_stage, job["id"], stage)
+
+        start_time = time.monotonic()
+        result_text: Optional[str] = None
+        user_message: Optional[str] = None
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            result_text = await self._handler(job, set_stage)
+            status = "success"
+        except AudioPipelineError as e:
+            user_message = e.user_message
+            status = "stage_error"
+            logger.error(
+                "Pipeline job failed | job_id=%s worker_id=%s error=%s",
+                job["id"],
+                self.worker_id,
+                e.__class__.__name__,
+            )
+        except Exception as e:
+            user_message = c.MSG_ERROR_INTERNAL
+            status = "unexpected_error"
+            logger.error(
+                "Pipeline job unexpected error | job_id=%s worker_id=%s error=%s",
+                job["id"],
+                self.worker_id,
+                e.__class__.__name__,
+            )
+        finally:
+            heartbeat.cancel()
+
+        finished = await self._call_db(
+            functools.partial(
+                self._db.finish_pipeline_job,
+                job["id"],
+                worker_id=self.worker_id,
+                result_text=result_text,
+                user_message=user_message,
+            )
+        )
+        if not finished:
+            logger.warning(
+                "Pipeline job result discarded | job_id=%s worker_id=%s reason=claim_lost",
+                job["id"],
+                self.worker_id,
+            )
+            return
+        logger.info(
+            "Pipeline job finished | job_id=%s worker_id=%s status=%s duration_ms=%s",
+            job["id"],
+            self.worker_id,
+            status,
+            _elapsed_ms(start_time),
+        )
+
+    async def run(self, stop_event: asyncio.Event | None = None, *, until_idle: bool = False) -> None:
+        """Process jobs until *stop_event* is set (or forever).
+
+        With *until_idle*, return once the queue is empty and every claimed
+        job has finished.  Jobs still running when the loop stops are
+        awaited, not cancelled.
+        """
+        logger.info(
+            "Pipeline worker started | worker_id=%s concurrency=%s",
+            self.worker_id,
+            self.concurrency,
+        )
+        running: Set[asyncio.Task] = set()
+        try:
+            while stop_event is None or not stop_event.is_set():
+                while len(running) < self.concurrency:
+                    job = await self._claim()
+                    if job is None:
+                        break
+                    running.add(asyncio.create_task(self._run_job(job)))
+                if not running:
+                    if until_idle:
+                        return
+                    await asyncio.sleep(self._poll_interval)
+                    continue
+                # Full: wait for a free place.  Otherwise poll for new jobs too.
+                timeout = None if len(running) >= self.concurrency else self._poll_interval
+                _, running = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            if running:
+                await asyncio.wait(running)
+
+
+class AudioJobHandler:
+    """Runs the real audio pipeline for a job inside a worker process.
+
+    Used as an async context manager so the Telegram ``Bot`` client used
+    for ``getFile`` is initialised once per process.  Pipeline resolution
+    reads the database under :attr:`db_lock`, which the worker running
+    this handler must share.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        config,
+        bot: Bot,
+        hedging: HedgingPolicy | None = None,
+        retry: RetryPolicy | None = None,
+        audio_profiles: Dict[str, AudioProfile] | None = None,
+        conversion_pool: ConversionPool | None = None,
+        local_files_dir: str | None = None,
+    ):
+        self._db = db
+        self._config = config
+        self._bot = bot
+        self._resolver = PipelineResolver(db, hedging=hedging, retry=retry)
+        self._audio_profiles = audio_profiles or {}
+        self._conversion_pool = conversion_pool
+        self._local_files_dir = local_files_dir
+        self.db_lock = threading.Lock()
+        # Jobs run concurrently, but each process converts as many files at
+        # once as its conversion pool has processes.
+        self._conversion_slots = asyncio.Semaphore(
+            conversion_pool.processes if conversion_pool is not None else 1
+        )
+
+    async def __aenter__(self) -> "AudioJobHandler":
+        await self._bot.initialize()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._bot.shutdown()
+
+    def close(self) -> None:
+        if self._conversion_pool is not None:
+            self._conversion_pool.close()
+
+    def _build_processor(self, job: Dict[str, Any]) -> AudioProcessor:
+        """Mirror the per-request resolution done by ``handle_audio``.
+
+        Blocking: queries the shared connection under :attr:`db_lock`.
+        """
+        try:
+            with self.db_lock:
+                plan = self._resolver.resolve(
+                    PipelineRequest(
+                        mode=RequestMode.FULL,
+                        user_id=job["user_id"],
+                        chat_id=job["chat_id"],
+                    )
+                )
+        except AudioPipelineError:
+            raise
+        except Exception as e:
+            logger.error("Pipeline resolution failed: %s", e)
+            components = create_provider_components(self._config)
+            return AudioProcessor(
+                self._config,
+                transcriber=components.transcriber,
+                text_processor=components.text_processor,
+                provider_name=components.provider_name,
+                model_name=components.model_name,
+                conversion_pool=self._conversion_pool,
+            )
+        return AudioProcessor(
+            self._config,
+            transcriber=plan.transcriber,
+            text_processor=plan.text_processor,
+            provider_name=plan.provider_name,
+            model_name=plan.model_name,
+            single_pass=plan.single_pass,
+            audio_profile=profile_for(
+                getattr(plan.transcript_model, "adapter_type", None), self._audio_profiles
+            ),
+            conversion_pool=self._conversion_pool,
+            preprocessing=getattr(plan, "preprocessing", None),
+        )
+
+    async def __call__(self, job: Dict[str, Any], set_stage: StageReporter) -> str:
+        processor = await asyncio.to_thread(self._build_processor, job)
+        ogg_path, mp3_path = processor.generate_file_paths(
+            job["chat_id"], job["message_id"], job["file_unique_id"], job["file_ext"]
+        )
+        try:
+            await set_stage("download")
+            file_obj = await self._bot.get_file(job["file_id"])
+            await processor.download_audio(file_obj, ogg_path, self._local_files_dir)
+
+            await set_stage("convert")
+            async with self._conversion_slots:
+                await processor.convert_audio(ogg_path, mp3_path)
+
+            await set_stage("transcribe")
+            if getattr(processor, "uses_single_pass", False):
+                final_text = await processor.process_single_pass(mp3_path)
+            else:
+                raw_text = await processor.transcribe_audio(mp3_path)
+
+                await set_stage("refine")
+                final_text = await processor.refine_text(raw_text)
+            return processor.format_response(final_text)
+        finally:
+            processor.cleanup_files(ogg_path, mp3_path)
+
+
+def build_bot(token: str, bot_api_config: Dict[str, Any]) -> Bot:
+    """Build a ``Bot`` honouring the optional self-hosted Bot API server."""
+    base_url = (bot_api_config.get("base_url") or "").rstrip("/")
+    if not base_url:
+        return Bot(token)
+    return Bot(
+        token,
+        base_url=f"{base_url}/bot",
+        base_file_url=f"{base_url}/file/bot",
+        local_mode=bool(bot_api_config.get("local_mode")),
+    )
+
+
+def _open_audio_job_handler(processes: int = 1) -> tuple[DatabaseManager, AudioJobHandler]:
+    """Load configuration the same way ``bot.main`` does and build a handler.
+
+    Each of the *processes* workers converts one file at a time, so its
+    FFmpeg gets an equal share of the cores.
+    """
+    from bot.config_service import ConfigService
+    from bot.main import (
+        _get_database_path,
+        _get_master_key_path,
+        _init_secret_store,
+        initialize_configuration,
+    )
+    from bot.runtime import RuntimeSnapshot
+
+    config = initialize_configuration()
+    secret_store = _init_secret_store(_get_master_key_path(config))
+    db = DatabaseManager(_get_database_path(config), secret_store=secret_store)
+    db.initialize()
+    config_service = ConfigService(db, secret_store=secret_store)
+    snapshot = RuntimeSnapshot.from_config_service(config_service, config)
+
+    token = getattr(config, "telegram_token", "")
+    if not token:
+        encrypted = db.get_setting("telegram_token")
+        if encrypted and secret_store is not None and secret_store.key_available:
+            token = secret_store.decrypt(encrypted)
+    if not token:
+        raise RuntimeError("Telegram token not configured")
+
+    bot = build_bot(token, snapshot.telegram_bot_api_config)
+    hedging = HedgingPolicy.from_config(snapshot.provider_resilience_config)
+    retry = RetryPolicy.from_config(snapshot.provider_resilience_config)
+    conversion_pool = ConversionPool(
+        processes=1,
+        nice=snapshot.conversion_nice,
+        threads=max(1, available_cpus() // max(1, processes)),
+        backend=snapshot.conversion_backend,
+    )
+    return db, AudioJobHandler(
+        db,
+        config,
+        bot,
+        hedging=hedging,
+        retry=retry,
+        audio_profiles=snapshot.audio_profiles,
+        conversion_pool=conversion_pool,
+        local_files_dir=local_bot_api_files_dir(snapshot.telegram_bot_api_config),
+    )
+
+
+async def _run_audio_worker(
+    worker_id: str, processes: int = 1, concurrency: int = c.PIPELINE_WORKER_CONCURRENCY
+) -> None:
+    db, handler = _open_audio_job_handler(processes)
+    try:
+        async with handler:
+            await PipelineWorker(
+                db,
+                handler,
+                worker_id=worker_id,
+                concurrency=concurrency,
+                db_lock=handler.db_lock,
+            ).run()
+    finally:
+        handler.close()
+        await drain_gemini_cleanup()
+        await close_local_whisper_clients()
+        db.close()
+
+
+def _worker_main(
+    worker_id: str, processes: int = 1, concurrency: int = c.PIPELINE_WORKER_CONCURRENCY
+) -> None:
+    """Entry point of one spawned worker process."""
+    try:
+        asyncio.run(_run_audio_worker(worker_id, processes, concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.workers",
+        description="Run audio pipeline worker processes for dispatch mode.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=available_cpus(),
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=c.PIPELINE_WORKER_CONCURRENCY,
+        help=f"jobs run at once by each process (default: {c.PIPELINE_WORKER_CONCURRENCY})",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(processName)s - %(levelname)s - %(message)s',
+        level=logging.INFO,
+    )
+    ctx = multiprocessing.get_context("spawn")
+    count = max(1, args.processes)
+    processes = [
+        ctx.Process(
+            target=_worker_main,
+            args=(f"{os.getpid()}-{index}", count, max(1, args.concurrency)),
+            name=f"pipeline-worker-{index}",
+        )
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(
+        "Started pipeline workers | processes=%s concurrency=%s",
+        len(processes),
+        max(1, args.concurrency),
+    )
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,9 @@ from bot.exceptions import (
     ConvertError,
     DownloadError,
     DownloadTimeout,
+    ProviderBulkheadFull,
     ProviderCircuitOpen,
+    ProviderRateLimited,
     RefineError,
     TranscribeError,
 )
@@ -308,10 +310,15 @@ async def test_gemini_remote_cleanup_uses_keyword_name(monkeypatch):
     from bot import providers
 
     deleted = []
+    sleeps = []
+    states = iter(["PROCESSING", "ACTIVE"])
 
     class DummyFiles:
         def upload(self, file):
-            return SimpleNamespace(name="remote-file", state="ACTIVE")
+            return SimpleNamespace(name="remote-file", state="PROCESSING")
+
+        def get(self, *, name):
+            return SimpleNamespace(name=name, state=next(states))
 
         def delete(self, *, name):
             deleted.append(name)
@@ -320,16 +327,61 @@ async def test_gemini_remote_cleanup_uses_keyword_name(monkeypatch):
         def generate_content(self, **kwargs):
             return SimpleNamespace(text="transcribed text")
 
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(c, "GEMINI_INLINE_AUDIO_MAX_BYTES", 0)
+    monkeypatch.setattr(providers.asyncio, "sleep", fake_sleep)
     transcriber = providers.GeminiTranscriber.__new__(providers.GeminiTranscriber)
     transcriber.client = SimpleNamespace(files=DummyFiles(), models=DummyModels())
     transcriber.model_name = "gemini-test"
 
     result = await transcriber.transcribe(__file__)
+    await providers.drain_gemini_cleanup()
 
     assert result.text == "transcribed text"
+    assert sleeps == [c.GEMINI_FILE_POLL_INITIAL_SECONDS, c.GEMINI_FILE_POLL_INITIAL_SECONDS * 2]
     assert deleted == ["remote-file"]
 
 
+@pytest.mark.asyncio
+async def test_gemini_single_pass_sends_small_audio_inline_with_prompt():
+    """
+    Test that GeminiSinglePassProcessor sends the refinement prompt and
+    small audio inline in one request, without touching the Files API.
+    """
+    from bot import providers
+
+    requests = []
+
+    class NoFiles:
+        def __getattr__(self, name):
+            raise AssertionError(f"Files API used: {name}")
+
+    class DummyModels:
+        def generate_content(self, **kwargs):
+            requests.append(kwargs)
+            return SimpleNamespace(text=" refined text ")
+
+    processor = providers.GeminiSinglePassProcessor.__new__(providers.GeminiSinglePassProcessor)
+    processor.client = SimpleNamespace(files=NoFiles(), models=DummyModels())
+    processor.model_name = "gemini-test"
+    processor.prompts = {"single_pass": "Trascrivi e rielabora"}
+
+    result = await processor.process_audio(__file__)
+
+    assert result == "refined text"
+    assert len(requests) == 1
+    prompt, audio = requests[0]["contents"]
+    assert prompt.endswith("Trascrivi e rielabora")
+    with open(__file__, "rb") as f:
+        assert audio.inline_data.data == f.read()
+    assert audio.inline_data.mime_type == "audio/mpeg"
+
+
 # ==================================================================
 # Resilience (circuit-breaker) tests
 # ==================================================================
@@ -521,6 +573,39 @@ async def test_audio_processor_stream_refine_text_falls_back_to_accumulated_text
     assert finalized == ["📝 Trascrizione Completata\n🤖 Modello: gpt-4o-mini\n\nHello world"]
 
 
+@pytest.mark.asyncio
+async def test_audio_processor_stream_transcribe_previews_partial_text(monkeypatch):
+    """Partial transcripts are previewed (throttled) and the done text wins."""
+    from bot.handlers import audio
+
+    class StreamingTranscriber:
+        supports_transcribe_streaming = True
+
+        async def stream_transcribe(self, file_path: str):
+            yield RefineStreamEvent(type="delta", text="Ciao")
+            yield RefineStreamEvent(type="reset", text="")
+            yield RefineStreamEvent(type="delta", text="Salve")
+            yield RefineStreamEvent(type="delta", text=" a tutti")
+            yield RefineStreamEvent(type="done", text="Salve a tutti.")
+
+    processor = _minimal_processor()
+    processor._transcriber = StreamingTranscriber()
+    previews = []
+
+    class DummyAdapter:
+        async def show_transcript_preview(self, context, chat_id, ack_msg, status_text, partial_text):
+            previews.append(partial_text)
+
+    monkeypatch.setattr(audio, "TRANSCRIPT_PREVIEW_INTERVAL_SECONDS", 0)
+    context = SimpleNamespace(bot_data={"delivery_adapter": DummyAdapter()})
+
+    raw_text = await processor.stream_transcribe_audio(context, 1, SimpleNamespace(), "a.mp3", "status")
+
+    assert processor.supports_transcribe_streaming is True
+    assert raw_text == "Salve a tutti."
+    assert previews == ["Ciao", "Salve", "Salve a tutti"]
+
+
 # ==================================================================
 # ResilientTranscriber / ResilientTextProcessor tests
 # ==================================================================
@@ -568,3 +653,134 @@ async def test_resilient_text_processor_opens_circuit_after_threshold():
         await provider.process("hello")
     with pytest.raises(ProviderCircuitOpen):
         await provider.process("hello")
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_queues_then_rejects_excess_calls():
+    """A provider bulkhead caps in-flight calls and bounds its own queue."""
+    from bot.providers import Bulkhead
+
+    bulkhead = Bulkhead("provider:1", max_concurrent=1, max_queued=1)
+    release = asyncio.Event()
+    order = []
+
+    async def call(tag):
+        async with bulkhead.slot():
+            order.append(tag)
+            await release.wait()
+
+    first = asyncio.create_task(call("first"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(call("second"))
+    await asyncio.sleep(0)
+    assert (bulkhead.active, bulkhead.waiting) == (1, 1)
+
+    with pytest.raises(ProviderBulkheadFull):
+        async with bulkhead.slot():
+            pass
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert order == ["first", "second"]
+    assert bulkhead.get_stats()["rejected"] == 1
+    assert (bulkhead.active, bulkhead.waiting) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_full_fails_over_to_fallback_transcriber():
+    """A saturated primary bulkhead hands the request to the fallback."""
+    from bot.pipeline_resolver import FallbackTranscriber
+    from bot.providers import Bulkhead, ResilientTranscriber, Transcriber, TranscriptionResult
+
+    class NamedTranscriber(Transcriber):
+        def __init__(self, name):
+            self.name = name
+
+        async def transcribe(self, file_path: str) -> TranscriptionResult:
+            return TranscriptionResult(text=self.name)
+
+    saturated = Bulkhead("provider:1", max_concurrent=1, max_queued=0)
+    saturated.active = 1
+    chain = FallbackTranscriber(
+        ResilientTranscriber(NamedTranscriber("primary"), provider_name="p1", bulkheads=[saturated]),
+        [ResilientTranscriber(NamedTranscriber("fallback"), provider_name="p2")],
+    )
+
+    result = await chain.transcribe("a.mp3")
+
+    assert result.text == "fallback"
+
+
+@pytest.mark.asyncio
+async def test_rate_budget_waits_briefly_then_rejects():
+    """RPM budget waits for a refill that fits the max wait, else rejects."""
+    from bot.providers import ProviderRateBudget
+
+    budget = ProviderRateBudget("provider:1", rpm=6000, tpm=0, max_wait_seconds=0.5)
+    budget._rpm._level = 0  # next request refills in 10 ms
+
+    await budget.acquire(0)
+    assert budget.get_stats()["waited"] == 1
+
+    slow = ProviderRateBudget("provider:2", rpm=1, tpm=0, max_wait_seconds=0.5)
+    await slow.acquire(0)
+    with pytest.raises(ProviderRateLimited):
+        await slow.acquire(0)
+    assert slow.get_stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_budget_precharges_estimate_and_settles_reported_usage():
+    """Refine calls pre-charge estimated tokens, corrected by the usage."""
+    from bot.providers import (
+        ProviderRateBudget,
+        ResilientTextProcessor,
+        TextProcessor,
+        estimate_refine_tokens,
+        record_token_usage,
+    )
+
+    class UsageProcessor(TextProcessor):
+        async def process(self, raw_text):
+            record_token_usage(SimpleNamespace(total_tokens=50))
+            return raw_text
+
+    budget = ProviderRateBudget("provider:1", rpm=0, tpm=100_000)
+    estimate = estimate_refine_tokens("x" * 4000)
+    assert estimate == c.PROVIDER_REFINE_PROMPT_TOKENS + 2000
+
+    wrapper = ResilientTextProcessor(UsageProcessor(), rate_budget=budget)
+    assert await wrapper.process("x" * 4000) == "x" * 4000
+
+    remaining = budget.get_stats()["tpm_remaining"]
+    assert 100_000 - 50 <= remaining < 100_000 - 40
+
+
+@pytest.mark.asyncio
+async def test_observe_provider_call_reports_throttling_to_adaptive_limiter():
+    """A wrapped HTTP 429 is reported to the adaptive limiter as throttling."""
+    from bot.handlers.audio import _observe_provider_call
+    from bot.rate_limiter import AdaptiveConcurrencyLimit, RateLimiter
+
+    class FakeRateLimitError(Exception):
+        status_code = 429
+
+    async def throttled_call():
+        try:
+            raise FakeRateLimitError("slow down")
+        except FakeRateLimitError as e:
+            raise TranscribeError("wrapped", c.MSG_ERROR_TRANSCRIBE) from e
+
+    limiter = RateLimiter(
+        max_global=4,
+        adaptive=AdaptiveConcurrencyLimit(initial=4, min_limit=1, max_limit=8),
+    )
+    context = SimpleNamespace(bot_data={"rate_limiter": limiter})
+
+    with pytest.raises(TranscribeError):
+        await _observe_provider_call(context, "transcribe", throttled_call())
+
+    stats = limiter.get_adaptive_stats()
+    assert stats["samples"]["throttled"] == 1
+    assert stats["limit"] == 3
+    assert stats["changes"][0]["reason"] == "throttled"
@@ -0,0 +1,228 @@
+"""
+Tests for FFmpeg conversion profiles and audio preprocessing
+(bot.audio_profiles), their use in the conversion stage and the profile
+tuner (bot.bench.ffmpeg_profiles).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from bot import utils
+from bot.audio_profiles import (
+    DEFAULT_AUDIO_PROFILE,
+    NO_PREPROCESSING,
+    AudioPreprocessing,
+    AudioProfile,
+    dump_profile_map,
+    parse_profile_map,
+    profile_for,
+)
+from bot.bench.ffmpeg_profiles import build_matrix, recommend, run_tuner, save_recommendations
+from bot.config_service import ConfigService
+from bot.conversion import ConversionPool
+from bot.database import DatabaseManager
+from bot.handlers.audio import AudioProcessor
+from bot.pipeline_resolver import PipelineResolver
+from bot.runtime import RuntimeSnapshot
+from bot.web.setup_wizard import set_active_pipeline_profile_id
+
+
+def test_default_profile_keeps_legacy_ffmpeg_settings():
+    assert DEFAULT_AUDIO_PROFILE.output_args() == [
+        "-vn", "-c:a", "libmp3lame", "-ar", "44100", "-ac", "2", "-b:a", "192k",
+    ]
+    opus = AudioProfile("opus", 16000, 1, "32k", threads=2)
+    assert opus.extension == "ogg"
+    assert opus.output_args()[-2:] == ["-threads", "2"]
+    assert "-b:a" not in AudioProfile("flac", 16000, 1, "64k").output_args()
+
+    for bad in ({"codec": "vorbis"}, {"codec": "opus", "sample_rate": 44100}, {"channels": 6},
+                {"bitrate": "fast"}, {"threads": -1}, {"level": 3}):
+        with pytest.raises(ValueError):
+            AudioProfile.from_dict(bad)
+
+
+def test_profile_map_round_trip_and_codec_check():
+    profiles = {"gemini-native": AudioProfile("opus", 16000, 1, "32k", 1)}
+    assert parse_profile_map(dump_profile_map(profiles)) == profiles
+    assert parse_profile_map("") == {}
+    assert profile_for("openai-native", profiles) == DEFAULT_AUDIO_PROFILE
+    assert profile_for("gemini-native", profiles).codec == "opus"
+
+    with pytest.raises(ValueError, match="openai-compat"):
+        parse_profile_map('{"openai-compat": {"codec": "opus", "sample_rate": 16000}}')
+    # OpenAI single-pass sends input_audio, which only takes WAV and MP3.
+    with pytest.raises(ValueError, match="openai-native"):
+        parse_profile_map('{"openai-native": {"codec": "opus", "sample_rate": 16000}}')
+
+
+def test_short_adapter_aliases_share_the_stored_provider_profile():
+    stored = parse_profile_map('{"openai": {"codec": "wav", "sample_rate": 16000}}')
+
+    assert set(stored) == {"openai-native"}
+    assert profile_for("openai-native", stored).codec == "wav"
+    assert profile_for("openai", stored).codec == "wav"
+    with pytest.raises(ValueError, match="openai-native"):
+        parse_profile_map('{"openai": {"codec": "aac", "sample_rate": 16000}}')
+    with pytest.raises(ValueError):
+        parse_profile_map("[1, 2]")
+
+
+def test_setting_is_validated_and_reaches_the_snapshot(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.sqlite3"))
+    db.initialize()
+    service = ConfigService(db)
+
+    errors = service.update_setting("audio_conversion_profiles", '{"openai": {"codec": "wma"}}')
+    assert errors and "Profili di conversione audio" in errors[0]
+
+    value = dump_profile_map({"gemini-native": AudioProfile("aac", 24000, 1, "64k")})
+    assert service.update_setting("audio_conversion_profiles", value) == []
+    snapshot = RuntimeSnapshot.from_config_service(service)
+    assert snapshot.audio_profiles["gemini-native"].codec == "aac"
+
+    db.set_setting("audio_conversion_profiles", "{broken")
+    assert RuntimeSnapshot.from_config_service(service).audio_profiles == {}
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_processor_converts_with_its_profile(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_exec(*args, **kwargs):
+        calls.append(args)
+
+        class Process:
+            returncode = 0
+
+            async def communicate(self):
+                return b"", b""
+
+        return Process()
+
+    monkeypatch.setattr("bot.utils.asyncio.create_subprocess_exec", fake_exec)
+    profile = AudioProfile("opus", 16000, 1, "32k", 1)
+    processor = AudioProcessor.__new__(AudioProcessor)
+    processor.config = SimpleNamespace(audio_dir=str(tmp_path))
+    processor.audio_profile = profile
+
+    source, converted = processor.generate_file_paths(1, 2, "u", "ogg")
+    assert converted.endswith("1_2_u_converted.ogg") and source != converted
+    await processor.convert_audio(source, converted)
+
+    assert calls[0][:4] == ("ffmpeg", "-y", "-i", source)
+    assert list(calls[0][4:-1]) == profile.output_args()
+    assert calls[0][-1] == converted
+
+
+@pytest.mark.asyncio
+async def test_tuner_recommends_fastest_accepted_profile_and_saves_it(tmp_path, monkeypatch):
+    async def fake_convert(src, dst, profile):
+        # Size grows with bitrate and sample rate, so upload time (not wall
+        # clock noise) decides; lossless output is large.
+        kbps = 700 if profile.bitrate is None else int(profile.bitrate[:-1])
+        with open(dst, "wb") as handle:
+            handle.write(b"\0" * (kbps * 100 + profile.sample_rate // 10))
+
+    monkeypatch.setattr(utils, "convert_to_mp3", fake_convert)
+    source = tmp_path / "voice.ogg"
+    source.write_bytes(b"OggS")
+    matrix = build_matrix(["mp3", "opus", "flac"], [16000, 44100], ["32k", "64k"], [1])
+    assert [p.sample_rate for p in matrix if p.codec == "opus"] == [16000, 16000]  # no 44.1 kHz
+    assert sum(p.codec == "flac" for p in matrix) == 2
+
+    report = await run_tuner(
+        [str(source)], matrix, ["gemini", "openai-native", "openai-compat"], 1.0, repeat=1
+    )
+
+    picks = recommend(report["results"], ["gemini", "openai-native", "openai-compat"])
+    # Picks use the adapter types providers are stored with.
+    assert set(picks) == {"gemini-native", "openai-native", "openai-compat"}
+    assert picks["gemini-native"].bitrate == "32k" and picks["gemini-native"].sample_rate == 16000
+    assert picks["openai-native"].codec == "mp3"
+    assert picks["openai-compat"].codec in ("mp3", "flac")
+    assert report["recommendations"]["gemini-native"]["saved_ms_vs_default"] > 0
+    assert report["default"]["label"] == DEFAULT_AUDIO_PROFILE.label
+
+    db_path = str(tmp_path / "app.sqlite3")
+    assert save_recommendations(db_path, picks) == []
+    db = DatabaseManager(db_path)
+    db.initialize()
+    stored = json.loads(db.get_setting("audio_conversion_profiles"))
+    assert set(stored) == {"gemini-native", "openai-native", "openai-compat"}
+    db.close()
+    assert not any(name.startswith("tune-") for name in os.listdir(tmp_path))
+
+
+def test_preprocessing_filters_are_conservative_and_validated():
+    assert NO_PREPROCESSING.output_args() == [] and not NO_PREPROCESSING.enabled
+    chain = AudioPreprocessing(trim_silence=True, tempo=1.25).filter_chain()
+    assert chain.startswith("silenceremove=start_periods=1:start_threshold=-50dB:")
+    assert "stop_duration=0.7" in chain and "stop_silence=0.3" in chain
+    assert chain.endswith(",atempo=1.25")
+
+    for bad in ({"tempo": 0.8}, {"tempo": 2.5}, {"silence_threshold_db": -5},
+                {"min_silence_ms": 50}, {"speed": 2}, [1]):
+        with pytest.raises(ValueError):
+            AudioPreprocessing.from_dict(bad)
+
+
+@pytest.mark.asyncio
+async def test_conversion_applies_filters_and_reports_removed_audio(tmp_path, monkeypatch):
+    calls = []
+    ffmpeg_log = (
+        b"Input #0, ogg, from 'in.ogg':\n  Duration: 00:00:42.50, start: 0.000000\n"
+        b"size=      64kB time=00:00:20.00 bitrate\rsize=     120kB time=00:00:30.25 bitrate"
+    )
+
+    async def fake_exec(*args, **kwargs):
+        calls.append(args)
+
+        class Process:
+            pid = 1
+            returncode = 0
+
+            async def communicate(self):
+                return b"", ffmpeg_log
+
+        return Process()
+
+    monkeypatch.setattr("bot.utils.asyncio.create_subprocess_exec", fake_exec)
+    preprocessing = AudioPreprocessing(trim_silence=True)
+    processor = AudioProcessor.__new__(AudioProcessor)
+    processor.audio_profile = DEFAULT_AUDIO_PROFILE
+    processor.preprocessing = preprocessing
+    processor.conversion_pool = ConversionPool(processes=1, cpu_count=1)
+
+    result = await processor.convert_audio("in.ogg", "out.mp3")
+
+    assert calls[0][-3:] == ("-af", preprocessing.filter_chain(), "out.mp3")
+    assert (result.input_seconds, result.output_seconds) == (42.5, 30.25)
+    assert result.removed_seconds == pytest.approx(12.25)
+    stats = processor.conversion_pool.get_stats()
+    assert (stats["audio_seconds_in"], stats["audio_seconds_out"]) == (42.5, 30.2)
+
+
+def test_plan_carries_active_profile_preprocessing(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.sqlite3"))
+    db.initialize()
+    db.add_provider(name="Mock", adapter_type="mock", endpoint="mock://?latency=fixed&latency_ms=0")
+    resolver = PipelineResolver(db)
+    assert resolver.resolve().preprocessing is None
+
+    profile_id = db.add_pipeline_profile(name="Profilo", mode="two_stage")
+    set_active_pipeline_profile_id(db, profile_id)
+    db.set_pipeline_profile_preprocessing(profile_id, {"trim_silence": True, "tempo": 1.5})
+    plan = resolver.resolve()
+    assert plan.preprocessing == AudioPreprocessing(trim_silence=True, tempo=1.5)
+    assert plan.resolution_log[-1].startswith("Audio preprocessing:")
+
+    db.set_pipeline_profile_preprocessing(profile_id, {"tempo": 9})
+    assert resolver.resolve().preprocessing is None
+    db.close()
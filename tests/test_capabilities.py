@@ -52,6 +52,7 @@ class TestCapabilityModel:
             "refinement": False,
             "streaming_refinement": True,
             "single_pass_audio_to_text": False,
+            "streaming_transcription": False,
         }
         assert all(isinstance(v, bool) for v in d.values())
 
@@ -135,6 +136,13 @@ class TestDetectCapabilities:
         assert caps.refinement is True
         assert caps.streaming_refinement is True
 
+    def test_openai_compat_transcribe_model_streams(self):
+        caps = detect_capabilities("openai-compat", "gpt-4o-mini-transcribe")
+        assert caps.transcription is True
+        assert caps.streaming_transcription is True
+        assert detect_capabilities("openai-compat", "whisper-1").streaming_transcription is False
+        assert detect_capabilities("openai", "gpt-4o-transcribe").streaming_transcription is False
+
     def test_unknown_adapter(self):
         caps = detect_capabilities("ollama", "llama3")
         assert caps == CapabilityModel()
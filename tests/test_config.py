@@ -20,6 +20,11 @@ def configure_valid_environment(monkeypatch, tmp_path):
     monkeypatch.delenv("LLM_PROVIDER", raising=False)
     monkeypatch.delenv("LLM_MODEL", raising=False)
     monkeypatch.delenv("TELEGRAM_DRAFT_STREAMING", raising=False)
+    monkeypatch.delenv("TELEGRAM_RAW_FIRST", raising=False)
+    monkeypatch.delenv("TELEGRAM_BOT_API_URL", raising=False)
+    monkeypatch.delenv("TELEGRAM_BOT_API_LOCAL", raising=False)
+    monkeypatch.delenv("TELEGRAM_BOT_API_DIR", raising=False)
+    monkeypatch.delenv("PIPELINE_DISPATCH", raising=False)
     monkeypatch.setenv("AUTHORIZED_FILE", str(authorized_file))
     monkeypatch.setenv("AUDIO_DIR", str(audio_dir))
     monkeypatch.setattr(
@@ -110,6 +115,9 @@ def test_config_reports_invalid_numeric_variable(
         "RATE_LIMIT_QUEUE_ENABLED",
         "PROVIDER_RESILIENCE_ENABLED",
         "TELEGRAM_DRAFT_STREAMING",
+        "TELEGRAM_RAW_FIRST",
+        "TELEGRAM_BOT_API_LOCAL",
+        "PIPELINE_DISPATCH",
     ],
 )
 def test_config_rejects_ambiguous_boolean_values(monkeypatch, tmp_path, variable):
@@ -125,12 +133,31 @@ def test_config_accepts_explicit_boolean_values(monkeypatch, tmp_path):
     monkeypatch.setenv("RATE_LIMIT_QUEUE_ENABLED", "no")
     monkeypatch.setenv("PROVIDER_RESILIENCE_ENABLED", "yes")
     monkeypatch.setenv("TELEGRAM_DRAFT_STREAMING", "true")
+    monkeypatch.setenv("TELEGRAM_RAW_FIRST", "1")
+    monkeypatch.setenv("PIPELINE_DISPATCH", "yes")
 
     config = Config()
 
     assert config.rate_limit_config["queue_enabled"] is False
     assert config.provider_resilience_config["enabled"] is True
     assert config.telegram_progressive_output_config["enabled"] is True
+    assert config.telegram_progressive_output_config["raw_first"] is True
+    assert config.pipeline_dispatch_enabled is True
+
+
+def test_config_loads_local_bot_api_server(monkeypatch, tmp_path):
+    configure_valid_environment(monkeypatch, tmp_path)
+    monkeypatch.setenv("TELEGRAM_BOT_API_URL", "http://telegram-bot-api:8081/")
+    monkeypatch.setenv("TELEGRAM_BOT_API_LOCAL", "1")
+    monkeypatch.setenv("TELEGRAM_BOT_API_DIR", "/var/lib/telegram-bot-api")
+
+    config = Config()
+
+    assert config.telegram_bot_api_config == {
+        "base_url": "http://telegram-bot-api:8081",
+        "local_mode": True,
+        "files_dir": "/var/lib/telegram-bot-api",
+    }
 
 
 # ------------------------------------------------------------------
@@ -215,3 +242,16 @@ def test_relaxed_config_audio_dir_created(monkeypatch, tmp_path):
 
     config = Config(relaxed=True)
     assert audio_dir.exists()
+
+
+def test_config_loads_adaptive_concurrency_bounds(monkeypatch, tmp_path):
+    configure_valid_environment(monkeypatch, tmp_path)
+    monkeypatch.setenv("RATE_LIMIT_ADAPTIVE", "1")
+    monkeypatch.setenv("RATE_LIMIT_ADAPTIVE_MIN", "2")
+    monkeypatch.setenv("RATE_LIMIT_ADAPTIVE_MAX", "12")
+
+    config = Config()
+
+    assert config.rate_limit_config["adaptive_enabled"] is True
+    assert config.rate_limit_config["adaptive_min"] == 2
+    assert config.rate_limit_config["adaptive_max"] == 12
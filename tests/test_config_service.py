@@ -266,6 +266,13 @@ class TestValidation:
         sd = SettingDef(key="prompt_system", label="System", description="x", type="text")
         assert _validate(sd, "any text") == []
 
+    def test_admission_duration_tiers(self):
+        sd = SettingDef(key="admission_duration_tiers", label="Livelli", description="x", type="text")
+        assert _validate(sd, '{"groups": 300, "user:42": 0}') == []
+        errors = _validate(sd, '{"vip": 300}')
+        assert len(errors) == 1
+        assert "vip" in errors[0]
+
 
 # ------------------------------------------------------------------
 # ConfigService — writing
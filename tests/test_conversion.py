@@ -0,0 +1,169 @@
+"""
+Tests for the machine-sized FFmpeg conversion pool (bot.conversion).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from bot import conversion, utils
+from bot.audio_profiles import DEFAULT_AUDIO_PROFILE, AudioProfile
+from bot.conversion import ConversionPool
+from bot.pipeline_stages import StagedPipelineEngine
+
+
+def test_pool_caps_processes_at_core_count_and_splits_threads():
+    assert ConversionPool(cpu_count=8).get_stats() == {
+        "backend": "ffmpeg", "cpu_count": 8, "processes": 8, "threads_per_process": 1,
+        "nice": 0, "in_process": 0, "fallbacks": 0,
+        "audio_seconds_in": 0.0, "audio_seconds_out": 0.0,
+    }
+    pool = ConversionPool(processes=2, nice=40, cpu_count=8)
+    assert (pool.processes, pool.threads, pool.nice) == (2, 4, 19)
+    assert ConversionPool(processes=32, cpu_count=4).processes == 4
+    assert ConversionPool(processes=1, threads=3, cpu_count=8).threads == 3
+
+    assert pool.tune(None) == AudioProfile(threads=4)
+    pinned = AudioProfile("opus", 16000, 1, "32k", threads=1)
+    assert pool.tune(pinned) is pinned
+
+
+def test_engine_sizes_auto_convert_stage_to_the_machine(monkeypatch):
+    monkeypatch.setattr("bot.pipeline_stages.available_cpus", lambda: 3)
+    engine = StagedPipelineEngine({"convert": 0})
+    assert engine.stage("convert").concurrency == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_passes_threads_and_nice_to_ffmpeg(monkeypatch):
+    spawned = []
+    reniced = []
+
+    async def fake_exec(*args, **kwargs):
+        spawned.append(args)
+
+        class Process:
+            pid = 4242
+            returncode = 0
+
+            async def communicate(self):
+                return b"", b""
+
+        return Process()
+
+    monkeypatch.setattr("bot.utils.asyncio.create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(utils, "_lower_priority", lambda pid, nice: reniced.append((pid, nice)))
+
+    await ConversionPool(processes=2, nice=10, cpu_count=4).convert("in.ogg", "out.mp3")
+    assert list(spawned[0][4:-1]) == AudioProfile(threads=2).output_args()
+    assert reniced == [(4242, 10)]
+
+    await utils.convert_to_mp3("in.ogg", "out.mp3")
+    assert list(spawned[1][4:-1]) == DEFAULT_AUDIO_PROFILE.output_args()
+    assert len(reniced) == 1
+
+
+def test_nice_setting_is_bounded_and_reaches_the_snapshot(tmp_path):
+    from bot.config_service import ConfigService
+    from bot.database import DatabaseManager
+    from bot.runtime import RuntimeSnapshot
+
+    db = DatabaseManager(str(tmp_path / "app.sqlite3"))
+    db.initialize()
+    service = ConfigService(db)
+
+    assert service.update_setting("conversion_nice", "25")
+    assert service.update_setting("conversion_nice", "5") == []
+    assert service.update_setting("pipeline_stage_convert_concurrency", "0") == []
+    snapshot = RuntimeSnapshot.from_config_service(service)
+    assert snapshot.conversion_nice == 5
+    assert snapshot.pipeline_stage_config["convert"] == 0
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_pyav_backend_converts_in_process_and_falls_back_to_ffmpeg(monkeypatch):
+    monkeypatch.setattr(conversion, "av", None)
+    assert ConversionPool(backend="pyav").backend == "ffmpeg"
+    with pytest.raises(ValueError):
+        ConversionPool(backend="sox")
+
+    monkeypatch.setattr(conversion, "av", object())
+    in_process, spawned = [], []
+
+    def fake_transcode(src, dst, profile, cancelled):
+        if src == "broken.ogg":
+            raise RuntimeError("Invalid data found when processing input")
+        in_process.append((src, dst, profile.threads))
+
+    async def fake_convert(src, dst, profile=None, nice=0, preprocessing=None):
+        spawned.append(src)
+
+    monkeypatch.setattr(conversion, "transcode_in_process", fake_transcode)
+    monkeypatch.setattr(utils, "convert_to_mp3", fake_convert)
+    pool = ConversionPool(processes=2, cpu_count=4, backend="pyav")
+    try:
+        await pool.convert("note.ogg", "note.mp3")
+        await pool.convert("broken.ogg", "broken.mp3")
+    finally:
+        pool.close()
+
+    assert in_process == [("note.ogg", "note.mp3", 2)]
+    assert spawned == ["broken.ogg"]
+    stats = pool.get_stats()
+    assert (stats["backend"], stats["in_process"], stats["fallbacks"]) == ("pyav", 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_in_process_conversion_is_told_to_stop(monkeypatch):
+    monkeypatch.setattr(conversion, "av", object())
+    started, stopped = threading.Event(), threading.Event()
+
+    def slow_transcode(src, dst, profile, cancelled):
+        started.set()
+        if cancelled.wait(5):
+            stopped.set()
+
+    monkeypatch.setattr(conversion, "transcode_in_process", slow_transcode)
+    pool = ConversionPool(processes=1, cpu_count=1, backend="pyav")
+    task = asyncio.create_task(pool.convert("note.ogg", "note.mp3"))
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await asyncio.to_thread(stopped.wait, 5)
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_benchmark_reports_saving_per_note(tmp_path, monkeypatch):
+    from bot.bench.conversion_backends import run_benchmark
+
+    monkeypatch.setattr(conversion, "av", object())
+
+    def fake_transcode(src, dst, profile, cancelled):
+        with open(dst, "wb") as handle:
+            handle.write(b"ID3")
+
+    async def fake_convert(src, dst, profile=None, nice=0, preprocessing=None):
+        await asyncio.sleep(0.005)  # process startup
+        with open(dst, "wb") as handle:
+            handle.write(b"ID3")
+
+    monkeypatch.setattr(conversion, "transcode_in_process", fake_transcode)
+    monkeypatch.setattr(utils, "convert_to_mp3", fake_convert)
+    note = tmp_path / "voice-3s.ogg"
+    note.write_bytes(b"OggS")
+
+    report = await run_benchmark(
+        {3: str(note)}, ["ffmpeg", "pyav"], repeat=3, concurrency=2, measure_spawn_cost=False
+    )
+
+    row = report["results"]["3s"]
+    assert row["pyav"]["fallbacks"] == 0 and "burst_ms" in row["ffmpeg"]
+    assert row["pyav_saved_ms"] > 0
+    assert sorted(os.listdir(tmp_path)) == ["voice-3s.ogg"]
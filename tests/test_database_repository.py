@@ -173,6 +173,17 @@ def test_update_provider_updates_fields(tmp_path):
     assert provider["enabled"] == 0
 
 
+def test_update_provider_stores_bulkhead_limits(tmp_path):
+    db = _make_db(tmp_path)
+    pid = db.add_provider("Limited", "openai-native")
+    assert db.get_provider(pid)["max_concurrent"] == 0
+
+    db.update_provider(pid, max_concurrent=3, max_queued=-5)
+
+    provider = db.get_provider(pid)
+    assert (provider["max_concurrent"], provider["max_queued"]) == (3, 0)
+
+
 def test_update_provider_returns_false_for_missing(tmp_path):
     db = _make_db(tmp_path)
     assert db.update_provider(999, name="Ghost") is False
@@ -1239,3 +1250,126 @@ class TestDeleteProtection:
         result = db.update_provider(pid, enabled=False)
         assert result is True
         assert db.get_provider(pid)["enabled"] == 0
+
+
+# ------------------------------------------------------------------
+# Pipeline jobs
+# ------------------------------------------------------------------
+
+def _enqueue(db, message_id=10):
+    return db.enqueue_pipeline_job(
+        chat_id=1,
+        user_id=2,
+        message_id=message_id,
+        ack_message_id=message_id + 1,
+        file_id="file-id",
+        file_unique_id=f"uniq-{message_id}",
+        file_ext=".ogg",
+    )
+
+
+def test_claim_pipeline_job_returns_oldest_queued_job_once(tmp_path):
+    db = _make_db(tmp_path)
+    first = _enqueue(db, 10)
+    _enqueue(db, 20)
+
+    job = db.claim_pipeline_job("w1")
+    assert job["id"] == first
+    assert job["status"] == "running"
+    assert job["worker_id"] == "w1"
+    assert job["attempts"] == 1
+
+    assert db.claim_pipeline_job("w2")["message_id"] == 20
+    assert db.claim_pipeline_job("w3") is None
+
+
+def test_claim_pipeline_job_is_exclusive_across_connections(tmp_path):
+    db_a = _make_db(tmp_path)
+    db_b = DatabaseManager(db_a.db_path)
+    db_b.initialize()
+    _enqueue(db_a)
+
+    claimed = [db_a.claim_pipeline_job("a"), db_b.claim_pipeline_job("b")]
+    assert sum(job is not None for job in claimed) == 1
+    db_b.close()
+
+
+def test_finish_and_deliver_pipeline_job_drops_transcript(tmp_path):
+    db = _make_db(tmp_path)
+    ok_id = _enqueue(db, 10)
+    failed_id = _enqueue(db, 20)
+    db.claim_pipeline_job("w")
+    db.claim_pipeline_job("w")
+
+    assert db.finish_pipeline_job(ok_id, worker_id="w", result_text="testo")
+    assert db.finish_pipeline_job(failed_id, worker_id="w", user_message="errore")
+
+    finished = db.list_pipeline_jobs(["done", "failed"], undelivered_only=True)
+    assert [(j["id"], j["status"]) for j in finished] == [(ok_id, "done"), (failed_id, "failed")]
+    assert db.count_pipeline_jobs() == {"done": 1, "failed": 1}
+
+    db.mark_pipeline_job_delivered(ok_id)
+    remaining = db.list_pipeline_jobs(["done", "failed"], undelivered_only=True)
+    assert [j["id"] for j in remaining] == [failed_id]
+    row = db.connection.execute(
+        "SELECT result_text FROM pipeline_jobs WHERE id = ?", (ok_id,)
+    ).fetchone()
+    assert row["result_text"] is None
+
+
+def test_requeue_stale_pipeline_jobs(tmp_path):
+    db = _make_db(tmp_path)
+    job_id = _enqueue(db)
+    db.claim_pipeline_job("dead-worker")
+    db.connection.execute(
+        "UPDATE pipeline_jobs SET claimed_at = datetime('now', '-1 hour') WHERE id = ?",
+        (job_id,),
+    )
+    db.connection.commit()
+
+    assert db.requeue_stale_pipeline_jobs(600) == 1
+    job = db.claim_pipeline_job("w2")
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+
+
+def test_pipeline_job_heartbeat_and_finish_belong_to_the_claiming_worker(tmp_path):
+    db = _make_db(tmp_path)
+    job_id = _enqueue(db)
+    db.claim_pipeline_job("w1")
+
+    def age_claim():
+        db.connection.execute(
+            "UPDATE pipeline_jobs SET claimed_at = datetime('now', '-1 hour') WHERE id = ?",
+            (job_id,),
+        )
+        db.connection.commit()
+
+    age_claim()
+    assert db.heartbeat_pipeline_job(job_id, "w1") is True
+    assert db.requeue_stale_pipeline_jobs(600) == 0
+
+    age_claim()
+    assert db.requeue_stale_pipeline_jobs(600) == 1
+    assert db.claim_pipeline_job("w2")["id"] == job_id
+    assert db.heartbeat_pipeline_job(job_id, "w1") is False
+    assert db.finish_pipeline_job(job_id, worker_id="w1", result_text="vecchio") is False
+    assert db.finish_pipeline_job(job_id, worker_id="w2", result_text="nuovo") is True
+    [job] = db.list_pipeline_jobs(["done"], undelivered_only=True)
+    assert job["result_text"] == "nuovo"
+
+
+def test_requeue_stale_pipeline_jobs_fails_exhausted_jobs(tmp_path):
+    db = _make_db(tmp_path)
+    job_id = _enqueue(db)
+    db.claim_pipeline_job("dead-worker")
+    db.connection.execute(
+        "UPDATE pipeline_jobs SET claimed_at = datetime('now', '-1 hour') WHERE id = ?",
+        (job_id,),
+    )
+    db.connection.commit()
+
+    assert db.requeue_stale_pipeline_jobs(600, max_attempts=1, failure_message="errore") == 0
+    [job] = db.list_pipeline_jobs(["failed"], undelivered_only=True)
+    assert job["id"] == job_id
+    assert job["user_message"] == "errore"
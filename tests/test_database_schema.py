@@ -275,7 +275,7 @@ def test_migration_002_is_idempotent():
         r["version"] for r in
         conn.execute("SELECT version FROM schema_version WHERE success=1 ORDER BY version").fetchall()
     ]
-    assert versions == [1, 2]
+    assert versions == [m.version for m in MIGRATIONS]
     conn.close()
 
 
@@ -517,3 +517,65 @@ def test_pipeline_profiles_mode_check_constraint():
             ("Bad Mode", "three_stage"),
         )
     conn.close()
+
+
+def test_migration_003_creates_pipeline_jobs():
+    """Migration 003 creates the pipeline_jobs queue with a status CHECK."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    run_pending(conn)
+
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(pipeline_jobs)").fetchall()}
+    assert {"status", "stage", "worker_id", "result_text", "delivered_at"} <= cols
+
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO pipeline_jobs (chat_id, user_id, message_id, ack_message_id, "
+            "file_id, file_unique_id, file_ext, status) VALUES (1, 1, 1, 1, 'f', 'u', '.ogg', 'lost')"
+        )
+    conn.close()
+
+
+def test_migration_004_adds_bulkhead_limits():
+    """Migration 004 adds concurrency limits to providers and models."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    run_pending(conn)
+
+    provider_cols = {
+        r["name"]: r["dflt_value"]
+        for r in conn.execute("PRAGMA table_info(provider_connections)").fetchall()
+    }
+    model_cols = {r["name"] for r in conn.execute("PRAGMA table_info(provider_models)").fetchall()}
+    assert provider_cols["max_concurrent"] == "0"
+    assert provider_cols["max_queued"] == "20"
+    assert "max_concurrent" in model_cols
+    conn.close()
+
+
+def test_migration_005_adds_provider_priority():
+    """Migration 005 adds the admin-pinned provider priority (default 0)."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    run_pending(conn)
+
+    cols = {
+        r["name"]: r["dflt_value"]
+        for r in conn.execute("PRAGMA table_info(provider_connections)").fetchall()
+    }
+    assert cols["priority"] == "0"
+    conn.close()
+
+
+def test_migration_006_adds_provider_rate_limits():
+    """Migration 006 adds per-provider RPM/TPM budgets (default 0 = unlimited)."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    run_pending(conn)
+
+    cols = {
+        r["name"]: r["dflt_value"]
+        for r in conn.execute("PRAGMA table_info(provider_connections)").fetchall()
+    }
+    assert (cols["rpm_limit"], cols["tpm_limit"]) == ("0", "0")
+    conn.close()
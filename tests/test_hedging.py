@@ -0,0 +1,111 @@
+"""
+Tests for hedged requests across fallback models (bot.hedging).
+"""
+
+import asyncio
+
+import pytest
+
+from bot.hedging import HedgingPolicy
+
+
+def _warm_policy(key="transcribe:primary", latency=0.01, **kwargs) -> HedgingPolicy:
+    policy = HedgingPolicy(enabled=True, min_samples=5, **kwargs)
+    for _ in range(5):
+        policy.record_latency(key, latency)
+    return policy
+
+
+def test_hedge_delay_needs_min_samples_and_uses_percentile():
+    policy = HedgingPolicy(enabled=True, percentile=90, min_samples=10)
+    for value in range(1, 10):
+        policy.record_latency("k", value / 10)
+    assert policy.hedge_delay("k") is None
+
+    policy.record_latency("k", 1.0)
+    assert policy.hedge_delay("k") == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_cancels_slow_primary():
+    policy = _warm_policy(budget_percent=100)
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+        return "primary"
+
+    async def fast_fallback():
+        return "fallback"
+
+    result, index = await policy.run("transcribe:primary", slow_primary, fast_fallback)
+
+    assert (result, index) == ("fallback", 1)
+    assert primary_cancelled.is_set()
+    stats = policy.get_stats()
+    assert (stats["hedges_fired"], stats["hedges_won"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_caps_hedge_rate():
+    policy = _warm_policy(budget_percent=0)
+    calls = []
+
+    async def slow_primary():
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    async def fallback():
+        calls.append("fallback")
+        return "fallback"
+
+    result, index = await policy.run("transcribe:primary", slow_primary, fallback)
+
+    assert (result, index) == ("primary", 0)
+    assert calls == []
+    assert policy.get_stats()["hedges_skipped_budget"] == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_failure_falls_through_without_counting_a_hedge():
+    policy = HedgingPolicy(enabled=True)
+
+    async def failing_primary():
+        raise RuntimeError("boom")
+
+    async def fallback():
+        return "fallback"
+
+    assert await policy.run("refine:primary", failing_primary, fallback) == ("fallback", 1)
+    assert policy.get_stats()["hedges_fired"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fallback_transcriber_hedges_onto_first_fallback():
+    from bot.pipeline_resolver import FallbackTranscriber
+    from bot.providers import Transcriber, TranscriptionResult
+
+    class DelayedTranscriber(Transcriber):
+        def __init__(self, name, delay):
+            self.provider_name = name
+            self.delay = delay
+
+        async def transcribe(self, file_path):
+            await asyncio.sleep(self.delay)
+            return TranscriptionResult(text=self.provider_name)
+
+    policy = _warm_policy(key="transcribe:slow", budget_percent=100)
+    chain = FallbackTranscriber(
+        DelayedTranscriber("slow", 10),
+        [DelayedTranscriber("fast", 0)],
+        hedging=policy,
+    )
+
+    result = await asyncio.wait_for(chain.transcribe("a.mp3"), timeout=1)
+
+    assert result.text == "fast"
+    assert policy.get_stats()["hedges_won"] == 1
@@ -0,0 +1,184 @@
+"""
+Tests for the local Whisper HTTP adapter (bot.adapters.local_whisper),
+run against a stub HTTP server on localhost.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bot.adapters.local_whisper import (
+    LocalWhisperTranscriber,
+    close_local_whisper_clients,
+    parse_endpoint,
+    probe_local_whisper,
+)
+from bot.adapters.registry import transcriber_registry
+from bot.capabilities import detect_capabilities
+from bot.exceptions import TranscribeError
+from bot.retry import classify_retryable
+
+
+class _StubWhisperHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: str, content_type: str = "application/json"):
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(("GET", self.path, self.client_address))
+        if self.path == "/v1/models" and server.models is not None:
+            self._reply(200, json.dumps({"data": [{"id": m} for m in server.models]}))
+        elif self.path == "/health":
+            self._reply(200, "OK", "text/plain")
+        else:
+            self._reply(404, "{}")
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("latin-1")
+        server.requests.append(("POST", self.path, self.client_address))
+        server.bodies.append(body)
+        if server.fail_status:
+            self._reply(server.fail_status, '{"error": "busy"}')
+        elif self.path == "/inference" or 'name="response_format"\r\n\r\ntext' in body:
+            self._reply(200, " ciao dal server\n", "text/plain")
+        elif 'name="response_format"\r\n\r\nverbose_json' in body:
+            self._reply(200, json.dumps({
+                "text": " ciao dal server",
+                "language": "italian",
+                "duration": 2.5,
+                "segments": [{"id": 0, "start": 0.0, "end": 2.5, "text": " ciao dal server"}],
+            }))
+        else:
+            self._reply(200, json.dumps({"text": " ciao dal server"}))
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubWhisperHandler)
+    server.requests = []
+    server.bodies = []
+    server.models = ["Systran/faster-whisper-small"]
+    server.fail_status = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.origin = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "voice.mp3"
+    path.write_bytes(b"ID3fakeaudio")
+    return str(path)
+
+
+def test_parse_endpoint_paths_and_options():
+    default = parse_endpoint("http://localhost:8000")
+    assert default.url == "http://localhost:8000/v1/audio/transcriptions"
+    assert default.base_url == "http://localhost:8000/v1"
+    assert default.response_format == "json"
+    assert default.language is None
+
+    cpp = parse_endpoint("http://127.0.0.1:8080/inference?response_format=text&language=it")
+    assert cpp.url == "http://127.0.0.1:8080/inference"
+    assert cpp.origin == "http://127.0.0.1:8080"
+    assert (cpp.response_format, cpp.language) == ("text", "it")
+
+    with pytest.raises(ValueError):
+        parse_endpoint("http://localhost:8000/v1?response_format=srt")
+
+
+@pytest.mark.asyncio
+async def test_transcribe_sends_options_and_reuses_connection(stub_server, audio_file):
+    transcriber = transcriber_registry.create(
+        "local-whisper",
+        api_key="",
+        endpoint=f"{stub_server.origin}/v1?response_format=verbose_json&language=it",
+        model_name="Systran/faster-whisper-small",
+    )
+    assert isinstance(transcriber, LocalWhisperTranscriber)
+    try:
+        first = await transcriber.transcribe(audio_file)
+        # A new adapter per request still shares the keep-alive client.
+        second = await LocalWhisperTranscriber(
+            endpoint=f"{stub_server.origin}/v1", model_name="Systran/faster-whisper-small"
+        ).transcribe(audio_file)
+    finally:
+        await close_local_whisper_clients()
+
+    assert first.text == "ciao dal server"
+    assert (first.language, first.duration_seconds) == ("italian", 2.5)
+    assert first.segments == [{"start": 0.0, "end": 2.5, "text": " ciao dal server"}]
+    assert second.text == "ciao dal server" and second.language is None
+
+    body = stub_server.bodies[0]
+    assert 'name="model"\r\n\r\nSystran/faster-whisper-small' in body
+    assert 'name="language"\r\n\r\nit' in body
+    assert 'filename="voice.mp3"' in body
+    assert "Authorization" not in body
+    assert {path for _, path, _ in stub_server.requests} == {"/v1/audio/transcriptions"}
+    assert len({client for _, _, client in stub_server.requests}) == 1
+
+
+@pytest.mark.asyncio
+async def test_whisper_cpp_inference_returns_plain_text(stub_server, audio_file):
+    transcriber = LocalWhisperTranscriber(endpoint=f"{stub_server.origin}/inference")
+    try:
+        result = await transcriber.transcribe(audio_file)
+    finally:
+        await close_local_whisper_clients()
+
+    assert result.text == "ciao dal server"
+    assert 'name="model"\r\n\r\nwhisper-1' in stub_server.bodies[0]
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_wrapped_and_retryable(stub_server, audio_file):
+    stub_server.fail_status = 503
+    transcriber = LocalWhisperTranscriber(endpoint=stub_server.origin)
+    try:
+        with pytest.raises(TranscribeError) as excinfo:
+            await transcriber.transcribe(audio_file)
+    finally:
+        await close_local_whisper_clients()
+
+    assert classify_retryable(excinfo.value) == "server"
+
+
+@pytest.mark.asyncio
+async def test_probe_lists_models_or_falls_back_to_health(stub_server):
+    probe = await probe_local_whisper(f"{stub_server.origin}/v1?language=it")
+    assert probe["reachable"] is True
+    assert probe["models"] == ["Systran/faster-whisper-small"]
+    assert probe["language"] == "it"
+
+    stub_server.models = None  # whisper.cpp: no model list
+    probe = await probe_local_whisper(f"{stub_server.origin}/inference")
+    assert probe["reachable"] is True
+    assert probe["models"] == []
+    assert [path for _, path, _ in stub_server.requests[-2:]] == ["/models", "/health"]
+
+
+def test_capabilities_are_transcription_only():
+    caps = detect_capabilities("local-whisper", "Systran/faster-whisper-small")
+    assert caps.transcription is True
+    assert caps.refinement is False
+    assert caps.single_pass_audio_to_text is False
+    assert caps.streaming_transcription is False
@@ -0,0 +1,150 @@
+"""
+Tests for the mock provider adapters (bot.adapters.mock) used for load
+tests and chaos experiments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.adapters.mock import MockBehaviour, MockTextProcessor, MockTranscriber, reset_mock_state
+from bot.adapters.registry import text_processor_registry, transcriber_registry
+from bot.database import DatabaseManager
+from bot.exceptions import ProviderCircuitOpen, RefineError, TranscribeError, TranscribeTimeout
+from bot.pipeline_resolver import PipelineResolver
+from bot.providers import ResilientTranscriber, is_throttling_error
+from bot.retry import classify_retryable, retry_after_hint
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sequences():
+    reset_mock_state()
+    yield
+    reset_mock_state()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record asyncio.sleep calls of the mock module instead of waiting."""
+    recorded = []
+
+    async def fake_sleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr("bot.adapters.mock.asyncio.sleep", fake_sleep)
+    return recorded
+
+
+def test_behaviour_parses_endpoint_and_rejects_bad_settings():
+    behaviour = MockBehaviour.from_endpoint(
+        "mock://?latency=uniform&latency_ms=300&jitter_ms=50&error_rate=0.1&seed=7&words=5"
+    )
+    assert behaviour.latency == "uniform"
+    assert (behaviour.latency_ms, behaviour.jitter_ms) == (300.0, 50.0)
+    assert (behaviour.error_rate, behaviour.seed, behaviour.words) == (0.1, 7, 5)
+    assert MockBehaviour.from_endpoint("") == MockBehaviour()
+
+    for endpoint in (
+        "mock://?latency=pareto",
+        "mock://?latency_ms=fast",
+        "mock://?unknown=1",
+        "mock://?error_rate=0.6&throttle_rate=0.6",
+    ):
+        with pytest.raises(ValueError):
+            MockBehaviour.from_endpoint(endpoint)
+
+
+@pytest.mark.asyncio
+async def test_same_seed_gives_same_latencies(sleeps):
+    endpoint = "mock://?latency=lognormal&latency_ms=500&jitter_ms=200&seed=3"
+    for _ in range(3):
+        await MockTranscriber(endpoint=endpoint).transcribe("a.mp3")
+    first_run = list(sleeps)
+
+    reset_mock_state()
+    sleeps.clear()
+    for _ in range(3):
+        await MockTranscriber(endpoint=endpoint).transcribe("a.mp3")
+
+    assert sleeps == first_run
+    assert len(set(first_run)) == 3  # the adapters share one sequence
+
+
+@pytest.mark.asyncio
+async def test_per_operation_latency_and_fixed_distribution(sleeps):
+    endpoint = "mock://?latency=fixed&transcribe_latency_ms=1500&refine_latency_ms=250&words=3"
+    result = await MockTranscriber(endpoint=endpoint).transcribe("a.mp3")
+    refined = await MockTextProcessor(endpoint=endpoint).process(result.text)
+
+    assert sleeps == [1.5, 0.25]
+    assert refined == result.text
+    assert len(result.text.split()) == 3
+
+
+@pytest.mark.asyncio
+async def test_streaming_chunk_cadence(sleeps):
+    processor = MockTextProcessor(endpoint="mock://?latency=fixed&latency_ms=100&chunk_ms=40&chunk_chars=4")
+
+    events = [event async for event in processor.stream_process("abcdefghij")]
+
+    assert [e.text for e in events if e.type == "delta"] == ["abcd", "efgh", "ij"]
+    assert events[-1].type == "done" and events[-1].text == "abcdefghij"
+    assert events[-1].total_tokens > 0
+    assert sleeps == [0.1, 0.04, 0.04]
+
+
+@pytest.mark.asyncio
+async def test_injected_failures_look_like_provider_errors(sleeps):
+    throttled = MockTranscriber(endpoint="mock://?throttle_rate=1&retry_after_ms=250")
+    with pytest.raises(TranscribeError) as excinfo:
+        await throttled.transcribe("a.mp3")
+    assert classify_retryable(excinfo.value) == "throttled"
+    assert is_throttling_error(excinfo.value)
+    assert retry_after_hint(excinfo.value) == 0.25
+    assert sleeps == []  # 429s are rejected without the latency
+
+    with pytest.raises(RefineError) as excinfo:
+        await MockTextProcessor(endpoint="mock://?error_rate=1").process("ciao")
+    assert classify_retryable(excinfo.value) == "server"
+
+    with pytest.raises(TranscribeTimeout):
+        await MockTranscriber(endpoint="mock://?timeout_rate=1&timeout_ms=3000").transcribe("a.mp3")
+    assert sleeps[-1] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_error_injection_opens_circuit_breaker():
+    inner = MockTranscriber(endpoint="mock://?latency=fixed&latency_ms=0&error_rate=1")
+    wrapper = ResilientTranscriber(inner, failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(TranscribeError):
+            await wrapper.transcribe("a.mp3")
+    with pytest.raises(ProviderCircuitOpen):
+        await wrapper.transcribe("a.mp3")
+
+
+@pytest.mark.asyncio
+async def test_mock_provider_in_database_runs_through_resolver(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.sqlite3"))
+    db.initialize()
+    db.add_provider(
+        name="Mock",
+        adapter_type="mock",
+        endpoint="mock://?latency=fixed&latency_ms=1&chunk_ms=0&words=4",
+    )
+    assert transcriber_registry.has_type("mock")
+    assert text_processor_registry.has_type("mock")
+
+    plan = PipelineResolver(db).resolve()
+    result = await plan.transcriber.transcribe("a.mp3")
+    events = [e async for e in plan.transcriber.stream_transcribe("a.mp3")]
+    refined = await asyncio.wait_for(plan.text_processor.process(result.text), timeout=5)
+
+    assert plan.provider_name == "Mock"
+    assert plan.transcriber.supports_transcribe_streaming
+    assert events[-1].text == result.text
+    assert refined == result.text
+    db.close()
@@ -2,7 +2,8 @@
 Tests for OpenAI-compatible adapters (P3).
 
 Covers:
-- :class:`OpenAICompatTranscriber` construction and ``get_capabilities``
+- :class:`OpenAICompatTranscriber` construction, ``get_capabilities`` and
+  ``stream_transcribe``
 - :class:`OpenAICompatTextProcessor` construction and ``get_capabilities``
 - Registry-based creation through ``openai-compat`` adapter type
 - ``_normalise_endpoint`` URL logic
@@ -68,6 +69,40 @@ class TestOpenAICompatTranscriber:
         assert caps.transcription is True
         assert caps.text_generation is False
         assert caps.refinement is False
+        assert caps.streaming_transcription is False
+
+    def test_chat_model_name_falls_back_to_whisper(self):
+        assert OpenAICompatTranscriber(api_key="sk-test", model_name="llama3").model_name == "whisper-1"
+        t = OpenAICompatTranscriber(api_key="sk-test", model_name="gpt-4o-mini-transcribe")
+        assert t.model_name == "gpt-4o-mini-transcribe"
+
+    @pytest.mark.asyncio
+    async def test_stream_transcribe_yields_partial_text(self, tmp_path):
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"audio")
+        events = [
+            MagicMock(type="transcript.text.delta", delta="Ciao "),
+            MagicMock(type="transcript.text.delta", delta="mondo"),
+            MagicMock(type="transcript.text.done", text="Ciao mondo.", usage=MagicMock(total_tokens=42)),
+        ]
+
+        async def stream():
+            for event in events:
+                yield event
+
+        t = OpenAICompatTranscriber(api_key="sk-test", model_name="gpt-4o-transcribe", streaming=True)
+        create = AsyncMock(return_value=stream())
+        t.async_client = MagicMock()
+        t.async_client.with_options.return_value.audio.transcriptions.create = create
+
+        received = [e async for e in t.stream_transcribe(str(audio))]
+
+        assert [(e.type, e.text) for e in received] == [
+            ("delta", "Ciao "), ("delta", "mondo"), ("done", "Ciao mondo."),
+        ]
+        assert received[-1].total_tokens == 42
+        assert create.call_args.kwargs["stream"] is True
+        assert create.call_args.kwargs["model"] == "gpt-4o-transcribe"
 
 
 # ===================================================================
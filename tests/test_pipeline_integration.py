@@ -1,14 +1,24 @@
 import asyncio
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from types import SimpleNamespace
 
 import pytest
-from telegram.ext import CommandHandler, MessageHandler
+from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler
 
 from bot import constants as c
-from bot.core.app import create_application
-from bot.exceptions import TranscribeError
-from bot.handlers.audio import handle_audio
+from bot.audio_profiles import DEFAULT_AUDIO_PROFILE, NO_PREPROCESSING
+from bot.capabilities import CapabilityModel
+from bot.config_service import ConfigService
+from bot.core.app import configure_bot_api_server, create_application, effective_max_file_size_mb
+from bot.database import DatabaseManager
+from bot.exceptions import RefineError, TranscribeError
+from bot.handlers.audio import AudioProcessor, handle_audio
+from bot.pipeline_stages import StagedPipelineEngine
 from bot.rate_limiter import RateLimiter
+from bot.ui.streaming import TelegramDeliveryAdapter
 
 
 class FakeAckMessage:
@@ -92,7 +102,7 @@ class FakeProcessor:
     def generate_file_paths(self, chat_id, message_id, unique_id, ext):
         return f"/tmp/{chat_id}_{message_id}_{unique_id}.{ext}", f"/tmp/{chat_id}_{message_id}_{unique_id}.mp3"
 
-    async def download_audio(self, file_obj, file_path):
+    async def download_audio(self, file_obj, file_path, local_files_dir=None):
         self.calls.append("download")
         if self.started is not None:
             self.started.set()
@@ -110,11 +120,19 @@ class FakeProcessor:
 
     async def refine_text(self, raw_text):
         self.calls.append("refine")
+        if self.fail_stage == "refine":
+            raise RefineError("provider failed", c.MSG_ERROR_REFINE)
+        if self.fail_stage == "refine_crash":
+            raise RuntimeError("unexpected SDK error")
         return "refined transcript"
 
     def format_response(self, final_text):
         return f"result: {final_text}"
 
+    def format_raw_response(self, raw_text, refine_failed=False):
+        label = "raw-unrefined" if refine_failed else "raw"
+        return f"{label}: {raw_text}"
+
     async def send_response(self, context, chat_id, ack_msg, full_text):
         self.calls.append("send")
         self.responses.append(full_text)
@@ -125,6 +143,15 @@ class FakeProcessor:
         self.cleaned.append((source, target))
 
 
+class SinglePassFakeProcessor(FakeProcessor):
+    uses_single_pass = True
+    supports_refine_streaming = False
+
+    async def process_single_pass(self, file_path):
+        self.calls.append("single_pass")
+        return "refined in one call"
+
+
 class FailingDeliveryProcessor(FakeProcessor):
     async def send_response(self, context, chat_id, ack_msg, full_text):
         self.calls.append("send")
@@ -139,7 +166,7 @@ def build_update(message):
     )
 
 
-def build_context(processor, limiter):
+def build_context(processor, limiter, delivery_adapter=None):
     return SimpleNamespace(
         bot=FakeBot(),
         bot_data={
@@ -147,8 +174,9 @@ def build_context(processor, limiter):
                 authorized_data={"admin": [], "users": [1, 2], "groups": []}
             ),
             "audio_processor": processor,
-            "delivery_adapter": SimpleNamespace(
-                supports_live_refine_streaming=lambda context, ack: False
+            "delivery_adapter": delivery_adapter or SimpleNamespace(
+                supports_live_refine_streaming=lambda context, ack: False,
+                is_raw_first_enabled=lambda: False,
             ),
             "rate_limiter": limiter,
         },
@@ -174,11 +202,101 @@ async def test_complete_handler_pipeline_runs_through_decorators_and_releases_sl
         "cleanup",
     ]
     assert processor.responses == ["result: refined transcript"]
+    assert len(context.bot.actions) < len(context.bot.edits)
     assert processor.cleaned == [("/tmp/10_20_voice.ogg", "/tmp/10_20_voice.mp3")]
     assert limiter._global_count == 0
     assert limiter._active_requests == {}
 
 
+@pytest.mark.asyncio
+async def test_handler_runs_each_stage_through_the_stage_engine():
+    processor = FakeProcessor()
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    message = FakeMessage(user_id=1, chat_id=10, message_id=20, file_unique_id="voice")
+    context = build_context(processor, limiter)
+    engine = StagedPipelineEngine()
+    context.bot_data["stage_engine"] = engine
+
+    await handle_audio(build_update(message), context)
+
+    stats = engine.get_stats()
+    assert {name: s["completed"] for name, s in stats.items()} == {
+        "download": 1,
+        "convert": 1,
+        "transcribe": 1,
+        "refine": 1,
+        "deliver": 1,
+    }
+    assert processor.responses == ["result: refined transcript"]
+
+
+class BlockingRefineProcessor(FakeProcessor):
+    def __init__(self):
+        super().__init__()
+        self.refine_started = asyncio.Event()
+        self.refine_release = asyncio.Event()
+
+    async def refine_text(self, raw_text):
+        self.calls.append("refine")
+        self.refine_started.set()
+        await self.refine_release.wait()
+        return "refined transcript"
+
+
+@pytest.mark.asyncio
+async def test_slow_refine_frees_the_global_slot_and_later_stages_wait():
+    processor = BlockingRefineProcessor()
+    limiter = RateLimiter(max_per_user=1, max_global=1, queue_enabled=False)
+    context = build_context(processor, limiter)
+    engine = StagedPipelineEngine({"refine": 1})
+    context.bot_data["stage_engine"] = engine
+
+    first = asyncio.create_task(handle_audio(build_update(
+        FakeMessage(user_id=1, chat_id=10, message_id=20, file_unique_id="one")
+    ), context))
+    await asyncio.wait_for(processor.refine_started.wait(), timeout=1)
+    # The first request is refining without holding the only global slot.
+    assert limiter._global_count == 0
+
+    second = asyncio.create_task(handle_audio(build_update(
+        FakeMessage(user_id=2, chat_id=11, message_id=21, file_unique_id="two")
+    ), context))
+    for _ in range(50):
+        if engine.stage("refine").queued:
+            break
+        await asyncio.sleep(0.01)
+    # The second one was transcribed and waits for refine instead of failing.
+    assert processor.calls.count("transcribe") == 2
+    assert engine.stage("refine").queued == 1
+    assert limiter._global_count == 1
+
+    processor.refine_release.set()
+    await asyncio.wait_for(asyncio.gather(first, second), timeout=1)
+
+    assert processor.responses == ["result: refined transcript"] * 2
+    assert engine.stage("refine").get_stats()["rejected"] == 0
+    assert limiter._global_count == 0
+    assert limiter._active_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_single_pass_plan_makes_one_provider_call_under_transcribe_stage():
+    processor = SinglePassFakeProcessor()
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    message = FakeMessage(user_id=1, chat_id=10, message_id=20, file_unique_id="voice")
+    context = build_context(processor, limiter)
+    engine = StagedPipelineEngine()
+    context.bot_data["stage_engine"] = engine
+
+    await handle_audio(build_update(message), context)
+
+    assert processor.calls == ["determine", "download", "convert", "single_pass", "send", "cleanup"]
+    assert processor.responses == ["result: refined in one call"]
+    stats = engine.get_stats()
+    assert (stats["transcribe"]["completed"], stats["refine"]["completed"]) == (1, 0)
+    assert limiter._global_count == 0
+
+
 @pytest.mark.asyncio
 async def test_provider_error_is_reported_and_pipeline_resources_are_released():
     processor = FakeProcessor(fail_stage="transcribe")
@@ -209,6 +327,45 @@ async def test_telegram_delivery_error_uses_safe_message_and_releases_resources(
     assert limiter._active_requests == {}
 
 
+@pytest.mark.asyncio
+async def test_raw_first_delivery_shows_raw_transcript_then_refined_text():
+    processor = FakeProcessor()
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    message = FakeMessage(user_id=1, chat_id=10, message_id=23, file_unique_id="voice")
+    context = build_context(
+        processor, limiter, delivery_adapter=TelegramDeliveryAdapter(raw_first_enabled=True)
+    )
+
+    await handle_audio(build_update(message), context)
+
+    assert message.ack.edits == ["raw: raw transcript", "result: refined transcript"]
+    assert processor.calls[-3:] == ["refine", "send", "cleanup"]
+    assert all(
+        c.MSG_PROGRESS_REFINE not in edit["text"] for edit in context.bot.edits
+    )
+    assert limiter._global_count == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_stage", ["refine", "refine_crash"])
+async def test_raw_first_delivery_keeps_labelled_raw_text_when_refine_fails(fail_stage):
+    processor = FakeProcessor(fail_stage=fail_stage)
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    message = FakeMessage(user_id=1, chat_id=10, message_id=24, file_unique_id="voice")
+    context = build_context(
+        processor, limiter, delivery_adapter=TelegramDeliveryAdapter(raw_first_enabled=True)
+    )
+
+    await handle_audio(build_update(message), context)
+
+    assert message.ack.edits == ["raw: raw transcript", "raw-unrefined: raw transcript"]
+    assert c.MSG_ERROR_REFINE not in message.ack.edits
+    assert c.MSG_ERROR_INTERNAL not in message.ack.edits
+    assert processor.calls[-1] == "cleanup"
+    assert limiter._global_count == 0
+    assert limiter._active_requests == {}
+
+
 @pytest.mark.asyncio
 async def test_decorated_handlers_handoff_global_queue_in_fifo_order():
     first_started = asyncio.Event()
@@ -245,7 +402,7 @@ async def test_decorated_handlers_handoff_global_queue_in_fifo_order():
 
 def test_create_application_wires_services_handlers_and_cleanup_job(monkeypatch, tmp_path):
     processor = object()
-    monkeypatch.setattr("bot.core.app.AudioProcessor", lambda config: processor)
+    monkeypatch.setattr("bot.core.app.AudioProcessor", lambda config, **kwargs: processor)
     config = SimpleNamespace(
         authorized_db=str(tmp_path / "authorized.sqlite3"),
         authorized_data={"admin": [1], "users": [], "groups": []},
@@ -267,6 +424,11 @@ def test_create_application_wires_services_handlers_and_cleanup_job(monkeypatch,
     assert application.bot_data["audio_processor"] is processor
     assert application.bot_data["whitelist_manager"].authorized_data["admin"] == [1]
     assert isinstance(application.bot_data["rate_limiter"], RateLimiter)
+    assert isinstance(application.bot_data["stage_engine"], StagedPipelineEngine)
+    assert (
+        application.bot_data["stage_engine"].stage("convert").concurrency
+        == application.bot_data["conversion_pool"].processes
+    )
     assert application.bot_data["delivery_adapter"].is_progressive_enabled() is False
 
     handlers = [handler for group in application.handlers.values() for handler in group]
@@ -274,3 +436,187 @@ def test_create_application_wires_services_handlers_and_cleanup_job(monkeypatch,
     assert sum(isinstance(handler, MessageHandler) for handler in handlers) == 1
     assert application.job_queue is not None
     assert len(application.job_queue.jobs()) == 1
+
+
+def test_create_application_without_config_builds_an_unresolved_processor(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.sqlite3"))
+    db.initialize()
+    try:
+        application = create_application(
+            "123456:TEST_TOKEN", None, database_manager=db, config_service=ConfigService(db)
+        )
+    finally:
+        db.close()
+
+    processor = application.bot_data["audio_processor"]
+    assert processor.config is application.bot_data["runtime_snapshot"]
+    assert set(vars(processor)) == set(vars(AudioProcessor(None, transcriber=object())))
+    assert processor.uses_single_pass is False
+    assert processor.capabilities == CapabilityModel()
+    assert processor.audio_profile is DEFAULT_AUDIO_PROFILE
+    assert processor.preprocessing is NO_PREPROCESSING
+    assert processor.conversion_pool is application.bot_data["conversion_pool"]
+    assert processor.generate_file_paths(1, 2, "unique", "oga")[1].endswith("1_2_unique.mp3")
+
+
+class _StubBotApiHandler(BaseHTTPRequestHandler):
+    file_path = ""
+
+    def do_POST(self):
+        method = self.path.rsplit("/", 1)[-1]
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "stub", "username": "stub_bot"}
+        elif method == "getFile":
+            result = {
+                "file_id": "file",
+                "file_unique_id": "unique",
+                "file_size": os.path.getsize(self.file_path),
+                "file_path": self.file_path,
+            }
+        else:
+            result = True
+        body = json.dumps({"ok": True, "result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_local_bot_api_server_file_is_hardlinked_not_downloaded(tmp_path):
+    server_dir = tmp_path / "telegram-bot-api"
+    server_dir.mkdir()
+    server_file = server_dir / "voice.oga"
+    server_file.write_bytes(b"voice-bytes")
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+
+    handler = type("Handler", (_StubBotApiHandler,), {"file_path": str(server_file)})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        app = configure_bot_api_server(
+            ApplicationBuilder().token("123:abc"),
+            {"base_url": base_url, "local_mode": True},
+        ).build()
+        async with app.bot:
+            file_obj = await app.bot.get_file("file")
+
+        processor = AudioProcessor.__new__(AudioProcessor)
+        processor.config = SimpleNamespace(audio_dir=str(audio_dir))
+        target = processor.generate_file_paths(1, 2, "unique", "oga")[0]
+        await processor.download_audio(file_obj, target, str(server_dir))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert app.bot.local_mode is True
+    assert os.path.samefile(target, server_file)
+    processor.cleanup_files(target, target + ".mp3")
+    assert server_file.read_bytes() == b"voice-bytes"
+
+
+@pytest.mark.asyncio
+async def test_absolute_file_path_is_downloaded_without_a_local_files_dir(tmp_path):
+    server_file = tmp_path / "voice.oga"
+    server_file.write_bytes(b"voice-bytes")
+    downloads = []
+
+    class FileObj:
+        file_path = str(server_file)
+
+        async def download_to_drive(self, path):
+            downloads.append(path)
+
+    processor = AudioProcessor.__new__(AudioProcessor)
+    target = str(tmp_path / "target.oga")
+
+    await processor.download_audio(FileObj(), target)
+    await processor.download_audio(FileObj(), target, str(tmp_path / "elsewhere"))
+
+    assert downloads == [target, target]
+    assert not os.path.exists(target)
+
+
+def test_effective_max_file_size_depends_on_local_bot_api_mode():
+    local = {"base_url": "http://localhost:8081", "local_mode": True}
+
+    assert effective_max_file_size_mb(50, {}) == c.TELEGRAM_CLOUD_MAX_FILE_SIZE_MB
+    assert effective_max_file_size_mb(10, {}) == 10
+    assert effective_max_file_size_mb(1500, local) == 1500
+    assert effective_max_file_size_mb(5000, local) == c.TELEGRAM_LOCAL_MAX_FILE_SIZE_MB
+
+
+def test_single_pass_benchmark_reports_saved_round_trip():
+    from bot.bench.single_pass import run_benchmark, synthetic_components
+
+    report = run_benchmark(synthetic_components(20, 1, 1, 1), "synthetic.mp3", 1)
+
+    assert report["results"]["single_pass_stream"]["first_delta"] is not None
+    assert report["single_pass_saving_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_e2e_load_harness_reports_latencies_and_api_calls(tmp_path, monkeypatch):
+    from bot.bench.e2e import compare_with_baseline, run_load_test
+
+    async def fake_convert(src_path, dst_path, profile=None, nice=0, preprocessing=None):
+        with open(dst_path, "wb") as handle:
+            handle.write(b"ID3mp3")
+
+    monkeypatch.setattr("bot.utils.convert_to_mp3", fake_convert)
+    variants = {}
+    for duration in (5, 30):
+        path = tmp_path / f"voice-{duration}s.ogg"
+        path.write_bytes(b"OggS" * duration)
+        variants[duration] = str(path)
+
+    report = await run_load_test(
+        variants,
+        users=3,
+        requests_per_user=2,
+        work_dir=str(tmp_path),
+        mock_endpoint="mock://?latency=fixed&latency_ms=1&chunk_ms=0&words=5",
+    )
+
+    assert report["statuses"] == {"success": 6}
+    assert report["throughput_rps"] > 0
+    assert report["e2e"]["count"] == 6
+    assert report["queue_wait"]["p99_ms"] >= 0
+    assert {"download", "convert", "send_response"} <= set(report["stages"])
+    assert report["telegram_api_calls"]["getFile"] == 6
+    assert report["telegram_api_calls"]["downloadFile"] == 6
+
+    assert compare_with_baseline(report, report, tolerance=0.2) == []
+    slower = {**report, "throughput_rps": report["throughput_rps"] * 2}
+    assert compare_with_baseline(report, slower, tolerance=0.2) == [
+        f"throughput_rps {slower['throughput_rps']} -> {report['throughput_rps']}"
+    ]
+
+
+def test_micro_benchmarks_run_and_flag_regressions():
+    from bot.bench.micro import BENCHMARKS, find_regressions, run_suite
+
+    report = run_suite(
+        ["rate_limiter_contention", "restricted_lookup", "secret_store_decrypt"], repeat=1
+    )
+
+    assert set(report["results"]) == {
+        "rate_limiter_contention", "restricted_lookup", "secret_store_decrypt"
+    }
+    assert all(result["best_us"] > 0 for result in report["results"].values())
+    assert "pipeline_resolver_resolve" in BENCHMARKS
+
+    result = report["results"]["secret_store_decrypt"]
+    faster = {"results": {"secret_store_decrypt": {"best_us": result["best_us"] / 2}}}
+    over_budget = {"results": {"secret_store_decrypt": {**result, "within_budget": False}}}
+    assert find_regressions(report, report) == []
+    assert find_regressions(report, faster)[-1].startswith("secret_store_decrypt")
+    assert "over budget" in find_regressions(over_budget)[0]
@@ -12,8 +12,9 @@ from __future__ import annotations
 
 import pytest
 
+from bot import constants as c
 from bot.database import DatabaseManager
-from bot.exceptions import PipelineResolutionError
+from bot.exceptions import PipelineResolutionError, ProviderCircuitOpen
 from bot.pipeline_resolver import (
     ExecutionPlan,
     FallbackTextProcessor,
@@ -22,7 +23,15 @@ from bot.pipeline_resolver import (
     PipelineResolver,
     RequestMode,
 )
-from bot.providers import RefineError, TextProcessor, Transcriber, TranscribeError, TranscriptionResult
+from bot.providers import (
+    RefineError,
+    RefineStreamEvent,
+    TextProcessor,
+    Transcriber,
+    TranscribeError,
+    TranscriptionResult,
+)
+from bot.retry import RetryPolicy
 
 
 # ------------------------------------------------------------------
@@ -1425,6 +1434,38 @@ class TestSinglePassResolution:
         assert "Single-pass" in plan.resolution_log[-1] or "Single-pass" in log_text
         assert "gpt-4o-audio-preview" in log_text
 
+    def test_explicit_stage_attaches_single_pass_processor(self, tmp_path):
+        """✅ Single-pass plan carries a processor for the one-call path."""
+        db = _make_db(tmp_path)
+        _, _, profile_id, _ = self._setup_single_pass(db)
+        plan = PipelineResolver(db).resolve_from_profile(profile_id)
+
+        assert plan.single_pass is not None
+        assert plan.single_pass.get_capabilities().single_pass_audio_to_text is True
+        assert any("audio and refinement prompt in one call" in line
+                   for line in plan.resolution_log)
+
+    def test_resolve_honours_active_single_pass_profile(self, tmp_path):
+        """✅ resolve() uses the active profile when its mode is single_pass."""
+        db = _make_db(tmp_path)
+        _, _, profile_id, _ = self._setup_single_pass(db)
+        db.set_setup_state("active_pipeline_profile", str(profile_id))
+
+        plan = PipelineResolver(db).resolve()
+
+        assert plan.single_pass is not None
+        assert plan.transcript_model.model_id == "gpt-4o-audio-preview"
+
+    def test_resolve_ignores_single_pass_profile_without_refinement(self, tmp_path):
+        """✅ Raw-only requests never take the single-pass path."""
+        db = _make_db(tmp_path)
+        _, _, profile_id, _ = self._setup_single_pass(db)
+        db.set_setup_state("active_pipeline_profile", str(profile_id))
+
+        plan = PipelineResolver(db).resolve(PipelineRequest(mode=RequestMode.TRANSCRIPTION_ONLY))
+
+        assert plan.single_pass is None
+
     def test_openai_provider_single_pass_fallback_with_stages(self, tmp_path):
         """✅ Single-pass mode with explicit stage but provider model
         without single_pass cap falls through to provider-level fallback.
@@ -1597,6 +1638,23 @@ class TestFallbackTranscriber:
         result = await ft.transcribe("/tmp/test.mp3")
         assert result.text == "direct"
 
+    @pytest.mark.asyncio
+    async def test_stream_failure_after_partial_text_resets_and_falls_back(self):
+        """A stream that breaks mid-way is replaced after a reset event."""
+
+        class BrokenStream(Transcriber):
+            async def transcribe(self, file_path): ...
+            async def stream_transcribe(self, file_path):
+                yield RefineStreamEvent(type="delta", text="par")
+                raise TranscribeError("reset by peer", "msg")
+
+        ft = FallbackTranscriber(BrokenStream(), [_make_stub_transcriber("fallback")])
+        events = [(e.type, e.text) async for e in ft.stream_transcribe("/tmp/test.mp3")]
+
+        assert events == [
+            ("delta", "par"), ("reset", ""), ("delta", "fallback"), ("done", "fallback"),
+        ]
+
 
 class TestFallbackTextProcessor:
     """Tests for FallbackTextProcessor runtime fallback execution."""
@@ -1951,3 +2009,133 @@ class TestModelRef:
         assert ref.capabilities.transcription is False
         assert ref.capabilities.refinement is False
         assert ref.capabilities.single_pass_audio_to_text is False
+
+
+# ------------------------------------------------------------------
+# Latency- and health-aware provider ranking
+# ------------------------------------------------------------------
+
+
+class TestHealthAwareRanking:
+    CAPS = {"transcription": True, "refinement": True}
+
+    def _two_providers(self, tmp_path):
+        db = _make_db(tmp_path)
+        slow_id = _add_provider(db, name="Slow", capabilities=self.CAPS)
+        fast_id = _add_provider(db, name="Fast", capabilities=self.CAPS)
+        return db, slow_id, fast_id
+
+    def test_without_statistics_keeps_id_order(self, tmp_path):
+        db, _, _ = self._two_providers(tmp_path)
+
+        plan = PipelineResolver(db).resolve()
+
+        assert plan.provider_name == "Slow"
+
+    def test_prefers_provider_with_lower_expected_completion(self, tmp_path):
+        db, slow_id, fast_id = self._two_providers(tmp_path)
+        resolver = PipelineResolver(db)
+        for operation in ("transcribe", "refine"):
+            resolver._health.get(f"provider:{slow_id}").record(operation, 4.0, ok=True)
+            resolver._health.get(f"provider:{fast_id}").record(operation, 1.0, ok=True)
+
+        plan = resolver.resolve()
+
+        assert plan.provider_name == "Fast"
+        assert any(
+            "expected completion" in msg and msg.index("'Fast'") < msg.index("'Slow'")
+            for msg in plan.resolution_log
+        )
+
+    def test_error_rate_outweighs_raw_latency(self, tmp_path):
+        db, slow_id, fast_id = self._two_providers(tmp_path)
+        resolver = PipelineResolver(db)
+        slow = resolver._health.get(f"provider:{slow_id}")
+        flaky = resolver._health.get(f"provider:{fast_id}")
+        slow.record("transcribe", 2.0, ok=True)
+        flaky.record("transcribe", 1.0, ok=True)
+        for _ in range(10):
+            flaky.record("transcribe", 1.0, ok=False)
+
+        plan = resolver.resolve(PipelineRequest(mode=RequestMode.TRANSCRIPTION_ONLY))
+
+        assert plan.provider_name == "Slow"
+
+    def test_priority_breaks_ties(self, tmp_path):
+        db, slow_id, fast_id = self._two_providers(tmp_path)
+        db.update_provider(fast_id, priority=5)
+        resolver = PipelineResolver(db)
+        resolver._health.get(f"provider:{slow_id}").record("transcribe", 1.0, ok=True)
+        resolver._health.get(f"provider:{fast_id}").record("transcribe", 1.1, ok=True)
+
+        plan = resolver.resolve(PipelineRequest(mode=RequestMode.TRANSCRIPTION_ONLY))
+
+        assert plan.provider_name == "Fast"
+
+    @pytest.mark.asyncio
+    async def test_resilient_wrapper_feeds_endpoint_health(self):
+        from bot.providers import EndpointHealth, ResilientTranscriber
+
+        class OkTranscriber(Transcriber):
+            async def transcribe(self, file_path):
+                return TranscriptionResult(text="ok")
+
+        health = EndpointHealth("provider:1")
+        wrapper = ResilientTranscriber(OkTranscriber(), provider_name="p", health=[health])
+
+        await wrapper.transcribe("a.mp3")
+
+        stats = health.get_stats()["transcribe"]
+        assert stats["samples"] == 1
+        assert stats["error_rate"] == 0
+
+
+# ------------------------------------------------------------------
+# Client-side RPM/TPM budgets
+# ------------------------------------------------------------------
+
+
+def test_provider_rate_limits_share_one_budget_across_stages(tmp_path):
+    db = _make_db(tmp_path)
+    pid = _add_provider(db, capabilities={"transcription": True, "refinement": True})
+    db.update_provider(pid, rpm_limit=60, tpm_limit=90000)
+    resolver = PipelineResolver(db)
+
+    plan = resolver.resolve()
+
+    assert plan.transcriber._rate_budget is plan.text_processor._rate_budget
+    stats = resolver.get_rate_budget_stats()[f"provider:{pid}"]
+    assert (stats["rpm_limit"], stats["tpm_limit"]) == (60, 90000)
+
+    db.update_provider(pid, rpm_limit=0, tpm_limit=0)
+    assert resolver.resolve().transcriber._rate_budget is None
+    assert resolver.get_rate_budget_stats() == {}
+
+
+# ------------------------------------------------------------------
+# Shared circuit breakers
+# ------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_failures_carry_over_between_requests(tmp_path):
+    db = _make_db(tmp_path)
+    _add_provider(db, capabilities={"transcription": True, "refinement": True})
+    resolver = PipelineResolver(db, retry=RetryPolicy(max_attempts=1))
+
+    first, second = resolver.resolve(), resolver.resolve()
+    assert first.transcriber._cb is second.transcriber._cb
+    assert first.transcriber._cb is not first.text_processor._cb
+
+    async def down(file_path):
+        raise TranscribeError("provider down", c.MSG_ERROR_TRANSCRIBE)
+
+    # One failure per request: the breaker counts them across requests.
+    for _ in range(3):
+        plan = resolver.resolve()
+        plan.transcriber._inner.transcribe = down
+        with pytest.raises(TranscribeError):
+            await plan.transcriber.transcribe("a.mp3")
+
+    with pytest.raises(ProviderCircuitOpen):
+        await resolver.resolve().transcriber.transcribe("a.mp3")
@@ -0,0 +1,105 @@
+"""
+Tests for the staged pipeline engine (bot.pipeline_stages).
+"""
+
+import asyncio
+
+import pytest
+
+from bot import constants as c
+from bot.exceptions import StageQueueFull
+from bot.pipeline_stages import PIPELINE_STAGE_NAMES, PipelineStage, StagedPipelineEngine
+
+
+@pytest.mark.asyncio
+async def test_stage_bounds_concurrency_and_records_stats():
+    stage = PipelineStage("convert", concurrency=2, max_queue=10)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(stage.run(work()) for _ in range(5)))
+
+    assert results == ["ok"] * 5
+    assert peak == 2
+    stats = stage.get_stats()
+    assert stats["completed"] == 5
+    assert stats["active"] == 0
+    assert stats["queued"] == 0
+    assert stats["avg_service_ms"] >= 10
+    assert stats["p95_service_ms"] >= stats["avg_service_ms"] - 1
+    assert stats["p95_wait_ms"] >= 10  # the last of five waited for two rounds
+
+
+@pytest.mark.asyncio
+async def test_stage_rejects_work_when_queue_is_full():
+    stage = PipelineStage("refine", concurrency=1, max_queue=1)
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+
+    first = asyncio.create_task(stage.run(blocked()))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(stage.run(blocked()))
+    await asyncio.sleep(0)
+    assert stage.get_stats()["queued"] == 1
+
+    with pytest.raises(StageQueueFull) as exc_info:
+        await stage.run(blocked())
+    assert exc_info.value.user_message == c.MSG_QUEUE_FULL
+    assert stage.get_stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+
+
+@pytest.mark.asyncio
+async def test_stage_without_queue_bound_waits_instead_of_rejecting():
+    stage = PipelineStage("refine", concurrency=1)
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+        return "done"
+
+    tasks = [asyncio.create_task(stage.run(blocked())) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert stage.get_stats()["queued"] == 4
+
+    release.set()
+    assert await asyncio.gather(*tasks) == ["done"] * 5
+    assert stage.get_stats()["rejected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stage_counts_failures_and_frees_slot():
+    stage = PipelineStage("transcribe", concurrency=1, max_queue=0)
+
+    async def boom():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        await stage.run(boom())
+
+    assert stage.get_stats()["failed"] == 1
+    assert await stage.run(asyncio.sleep(0, result="again")) == "again"
+
+
+def test_engine_uses_configured_limits_with_defaults():
+    engine = StagedPipelineEngine({"convert": 1, "queue_size": 3})
+
+    stats = engine.get_stats()
+    assert tuple(stats) == PIPELINE_STAGE_NAMES
+    assert stats["convert"]["concurrency"] == 1
+    assert stats["download"]["concurrency"] == c.PIPELINE_STAGE_DEFAULTS["download"]
+    # Only the entry stage turns work away; the later ones apply backpressure.
+    assert stats["download"]["max_queue"] == 3
+    assert all(s["max_queue"] is None for name, s in stats.items() if name != "download")
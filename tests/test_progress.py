@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from telegram.constants import ChatAction
+
+from bot.ui import progress
+
+
+class RecordingBot:
+    def __init__(self):
+        self.actions = []
+        self.edits = []
+
+    async def send_chat_action(self, **kwargs):
+        self.actions.append(kwargs)
+
+    async def edit_message_text(self, **kwargs):
+        self.edits.append(kwargs)
+
+
+@pytest.mark.asyncio
+async def test_update_progress_edits_without_chat_action():
+    bot = RecordingBot()
+    context = SimpleNamespace(bot=bot)
+
+    await progress.update_progress(context, 1, 2, "step")
+    await progress.update_progress(context, 1, 2, "step")
+    progress.clear_progress_cache(1, 2)
+
+    assert bot.actions == []
+    assert bot.edits == [{"chat_id": 1, "message_id": 2, "text": "step"}]
+
+
+@pytest.mark.asyncio
+async def test_typing_heartbeat_refreshes_until_stopped():
+    bot = RecordingBot()
+    context = SimpleNamespace(bot=bot)
+
+    task = progress.start_typing_heartbeat(context, 7, interval=0.01)
+    await asyncio.sleep(0.035)
+    await progress.stop_typing_heartbeat(task)
+    sent = len(bot.actions)
+    await asyncio.sleep(0.02)
+
+    assert task.cancelled()
+    assert sent >= 2
+    assert len(bot.actions) == sent
+    assert bot.actions[0] == {"chat_id": 7, "action": ChatAction.TYPING}
+
+
+@pytest.mark.asyncio
+async def test_typing_heartbeat_survives_chat_action_errors():
+    calls = []
+
+    async def failing_action(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("telegram unavailable")
+
+    context = SimpleNamespace(bot=SimpleNamespace(send_chat_action=failing_action))
+
+    task = progress.start_typing_heartbeat(context, 7, interval=0.01)
+    await asyncio.sleep(0.025)
+    await progress.stop_typing_heartbeat(task)
+
+    assert len(calls) >= 2
+
+
+@pytest.mark.asyncio
+async def test_typing_heartbeat_only_runs_while_a_stage_does():
+    from bot.handlers.audio import _run_stage
+    from bot.pipeline_stages import StagedPipelineEngine
+
+    bot = RecordingBot()
+    heartbeat = progress.TypingHeartbeat(SimpleNamespace(bot=bot), 7, interval=0.01)
+    engine = StagedPipelineEngine({"transcribe": 1})
+    release = asyncio.Event()
+
+    busy = asyncio.create_task(engine.run("transcribe", release.wait()))
+    waiting = asyncio.create_task(_run_stage(engine, "transcribe", asyncio.sleep(0.02), heartbeat))
+    await asyncio.sleep(0.03)
+    assert bot.actions == []  # queued behind the busy slot: no typing
+
+    release.set()
+    await busy
+    await waiting
+    sent = len(bot.actions)
+    await asyncio.sleep(0.02)
+
+    assert sent >= 1
+    assert len(bot.actions) == sent
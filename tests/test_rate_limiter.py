@@ -1,9 +1,14 @@
 import asyncio
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
 from bot import constants as c
-from bot.rate_limiter import RateLimiter
+from bot.admission import MetadataAdmission, parse_duration_tiers
+from bot.decorators.rate_limit import rate_limited, wait_for_provider_turn
+from bot.rate_limiter import AdaptiveConcurrencyLimit, PreparationBudget, RateLimiter
 
 
 @pytest.mark.asyncio
@@ -99,3 +104,268 @@ async def test_rate_limiter_rejects_duplicate_queued_user():
     assert first_queued.queued is True
     assert second_queued.allowed is False
     assert second_queued.message == c.MSG_ALREADY_QUEUED
+
+
+def test_adaptive_limit_grows_under_healthy_saturated_load():
+    adaptive = AdaptiveConcurrencyLimit(initial=2, min_limit=1, max_limit=3)
+
+    # Healthy samples without demand reaching the limit do not grow it.
+    for _ in range(5):
+        adaptive.on_sample("transcribe", 1.0, "ok", demand=1)
+    assert adaptive.limit == 2
+
+    assert adaptive.on_sample("transcribe", 1.0, "ok", demand=2) is False
+    assert adaptive.on_sample("transcribe", 1.0, "ok", demand=2) is True
+    assert adaptive.limit == 3
+    for _ in range(10):
+        adaptive.on_sample("transcribe", 1.0, "ok", demand=5)
+    assert adaptive.limit == 3  # capped at max_limit
+    assert adaptive.changes[-1]["reason"] == "healthy"
+
+
+def test_adaptive_limit_backs_off_on_throttling_and_latency(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("bot.rate_limiter.time.monotonic", lambda: clock[0])
+    adaptive = AdaptiveConcurrencyLimit(initial=8, min_limit=2, max_limit=10, decrease_cooldown=10)
+
+    assert adaptive.on_sample("refine", 0.5, "throttled", demand=8) is True
+    assert adaptive.limit == 6
+    # A second failure from the same overload episode is ignored.
+    assert adaptive.on_sample("refine", 0.5, "timeout", demand=8) is False
+
+    clock[0] += 11
+    adaptive.on_sample("transcribe", 1.0, "ok", demand=6)
+    for _ in range(5):
+        adaptive.on_sample("transcribe", 5.0, "ok", demand=6)
+    assert adaptive.limit == 4
+    assert adaptive.changes[-1]["reason"] == "latency"
+    assert adaptive.changes[-1]["stage"] == "transcribe"
+
+    # Ordinary errors are not a load signal.
+    clock[0] += 11
+    assert adaptive.on_sample("refine", 0.5, "error", demand=4) is False
+    assert adaptive.get_stats()["samples"]["error"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_adaptive_limit_admits_queued_request_on_increase():
+    adaptive = AdaptiveConcurrencyLimit(initial=1, min_limit=1, max_limit=2)
+    limiter = RateLimiter(max_per_user=2, cooldown=30, max_global=1, queue_enabled=True, max_queue_size=5, adaptive=adaptive)
+
+    await limiter.request_admission(user_id=1, file_size_mb=1)
+    queued = await limiter.request_admission(user_id=2, file_size_mb=1)
+    assert queued.queued is True
+    wait_task = asyncio.create_task(limiter.wait_for_queue_turn(queued.queue_entry))
+
+    await limiter.record_sample("transcribe", 1.0, "ok")
+    await asyncio.wait_for(wait_task, timeout=1)
+
+    assert limiter.max_global == 2
+    assert limiter._global_count == 2
+    assert limiter.get_adaptive_stats()["in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_release_does_not_hand_over_above_shrunk_limit():
+    adaptive = AdaptiveConcurrencyLimit(initial=2, min_limit=1, max_limit=2)
+    limiter = RateLimiter(max_per_user=2, cooldown=30, max_global=2, queue_enabled=True, max_queue_size=5, adaptive=adaptive)
+
+    await limiter.request_admission(user_id=1, file_size_mb=1)
+    await limiter.request_admission(user_id=2, file_size_mb=1)
+    queued = await limiter.request_admission(user_id=3, file_size_mb=1)
+    await limiter.record_sample("refine", 1.0, "throttled")
+    assert limiter.max_global == 1
+
+    await limiter.release_async(1)
+    assert queued.queue_entry.granted is False
+    assert limiter._global_count == 1
+
+    await limiter.release_async(2)
+    assert queued.queue_entry.granted is True
+
+
+def _audio_message(kind="voice", duration=30, user_id=7, chat_id=7, chat_type="private",
+                   mime_type="audio/ogg", file_name=None):
+    attachment = SimpleNamespace(duration=duration, mime_type=mime_type, file_name=file_name,
+                                 file_size=1024)
+    message = SimpleNamespace(
+        voice=None, audio=None, document=None,
+        from_user=SimpleNamespace(id=user_id),
+        chat=SimpleNamespace(id=chat_id, type=chat_type),
+        reply_text=AsyncMock(),
+    )
+    setattr(message, kind, attachment)
+    return message
+
+
+def test_metadata_admission_duration_tiers():
+    tiers = parse_duration_tiers('{"admin": 0, "groups": 120, "user:7": 900, "chat:-100": 60}')
+    admission = MetadataAdmission(max_duration_seconds=300, duration_tiers=tiers)
+
+    assert admission.check(_audio_message(duration=600)) is None  # user:7 overrides 300 s
+    assert admission.check(_audio_message(duration=1000)).message == c.MSG_AUDIO_TOO_LONG.format(
+        duration="16:40", max_duration="15:00"
+    )
+    assert admission.max_duration_for(8, 8, is_group=False, is_admin=False) == 300
+    assert admission.max_duration_for(8, -5, is_group=True, is_admin=False) == 120
+    assert admission.max_duration_for(8, -100, is_group=True, is_admin=True) == 60
+    assert admission.max_duration_for(8, -5, is_group=True, is_admin=True) == 0
+    assert admission.check(_audio_message(user_id=8, chat_id=-5, duration=7200), is_admin=True) is None
+    assert admission.get_stats()["rejected"] == {"duration": 1, "mime": 0, "extension": 0}
+
+    for bad in ('{"vip": 10}', '{"users": -1}', '{"user:abc": 10}', "[1]"):
+        with pytest.raises(ValueError):
+            parse_duration_tiers(bad)
+
+
+def test_metadata_admission_checks_mime_and_extension():
+    admission = MetadataAdmission(allowed_extensions="mp3, .M4A")
+
+    assert admission.check(_audio_message("audio", file_name="memo.M4A", mime_type="audio/mp4")) is None
+    assert admission.check(_audio_message("audio", file_name=None, mime_type="audio/mpeg")) is None
+    rejected = admission.check(_audio_message("document", file_name="memo.wma", mime_type="audio/x-ms-wma"))
+    assert rejected.reason == "extension"
+    assert rejected.message == c.MSG_UNSUPPORTED_FORMAT.format(extension="wma", allowed="m4a, mp3")
+    assert admission.check(_audio_message("document", file_name="clip.mp3", mime_type="video/mp4")).reason == "mime"
+    assert MetadataAdmission(allowed_extensions="").check(
+        _audio_message("document", file_name="memo.wma", mime_type="audio/x-ms-wma")
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_rejects_from_metadata_before_taking_a_slot():
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    handler = AsyncMock()
+    message = _audio_message(duration=3600)
+    context = SimpleNamespace(bot_data={
+        "rate_limiter": limiter,
+        "metadata_admission": MetadataAdmission(max_duration_seconds=600),
+        "config": SimpleNamespace(authorized_data={"admin": []}),
+    })
+    update = SimpleNamespace(effective_user=message.from_user, message=message)
+
+    await rate_limited(handler)(update, context)
+
+    handler.assert_not_awaited()
+    message.reply_text.assert_awaited_once_with(
+        c.MSG_AUDIO_TOO_LONG.format(duration="1:00:00", max_duration="10:00")
+    )
+    assert limiter._global_count == 0 and limiter._last_rejection_time == {}
+
+    message.voice.duration = 60
+    await rate_limited(handler)(update, context)
+    handler.assert_awaited_once()
+
+
+def test_preparation_budget_bounds_jobs_and_disk(tmp_path):
+    budget = PreparationBudget(max_jobs=2, max_mb=1)
+    first = budget.reserve(600 * 1024)
+    assert budget.reserve(600 * 1024) is None  # over 1 MB
+
+    prepared = tmp_path / "prepared.mp3"
+    prepared.write_bytes(b"\0" * 1024)
+    budget.track(first, str(prepared), str(tmp_path / "missing.ogg"))
+    second = budget.reserve(600 * 1024)
+    assert second is not None and budget.reserve(0) is None  # two jobs max
+
+    budget.release(first)
+    budget.release(first)
+    assert budget.get_stats() == {
+        "max_jobs": 2, "max_mb": 1, "jobs": 1, "mb": 0.6, "prepared": 2, "skipped": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_hands_slots_over_in_arrival_order():
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    assert (await limiter.request_admission(1, 1)).allowed
+    preparing = (await limiter.request_admission(2, 1, prepare=True)).queue_entry
+    ready = (await limiter.request_admission(3, 1)).queue_entry
+
+    await limiter.release_async(1)
+    assert not preparing.granted and not ready.granted  # slot kept for user 2
+    late = await limiter.request_admission(4, 1)
+    assert late.queued  # no jumping ahead of the queue
+
+    await limiter.mark_ready(preparing)
+    assert preparing.granted and not ready.granted
+    await limiter.wait_for_queue_turn(preparing)
+    await limiter.release_async(2)
+    assert ready.granted and not late.queue_entry.granted
+
+
+@pytest.mark.asyncio
+async def test_prepared_admissions_hold_a_slot_only_once_ready():
+    limiter = RateLimiter(max_per_user=1, max_global=2)
+    first = await limiter.request_admission(1, 1, prepare=True)
+    second = await limiter.request_admission(2, 1, prepare=True)
+    assert first.allowed and not first.queued and first.queue_entry is not None
+    assert limiter._global_count == 0 and limiter._active_requests == {1: 1, 2: 1}
+    assert not (await limiter.request_admission(1, 1, prepare=True)).allowed
+    third = await limiter.request_admission(3, 1, prepare=True)
+    assert third.queued  # both slots are reserved
+
+    await limiter.mark_ready(second.queue_entry)
+    assert second.queue_entry.granted and limiter._global_count == 1
+    await limiter.cancel_queue_entry(first.queue_entry)  # e.g. download failed
+    assert limiter._active_requests == {2: 1}
+
+    await limiter.mark_ready(third.queue_entry)
+    assert third.queue_entry.granted and limiter._global_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_prepares_queued_audio_before_its_turn(tmp_path):
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    budget = PreparationBudget(max_jobs=1)
+    context = SimpleNamespace(bot_data={"rate_limiter": limiter, "preparation_budget": budget})
+    events = []
+
+    async def handler(update, context):
+        events.append(("prepared", update.message.from_user.id))
+        await wait_for_provider_turn(str(tmp_path / "missing.mp3"))
+        events.append(("provider", update.message.from_user.id))
+
+    assert (await limiter.request_admission(1, 1)).allowed  # holds the only slot
+    message = _audio_message(user_id=2)
+    update = SimpleNamespace(effective_user=message.from_user, message=message)
+    task = asyncio.create_task(rate_limited(handler)(update, context))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert events == [("prepared", 2)]
+    assert budget.jobs == 1 and limiter._global_count == 1
+
+    await limiter.release_async(1)
+    await task
+    assert events[-1] == ("provider", 2)
+    assert budget.jobs == 0 and limiter._global_count == 0 and limiter._active_requests == {}
+
+    # A queued request that stops before its turn gives up its queue place.
+    async def rejected(update, context):
+        return None
+
+    assert (await limiter.request_admission(1, 1)).allowed
+    await rate_limited(rejected)(update, context)
+    assert limiter._wait_queue == deque() and limiter._global_count == 1 and budget.jobs == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_takes_the_slot_after_preparing():
+    limiter = RateLimiter(max_per_user=1, max_global=1)
+    budget = PreparationBudget(max_jobs=1)
+    context = SimpleNamespace(bot_data={"rate_limiter": limiter, "preparation_budget": budget})
+    slots = []
+
+    async def handler(update, context):
+        slots.append(limiter._global_count)
+        await wait_for_provider_turn()
+        slots.append(limiter._global_count)
+
+    message = _audio_message(user_id=2)
+    update = SimpleNamespace(effective_user=message.from_user, message=message)
+    await rate_limited(handler)(update, context)
+
+    assert slots == [0, 1]
+    message.reply_text.assert_not_awaited()
+    assert limiter._global_count == 0 and limiter._active_requests == {}
+    assert limiter._wait_queue == deque() and budget.jobs == 0
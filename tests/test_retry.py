@@ -0,0 +1,165 @@
+"""
+Tests for the provider retry policy (bot.retry) and its use by the
+resilient provider wrappers.
+"""
+
+import random
+
+import httpx
+import openai
+import pytest
+
+from bot import constants as c
+from bot.exceptions import ProviderCircuitOpen, RefineError, TranscribeError
+from bot.providers import (
+    RefineStreamEvent,
+    ResilientTextProcessor,
+    ResilientTranscriber,
+    TextProcessor,
+    Transcriber,
+    TranscriptionResult,
+)
+from bot.retry import RetryPolicy, classify_retryable, retry_after_hint
+
+
+def _status_error(status: int, headers=None) -> TranscribeError:
+    """An adapter error wrapping a real OpenAI SDK status error."""
+    response = httpx.Response(
+        status,
+        headers=headers or {},
+        request=httpx.Request("POST", "https://api.example.test/v1/audio"),
+    )
+    try:
+        try:
+            raise openai.APIStatusError("boom", response=response, body=None)
+        except openai.APIStatusError as exc:
+            raise TranscribeError(f"failed: {exc}", c.MSG_ERROR_TRANSCRIBE) from exc
+    except TranscribeError as wrapped:
+        return wrapped
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    kwargs.setdefault("base_delay", 0.001)
+    kwargs.setdefault("max_delay", 0.01)
+    return RetryPolicy(rng=random.Random(0), **kwargs)
+
+
+class FlakyTranscriber(Transcriber):
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def transcribe(self, file_path):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return TranscriptionResult(text="ok")
+
+
+def test_classify_retryable_by_status_and_error_type():
+    assert classify_retryable(_status_error(429)) == "throttled"
+    assert classify_retryable(_status_error(503)) == "server"
+    assert classify_retryable(_status_error(400)) is None
+    assert classify_retryable(ConnectionResetError()) == "connection"
+    assert classify_retryable(RuntimeError("bad payload")) is None
+    assert classify_retryable(ProviderCircuitOpen("open", "msg")) is None
+
+
+def test_retry_after_hint_reads_provider_headers():
+    assert retry_after_hint(_status_error(429, {"Retry-After": "2"})) == 2.0
+    assert retry_after_hint(_status_error(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_hint(
+        _status_error(429, {"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "1m30s"})
+    ) == 90.0
+    assert retry_after_hint(_status_error(503)) is None
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_and_counted_by_circuit_breaker():
+    inner = FlakyTranscriber([_status_error(502), _status_error(429, {"retry-after-ms": "5"})])
+    policy = _policy(max_attempts=3)
+    wrapper = ResilientTranscriber(inner, failure_threshold=5, retry=policy)
+
+    result = await wrapper.transcribe("a.mp3")
+
+    assert result.text == "ok"
+    assert inner.calls == 3
+    stats = policy.get_stats()
+    assert stats["retries_by_reason"] == {"server": 1, "throttled": 1}
+    assert stats["recovered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_attempts_open_the_circuit():
+    inner = FlakyTranscriber([_status_error(503)] * 5)
+    policy = _policy(max_attempts=5)
+    wrapper = ResilientTranscriber(inner, failure_threshold=2, retry=policy)
+
+    with pytest.raises(TranscribeError):
+        await wrapper.transcribe("a.mp3")
+
+    assert inner.calls == 2
+    assert policy.get_stats()["gave_up"] == {"circuit": 1}
+    with pytest.raises(ProviderCircuitOpen):
+        await wrapper.transcribe("a.mp3")
+
+
+@pytest.mark.asyncio
+async def test_no_retry_past_deadline_or_long_retry_after(monkeypatch):
+    policy = _policy(max_attempts=3, max_delay=1.0)
+    monkeypatch.setitem(c.PROGRESS_TIMEOUTS, "transcribe", 0)
+    inner = FlakyTranscriber([_status_error(503)])
+
+    with pytest.raises(TranscribeError):
+        await ResilientTranscriber(inner, retry=policy).transcribe("a.mp3")
+
+    monkeypatch.setitem(c.PROGRESS_TIMEOUTS, "transcribe", 120)
+    inner = FlakyTranscriber([_status_error(429, {"Retry-After": "30"})])
+    with pytest.raises(TranscribeError):
+        await ResilientTranscriber(inner, retry=policy).transcribe("a.mp3")
+
+    assert policy.get_stats()["gave_up"] == {"deadline": 1, "retry_after": 1}
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries():
+    policy = _policy(max_attempts=2, budget_percent=0)
+    policy._tokens = 1
+    first = FlakyTranscriber([_status_error(503)])
+    second = FlakyTranscriber([_status_error(503)])
+
+    assert (await ResilientTranscriber(first, retry=policy).transcribe("a.mp3")).text == "ok"
+    with pytest.raises(TranscribeError):
+        await ResilientTranscriber(second, retry=policy).transcribe("a.mp3")
+
+    assert policy.get_stats()["gave_up"] == {"budget": 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_is_retried_only_before_the_first_event():
+    class FlakyStream(TextProcessor):
+        def __init__(self, fail_after_delta):
+            self.fail_after_delta = fail_after_delta
+            self.calls = 0
+
+        async def process(self, raw_text):
+            return raw_text
+
+        async def stream_process(self, raw_text):
+            self.calls += 1
+            if self.calls == 1:
+                if self.fail_after_delta:
+                    yield RefineStreamEvent(type="delta", text="par")
+                raise RefineError("reset", c.MSG_ERROR_REFINE) from ConnectionResetError()
+            yield RefineStreamEvent(type="done", text=raw_text)
+
+    before = FlakyStream(fail_after_delta=False)
+    events = [e async for e in ResilientTextProcessor(before, retry=_policy()).stream_process("hi")]
+    assert [e.type for e in events] == ["done"]
+    assert before.calls == 2
+
+    after = FlakyStream(fail_after_delta=True)
+    with pytest.raises(RefineError):
+        async for _ in ResilientTextProcessor(after, retry=_policy()).stream_process("hi"):
+            pass
+    assert after.calls == 1
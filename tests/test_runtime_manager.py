@@ -7,7 +7,7 @@ full start/stop/restart lifecycle.  Lifecycle tests mock the PTB
 """
 
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -242,6 +242,51 @@ def test_get_health_includes_uptime_when_running(ready_manager, mock_app):
     assert health["uptime_seconds"] >= 0
 
 
+def test_get_health_reports_pipeline_stage_stats(ready_manager, mock_app):
+    """pipeline_stages mirrors the running app's stage engine."""
+    from bot.conversion import ConversionPool
+    from bot.pipeline_stages import StagedPipelineEngine
+
+    assert ready_manager.get_health()["pipeline_stages"] is None
+    assert ready_manager.get_health()["conversion"] is None
+    assert ready_manager.get_health()["rate_budgets"] is None
+
+    mock_app.running = True
+    mock_app.bot_data = {
+        "stage_engine": StagedPipelineEngine({"convert": 1}),
+        "conversion_pool": ConversionPool(processes=2, nice=5, cpu_count=4),
+    }
+    ready_manager.start(block=False)
+
+    health = ready_manager.get_health()
+    stages = health["pipeline_stages"]
+    assert stages["convert"]["concurrency"] == 1
+    assert stages["refine"]["queued"] == 0
+    assert stages["convert"]["p95_wait_ms"] is None
+    assert health["conversion"]["threads_per_process"] == 2
+    assert health["admission"] is None
+    assert health["preparation"] is None
+    assert health["rate_budgets"] == {}
+
+
+def test_get_health_reports_adaptive_concurrency(ready_manager, mock_app):
+    """adaptive_concurrency is only reported when the limiter is adaptive."""
+    from bot.rate_limiter import AdaptiveConcurrencyLimit, RateLimiter
+
+    mock_app.running = True
+    mock_app.bot_data = {"rate_limiter": RateLimiter(max_global=4)}
+    ready_manager.start(block=False)
+    assert ready_manager.get_health()["adaptive_concurrency"] is None
+
+    mock_app.bot_data["rate_limiter"] = RateLimiter(
+        max_global=4,
+        adaptive=AdaptiveConcurrencyLimit(initial=4, min_limit=2, max_limit=8),
+    )
+    adaptive = ready_manager.get_health()["adaptive_concurrency"]
+    assert (adaptive["limit"], adaptive["min_limit"], adaptive["max_limit"]) == (4, 2, 8)
+    assert adaptive["changes"] == []
+
+
 # ------------------------------------------------------------------
 # Lifecycle — start (blocking mode)
 # ------------------------------------------------------------------
@@ -420,3 +465,112 @@ def test_run_until_stopped_propagates_runtime_error(tmp_path, mock_app):
         manager = _make_manager(tmp_path, ready=False)
     with pytest.raises(RuntimeError, match="Cannot start bot"):
         manager.run_until_stopped()
+
+
+# ------------------------------------------------------------------
+# Webhook mode
+# ------------------------------------------------------------------
+
+
+def _make_async_app(mock_app):
+    mock_app.initialize = AsyncMock()
+    mock_app.start = AsyncMock()
+    mock_app.stop = AsyncMock()
+    mock_app.shutdown = AsyncMock()
+    mock_app.updater.running = False
+    mock_app.updater.start_polling = AsyncMock()
+    mock_app.updater.stop = AsyncMock()
+    mock_app.bot.set_webhook = AsyncMock()
+    mock_app.bot.delete_webhook = AsyncMock()
+    mock_app.update_queue.put = AsyncMock()
+    return mock_app
+
+
+@pytest.mark.asyncio
+async def test_start_async_registers_webhook_on_secret_path(ready_manager, mock_app):
+    _make_async_app(mock_app)
+    ready_manager._config_service.update_setting("telegram_update_mode", "webhook")
+    ready_manager._config_service.update_setting(
+        "telegram_webhook_url", "https://bot.example.com"
+    )
+
+    await ready_manager.start_async()
+    mock_app.running = True
+
+    mock_app.updater.start_polling.assert_not_called()
+    kwargs = mock_app.bot.set_webhook.call_args.kwargs
+    path_token = kwargs["url"].rsplit("/", 1)[-1]
+    assert kwargs["url"] == f"https://bot.example.com/telegram/webhook/{path_token}"
+    assert ready_manager.webhook_active is True
+    assert ready_manager.get_health()["update_mode"] == "webhook"
+    assert ready_manager.verify_webhook_request(path_token, kwargs["secret_token"]) is True
+    assert ready_manager.verify_webhook_request(path_token, "wrong") is False
+    assert ready_manager.verify_webhook_request("wrong", kwargs["secret_token"]) is False
+
+    await ready_manager.stop_async()
+
+    mock_app.bot.delete_webhook.assert_awaited_once()
+    assert ready_manager.verify_webhook_request(path_token, kwargs["secret_token"]) is False
+
+
+@pytest.mark.asyncio
+async def test_start_async_polls_when_webhook_url_missing(ready_manager, mock_app):
+    _make_async_app(mock_app)
+    ready_manager._config_service.update_setting("telegram_update_mode", "webhook")
+
+    await ready_manager.start_async()
+
+    mock_app.updater.start_polling.assert_awaited_once()
+    mock_app.bot.set_webhook.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_webhook_update_feeds_update_queue(ready_manager, mock_app):
+    _make_async_app(mock_app)
+    await ready_manager.start_async()
+
+    await ready_manager.enqueue_webhook_update({"update_id": 42})
+
+    update = mock_app.update_queue.put.call_args.args[0]
+    assert update.update_id == 42
+
+
+@pytest.mark.asyncio
+async def test_set_update_mode_restarts_running_bot(ready_manager, mock_app):
+    _make_async_app(mock_app)
+    await ready_manager.start_async()
+    mock_app.running = True
+
+    with pytest.raises(ValueError):
+        await ready_manager.set_update_mode_async("webhook")
+
+    await ready_manager.set_update_mode_async(
+        "webhook", webhook_url="https://bot.example.com/"
+    )
+
+    assert ready_manager.get_webhook_url() == "https://bot.example.com"
+    mock_app.stop.assert_awaited_once()
+    mock_app.bot.set_webhook.assert_awaited_once()
+    assert ready_manager.get_health()["update_mode"] == "webhook"
+
+
+@pytest.mark.asyncio
+async def test_switching_running_bot_to_webhook_stops_polling_first(ready_manager, mock_app):
+    _make_async_app(mock_app)
+    calls = []
+    mock_app.updater.stop.side_effect = lambda: calls.append("updater.stop")
+    mock_app.stop.side_effect = lambda: calls.append("app.stop")
+    mock_app.shutdown.side_effect = lambda: calls.append("app.shutdown")
+    mock_app.bot.set_webhook.side_effect = lambda **kwargs: calls.append("set_webhook")
+
+    await ready_manager.start_async()
+    assert ready_manager.get_health()["update_mode"] == "polling"
+    mock_app.running = True
+    mock_app.updater.running = True
+
+    await ready_manager.set_update_mode_async(
+        "webhook", webhook_url="https://bot.example.com"
+    )
+
+    assert calls == ["updater.stop", "app.stop", "app.shutdown", "set_webhook"]
+    assert ready_manager.get_health()["update_mode"] == "webhook"
@@ -121,6 +121,9 @@ def test_from_config_service_with_db_values(tmp_path):
     cs.update_setting("llm_model", "gemini-2.0-flash")
     cs.update_setting("rate_limit_max_per_user", "5")
     cs.update_setting("telegram_draft_streaming", "true")
+    cs.update_setting("telegram_raw_first_delivery", "true")
+    cs.update_setting("pipeline_dispatch_enabled", "true")
+    cs.update_setting("pipeline_stage_convert_concurrency", "1")
 
     snapshot = RuntimeSnapshot.from_config_service(cs, cfg)
 
@@ -129,6 +132,10 @@ def test_from_config_service_with_db_values(tmp_path):
     assert snapshot.model_name == "gemini-2.0-flash"
     assert snapshot.rate_limit_config["max_per_user"] == 5
     assert snapshot.telegram_progressive_output_config["enabled"] is True
+    assert snapshot.telegram_progressive_output_config["raw_first"] is True
+    assert snapshot.pipeline_dispatch_enabled is True
+    assert snapshot.pipeline_stage_config["convert"] == 1
+    assert snapshot.pipeline_stage_config["refine"] == 6
 
     # Values NOT set in ConfigService should fall back to Config
     assert snapshot.rate_limit_config["cooldown_seconds"] == 30
@@ -136,6 +143,26 @@ def test_from_config_service_with_db_values(tmp_path):
     assert snapshot.prompts["system"] == "You are a transcription assistant."
 
 
+def test_from_config_service_resolves_admission_rules(tmp_path):
+    db = _make_db(tmp_path)
+    cs = ConfigService(db, secret_store=None)
+
+    default = RuntimeSnapshot.from_config_service(cs, _make_legacy_config(tmp_path))
+    assert default.admission_config["max_duration_seconds"] == 0
+    assert "ogg" in default.admission_config["allowed_extensions"]
+
+    cs.update_setting("admission_max_duration_seconds", "600")
+    cs.update_setting("admission_duration_tiers", '{"admin": 0}')
+    cs.update_setting("admission_allowed_extensions", "mp3, OGG")
+    snapshot = RuntimeSnapshot.from_config_service(cs, _make_legacy_config(tmp_path))
+
+    assert snapshot.admission_config == {
+        "max_duration_seconds": 600,
+        "duration_tiers": {"admin": 0},
+        "allowed_extensions": ["mp3", "ogg"],
+    }
+
+
 def test_from_config_service_falls_back_to_config_defaults(tmp_path):
     db = _make_db(tmp_path)
     cs = ConfigService(db, secret_store=None)
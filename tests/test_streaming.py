@@ -302,3 +302,47 @@ async def test_finalize_progressive_response_splits_long_text_for_draft_session(
     assert len(sent_messages[0][1]) == 4000
     assert len(sent_messages[1][1]) == 1000
     assert ack.deleted == 1
+
+
+@pytest.mark.asyncio
+async def test_send_raw_preview_edits_ack_and_truncates_long_text():
+    adapter = TelegramDeliveryAdapter(raw_first_enabled=True)
+    edits = []
+
+    async def edit_text(text):
+        edits.append(text)
+
+    ack = SimpleNamespace(edit_text=edit_text)
+
+    await adapter.send_raw_preview(SimpleNamespace(bot=None), 1, ack, "short")
+    await adapter.send_raw_preview(SimpleNamespace(bot=None), 1, ack, "a" * 5000)
+
+    assert adapter.is_raw_first_enabled() is True
+    assert edits[0] == "short"
+    assert len(edits[1]) == 4000
+    assert edits[1].endswith("…")
+
+
+@pytest.mark.asyncio
+async def test_show_transcript_preview_appends_tail_to_progress_message():
+    from bot.ui.streaming import TRANSCRIPT_PREVIEW_MAX_CHARS
+
+    adapter = TelegramDeliveryAdapter(progressive_enabled=True)
+    edits = []
+
+    class DummyBot:
+        async def edit_message_text(self, chat_id, message_id, text):
+            edits.append(text)
+
+    ack = SimpleNamespace(message_id=5, chat=SimpleNamespace(type="group"))
+    partial = "x" * (TRANSCRIPT_PREVIEW_MAX_CHARS + 10) + "fine"
+
+    await adapter.show_transcript_preview(
+        SimpleNamespace(bot=DummyBot()), 1, ack, "🎧 Trascrizione audio", partial
+    )
+
+    assert len(edits) == 1
+    status, tail = edits[0].split("\n\n")
+    assert status == "🎧 Trascrizione audio"
+    assert tail.startswith("…") and tail.endswith("fine")
+    assert len(tail) == TRANSCRIPT_PREVIEW_MAX_CHARS + 1
@@ -104,3 +104,46 @@ def test_resilient_provider_exposes_streaming_capability():
     provider = ResilientProvider(DummyStreamingProvider(), provider_name="openai", failure_threshold=2, cooldown_seconds=30)
 
     assert provider.supports_refine_streaming is True
+
+
+def test_is_local_bot_api_file_only_accepts_files_inside_the_server_dir(tmp_path):
+    server_dir = tmp_path / "telegram-bot-api"
+    server_dir.mkdir()
+    local = server_dir / "voice.oga"
+    local.write_bytes(b"x")
+    outside = tmp_path / "secret.txt"
+    outside.write_bytes(b"x")
+    (server_dir / "escape.oga").symlink_to(outside)
+
+    assert utils.is_local_bot_api_file(str(local), str(server_dir)) is True
+    assert utils.is_local_bot_api_file("voice/file_1.oga", str(server_dir)) is False
+    assert utils.is_local_bot_api_file(str(server_dir / "missing.oga"), str(server_dir)) is False
+    assert utils.is_local_bot_api_file(None, str(server_dir)) is False
+    assert utils.is_local_bot_api_file(str(outside), str(server_dir)) is False
+    assert utils.is_local_bot_api_file(str(server_dir / ".." / "secret.txt"), str(server_dir)) is False
+    assert utils.is_local_bot_api_file(str(server_dir / "escape.oga"), str(server_dir)) is False
+    assert utils.is_local_bot_api_file(str(local), None) is False
+
+
+def test_local_bot_api_files_dir_requires_local_mode():
+    local = {"base_url": "http://localhost:8081", "local_mode": True, "files_dir": "/srv/tg"}
+
+    assert utils.local_bot_api_files_dir(local) == "/srv/tg"
+    assert utils.local_bot_api_files_dir({**local, "local_mode": False}) is None
+    assert utils.local_bot_api_files_dir({**local, "base_url": ""}) is None
+    assert utils.local_bot_api_files_dir({**local, "files_dir": ""}) is None
+
+
+def test_link_local_file_falls_back_to_copy_across_filesystems(monkeypatch, tmp_path):
+    src = tmp_path / "src.oga"
+    src.write_bytes(b"audio")
+    dst = tmp_path / "dst.oga"
+
+    def cross_device(*args):
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(utils.os, "link", cross_device)
+    utils.link_local_file(str(src), str(dst))
+
+    assert dst.read_bytes() == b"audio"
+    assert not dst.samefile(src)
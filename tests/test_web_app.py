@@ -573,6 +573,105 @@ def test_api_health(fresh_app):
     assert data["bot_running"] is False
 
 
+def test_telegram_webhook_rejects_unknown_path_or_secret(fresh_app):
+    """The webhook endpoint answers 404 unless path and header match."""
+    with TestClient(fresh_app) as client:
+        resp = client.post("/telegram/webhook/guess", json={"update_id": 1})
+    assert resp.status_code == 404
+
+
+def test_telegram_webhook_enqueues_verified_update(fresh_app, monkeypatch):
+    """A verified webhook request is handed to the runtime manager."""
+    manager = fresh_app.state.runtime_manager
+    received = []
+
+    async def enqueue(data):
+        received.append(data)
+
+    monkeypatch.setattr(
+        manager,
+        "verify_webhook_request",
+        lambda path, secret: path == "tok" and secret == "s3cret",
+    )
+    monkeypatch.setattr(manager, "enqueue_webhook_update", enqueue)
+
+    with TestClient(fresh_app) as client:
+        ok = client.post(
+            "/telegram/webhook/tok",
+            json={"update_id": 7},
+            headers={"X-Telegram-Bot-Api-Secret-Token": "s3cret"},
+        )
+        bad = client.post(
+            "/telegram/webhook/tok",
+            json={"update_id": 8},
+            headers={"X-Telegram-Bot-Api-Secret-Token": "nope"},
+        )
+
+    assert ok.status_code == 200
+    assert bad.status_code == 404
+    assert received == [{"update_id": 7}]
+
+
+def test_update_mode_switch_requires_https_url(ready_app):
+    """Switching to webhook mode validates the public URL."""
+    with TestClient(ready_app) as client:
+        cookies = _authed_session(client)
+        resp = client.get("/admin/dashboard", cookies=cookies)
+        csrf = _extract_csrf(resp.text)
+        assert "Ricezione aggiornamenti" in resp.text
+
+        bad = client.post(
+            "/admin/bot/update-mode",
+            data={"csrf_token": csrf, "update_mode": "webhook", "webhook_url": "http://x"},
+            cookies=cookies,
+            follow_redirects=False,
+        )
+        missing = client.post(
+            "/admin/bot/update-mode",
+            data={"csrf_token": csrf, "update_mode": "webhook", "webhook_url": ""},
+            cookies=cookies,
+            follow_redirects=False,
+        )
+        ok = client.post(
+            "/admin/bot/update-mode",
+            data={
+                "csrf_token": csrf,
+                "update_mode": "webhook",
+                "webhook_url": "https://bot.example.com",
+            },
+            cookies=cookies,
+            follow_redirects=False,
+        )
+
+    assert bad.headers["location"] == "/admin/dashboard?error=webhook_url_invalid"
+    assert missing.headers["location"] == "/admin/dashboard?error=webhook_url_missing"
+    assert ok.headers["location"] == "/admin/dashboard?success=update_mode"
+    assert ready_app.state.runtime_manager.get_update_mode() == "webhook"
+
+
+def test_update_mode_switch_reports_other_validation_errors(ready_app, monkeypatch):
+    """A rejected setting is not reported as a missing webhook URL."""
+    async def reject(mode, webhook_url=None):
+        raise ValueError("telegram_webhook_url: valore non valido")
+
+    monkeypatch.setattr(ready_app.state.runtime_manager, "set_update_mode_async", reject)
+    with TestClient(ready_app) as client:
+        cookies = _authed_session(client)
+        csrf = _extract_csrf(client.get("/admin/dashboard", cookies=cookies).text)
+        resp = client.post(
+            "/admin/bot/update-mode",
+            data={
+                "csrf_token": csrf,
+                "update_mode": "webhook",
+                "webhook_url": "https://bot.example.com",
+            },
+            cookies=cookies,
+            follow_redirects=False,
+        )
+
+    assert resp.headers["location"] == "/admin/dashboard?error=update_mode_rejected"
+
+
 # ==================================================================
 # Error pages
 # ==================================================================
@@ -612,6 +711,7 @@ class MockHttpxResponse:
     def __init__(self, status_code=200, json_data=None):
         self.status_code = status_code
         self._json_data = json_data if json_data is not None else {}
+        self.headers = {"content-type": "application/json"}
 
     async def json(self):
         return self._json_data
@@ -643,6 +743,9 @@ class MockHttpxClient:
     async def __aexit__(self, *args):
         pass
 
+    async def aclose(self):
+        pass
+
 
 def _provider_test_authed_session(client, ready_app):
     """Authenticate and return cookies for provider test requests."""
@@ -775,6 +878,57 @@ def test_providers_test_gemini_success(ready_app):
     assert "gemini-valid" not in json.dumps(data)
 
 
+def test_providers_test_local_whisper_without_key(ready_app):
+    """A local Whisper server needs no key and is transcription-only."""
+    mock_client = MockHttpxClient({
+        "http://127.0.0.1:8000/v1/models": MockHttpxResponse(
+            200, {"data": [{"id": "Systran/faster-whisper-small"}]}
+        ),
+    })
+
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        with TestClient(ready_app) as client:
+            session = _provider_test_authed_session(client, ready_app)
+            resp = client.post(
+                "/api/providers/test",
+                json={
+                    "provider_type": "local-whisper",
+                    "api_key": "",
+                    "endpoint": "http://127.0.0.1:8000/v1?language=it",
+                    "model_name": "Systran/faster-whisper-small",
+                },
+                cookies=session,
+            )
+
+    data = resp.json()
+    assert data["ok"] is True
+    assert data["models"] == ["Systran/faster-whisper-small"]
+    assert data["capabilities"]["transcription"] is True
+    assert data["capabilities"]["refinement"] is False
+    assert data["pipeline_status"] == "transcription_only"
+
+
+def test_providers_test_mock_validates_endpoint(ready_app):
+    """The mock provider is checked offline from its endpoint settings."""
+    with TestClient(ready_app) as client:
+        session = _provider_test_authed_session(client, ready_app)
+        ok = client.post(
+            "/api/providers/test",
+            json={"provider_type": "mock", "endpoint": "mock://?latency_ms=50&error_rate=0.1"},
+            cookies=session,
+        ).json()
+        bad = client.post(
+            "/api/providers/test",
+            json={"provider_type": "mock", "endpoint": "mock://?latency=pareto"},
+            cookies=session,
+        ).json()
+
+    assert ok["ok"] is True
+    assert ok["pipeline_status"] == "complete_same_provider"
+    assert bad["ok"] is False
+    assert "mock" in bad["user_message"]
+
+
 def test_providers_test_openrouter_text_only(ready_app, monkeypatch):
     """OpenRouter text-only model returns refinement-only pipeline status.
 
@@ -2434,6 +2588,37 @@ def test_pipeline_save_two_stage_success(ready_app):
     assert "refinement" in stage_types
 
 
+def test_pipeline_save_stores_audio_preprocessing(ready_app):
+    """POST /admin/pipeline/save keeps the preprocessing chosen in the form.
+
+    ✅ Positive: the new profile trims silence and speeds audio up.
+    """
+    provider_id = _create_provider(ready_app.state.db)
+
+    with TestClient(ready_app) as client:
+        session = _authed_session(client)
+        csrf = _extract_csrf(client.get("/admin/pipeline", cookies=session).text)
+        resp = client.post(
+            "/admin/pipeline/save",
+            data={
+                "csrf_token": csrf,
+                "pipeline_mode": "single",
+                "provider_id": str(provider_id),
+                "trim_silence": "1",
+                "tempo": "1.5",
+            },
+            cookies=session,
+            follow_redirects=False,
+        )
+        page = client.get("/admin/pipeline", cookies=session).text
+
+    assert "success=saved" in resp.headers["location"]
+    profile_id = ready_app.state.db.get_active_pipeline_profile_id()
+    stored = ready_app.state.db.get_pipeline_profile_preprocessing(profile_id)
+    assert stored["trim_silence"] is True and stored["tempo"] == 1.5
+    assert "taglio silenzi" in page
+
+
 def test_pipeline_save_two_stage_no_tx_model(ready_app):
     """POST /admin/pipeline/save with two_stage but no transcription model
     returns an error.
@@ -2719,6 +2904,36 @@ def test_api_pipeline_stages_update(ready_app):
     assert mode == "two_stage"
 
 
+def test_api_pipeline_stages_sets_audio_preprocessing(ready_app):
+    """POST /api/pipeline/stages stores, validates and clears preprocessing.
+
+    ✅ Positive: valid settings are stored on the profile.
+    ❌ Negative: an out-of-range tempo is rejected.
+    """
+    db = ready_app.state.db
+    profile_id = db.add_pipeline_profile(name="Test Profile", mode="two_stage")
+
+    with TestClient(ready_app) as client:
+        session = _authed_session(client)
+
+        def post(preprocessing):
+            return client.post(
+                "/api/pipeline/stages",
+                json={"profile_id": profile_id, "stages": [], "preprocessing": preprocessing},
+                cookies=session,
+            ).json()
+
+        assert post({"trim_silence": True, "tempo": 1.25})["ok"] is True
+        assert db.get_pipeline_profile(profile_id)["audio_preprocessing"]["tempo"] == 1.25
+
+        rejected = post({"tempo": 3})
+        assert rejected["ok"] is False and "tempo" in rejected["error"]
+        assert db.get_pipeline_profile_preprocessing(profile_id)["trim_silence"] is True
+
+        assert post({})["ok"] is True
+    assert db.get_pipeline_profile_preprocessing(profile_id) is None
+
+
 def test_api_pipeline_stages_requires_auth(ready_app):
     """POST /api/pipeline/stages without auth returns 401.
 
@@ -3222,3 +3437,93 @@ def test_api_discover_models_timeout(ready_app):
     data = resp.json()
     assert data["ok"] is False
     assert "timeout" in data["error"].lower()
+
+
+def test_provider_limits_saves_provider_and_model_limits(ready_app):
+    """POST /admin/providers/{id}/limits persists the bulkhead limits."""
+    provider_id = _create_provider(ready_app.state.db)
+    entry_id = _create_model(ready_app.state.db, provider_id)
+
+    with TestClient(ready_app) as client:
+        session = _authed_session(client)
+        resp = client.get(f"/admin/providers/{provider_id}", cookies=session)
+        assert "Limiti di concorrenza" in resp.text
+        csrf = _extract_csrf(resp.text)
+
+        resp = client.post(
+            f"/admin/providers/{provider_id}/limits",
+            data={
+                "csrf_token": csrf,
+                "max_concurrent": "4",
+                "max_queued": "10",
+                f"model_max_concurrent_{entry_id}": "2",
+            },
+            cookies=session,
+            follow_redirects=False,
+        )
+
+    assert resp.status_code == 303
+    assert resp.headers["location"].endswith("?success=limits_updated")
+    provider = ready_app.state.db.get_provider(provider_id)
+    assert (provider["max_concurrent"], provider["max_queued"]) == (4, 10)
+    assert ready_app.state.db.get_provider_model(entry_id)["max_concurrent"] == 2
+
+
+def test_provider_limits_saves_rate_limits(ready_app):
+    """The limits form also stores the provider's RPM/TPM budget."""
+    provider_id = _create_provider(ready_app.state.db)
+
+    with TestClient(ready_app) as client:
+        session = _authed_session(client)
+        resp = client.get(f"/admin/providers/{provider_id}", cookies=session)
+        assert 'name="rpm_limit"' in resp.text
+        csrf = _extract_csrf(resp.text)
+        resp = client.post(
+            f"/admin/providers/{provider_id}/limits",
+            data={"csrf_token": csrf, "rpm_limit": "500", "tpm_limit": "200000"},
+            cookies=session,
+            follow_redirects=False,
+        )
+
+    assert resp.headers["location"].endswith("?success=limits_updated")
+    provider = ready_app.state.db.get_provider(provider_id)
+    assert (provider["rpm_limit"], provider["tpm_limit"]) == (500, 200000)
+
+
+def test_provider_limits_rejects_negative_values(ready_app):
+    """Negative limits are refused without touching the database."""
+    provider_id = _create_provider(ready_app.state.db)
+
+    with TestClient(ready_app) as client:
+        session = _authed_session(client)
+        resp = client.get(f"/admin/providers/{provider_id}", cookies=session)
+        csrf = _extract_csrf(resp.text)
+        resp = client.post(
+            f"/admin/providers/{provider_id}/limits",
+            data={"csrf_token": csrf, "max_concurrent": "-1", "max_queued": "5"},
+            cookies=session,
+            follow_redirects=False,
+        )
+
+    assert "error=limits_invalid" in resp.headers["location"]
+    assert ready_app.state.db.get_provider(provider_id)["max_concurrent"] == 0
+
+
+def test_provider_edit_saves_priority(ready_app):
+    """The provider edit form stores the ranking tiebreak priority."""
+    provider_id = _create_provider(ready_app.state.db)
+
+    with TestClient(ready_app) as client:
+        session = _authed_session(client)
+        resp = client.get(f"/admin/providers/{provider_id}", cookies=session)
+        assert 'name="priority"' in resp.text
+        csrf = _extract_csrf(resp.text)
+        resp = client.post(
+            f"/admin/providers/{provider_id}/edit",
+            data={"csrf_token": csrf, "priority": "3", "enabled": "1"},
+            cookies=session,
+            follow_redirects=False,
+        )
+
+    assert resp.headers["location"].endswith("?success=updated")
+    assert ready_app.state.db.get_provider(provider_id)["priority"] == 3
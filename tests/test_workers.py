@@ -0,0 +1,293 @@
+"""
+Tests for the dispatcher / worker-process split (bot.workers).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot import constants as c
+from bot.database.repository import DatabaseManager
+from bot.exceptions import PipelineResolutionError, TranscribeError
+from bot.workers import AudioJobHandler, JobDispatcher, PipelineWorker
+
+
+def _make_db(tmp_path) -> DatabaseManager:
+    db = DatabaseManager(str(tmp_path / "app.sqlite3"))
+    db.initialize()
+    return db
+
+
+class FakeBot:
+    def __init__(self):
+        self.edits = []
+        self.sent = []
+
+    async def edit_message_text(self, chat_id, message_id, text):
+        self.edits.append((chat_id, message_id, text))
+
+    async def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+class FakeMessage:
+    def __init__(self, voice=True, user_id=42):
+        self.chat_id = 100
+        self.message_id = 7
+        self.from_user = SimpleNamespace(id=user_id)
+        self.voice = SimpleNamespace(file_id="voice-id", file_unique_id="voice-uniq") if voice else None
+        self.audio = None
+        self.document = None
+        self.replies = []
+
+    async def reply_text(self, text):
+        self.replies.append(text)
+
+        async def edit_text(new_text):
+            self.replies[-1] = new_text
+
+        return SimpleNamespace(message_id=8, edit_text=edit_text)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_submit_queues_job_without_downloading(tmp_path):
+    db = _make_db(tmp_path)
+    message = FakeMessage()
+
+    job_id = await JobDispatcher(db).submit(message)
+
+    assert message.replies == [c.MSG_PIPELINE_JOB_QUEUED]
+    job = db.claim_pipeline_job("w")
+    assert job["id"] == job_id
+    assert (job["chat_id"], job["ack_message_id"], job["file_id"], job["file_ext"]) == (
+        100, 8, "voice-id", "ogg",
+    )
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_submit_rejects_unsupported_message(tmp_path):
+    db = _make_db(tmp_path)
+    message = FakeMessage(voice=False)
+
+    assert await JobDispatcher(db).submit(message) is None
+    assert message.replies == [c.MSG_UNSUPPORTED_TYPE]
+    assert db.count_pipeline_jobs() == {}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_caps_pending_jobs_per_user_and_in_total(tmp_path):
+    db = _make_db(tmp_path)
+    dispatcher = JobDispatcher.from_rate_limits(db, {
+        "max_per_user": 1, "max_concurrent_global": 1, "queue_enabled": True,
+        "max_queued_per_user": 1, "max_queue_size": 1,
+    })
+    assert (dispatcher.max_per_user, dispatcher.max_pending) == (2, 2)
+
+    first, second, third = FakeMessage(), FakeMessage(), FakeMessage()
+    assert await dispatcher.submit(first) is not None
+    assert await dispatcher.submit(second) is not None
+    assert await dispatcher.submit(third) is None
+    assert third.replies == [c.MSG_CONCURRENT_LIMIT.format(max_concurrent=2)]
+
+    other_user = FakeMessage(user_id=43)
+    assert await dispatcher.submit(other_user) is None
+    assert other_user.replies == [c.MSG_QUEUE_FULL]
+    assert db.count_pending_pipeline_jobs() == 2
+
+    # Finished jobs no longer count.
+    db.finish_pipeline_job(db.claim_pipeline_job("w1")["id"], worker_id="w1", result_text="ok")
+    assert await dispatcher.submit(other_user) is not None
+    assert db.count_pending_pipeline_jobs(43) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_job_and_dispatcher_delivers_chunks(tmp_path):
+    db = _make_db(tmp_path)
+    await JobDispatcher(db).submit(FakeMessage())
+    long_text = "x" * (c.MAX_MESSAGE_LENGTH + 10)
+
+    async def handler(job, set_stage):
+        await set_stage("transcribe")
+        assert db.list_pipeline_jobs(["running"])[0]["stage"] == "transcribe"
+        return long_text
+
+    worker = PipelineWorker(db, handler, worker_id="w1")
+    assert await worker.process_one() is True
+    assert await worker.process_one() is False
+
+    bot = FakeBot()
+    await JobDispatcher(db).poll(SimpleNamespace(bot=bot))
+
+    assert bot.edits == [(100, 8, long_text[:c.MAX_MESSAGE_LENGTH])]
+    assert bot.sent == [(100, long_text[c.MAX_MESSAGE_LENGTH:])]
+    assert db.list_pipeline_jobs(["done"], undelivered_only=True) == []
+
+
+@pytest.mark.asyncio
+async def test_worker_records_pipeline_error_user_message(tmp_path):
+    db = _make_db(tmp_path)
+    await JobDispatcher(db).submit(FakeMessage())
+
+    async def handler(job, set_stage):
+        raise TranscribeError("boom", c.MSG_ERROR_TRANSCRIBE)
+
+    await PipelineWorker(db, handler, worker_id="w1").process_one()
+    bot = FakeBot()
+    await JobDispatcher(db).poll(SimpleNamespace(bot=bot))
+
+    assert bot.edits == [(100, 8, c.MSG_ERROR_TRANSCRIBE)]
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_up_to_concurrency_jobs_at_once(tmp_path):
+    db = _make_db(tmp_path)
+    dispatcher = JobDispatcher(db)
+    for user_id in (1, 2, 3):
+        await dispatcher.submit(FakeMessage(user_id=user_id))
+    active = 0
+    peak = 0
+
+    async def handler(job, set_stage):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await set_stage("transcribe")
+        await asyncio.sleep(0.05)
+        active -= 1
+        return f"job {job['id']}"
+
+    worker = PipelineWorker(db, handler, worker_id="w1", poll_interval=0.01, concurrency=2)
+    await asyncio.wait_for(worker.run(until_idle=True), timeout=5)
+
+    assert peak == 2
+    assert db.count_pipeline_jobs() == {"done": 3}
+
+
+@pytest.mark.asyncio
+async def test_worker_heartbeat_keeps_a_slow_job_from_being_requeued(tmp_path):
+    db = _make_db(tmp_path)
+    job_id = await JobDispatcher(db).submit(FakeMessage())
+    requeued = []
+
+    async def handler(job, set_stage):
+        db.connection.execute(
+            "UPDATE pipeline_jobs SET claimed_at = datetime('now', '-1 hour') WHERE id = ?",
+            (job_id,),
+        )
+        db.connection.commit()
+        await asyncio.sleep(0.1)
+        requeued.append(db.requeue_stale_pipeline_jobs(600))
+        return "ok"
+
+    worker = PipelineWorker(db, handler, worker_id="w1", heartbeat_interval=0.01)
+    assert await worker.process_one() is True
+
+    assert requeued == [0]
+    assert db.count_pipeline_jobs() == {"done": 1}
+
+
+@pytest.mark.asyncio
+async def test_worker_drops_result_of_a_job_requeued_to_another_worker(tmp_path):
+    db = _make_db(tmp_path)
+    job_id = await JobDispatcher(db).submit(FakeMessage())
+
+    async def handler(job, set_stage):
+        db.connection.execute(
+            "UPDATE pipeline_jobs SET claimed_at = datetime('now', '-1 hour') WHERE id = ?",
+            (job_id,),
+        )
+        db.connection.commit()
+        db.requeue_stale_pipeline_jobs(600)
+        db.claim_pipeline_job("w2")
+        return "duplicato"
+
+    worker = PipelineWorker(db, handler, worker_id="w1")
+    assert await worker.process_one() is True
+
+    [job] = db.list_pipeline_jobs(["running"])
+    assert (job["worker_id"], job["result_text"]) == ("w2", None)
+
+
+@pytest.mark.asyncio
+async def test_audio_job_handler_resolves_under_the_worker_db_lock(tmp_path):
+    db = _make_db(tmp_path)
+    handler = AudioJobHandler(db, SimpleNamespace(), bot=SimpleNamespace())
+    worker = PipelineWorker(db, handler, worker_id="w1", db_lock=handler.db_lock)
+    held = []
+
+    def resolve(request):
+        held.append(handler.db_lock.locked())
+        raise PipelineResolutionError("no provider", "nessun provider")
+
+    handler._resolver.resolve = resolve
+    await JobDispatcher(db).submit(FakeMessage())
+
+    assert await worker.process_one() is True
+    assert held == [True]
+    [job] = db.list_pipeline_jobs(["failed"], undelivered_only=True)
+    assert job["user_message"] == "nessun provider"
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_prunes_delivered_jobs_after_retention(tmp_path):
+    db = _make_db(tmp_path)
+    await JobDispatcher(db).submit(FakeMessage(user_id=1))
+    await JobDispatcher(db).submit(FakeMessage(user_id=2))
+
+    async def handler(job, set_stage):
+        return "ok"
+
+    worker = PipelineWorker(db, handler, worker_id="w1")
+    await worker.process_one()
+    await JobDispatcher(db).poll(SimpleNamespace(bot=FakeBot()))
+    db.connection.execute(
+        "UPDATE pipeline_jobs SET delivered_at = datetime('now', '-2 hours') "
+        "WHERE delivered_at IS NOT NULL"
+    )
+    db.connection.commit()
+
+    await JobDispatcher(db, retention_seconds=7200 + 60).prune(SimpleNamespace())
+    assert db.connection.execute("SELECT COUNT(*) FROM pipeline_jobs").fetchone()[0] == 2
+
+    await JobDispatcher(db, retention_seconds=3600).prune(SimpleNamespace())
+    assert db.connection.execute("SELECT COUNT(*) FROM pipeline_jobs").fetchone()[0] == 1
+    assert db.count_pipeline_jobs() == {"queued": 1}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_poll_mirrors_running_stage(tmp_path):
+    db = _make_db(tmp_path)
+    await JobDispatcher(db).submit(FakeMessage())
+    job = db.claim_pipeline_job("w1")
+    db.set_pipeline_job_stage(job["id"], "convert")
+
+    bot = FakeBot()
+    dispatcher = JobDispatcher(db)
+    await dispatcher.poll(SimpleNamespace(bot=bot))
+    await dispatcher.poll(SimpleNamespace(bot=bot))
+
+    assert len(bot.edits) == 1
+    assert c.MSG_PROGRESS_CONVERT in bot.edits[0][2]
+
+
+def test_worker_benchmark_drains_queue_with_multiple_processes():
+    from bot.bench.workers import measure
+
+    result = measure(processes=2, jobs=6, cpu_ms=1, io_ms=0)
+
+    assert result["completed"] == 6
+    assert result["jobs_per_s"] > 0
+
+
+def test_worker_benchmark_compares_against_in_process_run():
+    from bot.bench.workers import run_benchmark
+
+    report = run_benchmark(jobs=4, max_processes=1, cpu_ms=1, io_ms=20, concurrency=2)
+
+    in_process, workers = report["results"]
+    assert in_process["mode"] == "in_process"
+    assert in_process["speedup"] == 1.0
+    assert workers["mode"] == "workers"
+    assert workers["completed"] == 4
+    assert workers["speedup"] > 0